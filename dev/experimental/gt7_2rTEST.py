@@ -249,15 +249,19 @@ def calculate_derived_metrics(data):
         prev = data[i-1]
 
         # Time delta in seconds
-        # Try using current_lap_time difference
-        t_curr = to_float(curr.get('current_lap_time'), 0)
-        t_prev = to_float(prev.get('current_lap_time'), 0)
-
-        dt = t_curr - t_prev
+        # Packet ids tick once per 60Hz frame, so their difference is exact
+        # (and accounts for dropped packets); wall-clock lap time is jittery
+        pkt_step = to_float(curr.get('packet_id'), 0) - to_float(prev.get('packet_id'), 0)
+        if pkt_step >= 1:
+            dt = pkt_step / 60.0
+        else:
+            t_curr = to_float(curr.get('current_lap_time'), 0)
+            t_prev = to_float(prev.get('current_lap_time'), 0)
+            dt = t_curr - t_prev
 
         # Fallback if lap time resets or is weird (e.g. new lap boundary crossing, though file is per lap)
         # If dt is too small or negative, assume 60Hz (0.0166s)
-        if dt <= 0.001 or dt > 0.2:
+        if dt <= 0.001 or (pkt_step < 1 and dt > 0.2):
             dt = 1.0 / 60.0
 
         # Calculate suspension velocity for each corner
@@ -409,6 +409,14 @@ class ClaudeTunesCLI:
         domain_files = ['metadata.json', 'suspension.json', 'tires.json',
                        'aero.json', 'drivetrain.json', 'balance.json']
 
+        # Prefer the consolidated snapshot: one open, all domains from the same flush
+        from utils.json_writers import DomainSnapshotReader
+        snapshot = DomainSnapshotReader(session_path).read()
+        if snapshot is not None:
+            print(f"  ✓ Loaded domains.snapshot (sequence {snapshot['sequence']})")
+            domains = snapshot['domains']
+            domain_files = [f for f in domain_files if f.replace('.json', '') not in domains]
+
         for domain_file in domain_files:
             domain_path = session_path / domain_file
             domain_name = domain_file.replace('.json', '')
@@ -436,12 +444,22 @@ class ClaudeTunesCLI:
                 'RR': travel_data.get('RR', {}).get('samples', [])
             }
 
+        # Measured ride frequency (online zero-crossing estimate from the logger)
+        if 'suspension' in domains and domains['suspension'].get('ride_frequency_hz'):
+            telemetry['ride_frequency'] = domains['suspension']['ride_frequency_hz']
+
         # Balance data (from balance.json)
-        if 'balance' in domains and 'weight_transfer' in domains['balance']:
-            # Extract lateral_g average for understeer/oversteer detection
+        yaw_ratio = domains.get('balance', {}).get('stability_metrics', {}).get('yaw_ratio_avg')
+        if yaw_ratio is not None:
+            # Measured / kinematic yaw rate: 1.0 = neutral, <1 = understeer, >1 = oversteer
+            # Scaled so 0.8 lands on the Neutral/Moderate boundary (gradient 2)
+            telemetry['balance'] = {
+                'understeer_gradient': (1.0 - yaw_ratio) * 10,
+                'yaw_ratio': yaw_ratio
+            }
+        elif 'balance' in domains and 'weight_transfer' in domains['balance']:
+            # Older sessions: no yaw data, fall back to lateral G approximation
             lateral_g = domains['balance']['weight_transfer'].get('lateral_g', {})
-            # Simple approximation: convert lateral G to understeer gradient
-            # This is a placeholder - real balance analysis would be more sophisticated
             avg_lateral = lateral_g.get('avg', 0)
             telemetry['balance'] = {
                 'understeer_gradient': avg_lateral * 2  # Simple conversion
@@ -915,6 +933,18 @@ class ClaudeTunesCLI:
 
         print(f"  ✓ Target: F={front_freq:.2f} Hz | R={rear_freq:.2f} Hz | Stability={stability:.2f}")
 
+        # Compare against what the car actually did on track (Phase 1 domain JSONs)
+        measured = self.telemetry.get('ride_frequency', {}) if isinstance(self.telemetry, dict) else {}
+        if measured.get('front') and measured.get('rear'):
+            self.results['physics']['measured_frequency'] = {
+                'front': measured['front'],
+                'rear': measured['rear'],
+                'front_delta': measured['front'] - front_freq,
+                'rear_delta': measured['rear'] - rear_freq
+            }
+            print(f"  • Measured: F={measured['front']:.2f} Hz ({measured['front'] - front_freq:+.2f}) | "
+                  f"R={measured['rear']:.2f} Hz ({measured['rear'] - rear_freq:+.2f})")
+
         # Safety check
         if stability > 0:
             print("  ⚠ WARNING: Positive stability (oversteer tendency)")
@@ -10,13 +10,11 @@ from Crypto.Cipher import Salsa20
 
 # Phase 1: Domain extractors and JSON writers
 from utils import (
-    MetadataExtractor,
-    SuspensionExtractor,
-    TireExtractor,
-    AeroExtractor,
-    DrivetrainExtractor,
-    BalanceExtractor,
-    BufferedDomainWriter
+    DecodedPacket,
+    ExtractorPipeline,
+    BackgroundDomainWriter,
+    PACKET_LOG_FILENAME,
+    LAPS_DIRNAME
 )
 
 # ansi prefix
@@ -251,19 +249,18 @@ DOWNFORCE_DATABASE = {
     # Default: 0 for street cars
 }
 
-# Phase 1: Initialize domain extractors and JSON writer
-metadata_extractor = MetadataExtractor(CAR_DATABASE)
-suspension_extractor = SuspensionExtractor()
-tire_extractor = TireExtractor()
-aero_extractor = AeroExtractor(DOWNFORCE_DATABASE)
-drivetrain_extractor = DrivetrainExtractor()
-balance_extractor = BalanceExtractor()
+# Phase 1: Initialize domain extractors (timed per extractor) and JSON writer
+# Extraction budget per packet - optional metrics are skipped while it is exceeded
+EXTRACTION_BUDGET_MS = 8.0
+extractor_pipeline = ExtractorPipeline(CAR_DATABASE, DOWNFORCE_DATABASE, budget_ms=EXTRACTION_BUDGET_MS)
 
 # Buffered JSON writer (writes every 10 packets)
-domain_writer = BufferedDomainWriter(session_folder, buffer_size=10)
+# Its thread also appends the raw packet log so domain JSONs can be rebuilt in batch (rebuild_domains.py)
+domain_writer = BackgroundDomainWriter(session_folder, write_snapshot=True, journal=True, lap_rollups=True,
+                                       packet_log=True)
 
 print("Domain extractors initialized")
-print("JSON writer ready (buffer=10 packets)")
+print("JSON writer ready (background thread, changed domains only)")
 
 # OLD CSV CODE - No longer used in Phase 1
 # csv_headers = [
@@ -667,8 +664,14 @@ def extract_telemetry_data(ddata, lap_time_seconds):
 def handler(signum, frame):
     print("\nShutting down...")
 
-    # Phase 1: Force write final domain JSONs
-    domain_writer.force_write()
+    # Phase 1: Force write final domain JSONs (and the lap in progress)
+    # The last packet was most likely not a snapshot: rebuild the full domain output
+    for domain_name, domain_data in extractor_pipeline.snapshot_domains().items():
+        domain_writer.update_domain(domain_name, domain_data)
+    final_lap = extractor_pipeline.finish_lap()
+    if final_lap is not None:
+        domain_writer.add_lap_rollup(final_lap)
+    domain_writer.close()
     print("Final domain JSONs written")
 
     summary_file = f"{session_folder}/session_summary.txt"
@@ -686,6 +689,10 @@ def handler(signum, frame):
         f.write(f"  - aero.json (ride height, downforce, rake)\n")
         f.write(f"  - drivetrain.json (power, gearing, wheel spin)\n")
         f.write(f"  - balance.json (g-forces, stability)\n")
+        f.write(f"  - domains.snapshot (all six domains, one consistent flush)\n")
+        f.write(f"  - journal.jsonl + journal.idx (per-flush domain history, indexed by lap)\n")
+        f.write(f"  - {LAPS_DIRNAME}/lap_NNN.json + {LAPS_DIRNAME}/index.json (per-lap rollups)\n")
+        f.write(f"  - {PACKET_LOG_FILENAME} (raw packets, for rebuild_domains.py)\n")
 
     print(f"Session data saved to: {session_folder}/")
     sys.stdout.write(f'{pref}?1049l')
@@ -826,30 +833,33 @@ while True:
                 current_lap_number = curlap
                 curLapTime = dt_now - dt_start
 
-                # Phase 1: Extract all 6 domains from packet
-                metadata = metadata_extractor.extract(ddata, dt_now)
-                suspension = suspension_extractor.extract(ddata)
-                tires = tire_extractor.extract(ddata)
-                car_code = struct.unpack('i', ddata[0x124:0x128])[0]
-                aero = aero_extractor.extract(ddata, car_code)
-                drivetrain = drivetrain_extractor.extract(ddata)
-                balance = balance_extractor.extract(ddata)
-
-                # Update buffered writer
-                domain_writer.update_domain('metadata', metadata)
-                domain_writer.update_domain('suspension', suspension)
-                domain_writer.update_domain('tires', tires)
-                domain_writer.update_domain('aero', aero)
-                domain_writer.update_domain('drivetrain', drivetrain)
-                should_flush = domain_writer.update_domain('balance', balance)
+                # Phase 1: Decode once, extract all 6 domains from the shared packet
+                # Sample lists are only built when the writer is about to pick this packet up
+                packet = DecodedPacket.from_bytes(ddata)
+                domain_writer.add_packet(ddata)
+                # A lap change wakes the writer right away, so that packet is a snapshot too
+                snapshot = domain_writer.snapshot_due or extractor_pipeline.lap_changes(packet)
+                domains = extractor_pipeline.process(packet, dt_now, snapshot)
+                metadata, suspension, drivetrain = domains['metadata'], domains['suspension'], domains['drivetrain']
+
+                # Hand newest snapshots to the background writer (no disk I/O here)
+                for domain_name, domain_data in domains.items():
+                    domain_writer.update_domain(domain_name, domain_data, snapshot)
+                if extractor_pipeline.completed_lap is not None:
+                    # Lap summary is stored by the writer thread as soon as the lap ends
+                    domain_writer.add_lap_rollup(extractor_pipeline.completed_lap)
 
                 # Increment packet counter
                 packet_count += 1
 
-                # Flush to disk every 10 packets
-                if should_flush:
-                    domain_writer.flush()
-                    printAt(f'Domain JSONs updated ({packet_count} packets)', 19, 1)
+                if snapshot:
+                    printAt(f'Domain JSONs updated ({domain_writer.files_written} writes)   ', 19, 1)
+                    timing = metadata['pipeline']
+                    slowest = extractor_pipeline.slowest()
+                    printAt(f"Extract p99: {timing['total']['p99_us']:7.1f}us "
+                            f"(max {timing['total']['max_us']:7.1f}us, slowest {slowest:<10}) "
+                            f"{'DEGRADED' if timing['degraded'] else '        '}", 4, 1,
+                            reverse=1 if timing['degraded'] else 0)
 
                 # Update display
                 printAt(f'{current_lap_number:3d}', 5, 15)
@@ -878,6 +888,7 @@ while True:
 
                 # Car name and code (from metadata)
                 car_name = metadata['car']['name']
+                car_code = metadata['car']['code']
                 car_display = car_name[:25] if len(car_name) > 25 else car_name
                 printAt(f'{car_display:<25}', 13, 6)
                 printAt(f'{car_code:5d}', 14, 7)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Rebuild Domain JSON Files from a Recorded Session
+Replays packets.bin (written by gt7_1r_phase1.py) through the batch extractors,
+which give the same results as the live streaming path in a fraction of the time.
+
+Usage:
+    python3 rebuild_domains.py sessions/20251230_173045
+    python3 rebuild_domains.py sessions/20251230_173045 --journal --chunk-seconds 0.2
+    python3 rebuild_domains.py sessions/20251230_173045 --output /tmp/rebuilt --laps
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime as dt
+from pathlib import Path
+
+import numpy as np
+
+from utils import (
+    MetadataExtractor,
+    SuspensionExtractor,
+    TireExtractor,
+    AeroExtractor,
+    DrivetrainExtractor,
+    BalanceExtractor,
+    DomainJSONWriter,
+    DomainJournal,
+    LapRollupStore,
+    build_lap_rollup,
+    decode_columns,
+    PACKET_LOG_FILENAME,
+    LAPS_DIRNAME
+)
+from utils.domain_journal import JOURNAL_FILENAME
+
+
+def load_databases(session_path):
+    """
+    Car name / downforce lookups for this session
+
+    The full tables live in the logger script; the session's own metadata.json
+    and aero.json already hold the entries for the car that was driven.
+    """
+    car_database, downforce_database = {}, {}
+    try:
+        metadata = json.loads((session_path / 'metadata.json').read_text())
+        car = metadata['car']
+        car_database[car['code']] = car['name']
+        aero = json.loads((session_path / 'aero.json').read_text())
+        downforce_database[car['code']] = aero['downforce_estimate_lbs']['total']
+    except (FileNotFoundError, KeyError, json.JSONDecodeError):
+        pass
+    return car_database, downforce_database
+
+
+def rebuild_session(session_folder, output_folder=None, chunk_packets=None, journal=False, laps=False):
+    """
+    Rebuild all six domains from a session's packet log
+
+    Args:
+        session_folder: Session directory containing packets.bin
+        output_folder: Where to write the domain JSONs (default: session folder)
+        chunk_packets: Packets per snapshot (default: whole session in one batch)
+        journal: Also write journal.jsonl history, one record per chunk
+        laps: Also write the per-lap rollups (laps/lap_NNN.json)
+
+    Returns:
+        Final domain data (domain name -> dict)
+    """
+    session_path = Path(session_folder)
+    output_path = Path(output_folder) if output_folder else session_path
+    packet_log = session_path / PACKET_LOG_FILENAME
+
+    columns = decode_columns(packet_log.read_bytes())
+    if not len(columns):
+        raise ValueError(f"No packets in {packet_log}")
+
+    car_database, downforce_database = load_databases(session_path)
+    metadata_extractor = MetadataExtractor(car_database)
+    try:
+        metadata_extractor.session_start = dt.strptime(session_path.name, '%Y%m%d_%H%M%S')
+    except ValueError:
+        pass
+    suspension_extractor = SuspensionExtractor()
+    tire_extractor = TireExtractor()
+    aero_extractor = AeroExtractor(downforce_database)
+    drivetrain_extractor = DrivetrainExtractor()
+    balance_extractor = BalanceExtractor()
+
+    if journal and (output_path / JOURNAL_FILENAME).exists():
+        raise FileExistsError(f"{output_path / JOURNAL_FILENAME} already exists - choose another --output")
+    journal_writer = DomainJournal(output_path) if journal else None
+    if laps and (output_path / LAPS_DIRNAME).exists():
+        raise FileExistsError(f"{output_path / LAPS_DIRNAME} already exists - choose another --output")
+    lap_store = LapRollupStore(output_path) if laps else None
+    extractors = {
+        'metadata': metadata_extractor,
+        'suspension': suspension_extractor,
+        'tires': tire_extractor,
+        'aero': aero_extractor,
+        'drivetrain': drivetrain_extractor,
+        'balance': balance_extractor
+    }
+
+    timestamp = dt.fromtimestamp(packet_log.stat().st_mtime)
+    chunk = chunk_packets or len(columns)
+    # Chunks never straddle a lap change, so each lap's accumulators hold exactly its packets
+    lap_starts = [0] + (np.flatnonzero(np.diff(columns.current_lap)) + 1).tolist() + [len(columns)]
+    domains = {}
+    for lap_start, lap_end in zip(lap_starts[:-1], lap_starts[1:]):
+        for start in range(lap_start, lap_end, chunk):
+            part = columns.slice(start, min(start + chunk, lap_end))
+            car_code = int(part.car_code[-1])
+            domains = {
+                'metadata': metadata_extractor.extract_batch(part, timestamp),
+                'suspension': suspension_extractor.extract_batch(part),
+                'tires': tire_extractor.extract_batch(part),
+                'aero': aero_extractor.extract_batch(part, car_code),
+                'drivetrain': drivetrain_extractor.extract_batch(part),
+                'balance': balance_extractor.extract_batch(part)
+            }
+            if journal_writer is not None:
+                # Packets arrive at 60 Hz and the log was last written at `timestamp`
+                packets_after = len(columns) - (start + len(part))
+                journal_writer.append(domains, domains['metadata']['session_summary']['current_lap'],
+                                      timestamp=timestamp.timestamp() - packets_after / 60.0)
+
+        next_packet = columns.row(lap_end) if lap_end < len(columns) else None
+        rollup = build_lap_rollup(extractors, int(columns.current_lap[lap_start]), next_packet)
+        if lap_store is not None:
+            lap_store.write(rollup)
+
+    if journal_writer is not None:
+        journal_writer.close()
+
+    writer = DomainJSONWriter(output_path)
+    texts = {name: json.dumps(data, separators=(',', ':')) for name, data in domains.items()}
+    for name, text in texts.items():
+        writer.write_text_atomic(text, f'{name}.json')
+    writer.write_snapshot(texts, 1)
+    return domains
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild domain JSONs from a session packet log')
+    parser.add_argument('session_folder', help='Session folder containing packets.bin')
+    parser.add_argument('--output', help='Output folder (default: the session folder)')
+    parser.add_argument('--journal', action='store_true', help='Also write journal.jsonl history')
+    parser.add_argument('--laps', action='store_true', help='Also write per-lap rollups (laps/)')
+    parser.add_argument('--chunk-seconds', type=float, default=None,
+                        help='Snapshot interval for the journal (default: 0.2 with --journal)')
+    args = parser.parse_args()
+
+    chunk_seconds = args.chunk_seconds or (0.2 if args.journal else None)
+    chunk_packets = max(1, int(round(chunk_seconds * 60))) if chunk_seconds else None
+
+    started = time.perf_counter()
+    try:
+        domains = rebuild_session(args.session_folder, args.output, chunk_packets, args.journal, args.laps)
+    except (FileNotFoundError, FileExistsError, ValueError) as e:
+        print(f"❌ {e}")
+        return False
+
+    elapsed = time.perf_counter() - started
+    summary = domains['metadata']['session_summary']
+    print(f"✅ Rebuilt {len(domains)} domains in {elapsed:.2f}s "
+          f"(last packet {domains['metadata']['packet_id']}, lap {summary['current_lap']})")
+    return True
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
@@ -15,13 +15,26 @@ from datetime import datetime as dt
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'phase1'))
 
 from utils import (
+    DecodedPacket,
+    StatBuffer,
     MetadataExtractor,
     SuspensionExtractor,
     TireExtractor,
     AeroExtractor,
     DrivetrainExtractor,
     BalanceExtractor,
-    BufferedDomainWriter
+    BufferedDomainWriter,
+    BackgroundDomainWriter,
+    DomainSnapshotReader,
+    DomainJournal,
+    DomainJournalReader,
+    ExtractorPipeline,
+    LatencyHistogram,
+    LapRollupStore,
+    build_lap_rollup,
+    decode_columns,
+    PACKET_SIZE,
+    PACKET_LOG_FILENAME
 )
 
 # Simple car database for testing
@@ -132,6 +145,399 @@ def test_extractors():
     return True
 
 
+def test_decoded_packet():
+    """Shared DecodedPacket matches per-field unpacking and feeds every extractor"""
+    import struct
+
+    print("\n" + "=" * 60)
+    print("Testing DecodedPacket")
+    print("=" * 60)
+
+    packet = bytearray(create_dummy_packet())
+    # Wheel spin: rears at 1.3x car speed with 80% throttle
+    for i, radius in enumerate((0.33, 0.33, 0.33, 0.33)):
+        packet[0xB4 + i*4:0xB8 + i*4] = struct.pack('f', radius)
+    for i, ratio in enumerate((1.0, 1.0, 1.3, 1.3)):
+        rps = 50.0 * ratio / 0.33
+        packet[0xA4 + i*4:0xA8 + i*4] = struct.pack('f', rps)
+    packet = bytes(packet)
+
+    decoded = DecodedPacket.from_bytes(packet)
+    assert decoded.speed_mps == struct.unpack('f', packet[0x4C:0x50])[0]
+    assert decoded.rpm == struct.unpack('f', packet[0x3C:0x40])[0]
+    assert decoded.suspension == struct.unpack('4f', packet[0xC4:0xD4])
+    assert decoded.tire_temps == struct.unpack('4f', packet[0x60:0x70])
+    assert decoded.car_code == 3462
+    assert decoded.current_lap == 3
+    assert abs(decoded.throttle_pct - 80.0) < 0.5
+    print(f"   Speed: {decoded.speed_kph:.1f} kph, slip: {[round(s, 2) for s in decoded.slip_ratio]}")
+
+    # Same output from raw bytes and from the shared decoded packet
+    assert SuspensionExtractor().extract(packet) == SuspensionExtractor().extract(decoded)
+    assert TireExtractor().extract(packet) == TireExtractor().extract(decoded)
+    assert AeroExtractor(DOWNFORCE_DATABASE).extract(packet, 3462) == \
+        AeroExtractor(DOWNFORCE_DATABASE).extract(decoded, decoded.car_code)
+
+    drivetrain = DrivetrainExtractor().extract(decoded)
+    spin = drivetrain['wheel_spin_events']
+    print(f"   Wheel spin: RL={spin['RL_count']} RR={spin['RR_count']} severity={spin['severity_avg']:.2f}")
+    assert spin['RL_count'] == 1 and spin['RR_count'] == 1
+    assert spin['FL_count'] == 0 and spin['FR_count'] == 0
+    assert abs(spin['severity_avg'] - 0.3) < 0.01
+
+    print("\n✅ DecodedPacket working!")
+    return True
+
+
+def test_stat_buffer():
+    """Incremental StatBuffer matches a full recompute over the window"""
+    import random
+
+    print("\n" + "=" * 60)
+    print("Testing StatBuffer")
+    print("=" * 60)
+
+    random.seed(7)
+    values = [random.uniform(-50, 50) for _ in range(3000)]
+    for window in (1, 10, 600, None):
+        buf = StatBuffer(window)
+        for i, v in enumerate(values):
+            buf.add(v)
+            recent = values[max(0, i + 1 - window):i + 1] if window else values[:i + 1]
+            stats = buf.get_stats(snapshot=(i % 97 == 0))
+            assert stats['current'] == v
+            assert stats['max'] == max(recent) and stats['min'] == min(recent)
+            assert abs(stats['avg'] - sum(recent) / len(recent)) < 1e-9
+            assert ('samples' in stats) == (i % 97 == 0)
+            if 'samples' in stats:
+                assert stats['samples'] == recent
+        print(f"   window={window}: ✅")
+
+    assert StatBuffer.for_seconds(2.0).max_samples == 120
+    assert StatBuffer().get_stats()['samples'] == []
+
+    print("\n✅ StatBuffer working!")
+    return True
+
+
+def test_suspension_dynamics():
+    """Online damper histograms and zero-crossing ride frequency"""
+    import math
+    import struct
+
+    print("\n" + "=" * 60)
+    print("Testing suspension dynamics")
+    print("=" * 60)
+
+    packet = bytearray(create_dummy_packet())
+    extractor = SuspensionExtractor()
+    for i in range(1200):
+        t = i / 60.0
+        front = 0.100 + 0.010 * math.sin(2 * math.pi * 2.0 * t)
+        rear = 0.100 + 0.010 * math.sin(2 * math.pi * 3.0 * t)
+        if i == 600:
+            rear = 0.300  # one sample beyond the travel limit
+        struct.pack_into('<4f', packet, 0xC4, front, front, rear, rear)
+        struct.pack_into('<i', packet, 0x70, i)
+        data = extractor.extract(bytes(packet), snapshot=(i == 1199))
+        assert ('ride_frequency_hz' in data) == (i == 1199)
+
+    freq = data['ride_frequency_hz']
+    assert abs(freq['front'] - 2.0) < 0.15 and abs(freq['FL'] - 2.0) < 0.15
+    assert abs(freq['rear'] - 3.0) < 0.15
+    assert freq['modes']['roll']['frequency_hz'] == 0.0  # symmetric input
+    assert data['bottoming_events']['RL_count'] == 1 and data['bottoming_events']['FL_count'] == 0
+
+    damper = data['damper_velocity_mm_s']
+    assert damper['FL']['samples'] == 1199
+    assert sum(damper['FL']['counts']) == 1199
+    # Peak front velocity = 2*pi*2 Hz*10 mm = ~126 mm/s -> nothing above 200 mm/s
+    assert damper['FL']['counts'][0] == damper['FL']['counts'][-1] == 0
+    print(f"   front={freq['front']:.2f} Hz rear={freq['rear']:.2f} Hz "
+          f"FL low-speed={damper['FL']['low_speed_pct']:.0f}%")
+
+    print("\n✅ Suspension dynamics working!")
+    return True
+
+
+def drive_corner(yaw_gain: float):
+    """Drive a 30 m/s, 0.5 rad/s corner; the body yaws at yaw_gain x the path rate"""
+    import math
+    import struct
+
+    packet = bytearray(create_dummy_packet())
+    extractor = BalanceExtractor()
+    speed, course, heading, prev_rate = 30.0, 0.0, 0.0, 0.0
+    for i in range(600):
+        rate = 0.5 if 120 <= i < 480 else 0.0
+        course += (rate + prev_rate) / 2 / 60.0
+        heading += yaw_gain * (rate + prev_rate) / 2 / 60.0
+        prev_rate = rate
+        struct.pack_into('<3f', packet, 0x10, speed * math.sin(course), 0.0, speed * math.cos(course))
+        struct.pack_into('<4f', packet, 0x1C, 0.0, math.sin(heading / 2), 0.0, math.cos(heading / 2))
+        struct.pack_into('<3f', packet, 0x2C, 0.0, yaw_gain * rate, 0.0)
+        struct.pack_into('<i', packet, 0x70, i)
+        packet[0x92] = int(50 * 2.55) if 120 <= i < 180 else 0     # brake into the corner
+        packet[0x91] = int(80 * 2.55) if i >= 300 else 0           # throttle out of it
+        data = extractor.extract(bytes(packet), snapshot=False)
+        if i == 250:
+            mid_corner = data
+    return mid_corner, data
+
+
+def test_balance():
+    """Yaw-rate ratio classification and corner phases"""
+    print("\n" + "=" * 60)
+    print("Testing balance detection")
+    print("=" * 60)
+
+    mid, final = drive_corner(1.0)
+    # Body-frame lateral acceleration = v * yaw rate = 15 m/s^2
+    assert abs(mid['weight_transfer']['lateral_g']['current'] - 15.0 / 9.81) < 0.02
+    assert abs(mid['yaw_rate']['ratio'] - 1.0) < 0.02
+    assert final['stability_metrics']['balance_bias'] == 'neutral'
+    assert final['stability_metrics']['understeer_events'] == final['stability_metrics']['oversteer_events'] == 0
+    assert final['corner_analysis']['corners'] == 1
+    assert final['corner_analysis']['entry_stability'] == 'stable'
+
+    _, final = drive_corner(0.6)
+    assert final['stability_metrics']['balance_bias'] == 'understeer'
+    assert final['stability_metrics']['understeer_events'] == 1
+    assert final['corner_analysis']['mid_corner_grip'] == 'understeer'
+
+    _, final = drive_corner(1.5)
+    assert final['stability_metrics']['balance_bias'] == 'oversteer'
+    assert final['corner_analysis']['exit_traction'] == 'power_oversteer'
+    print(f"   {final['stability_metrics']}")
+
+    print("\n✅ Balance detection working!")
+    return True
+
+
+def make_session_packets(count, seed=3):
+    """Synthetic session: cornering, suspension oscillation, wheel spin, dropped/duplicate/reordered packets"""
+    import math
+    import random
+    import struct
+
+    rnd = random.Random(seed)
+    packet = bytearray(create_dummy_packet())
+    packets, packet_id, course = [], 100, 0.0
+    for i in range(count):
+        packet_id += 1 if rnd.random() > 0.03 else rnd.choice([0, -2, 3, 9])
+        t = i / 60.0
+        yaw_rate = 0.6 * math.sin(t / 3)
+        course += yaw_rate / 60.0
+        speed = 20 + 15 * abs(math.sin(t / 7))
+        heading = course + 0.05 * math.sin(2 * t)
+        struct.pack_into('<3f', packet, 0x10, speed * math.sin(course), 0.1 * math.sin(t), speed * math.cos(course))
+        struct.pack_into('<4f', packet, 0x1C, 0.01, math.sin(heading / 2), 0.0, math.cos(heading / 2))
+        struct.pack_into('<3f', packet, 0x2C, 0.0, yaw_rate * (1 + 0.3 * math.sin(t)), 0.0)
+        struct.pack_into('<f', packet, 0x4C, speed)
+        travel = [0.1 + 0.02 * math.sin(2 * math.pi * (2 + k * 0.3) * t) + rnd.gauss(0, 0.001) for k in range(4)]
+        if rnd.random() < 0.01:
+            travel[2] = 0.3
+        struct.pack_into('<4f', packet, 0xC4, *travel)
+        struct.pack_into('<4f', packet, 0x60, *[80 + 10 * math.sin(t / 20 + k) for k in range(4)])
+        struct.pack_into('<4f', packet, 0xA4, *[speed / (2 * math.pi * 0.33) * (1 + 0.3 * rnd.random() * (k > 1))
+                                                for k in range(4)])
+        struct.pack_into('<4f', packet, 0xB4, 0.33, 0.33, 0.33, 0.33)
+        struct.pack_into('<f', packet, 0x3C, 3000 + 4000 * abs(math.sin(t)))
+        struct.pack_into('<i', packet, 0x70, packet_id)
+        struct.pack_into('<h', packet, 0x74, 1 + i // 3000)
+        packet[0x90] = 1 + int(abs(math.sin(t / 5)) * 5)
+        packet[0x91] = int(255 * abs(math.sin(t / 4)))
+        packet[0x92] = int(255 * max(0.0, math.sin(t / 3)))
+        packets.append(bytes(packet))
+    return packets
+
+
+def assert_same_output(a, b, path=''):
+    """Equal structure and values; floats may differ only by running-sum rounding"""
+    if isinstance(a, dict):
+        assert a.keys() == b.keys(), path
+        for key in a:
+            assert_same_output(a[key], b[key], f'{path}/{key}')
+    elif isinstance(a, (list, tuple)):
+        assert len(a) == len(b), path
+        for i, (x, y) in enumerate(zip(a, b)):
+            assert_same_output(x, y, f'{path}[{i}]')
+    elif isinstance(a, float):
+        assert abs(a - b) <= 1e-9 * max(1.0, abs(a)), (path, a, b)
+    else:
+        assert a == b, (path, a, b)
+
+
+def test_batch_parity():
+    """extract_batch() over chunks matches streaming extract() snapshots and final state"""
+    import random
+    from datetime import datetime
+
+    print("\n" + "=" * 60)
+    print("Testing batch extraction parity")
+    print("=" * 60)
+
+    timestamp = datetime(2025, 1, 1, 12, 0, 0)
+
+    def make_extractors():
+        return (MetadataExtractor(CAR_DATABASE), SuspensionExtractor(), TireExtractor(),
+                AeroExtractor(DOWNFORCE_DATABASE), DrivetrainExtractor(), BalanceExtractor())
+
+    packets = make_session_packets(6000)
+    rnd = random.Random(1)
+    bounds = [0]
+    while bounds[-1] < len(packets):
+        bounds.append(min(len(packets), bounds[-1] + rnd.choice([1, 5, 12, 100, 700])))
+    boundaries = set(bounds[1:])
+
+    streaming = make_extractors()
+    expected = []
+    for i, raw in enumerate(packets):
+        packet = DecodedPacket.from_bytes(raw)
+        snapshot = (i + 1) in boundaries
+        meta, susp, tires, aero, drive, balance = streaming
+        outputs = (meta.extract(packet, timestamp), susp.extract(packet, snapshot),
+                   tires.extract(packet, snapshot), aero.extract(packet, packet.car_code, snapshot),
+                   drive.extract(packet, snapshot), balance.extract(packet, snapshot))
+        if snapshot:
+            expected.append(outputs)
+
+    batch = make_extractors()
+    batch[0].session_start = streaming[0].session_start
+    columns = decode_columns(b''.join(packets))
+    assert len(columns) == len(packets)
+    assert columns.row(17).slip_ratio == DecodedPacket.from_bytes(packets[17]).slip_ratio
+    for (start, stop), outputs in zip(zip(bounds, bounds[1:]), expected):
+        part = columns.slice(start, stop)
+        meta, susp, tires, aero, drive, balance = batch
+        batch_outputs = (meta.extract_batch(part, timestamp), susp.extract_batch(part),
+                         tires.extract_batch(part), aero.extract_batch(part, int(part.car_code[-1])),
+                         drive.extract_batch(part), balance.extract_batch(part))
+        assert_same_output(outputs, batch_outputs)
+
+    # Final state carries on identically
+    tail = DecodedPacket.from_bytes(packets[-1])
+    assert_same_output(streaming[5].extract(tail), batch[5].extract(tail))
+    assert_same_output(streaming[1].extract(tail), batch[1].extract(tail))
+    print(f"   {len(expected)} snapshots over {len(packets)} packets match")
+
+    print("\n✅ Batch extraction parity verified!")
+    return True
+
+
+def test_pipeline_timing():
+    """Per-extractor latency histograms and budget auto-degrade"""
+    print("\n" + "=" * 60)
+    print("Testing extractor pipeline timing")
+    print("=" * 60)
+
+    histogram = LatencyHistogram()
+    for ns in range(1000, 101000, 1000):  # 1..100 us, uniform
+        histogram.record(ns)
+    summary = histogram.summary()
+    assert summary['calls'] == 100 and summary['max_us'] == 100.0
+    assert 50.0 <= summary['p50_us'] <= 50.0 * 1.13
+    assert 99.0 <= summary['p99_us'] <= 100.0
+
+    packet = DecodedPacket.from_bytes(create_dummy_packet())
+    pipeline = ExtractorPipeline(CAR_DATABASE, DOWNFORCE_DATABASE)
+    for _ in range(50):
+        domains = pipeline.process(packet, dt.now(), snapshot=False)
+    assert set(domains) == set(ExtractorPipeline.DOMAINS)
+    assert 'pipeline' not in domains['metadata']
+    domains = pipeline.process(packet, dt.now(), snapshot=True)
+    timing = domains['metadata']['pipeline']
+    assert timing['extractors']['suspension']['calls'] == 51
+    assert timing['total']['p99_us'] > 0 and not timing['degraded']
+
+    # A zero budget is always exceeded -> optional metrics switch off, then come back
+    pipeline = ExtractorPipeline(CAR_DATABASE, DOWNFORCE_DATABASE, budget_ms=0.0)
+    for _ in range(ExtractorPipeline.DEGRADE_AFTER):
+        pipeline.process(packet, dt.now(), snapshot=False)
+    assert pipeline.degraded and pipeline.degraded_metrics() == ['suspension']
+    assert pipeline.extractors['suspension'].optional_metrics is False
+    assert 'over' in pipeline.last_warning
+    pipeline.budget_ns = 10 ** 12
+    for _ in range(ExtractorPipeline.RESTORE_AFTER):
+        pipeline.process(packet, dt.now(), snapshot=False)
+    assert not pipeline.degraded and pipeline.extractors['suspension'].optional_metrics is True
+    print(f"   total p50={timing['total']['p50_us']}us p99={timing['total']['p99_us']}us "
+          f"slowest={pipeline.slowest()}")
+
+    print("\n✅ Pipeline timing working!")
+    return True
+
+
+def test_lap_rollups():
+    """Per-lap accumulators roll up and reset at lap changes, streaming and batch alike"""
+    import numpy as np
+    import tempfile
+    import shutil
+
+    print("\n" + "=" * 60)
+    print("Testing lap rollups")
+    print("=" * 60)
+
+    packets = make_session_packets(7000)  # lap changes every 3000 packets
+    pipeline = ExtractorPipeline(CAR_DATABASE, DOWNFORCE_DATABASE)
+    rollups = []
+    for raw in packets:
+        pipeline.process(DecodedPacket.from_bytes(raw), dt.now(), snapshot=False)
+        if pipeline.completed_lap is not None:
+            rollups.append(pipeline.completed_lap)
+    rollups.append(pipeline.finish_lap())
+
+    assert [r['lap'] for r in rollups] == [1, 2, 3]
+    assert [r['complete'] for r in rollups] == [True, True, False]
+    assert [r['metadata']['packets'] for r in rollups] == [3000, 3000, 1000]
+    assert rollups[1]['suspension']['travel_mm']['FL']['samples'] == 3000
+    assert rollups[2]['lap_time_ms'] is None
+
+    # Per-lap counts add up to the session totals in the domain JSONs
+    session = pipeline.extractors
+    assert sum(r['tires']['slip_ratio']['RL']['events'] for r in rollups) == session['tires'].slip_events['RL']
+    assert (sum(r['suspension']['bottoming_events']['RL_count'] for r in rollups)
+            == session['suspension'].bottoming_counters['RL'])
+    assert sum(r['balance']['corners'] for r in rollups) == session['balance'].corner_count
+    travel = rollups[0]['suspension']['travel_mm']['FL']
+    assert travel['min'] <= travel['p5'] <= travel['p50'] <= travel['p95'] <= travel['max']
+
+    # Batch extraction split at the same lap boundaries gives the same rollups
+    batch = ExtractorPipeline(CAR_DATABASE, DOWNFORCE_DATABASE).extractors
+    columns = decode_columns(b''.join(packets))
+    starts = [0] + (np.flatnonzero(np.diff(columns.current_lap)) + 1).tolist() + [len(columns)]
+    timestamp = dt.now()
+    for start, end, expected in zip(starts, starts[1:], rollups):
+        part = columns.slice(start, end)
+        batch['metadata'].extract_batch(part, timestamp)
+        batch['suspension'].extract_batch(part)
+        batch['tires'].extract_batch(part)
+        batch['aero'].extract_batch(part, int(part.car_code[-1]))
+        batch['drivetrain'].extract_batch(part)
+        batch['balance'].extract_batch(part)
+        next_packet = columns.row(end) if end < len(columns) else None
+        assert_same_output(expected, build_lap_rollup(batch, int(part.current_lap[0]), next_packet))
+
+    test_session = tempfile.mkdtemp(prefix='gt7_test_laps_')
+    try:
+        store = LapRollupStore(test_session)
+        assert store.write(rollups[0]) == 'lap_001.json'
+        store.write(rollups[1])
+        assert store.write(rollups[0]) == 'lap_001_2.json'  # lap 1 driven again
+        reopened = LapRollupStore(test_session)
+        assert [entry['lap'] for entry in reopened.laps()] == [1, 2, 1]
+        assert reopened.read(2)['metadata']['packets'] == 3000
+        assert reopened.read(4) is None
+    finally:
+        shutil.rmtree(test_session, ignore_errors=True)
+
+    print(f"   laps {[r['lap'] for r in rollups]}, "
+          f"slip events per lap {[r['tires']['slip_ratio']['RL']['events'] for r in rollups]}")
+
+    print("\n✅ Lap rollups working!")
+    return True
+
+
 def test_json_writers():
     """Test JSON writers with atomic writes"""
     print("\n" + "=" * 60)
@@ -229,16 +635,246 @@ def test_json_writers():
             print(f"\nCleaned up test session: {test_session}")
 
 
+def test_background_writer():
+    """Background writer coalesces updates and skips unchanged domains"""
+    import tempfile
+    import shutil
+    import json
+    import time
+
+    print("\n" + "=" * 60)
+    print("Testing BackgroundDomainWriter")
+    print("=" * 60)
+
+    test_session = tempfile.mkdtemp(prefix="test_session_")
+    try:
+        writer = BackgroundDomainWriter(test_session, min_interval=0.05)
+        packet = create_dummy_packet()
+        tire_ex = TireExtractor()
+
+        # 100 updates in a burst -> only the newest is serialized
+        for i in range(100):
+            writer.update_domain('tires', tire_ex.extract(packet, snapshot=True))
+            writer.update_domain('aero', {'static': True})
+        writer.force_write()
+        assert writer.files_written == 2, writer.files_written
+        print(f"   100 updates -> {writer.files_written} file writes")
+
+        # Unchanged content is not rewritten
+        writer.update_domain('aero', {'static': True})
+        writer.force_write()
+        assert writer.files_written == 2 and writer.files_skipped_unchanged == 1
+
+        # Thread picks up new data on its own
+        writer.update_domain('aero', {'static': False})
+        deadline = time.monotonic() + 2.0
+        while writer.files_written < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.close()
+        assert writer.files_written == 3 and writer.write_errors == 0
+
+        with open(os.path.join(test_session, 'aero.json')) as f:
+            assert json.load(f) == {'static': False}
+        assert not os.path.exists(os.path.join(test_session, PACKET_LOG_FILENAME))
+
+        # Raw packets are appended to packets.bin by the writer thread, trimmed to PACKET_SIZE
+        writer = BackgroundDomainWriter(test_session, min_interval=0.05, packet_log=True)
+        raw = [bytes([i]) * (PACKET_SIZE + 4) for i in range(120)]
+        for packet in raw:
+            writer.add_packet(packet)
+        deadline = time.monotonic() + 2.0
+        while writer.packets_logged < 120 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert writer.packets_logged == 120
+        writer.add_packet(raw[0])
+        writer.close()
+        with open(os.path.join(test_session, PACKET_LOG_FILENAME), 'rb') as f:
+            assert f.read() == b''.join(packet[:PACKET_SIZE] for packet in raw + raw[:1])
+        print(f"   packets.bin: {writer.packets_logged} packets from the writer thread")
+        with open(os.path.join(test_session, 'tires.json')) as f:
+            assert f.read().startswith('{"temps_celsius":{')  # compact serialization
+
+        print("\n✅ BackgroundDomainWriter working!")
+        return True
+
+    finally:
+        shutil.rmtree(test_session, ignore_errors=True)
+
+
+def test_writer_final_output():
+    """Files left by the logger's flow after close() are full snapshots, not per-packet updates"""
+    import tempfile
+    import shutil
+    import json
+
+    print("\n" + "=" * 60)
+    print("Testing final domain JSONs after close()")
+    print("=" * 60)
+
+    test_session = tempfile.mkdtemp(prefix="test_session_")
+    try:
+        # Long interval: only lap changes and close() write, like a short session
+        writer = BackgroundDomainWriter(test_session, min_interval=60.0, max_interval=60.0, lap_rollups=True)
+        pipeline = ExtractorPipeline(CAR_DATABASE, DOWNFORCE_DATABASE)
+        for raw in make_session_packets(3600):  # one lap change at packet 3000
+            packet = DecodedPacket.from_bytes(raw)
+            snapshot = pipeline.lap_changes(packet)  # as gt7_1r_phase1.py (snapshot_due stays False)
+            domains = pipeline.process(packet, dt.now(), snapshot)
+            for domain_name, domain_data in domains.items():
+                writer.update_domain(domain_name, domain_data, snapshot)
+            if pipeline.completed_lap is not None:
+                writer.add_lap_rollup(pipeline.completed_lap)
+        for domain_name, domain_data in pipeline.snapshot_domains().items():
+            writer.update_domain(domain_name, domain_data)
+        writer.add_lap_rollup(pipeline.finish_lap())
+        writer.close()
+        assert writer.write_errors == 0, writer.last_error
+
+        def read(name):
+            with open(os.path.join(test_session, name)) as f:
+                return json.load(f)
+
+        suspension = read('suspension.json')
+        assert len(suspension['travel_mm']['FL']['samples']) == 10
+        assert 'damper_velocity_mm_s' in suspension and suspension['ride_frequency_hz']
+        metadata = read('metadata.json')
+        assert metadata['pipeline']['extractors']['suspension']['calls'] == 3600
+        assert read('tires.json')['temps_celsius']['FL']['samples']
+
+        # Per-packet updates never replace the stored snapshot
+        writer = BackgroundDomainWriter(test_session, min_interval=60.0)
+        writer.update_domain('aero', {'static': True})
+        writer.update_domain('aero', {'partial': True}, snapshot=False)
+        writer.close()
+        assert read('aero.json') == {'static': True}
+
+        print(f"   suspension.json: {sorted(suspension)}")
+        print("\n✅ Final domain JSONs complete!")
+        return True
+
+    finally:
+        shutil.rmtree(test_session, ignore_errors=True)
+
+
+def test_domain_snapshot():
+    """Consolidated snapshot gives one consistent, sequence-numbered view"""
+    import tempfile
+    import shutil
+
+    print("\n" + "=" * 60)
+    print("Testing domains.snapshot")
+    print("=" * 60)
+
+    test_session = tempfile.mkdtemp(prefix="test_session_")
+    try:
+        writer = BackgroundDomainWriter(test_session, write_domain_files=False, write_snapshot=True)
+        reader = DomainSnapshotReader(test_session)
+        assert reader.sequence() is None and reader.read() is None
+
+        packet = create_dummy_packet()
+        writer.update_domain('suspension', SuspensionExtractor().extract(packet))
+        writer.update_domain('tires', TireExtractor().extract(packet))
+        writer.force_write()
+        assert reader.sequence() == 1
+        assert not os.path.exists(os.path.join(test_session, 'tires.json'))
+
+        # Unchanged data -> no new snapshot; changed domain -> sequence bumps
+        writer.update_domain('tires', TireExtractor().extract(packet))
+        writer.force_write()
+        assert not reader.has_changed(1)
+        writer.update_domain('balance', {'stability_metrics': {'balance_bias': 'neutral'}})
+        writer.force_write()
+        writer.close()
+        assert reader.has_changed(1) and reader.sequence() == 2
+
+        snapshot = reader.read()
+        assert snapshot['sequence'] == 2
+        assert set(snapshot['domains']) == {'suspension', 'tires', 'balance'}
+        assert snapshot['domains']['tires']['temps_celsius']['FL']['current'] == 85.0
+        assert set(reader.read(['balance'])['domains']) == {'balance'}
+        print(f"   sequence={snapshot['sequence']} domains={sorted(snapshot['domains'])}")
+
+        print("\n✅ domains.snapshot working!")
+        return True
+
+    finally:
+        shutil.rmtree(test_session, ignore_errors=True)
+
+
+def test_domain_journal():
+    """Journal keeps per-lap domain history that survives reopen"""
+    import tempfile
+    import shutil
+    import time
+
+    print("\n" + "=" * 60)
+    print("Testing domain journal")
+    print("=" * 60)
+
+    test_session = tempfile.mkdtemp(prefix="test_session_")
+    try:
+        journal = DomainJournal(test_session, keyframe_interval=10)
+        for lap in (1, 2, 3):
+            for i in range(30):
+                journal.append({'suspension': {'lap': lap, 'step': i // 3},
+                                'tires': {'fixed': True}}, lap, timestamp=lap * 100.0 + i)
+        journal.close()
+
+        reader = DomainJournalReader(test_session)
+        assert reader.laps() == [1, 2, 3]
+        series = reader.read_lap(2, 'suspension')
+        assert [item['data']['step'] for item in series] == list(range(10))
+        assert all(item['data']['lap'] == 2 for item in series)
+        # Unchanged domain only appears in keyframes
+        assert len(reader.read_lap(2, 'tires')) < len(series)
+
+        # Reopen continues the sequence and starts with a keyframe
+        journal = DomainJournal(test_session)
+        journal.append({'tires': {'fixed': False}}, 3, timestamp=400.0)
+        journal.close()
+        reader = DomainJournalReader(test_session)
+        assert reader.entries[-1][0] == journal.sequence and reader.entries[-1][4]
+        assert reader.read_lap(3, 'suspension')[-1]['data']['step'] == 9
+
+        # Cost of a 60 Hz style append (one changed domain per record)
+        journal = DomainJournal(test_session)
+        payload = SuspensionExtractor().extract(create_dummy_packet(), snapshot=False)
+        started = time.perf_counter()
+        for i in range(600):
+            journal.append({'suspension': dict(payload, packet=i)}, 4)
+        per_append_us = (time.perf_counter() - started) / 600 * 1e6
+        journal.close()
+        assert len(DomainJournalReader(test_session).read_lap(4, 'suspension')) == 600
+        print(f"   {per_append_us:.1f} us per append")
+
+        print("\n✅ Domain journal working!")
+        return True
+
+    finally:
+        shutil.rmtree(test_session, ignore_errors=True)
+
+
 if __name__ == '__main__':
     print("Phase 1: Domain Extractor & JSON Writer Tests")
     print()
 
     # Run tests
     extractors_ok = test_extractors()
+    decoded_ok = test_decoded_packet()
+    stats_ok = test_stat_buffer()
+    suspension_ok = test_suspension_dynamics()
+    balance_ok = test_balance()
+    batch_ok = test_batch_parity()
+    pipeline_ok = test_pipeline_timing()
+    laps_ok = test_lap_rollups()
     writers_ok = test_json_writers()
+    background_ok = test_background_writer()
+    final_ok = test_writer_final_output()
+    snapshot_ok = test_domain_snapshot()
+    journal_ok = test_domain_journal()
 
     print("\n" + "=" * 60)
-    if extractors_ok and writers_ok:
+    if extractors_ok and decoded_ok and stats_ok and suspension_ok and balance_ok and batch_ok and pipeline_ok and laps_ok and writers_ok and background_ok and final_ok and snapshot_ok and journal_ok:
         print("✅ ALL TESTS PASSED!")
         print("=" * 60)
         sys.exit(0)
@@ -5,7 +5,14 @@ Utilities for extracting GT7 telemetry into domain-specific JSON files.
 """
 
 from .domain_extractors import (
+    DecodedPacket,
+    decode_packet,
+    PacketColumns,
+    decode_columns,
+    PACKET_SIZE,
+    PACKET_LOG_FILENAME,
     StatBuffer,
+    LapSeries,
     MetadataExtractor,
     SuspensionExtractor,
     TireExtractor,
@@ -16,11 +23,34 @@ from .domain_extractors import (
 
 from .json_writers import (
     DomainJSONWriter,
-    BufferedDomainWriter
+    BufferedDomainWriter,
+    BackgroundDomainWriter,
+    DomainSnapshotReader,
+    LapRollupStore,
+    SNAPSHOT_FILENAME,
+    LAPS_DIRNAME
+)
+
+from .domain_journal import (
+    DomainJournal,
+    DomainJournalReader
+)
+
+from .pipeline import (
+    ExtractorPipeline,
+    LatencyHistogram,
+    build_lap_rollup
 )
 
 __all__ = [
+    'DecodedPacket',
+    'decode_packet',
+    'PacketColumns',
+    'decode_columns',
+    'PACKET_SIZE',
+    'PACKET_LOG_FILENAME',
     'StatBuffer',
+    'LapSeries',
     'MetadataExtractor',
     'SuspensionExtractor',
     'TireExtractor',
@@ -28,5 +58,15 @@ __all__ = [
     'DrivetrainExtractor',
     'BalanceExtractor',
     'DomainJSONWriter',
-    'BufferedDomainWriter'
+    'BufferedDomainWriter',
+    'BackgroundDomainWriter',
+    'DomainSnapshotReader',
+    'LapRollupStore',
+    'SNAPSHOT_FILENAME',
+    'LAPS_DIRNAME',
+    'DomainJournal',
+    'DomainJournalReader',
+    'ExtractorPipeline',
+    'LatencyHistogram',
+    'build_lap_rollup'
 ]
@@ -3,6 +3,14 @@
 Domain Extractors for GT7 Telemetry Data
 Phase 1: Domain JSON Architecture
 
+Each datagram is decoded once into a DecodedPacket that all extractors share.
+Recorded sessions can be replayed in batch: decode_columns() turns a run of
+packets into PacketColumns and each extractor's extract_batch() produces the
+same output and final state as streaming those packets one by one (numpy).
+
+Alongside the session-long domain data, each extractor keeps per-lap
+accumulators; lap_rollup() summarizes the lap just driven and resets them.
+
 Extracts UDP packet data into 6 domain-specific structures:
 1. MetadataExtractor - Session info, car, track, lap times
 2. SuspensionExtractor - Travel, bottoming, ride height
@@ -12,41 +20,483 @@ Extracts UDP packet data into 6 domain-specific structures:
 6. BalanceExtractor - Weight transfer, stability, g-forces
 """
 
+import math
 import struct
+from array import array
 from datetime import datetime as dt
+from bisect import bisect_right
 from collections import deque
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # only needed for batch mode
+    np = None
+
+
+# Packet A layout (296 bytes), little-endian, unpacked in one call.
+# Skipped: magic (0x00), IV (0x40), unknown byte (0x93), 8 unknown floats (0xD4-0xF3)
+PACKET_STRUCT = struct.Struct(
+    '<4x'
+    '3f'    # 0x04 position x/y/z
+    '3f'    # 0x10 velocity x/y/z
+    '3f'    # 0x1C rotation pitch/yaw/roll
+    'f'     # 0x28 north orientation
+    '3f'    # 0x2C angular velocity x/y/z
+    'f'     # 0x38 body height (m)
+    'f'     # 0x3C rpm
+    '4x'    # 0x40 IV
+    '2f'    # 0x44 fuel level / capacity
+    'f'     # 0x4C speed (m/s)
+    'f'     # 0x50 boost (raw, bar + 1)
+    '3f'    # 0x54 oil pressure, water temp, oil temp
+    '4f'    # 0x60 tire temps FL/FR/RL/RR
+    'i'     # 0x70 packet id
+    '2h'    # 0x74 current lap, total laps
+    '3i'    # 0x78 best lap ms, last lap ms, time on track ms
+    '2h'    # 0x84 pre-race start position, num cars
+    '2H'    # 0x88 rev warning, rev limiter
+    'h'     # 0x8C estimated top speed
+    'H'     # 0x8E simulator flags
+    '3Bx'   # 0x90 gear byte, throttle, brake
+    '4f'    # 0x94 road plane x/y/z/distance
+    '4f'    # 0xA4 tire rps FL/FR/RL/RR
+    '4f'    # 0xB4 tire radius FL/FR/RL/RR
+    '4f'    # 0xC4 suspension FL/FR/RL/RR (m)
+    '32x'   # 0xD4 unknown floats
+    '3f'    # 0xF4 clutch pedal, engagement, rpm after clutch
+    'f'     # 0x100 transmission top speed
+    '8f'    # 0x104 gear ratios 1-8
+    'i'     # 0x124 car code
+)
+
+CORNERS = ('FL', 'FR', 'RL', 'RR')
+PACKET_SIZE = PACKET_STRUCT.size
+PACKET_LOG_FILENAME = 'packets.bin'  # decrypted packets, back to back, for batch rebuilds
+PACKET_RATE_HZ = 60.0
+MAX_PACKET_GAP = 6  # packets - longer gaps reset derivative channels
+
+
+class DecodedPacket:
+    """
+    One decoded Packet A datagram shared by all domain extractors.
+
+    Built with a single precompiled struct unpack; per-corner values are
+    tuples in FL/FR/RL/RR order. Derived values (kph, pedal %, tire speed,
+    slip ratio) are computed once here instead of in each extractor.
+    """
+
+    __slots__ = (
+        'pos_x', 'pos_y', 'pos_z', 'vel_x', 'vel_y', 'vel_z',
+        'rot_pitch', 'rot_yaw', 'rot_roll', 'north_orientation',
+        'ang_vel_x', 'ang_vel_y', 'ang_vel_z',
+        'body_height', 'rpm', 'fuel_level', 'fuel_capacity', 'speed_mps', 'boost_raw',
+        'oil_pressure', 'water_temp', 'oil_temp', 'tire_temps',
+        'packet_id', 'current_lap', 'total_laps', 'best_lap_ms', 'last_lap_ms', 'time_on_track_ms',
+        'pre_race_start_pos', 'pre_race_num_cars', 'rev_warning', 'rev_limiter', 'estimated_top_speed',
+        'flags', 'gear_raw', 'throttle_raw', 'brake_raw', 'road_plane',
+        'tire_rps', 'tire_radius', 'suspension', 'clutch_pedal', 'clutch_engagement', 'rpm_after_clutch',
+        'transmission_top_speed', 'gear_ratios', 'car_code',
+        # Derived
+        'speed_kph', 'throttle_pct', 'brake_pct', 'current_gear', 'suggested_gear',
+        'tire_speed_kph', 'slip_ratio',
+    )
+
+    @classmethod
+    def from_bytes(cls, ddata: bytes) -> 'DecodedPacket':
+        """Decode a decrypted 296-byte packet"""
+        v = PACKET_STRUCT.unpack_from(ddata)
+        p = cls.__new__(cls)
+        (p.pos_x, p.pos_y, p.pos_z, p.vel_x, p.vel_y, p.vel_z,
+         p.rot_pitch, p.rot_yaw, p.rot_roll, p.north_orientation,
+         p.ang_vel_x, p.ang_vel_y, p.ang_vel_z,
+         p.body_height, p.rpm, p.fuel_level, p.fuel_capacity, p.speed_mps, p.boost_raw,
+         p.oil_pressure, p.water_temp, p.oil_temp) = v[0:22]
+        p.tire_temps = v[22:26]
+        (p.packet_id, p.current_lap, p.total_laps, p.best_lap_ms, p.last_lap_ms, p.time_on_track_ms,
+         p.pre_race_start_pos, p.pre_race_num_cars, p.rev_warning, p.rev_limiter,
+         p.estimated_top_speed, p.flags, p.gear_raw, p.throttle_raw, p.brake_raw) = v[26:41]
+        p.road_plane = v[41:45]
+        p.tire_rps = v[45:49]
+        p.tire_radius = v[49:53]
+        p.suspension = v[53:57]
+        p.clutch_pedal, p.clutch_engagement, p.rpm_after_clutch, p.transmission_top_speed = v[57:61]
+        p.gear_ratios = v[61:69]
+        p.car_code = v[69]
+
+        p.speed_kph = 3.6 * p.speed_mps
+        p.throttle_pct = p.throttle_raw / 2.55
+        p.brake_pct = p.brake_raw / 2.55
+        p.current_gear = p.gear_raw & 0b00001111
+        p.suggested_gear = p.gear_raw >> 4
+        p.tire_speed_kph = tuple(abs(3.6 * r * w) for r, w in zip(p.tire_radius, p.tire_rps))
+        if p.speed_kph > 1.0:  # Only calc when moving
+            p.slip_ratio = tuple(ts / p.speed_kph for ts in p.tire_speed_kph)
+        else:
+            p.slip_ratio = (0.0, 0.0, 0.0, 0.0)
+        return p
+
+
+def decode_packet(packet: Union[bytes, DecodedPacket]) -> DecodedPacket:
+    """Return a DecodedPacket, decoding raw bytes if needed"""
+    if isinstance(packet, DecodedPacket):
+        return packet
+    return DecodedPacket.from_bytes(packet)
+
+
+# Column layout for batch decoding: (DecodedPacket field, offset, dtype, count)
+PACKET_COLUMNS = (
+    ('pos_x', 0x04, '<f4', 1), ('pos_y', 0x08, '<f4', 1), ('pos_z', 0x0C, '<f4', 1),
+    ('vel_x', 0x10, '<f4', 1), ('vel_y', 0x14, '<f4', 1), ('vel_z', 0x18, '<f4', 1),
+    ('rot_pitch', 0x1C, '<f4', 1), ('rot_yaw', 0x20, '<f4', 1), ('rot_roll', 0x24, '<f4', 1),
+    ('north_orientation', 0x28, '<f4', 1),
+    ('ang_vel_x', 0x2C, '<f4', 1), ('ang_vel_y', 0x30, '<f4', 1), ('ang_vel_z', 0x34, '<f4', 1),
+    ('body_height', 0x38, '<f4', 1), ('rpm', 0x3C, '<f4', 1),
+    ('fuel_level', 0x44, '<f4', 1), ('fuel_capacity', 0x48, '<f4', 1),
+    ('speed_mps', 0x4C, '<f4', 1), ('boost_raw', 0x50, '<f4', 1),
+    ('oil_pressure', 0x54, '<f4', 1), ('water_temp', 0x58, '<f4', 1), ('oil_temp', 0x5C, '<f4', 1),
+    ('tire_temps', 0x60, '<f4', 4),
+    ('packet_id', 0x70, '<i4', 1), ('current_lap', 0x74, '<i2', 1), ('total_laps', 0x76, '<i2', 1),
+    ('best_lap_ms', 0x78, '<i4', 1), ('last_lap_ms', 0x7C, '<i4', 1), ('time_on_track_ms', 0x80, '<i4', 1),
+    ('pre_race_start_pos', 0x84, '<i2', 1), ('pre_race_num_cars', 0x86, '<i2', 1),
+    ('rev_warning', 0x88, '<u2', 1), ('rev_limiter', 0x8A, '<u2', 1),
+    ('estimated_top_speed', 0x8C, '<i2', 1), ('flags', 0x8E, '<u2', 1),
+    ('gear_raw', 0x90, 'u1', 1), ('throttle_raw', 0x91, 'u1', 1), ('brake_raw', 0x92, 'u1', 1),
+    ('road_plane', 0x94, '<f4', 4), ('tire_rps', 0xA4, '<f4', 4),
+    ('tire_radius', 0xB4, '<f4', 4), ('suspension', 0xC4, '<f4', 4),
+    ('clutch_pedal', 0xF4, '<f4', 1), ('clutch_engagement', 0xF8, '<f4', 1),
+    ('rpm_after_clutch', 0xFC, '<f4', 1), ('transmission_top_speed', 0x100, '<f4', 1),
+    ('gear_ratios', 0x104, '<f4', 8), ('car_code', 0x124, '<i4', 1),
+)
+
+
+class PacketColumns:
+    """
+    A run of decoded packets as numpy columns (batch counterpart of DecodedPacket).
+
+    Attribute names match DecodedPacket; per-corner / multi-value fields are
+    (n, k) arrays. Floats are widened to float64 exactly as struct does, and
+    derived values use the same arithmetic, so results match the streaming path.
+    """
+
+    def __init__(self, records):
+        self.size = len(records)
+        for name, _, fmt, _ in PACKET_COLUMNS:
+            column = records[name]
+            setattr(self, name, column.astype(np.float64 if fmt.endswith('f4') else np.int64))
+
+        self.speed_kph = 3.6 * self.speed_mps
+        self.throttle_pct = self.throttle_raw / 2.55
+        self.brake_pct = self.brake_raw / 2.55
+        self.current_gear = self.gear_raw & 0b00001111
+        self.suggested_gear = self.gear_raw >> 4
+        self.tire_speed_kph = np.abs(3.6 * self.tire_radius * self.tire_rps)
+        moving = self.speed_kph > 1.0  # Only calc when moving
+        safe_speed = np.where(moving, self.speed_kph, 1.0)
+        self.slip_ratio = np.where(moving[:, None], self.tire_speed_kph / safe_speed[:, None], 0.0)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def slice(self, start: int, stop: int) -> 'PacketColumns':
+        """Columns for packets [start, stop)"""
+        part = PacketColumns.__new__(PacketColumns)
+        for name, value in vars(self).items():
+            if name not in ('size', '_rows'):
+                setattr(part, name, value[start:stop])
+        part.size = len(part.packet_id)
+        return part
+
+    def row(self, index: int) -> DecodedPacket:
+        """One packet as a DecodedPacket (plain Python values, as from_bytes builds)"""
+        index = index % self.size
+        rows = vars(self).setdefault('_rows', {})  # every extractor asks for the last row
+        if index not in rows:
+            p = DecodedPacket.__new__(DecodedPacket)
+            for name in DecodedPacket.__slots__:
+                value = getattr(self, name)[index]
+                setattr(p, name, tuple(value.tolist()) if value.ndim else value.item())
+            rows[index] = p
+        return rows[index]
+
+
+def decode_columns(packets: Union[bytes, Sequence[bytes]]) -> PacketColumns:
+    """
+    Decode many packets at once into PacketColumns
+
+    Args:
+        packets: Decrypted packets, either as a sequence or concatenated
+            (e.g. the contents of a packets.bin log)
+    """
+    if np is None:
+        raise ImportError("numpy is required for batch extraction. Install it with: pip3 install numpy")
+    raw = packets if isinstance(packets, (bytes, bytearray, memoryview)) else b''.join(packets)
+    dtype = np.dtype({
+        'names': [name for name, _, _, _ in PACKET_COLUMNS],
+        'formats': [fmt if count == 1 else (fmt, (count,)) for _, _, fmt, count in PACKET_COLUMNS],
+        'offsets': [offset for _, offset, _, _ in PACKET_COLUMNS],
+        'itemsize': PACKET_SIZE,
+    })
+    usable = len(raw) - len(raw) % PACKET_SIZE
+    return PacketColumns(np.frombuffer(raw[:usable], dtype=dtype))
+
+
+def accepted_packets(packet_ids, last_packet_id: Optional[int]):
+    """
+    Batch form of the streaming "only newer packet ids" rule
+
+    Returns:
+        (accepted mask, gap of every packet to the newest earlier packet id);
+        without history the first packet is accepted with a gap of 0
+    """
+    start = packet_ids[0] if last_packet_id is None else last_packet_id
+    running_max = np.maximum.accumulate(np.concatenate(([start], packet_ids)))[:-1]
+    gaps = packet_ids - running_max
+    accepted = gaps > 0
+    if last_packet_id is None:
+        accepted[0] = True
+    return accepted, gaps
 
 
 class StatBuffer:
-    """Maintains rolling statistics with last N samples"""
+    """
+    Rolling statistics over the last N samples at O(1) cost per update.
 
-    def __init__(self, max_samples: int = 10):
-        self.samples = deque(maxlen=max_samples)
+    Keeps a running sum plus monotonic deques for min/max, so get_stats()
+    never rescans the window. The samples list is only materialized when a
+    snapshot is requested (i.e. when a domain JSON is about to be written).
+    max_samples=None gives a cumulative window (e.g. a whole lap) until reset().
+    """
+
+    # Re-sum exactly after this many evictions to cancel float drift
+    RESYNC_INTERVAL = 1000
+
+    def __init__(self, max_samples: Optional[int] = 10):
         self.max_samples = max_samples
+        self.reset()
+
+    @classmethod
+    def for_seconds(cls, seconds: float, rate_hz: float = 60.0) -> 'StatBuffer':
+        """Window covering the given duration at the packet rate"""
+        return cls(max(1, int(round(seconds * rate_hz))))
+
+    def reset(self):
+        """Clear the window (e.g. at a lap boundary)"""
+        self.samples = deque(maxlen=self.max_samples)
+        self._sum = 0.0
+        self._count = 0  # total samples ever added (index of next sample)
+        self._min_q = deque()  # (index, value), values increasing
+        self._max_q = deque()  # (index, value), values decreasing
+        self._evictions = 0
 
     def add(self, value: float):
         """Add a new sample"""
-        self.samples.append(value)
-
-    def get_stats(self) -> Dict[str, Any]:
-        """Get current statistics"""
+        samples = self.samples
+        if self.max_samples is not None and len(samples) == self.max_samples:
+            self._sum -= samples[0]
+            self._evictions += 1
+        samples.append(value)
+        self._sum += value
+
+        idx = self._count
+        self._count += 1
+        min_q, max_q = self._min_q, self._max_q
+        while min_q and min_q[-1][1] >= value:
+            min_q.pop()
+        min_q.append((idx, value))
+        while max_q and max_q[-1][1] <= value:
+            max_q.pop()
+        max_q.append((idx, value))
+
+        if self.max_samples is not None:
+            oldest = idx - self.max_samples
+            if min_q[0][0] <= oldest:
+                min_q.popleft()
+            if max_q[0][0] <= oldest:
+                max_q.popleft()
+
+        if self._evictions >= self.RESYNC_INTERVAL:
+            self._sum = sum(samples)
+            self._evictions = 0
+
+    def extend(self, values: Sequence[float]):
+        """Add many samples (same resulting window as calling add() for each)"""
+        values = list(values)
+        if self.max_samples is not None and len(values) > self.max_samples:
+            # Only the last window survives - rebuild from it
+            total = self._count + len(values)
+            self.reset()
+            self._count = total - self.max_samples
+            values = values[-self.max_samples:]
+        for value in values:
+            self.add(value)
+
+    def get_stats(self, snapshot: bool = True) -> Dict[str, Any]:
+        """
+        Get current statistics.
+
+        Args:
+            snapshot: include the 'samples' list (only needed for JSON writes)
+        """
         if not self.samples:
-            return {
+            stats = {
                 'current': 0.0,
                 'avg': 0.0,
                 'max': 0.0,
                 'min': 0.0,
-                'samples': []
             }
+            if snapshot:
+                stats['samples'] = []
+            return stats
 
-        return {
+        stats = {
             'current': self.samples[-1],
-            'avg': sum(self.samples) / len(self.samples),
-            'max': max(self.samples),
-            'min': min(self.samples),
-            'samples': list(self.samples)
+            'avg': self._sum / len(self.samples),
+            'max': self._max_q[0][1],
+            'min': self._min_q[0][1],
         }
+        if snapshot:
+            stats['samples'] = list(self.samples)
+        return stats
+
+
+class RunningHistogram:
+    """
+    Fixed-bin histogram updated in O(log bins) per sample (bins are few).
+
+    counts[i] holds values in [edges[i-1], edges[i]); the first and last
+    bins are open-ended.
+    """
+
+    def __init__(self, edges: Tuple[float, ...]):
+        self.edges = edges
+        self.counts = [0] * (len(edges) + 1)
+        self.total = 0
+
+    def add(self, value: float):
+        self.counts[bisect_right(self.edges, value)] += 1
+        self.total += 1
+
+    def add_many(self, values) -> None:
+        """Add an array of samples (numpy)"""
+        counts = np.bincount(np.searchsorted(self.edges, values, side='right'), minlength=len(self.counts))
+        for i, count in enumerate(counts.tolist()):
+            self.counts[i] += count
+        self.total += len(values)
+
+    def fraction(self, low: float, high: float) -> float:
+        """Share of samples in bins fully inside [low, high)"""
+        if not self.total:
+            return 0.0
+        bounds = (float('-inf'),) + tuple(self.edges) + (float('inf'),)
+        inside = sum(count for i, count in enumerate(self.counts)
+                     if bounds[i] >= low and bounds[i + 1] <= high)
+        return inside / self.total
+
+
+class ZeroCrossingRate:
+    """
+    Online oscillation frequency from mean crossings, O(1) per sample.
+
+    The signal is centred on a slow EMA mean; a crossing only counts once the
+    signal leaves the deadband on the opposite side (hysteresis), so noise
+    around the mean is ignored. Frequency = crossings / (2 * window).
+    """
+
+    def __init__(self, deadband: float, window_s: float = 10.0, mean_tau_s: float = 2.0):
+        self.deadband = deadband
+        self.window_s = window_s
+        self.mean_tau_s = mean_tau_s
+        self.crossings = deque()  # timestamps (s) of counted crossings
+        self.mean: Optional[float] = None
+        self.mean_square = 0.0  # EMA of squared deviation from mean
+        self._side = 0
+        self._start_t = 0.0
+        self._last_t = 0.0
+
+    def add(self, value: float, t: float):
+        """Add a sample taken at time t (seconds)"""
+        if self.mean is None:
+            self.mean = value
+            self._start_t = self._last_t = t
+            return
+        alpha = min(1.0, (t - self._last_t) / self.mean_tau_s)
+        self._last_t = t
+        self.mean += alpha * (value - self.mean)
+        deviation = value - self.mean
+        self.mean_square += alpha * (deviation * deviation - self.mean_square)
+
+        side = 1 if deviation > self.deadband else -1 if deviation < -self.deadband else 0
+        if side and side != self._side:
+            if self._side:
+                self.crossings.append(t)
+            self._side = side
+
+        crossings = self.crossings
+        while crossings and crossings[0] < t - self.window_s:
+            crossings.popleft()
+
+    def extend(self, values: Sequence[float], times: Sequence[float]):
+        """Add many samples in order"""
+        add = self.add
+        for value, t in zip(values, times):
+            add(value, t)
+
+    def frequency(self) -> Optional[float]:
+        """Frequency (Hz) over the recent window, None until 1 s of data"""
+        covered = min(self.window_s, self._last_t - self._start_t)
+        if covered < 1.0:
+            return None
+        return len(self.crossings) / (2.0 * covered)
+
+    def rms(self) -> float:
+        """RMS deviation from the running mean"""
+        return self.mean_square ** 0.5
+
+
+class LapSeries:
+    """
+    All values of one channel during the current lap (compact double array).
+
+    rollup() sorts once at the lap boundary for min/max/percentiles and
+    starts the next lap empty.
+    """
+
+    PERCENTILES = (5, 50, 95)
+
+    def __init__(self):
+        self.values = array('d')
+
+    def add(self, value: float):
+        self.values.append(value)
+
+    def extend(self, values: Sequence[float]):
+        self.values.extend(values)
+
+    def rollup(self) -> Dict[str, Any]:
+        """Summary of the lap's values; clears the series"""
+        values = sorted(self.values)
+        self.values = array('d')
+        if not values:
+            return {'samples': 0}
+        n = len(values)
+        summary = {'samples': n, 'min': values[0], 'max': values[-1], 'avg': sum(values) / n}
+        for pct in self.PERCENTILES:
+            summary[f'p{pct}'] = values[round(pct / 100 * (n - 1))]
+        return summary
+
+
+def counter_delta(now: Dict[str, Any], base: Dict[str, Any]) -> Dict[str, Any]:
+    """Per-lap change of cumulative counters (nested dicts / lists of numbers)"""
+    delta = {}
+    for key, value in now.items():
+        if isinstance(value, dict):
+            delta[key] = counter_delta(value, base[key])
+        elif isinstance(value, list):
+            delta[key] = [a - b for a, b in zip(value, base[key])]
+        else:
+            delta[key] = value - base[key]
+    return delta
 
 
 class MetadataExtractor:
@@ -56,35 +506,49 @@ class MetadataExtractor:
         self.car_database = car_database
         self.session_start = dt.now()
 
-    def extract(self, ddata: bytes, timestamp: dt) -> Dict[str, Any]:
+        # Current lap
+        self.lap_speed = LapSeries()
+        self._lap_first_packet: Optional[int] = None
+        self._lap_last_packet: Optional[int] = None
+        self._lap_start_fuel: Optional[float] = None
+        self._last_fuel = 0.0
+
+    def extract(self, packet: Union[bytes, DecodedPacket], timestamp: dt) -> Dict[str, Any]:
         """Extract metadata from UDP packet"""
+        p = decode_packet(packet)
 
         # Packet info
-        pktid = struct.unpack('i', ddata[0x70:0x74])[0]
-        curlap = struct.unpack('h', ddata[0x74:0x76])[0]
-        total_laps = struct.unpack('h', ddata[0x76:0x78])[0]
+        pktid = p.packet_id
+        curlap = p.current_lap
+        total_laps = p.total_laps
+
+        self.lap_speed.add(p.speed_kph)
+        if self._lap_first_packet is None:
+            self._lap_first_packet = pktid
+            self._lap_start_fuel = p.fuel_level
+        self._lap_last_packet = pktid
+        self._last_fuel = p.fuel_level
 
         # Lap times
-        best_lap_ms = struct.unpack('i', ddata[0x78:0x7C])[0]
-        last_lap_ms = struct.unpack('i', ddata[0x7C:0x80])[0]
-        time_on_track_ms = struct.unpack('i', ddata[0x80:0x84])[0]
+        best_lap_ms = p.best_lap_ms
+        last_lap_ms = p.last_lap_ms
+        time_on_track_ms = p.time_on_track_ms
 
         # Car info
-        car_code = struct.unpack('i', ddata[0x124:0x128])[0]
+        car_code = p.car_code
         car_name = self.car_database.get(car_code, f"Unknown Car ({car_code})")
 
         # Speed
-        speed_mps = struct.unpack('f', ddata[0x4C:0x50])[0]
-        speed_kph = 3.6 * speed_mps
+        speed_kph = p.speed_kph
 
         # Fuel
-        fuel_level = struct.unpack('f', ddata[0x44:0x48])[0]
-        fuel_capacity = struct.unpack('f', ddata[0x48:0x4C])[0]
+        fuel_level = p.fuel_level
+        fuel_capacity = p.fuel_capacity
         is_electric = fuel_capacity <= 0
 
         # Race info
-        pre_race_start_pos = struct.unpack('h', ddata[0x84:0x86])[0]
-        pre_race_num_cars = struct.unpack('h', ddata[0x86:0x88])[0]
+        pre_race_start_pos = p.pre_race_start_pos
+        pre_race_num_cars = p.pre_race_num_cars
 
         return {
             'session_id': self.session_start.strftime('%Y%m%d_%H%M%S'),
@@ -117,6 +581,26 @@ class MetadataExtractor:
             }
         }
 
+    def extract_batch(self, columns: PacketColumns, timestamp: dt) -> Dict[str, Any]:
+        """Batch extract(): metadata only depends on the latest packet (plus lap accumulators)"""
+        self.lap_speed.extend(columns.speed_kph[:-1].tolist())
+        if self._lap_first_packet is None:
+            self._lap_first_packet = int(columns.packet_id[0])
+            self._lap_start_fuel = float(columns.fuel_level[0])
+        return self.extract(columns.row(-1), timestamp)
+
+    def lap_rollup(self) -> Dict[str, Any]:
+        """Lap summary since the last rollup; resets the lap accumulators"""
+        rollup = {
+            'packets': len(self.lap_speed.values),
+            'first_packet_id': self._lap_first_packet,
+            'last_packet_id': self._lap_last_packet,
+            'speed_kph': self.lap_speed.rollup(),
+            'fuel_used': (self._lap_start_fuel - self._last_fuel) if self._lap_start_fuel is not None else 0.0
+        }
+        self._lap_first_packet = self._lap_last_packet = self._lap_start_fuel = None
+        return rollup
+
     def _classify_car(self, car_code: int) -> str:
         """Classify car type (simple heuristic for now)"""
         # TODO: Use actual classification logic
@@ -125,7 +609,21 @@ class MetadataExtractor:
 
 
 class SuspensionExtractor:
-    """Extract suspension travel, bottoming, ride height"""
+    """
+    Extract suspension travel, bottoming, ride height, damper velocity and ride frequency
+
+    Everything is accumulated online at packet rate (O(1) per packet); the
+    histogram / frequency blocks are only emitted with snapshots, i.e. at
+    the persistence rate.
+    """
+
+    TRAVEL_LIMIT_MM = 280.0          # travel beyond this = suspension at its limit (CLI uses 0.28 m)
+    CHASSIS_BOTTOMING_MM = 15.0      # body height below this = chassis bottoming
+    DAMPER_VELOCITY_EDGES = (-400.0, -200.0, -100.0, -50.0, -25.0, 0.0,
+                             25.0, 50.0, 100.0, 200.0, 400.0)  # mm/s, + = bump
+    DAMPER_LOW_SPEED_MM_S = 50.0
+    FREQUENCY_DEADBAND_MM = 1.0
+    FREQUENCY_WINDOW_S = 10.0
 
     def __init__(self):
         self.fl_buffer = StatBuffer(10)
@@ -133,55 +631,109 @@ class SuspensionExtractor:
         self.rl_buffer = StatBuffer(10)
         self.rr_buffer = StatBuffer(10)
         self.bottoming_counters = {'FL': 0, 'FR': 0, 'RL': 0, 'RR': 0}
-        self.BOTTOMING_THRESHOLD = 5.0  # mm - threshold for bottoming detection
+        self.chassis_bottoming_count = 0
+
+        self.damper_histograms = {c: RunningHistogram(self.DAMPER_VELOCITY_EDGES) for c in CORNERS}
+        self.frequency = {
+            name: ZeroCrossingRate(self.FREQUENCY_DEADBAND_MM, self.FREQUENCY_WINDOW_S)
+            for name in CORNERS + ('front', 'rear', 'heave', 'pitch', 'roll')
+        }
+        self._last_packet_id: Optional[int] = None
+        self._last_travel: Optional[Tuple[float, ...]] = None
+        # Damper velocity / ride frequency can be switched off when extraction runs over budget
+        self.optional_metrics = True
 
-    def extract(self, ddata: bytes) -> Dict[str, Any]:
-        """Extract suspension data from UDP packet"""
+        # Current lap
+        self.lap_travel = {c: LapSeries() for c in CORNERS}
+        self.lap_body_height = LapSeries()
+        self._lap_base = self._lap_counters()
+
+    def extract(self, packet: Union[bytes, DecodedPacket], snapshot: bool = True) -> Dict[str, Any]:
+        """Extract suspension data from UDP packet (snapshot=False skips sample lists)"""
+        p = decode_packet(packet)
 
         # Suspension travel (in meters, convert to mm)
-        susp_fl = struct.unpack('f', ddata[0xC4:0xC8])[0] * 1000  # m to mm
-        susp_fr = struct.unpack('f', ddata[0xC8:0xCC])[0] * 1000
-        susp_rl = struct.unpack('f', ddata[0xCC:0xD0])[0] * 1000
-        susp_rr = struct.unpack('f', ddata[0xD0:0xD4])[0] * 1000
+        travel = tuple(v * 1000 for v in p.suspension)  # m to mm
+        susp_fl, susp_fr, susp_rl, susp_rr = travel
 
         # Add to buffers
         self.fl_buffer.add(susp_fl)
         self.fr_buffer.add(susp_fr)
         self.rl_buffer.add(susp_rl)
         self.rr_buffer.add(susp_rr)
+        for corner, value in zip(CORNERS, travel):
+            self.lap_travel[corner].add(value)
 
-        # Detect bottoming events (very low travel)
-        if susp_fl < self.BOTTOMING_THRESHOLD:
-            self.bottoming_counters['FL'] += 1
-        if susp_fr < self.BOTTOMING_THRESHOLD:
-            self.bottoming_counters['FR'] += 1
-        if susp_rl < self.BOTTOMING_THRESHOLD:
-            self.bottoming_counters['RL'] += 1
-        if susp_rr < self.BOTTOMING_THRESHOLD:
-            self.bottoming_counters['RR'] += 1
+        # Travel-limit events (per corner) and chassis bottoming (body height)
+        for corner, value in zip(CORNERS, travel):
+            if value > self.TRAVEL_LIMIT_MM:
+                self.bottoming_counters[corner] += 1
 
         # Body height / ride height
-        body_height = struct.unpack('f', ddata[0x38:0x3C])[0] * 1000  # m to mm
+        body_height = p.body_height * 1000  # m to mm
+        self.lap_body_height.add(body_height)
+        if 0.0 < body_height < self.CHASSIS_BOTTOMING_MM:
+            self.chassis_bottoming_count += 1
+
+        if self.optional_metrics:
+            self._accumulate_dynamics(p.packet_id, travel)
+        return self._build(p, snapshot)
+
+    def extract_batch(self, columns: PacketColumns, snapshot: bool = True) -> Dict[str, Any]:
+        """Batch extract(): same output and final state as streaming every packet in columns"""
+        travel = columns.suspension * 1000  # m to mm
+        for buffer, series, values in zip((self.fl_buffer, self.fr_buffer, self.rl_buffer, self.rr_buffer),
+                                          self.lap_travel.values(), travel.T):
+            values = values.tolist()
+            buffer.extend(values)
+            series.extend(values)
+
+        for corner, count in zip(CORNERS, (travel > self.TRAVEL_LIMIT_MM).sum(axis=0).tolist()):
+            self.bottoming_counters[corner] += count
+        body_height = columns.body_height * 1000
+        self.lap_body_height.extend(body_height.tolist())
+        self.chassis_bottoming_count += int(((0.0 < body_height) & (body_height < self.CHASSIS_BOTTOMING_MM)).sum())
+
+        accepted, gaps = accepted_packets(columns.packet_id, self._last_packet_id)
+        if accepted.any():
+            ids, gaps, travel = columns.packet_id[accepted], gaps[accepted], travel[accepted]
+            previous = np.vstack((self._last_travel or travel[0], travel[:-1]))
+            valid = (gaps > 0) & (gaps <= MAX_PACKET_GAP)  # gap 0 = first packet ever
+            velocity = (travel[valid] - previous[valid]) / (gaps[valid] / PACKET_RATE_HZ)[:, None]
+            for i, corner in enumerate(CORNERS):
+                self.damper_histograms[corner].add_many(velocity[:, i])
+
+            times = (ids / PACKET_RATE_HZ).tolist()
+            for name, values in self._modes(*travel.T).items():
+                self.frequency[name].extend(values.tolist(), times)
+            self._last_packet_id = int(ids[-1])
+            self._last_travel = tuple(travel[-1].tolist())
+
+        return self._build(columns.row(-1), snapshot)
+
+    def _build(self, p: DecodedPacket, snapshot: bool) -> Dict[str, Any]:
+        """Domain output from accumulated state plus the latest packet"""
+        # Body height / ride height
+        body_height = p.body_height * 1000  # m to mm
 
         # Road plane data
-        road_plane_x = struct.unpack('f', ddata[0x94:0x98])[0]
-        road_plane_y = struct.unpack('f', ddata[0x98:0x9C])[0]
-        road_plane_z = struct.unpack('f', ddata[0x9C:0xA0])[0]
-        road_plane_dist = struct.unpack('f', ddata[0xA0:0xA4])[0]
+        road_plane_x, road_plane_y, road_plane_z, road_plane_dist = p.road_plane
 
-        return {
+        data = {
             'travel_mm': {
-                'FL': self.fl_buffer.get_stats(),
-                'FR': self.fr_buffer.get_stats(),
-                'RL': self.rl_buffer.get_stats(),
-                'RR': self.rr_buffer.get_stats()
+                'FL': self.fl_buffer.get_stats(snapshot),
+                'FR': self.fr_buffer.get_stats(snapshot),
+                'RL': self.rl_buffer.get_stats(snapshot),
+                'RR': self.rr_buffer.get_stats(snapshot)
             },
             'bottoming_events': {
                 'detected': any(v > 0 for v in self.bottoming_counters.values()),
+                'travel_limit_mm': self.TRAVEL_LIMIT_MM,
                 'FL_count': self.bottoming_counters['FL'],
                 'FR_count': self.bottoming_counters['FR'],
                 'RL_count': self.bottoming_counters['RL'],
-                'RR_count': self.bottoming_counters['RR']
+                'RR_count': self.bottoming_counters['RR'],
+                'chassis_count': self.chassis_bottoming_count
             },
             'current_ride_height_mm': {
                 'front': body_height,
@@ -194,6 +746,85 @@ class SuspensionExtractor:
                 'distance': road_plane_dist
             }
         }
+        if snapshot:
+            data['damper_velocity_mm_s'] = self._damper_velocity_summary()
+            data['ride_frequency_hz'] = self._ride_frequency_summary()
+        return data
+
+    def lap_rollup(self) -> Dict[str, Any]:
+        """Lap summary since the last rollup; resets the lap accumulators"""
+        now = self._lap_counters()
+        delta = counter_delta(now, self._lap_base)
+        self._lap_base = now
+        return {
+            'travel_mm': {corner: series.rollup() for corner, series in self.lap_travel.items()},
+            'body_height_mm': self.lap_body_height.rollup(),
+            'bottoming_events': {
+                **{f'{corner}_count': delta['bottoming'][corner] for corner in CORNERS},
+                'chassis_count': delta['chassis']
+            },
+            'damper_velocity_counts': {'edges': list(self.DAMPER_VELOCITY_EDGES), **delta['damper']}
+        }
+
+    def _lap_counters(self) -> Dict[str, Any]:
+        return {
+            'bottoming': dict(self.bottoming_counters),
+            'chassis': self.chassis_bottoming_count,
+            'damper': {corner: list(hist.counts) for corner, hist in self.damper_histograms.items()}
+        }
+
+    def _accumulate_dynamics(self, packet_id: int, travel: Tuple[float, ...]):
+        """Update damper-velocity histograms and frequency estimators"""
+        t = packet_id / PACKET_RATE_HZ
+        modes = self._modes(*travel)
+
+        gap = None if self._last_packet_id is None else packet_id - self._last_packet_id
+        if gap is not None and gap <= 0:
+            return  # duplicate / reordered packet
+        if gap is not None and gap <= MAX_PACKET_GAP and self._last_travel is not None:
+            dt = gap / PACKET_RATE_HZ
+            for corner, now, before in zip(CORNERS, travel, self._last_travel):
+                self.damper_histograms[corner].add((now - before) / dt)
+        for name, value in modes.items():
+            self.frequency[name].add(value, t)
+        self._last_packet_id = packet_id
+        self._last_travel = travel
+
+    @staticmethod
+    def _modes(fl, fr, rl, rr) -> Dict[str, Any]:
+        """Signals fed to the frequency estimators (floats or numpy arrays)"""
+        front = (fl + fr) / 2
+        rear = (rl + rr) / 2
+        return {
+            'FL': fl, 'FR': fr, 'RL': rl, 'RR': rr,
+            'front': front,
+            'rear': rear,
+            'heave': (front + rear) / 2,
+            'pitch': front - rear,
+            'roll': ((fl - fr) + (rl - rr)) / 2,
+        }
+
+    def _damper_velocity_summary(self) -> Dict[str, Any]:
+        low = self.DAMPER_LOW_SPEED_MM_S
+        summary = {'edges': list(self.DAMPER_VELOCITY_EDGES)}
+        for corner, hist in self.damper_histograms.items():
+            summary[corner] = {
+                'counts': list(hist.counts),
+                'samples': hist.total,
+                'low_speed_pct': 100.0 * hist.fraction(-low, low),
+                'bump_pct': 100.0 * hist.fraction(0.0, float('inf')),
+            }
+        return summary
+
+    def _ride_frequency_summary(self) -> Dict[str, Any]:
+        summary = {name: est.frequency() for name, est in self.frequency.items()
+                   if name not in ('heave', 'pitch', 'roll')}
+        summary['window_s'] = self.FREQUENCY_WINDOW_S
+        summary['modes'] = {
+            name: {'frequency_hz': self.frequency[name].frequency(), 'rms_mm': self.frequency[name].rms()}
+            for name in ('heave', 'pitch', 'roll')
+        }
+        return summary
 
 
 class TireExtractor:
@@ -216,55 +847,34 @@ class TireExtractor:
         self.slip_events = {'FL': 0, 'FR': 0, 'RL': 0, 'RR': 0}
         self.SLIP_THRESHOLD = 1.15  # 15% slip
 
-    def extract(self, ddata: bytes) -> Dict[str, Any]:
-        """Extract tire data from UDP packet"""
+        # Current lap
+        self.lap_temps = {c: LapSeries() for c in CORNERS}
+        self.lap_slip = {c: LapSeries() for c in CORNERS}
+        self._lap_slip_events = dict(self.slip_events)
+
+    def extract(self, packet: Union[bytes, DecodedPacket], snapshot: bool = True) -> Dict[str, Any]:
+        """Extract tire data from UDP packet (snapshot=False skips sample lists)"""
+        p = decode_packet(packet)
 
         # Tire temperatures (Celsius)
-        temp_fl = struct.unpack('f', ddata[0x60:0x64])[0]
-        temp_fr = struct.unpack('f', ddata[0x64:0x68])[0]
-        temp_rl = struct.unpack('f', ddata[0x68:0x6C])[0]
-        temp_rr = struct.unpack('f', ddata[0x6C:0x70])[0]
+        temp_fl, temp_fr, temp_rl, temp_rr = p.tire_temps
 
         self.temp_fl.add(temp_fl)
         self.temp_fr.add(temp_fr)
         self.temp_rl.add(temp_rl)
         self.temp_rr.add(temp_rr)
+        for corner, value in zip(CORNERS, p.tire_temps):
+            self.lap_temps[corner].add(value)
 
-        # Tire rotation speeds (RPS - revolutions per second)
-        tire_rps_fl = struct.unpack('f', ddata[0xA4:0xA8])[0]
-        tire_rps_fr = struct.unpack('f', ddata[0xA8:0xAC])[0]
-        tire_rps_rl = struct.unpack('f', ddata[0xAC:0xB0])[0]
-        tire_rps_rr = struct.unpack('f', ddata[0xB0:0xB4])[0]
-
-        # Tire radius (meters)
-        tire_radius_fl = struct.unpack('f', ddata[0xB4:0xB8])[0]
-        tire_radius_fr = struct.unpack('f', ddata[0xB8:0xBC])[0]
-        tire_radius_rl = struct.unpack('f', ddata[0xBC:0xC0])[0]
-        tire_radius_rr = struct.unpack('f', ddata[0xC0:0xC4])[0]
-
-        # Car speed
-        speed_mps = struct.unpack('f', ddata[0x4C:0x50])[0]
-        speed_kph = 3.6 * speed_mps
-
-        # Calculate tire speeds (kph)
-        tire_speed_fl = abs(3.6 * tire_radius_fl * tire_rps_fl)
-        tire_speed_fr = abs(3.6 * tire_radius_fr * tire_rps_fr)
-        tire_speed_rl = abs(3.6 * tire_radius_rl * tire_rps_rl)
-        tire_speed_rr = abs(3.6 * tire_radius_rr * tire_rps_rr)
-
-        # Calculate slip ratios
-        if speed_kph > 1.0:  # Only calc when moving
-            slip_fl = tire_speed_fl / speed_kph
-            slip_fr = tire_speed_fr / speed_kph
-            slip_rl = tire_speed_rl / speed_kph
-            slip_rr = tire_speed_rr / speed_kph
-        else:
-            slip_fl = slip_fr = slip_rl = slip_rr = 0.0
+        # Slip ratios (tire speed / car speed, computed at decode)
+        slip_fl, slip_fr, slip_rl, slip_rr = p.slip_ratio
 
         self.slip_fl.add(slip_fl)
         self.slip_fr.add(slip_fr)
         self.slip_rl.add(slip_rl)
         self.slip_rr.add(slip_rr)
+        for corner, value in zip(CORNERS, p.slip_ratio):
+            self.lap_slip[corner].add(value)
 
         # Detect slip events
         if slip_fl > self.SLIP_THRESHOLD:
@@ -276,18 +886,51 @@ class TireExtractor:
         if slip_rr > self.SLIP_THRESHOLD:
             self.slip_events['RR'] += 1
 
+        return self._build(p, snapshot)
+
+    def extract_batch(self, columns: PacketColumns, snapshot: bool = True) -> Dict[str, Any]:
+        """Batch extract(): same output and final state as streaming every packet in columns"""
+        for buffer, series, values in zip((self.temp_fl, self.temp_fr, self.temp_rl, self.temp_rr),
+                                          self.lap_temps.values(), columns.tire_temps.T):
+            values = values.tolist()
+            buffer.extend(values)
+            series.extend(values)
+        for buffer, series, values in zip((self.slip_fl, self.slip_fr, self.slip_rl, self.slip_rr),
+                                          self.lap_slip.values(), columns.slip_ratio.T):
+            values = values.tolist()
+            buffer.extend(values)
+            series.extend(values)
+        for corner, count in zip(CORNERS, (columns.slip_ratio > self.SLIP_THRESHOLD).sum(axis=0).tolist()):
+            self.slip_events[corner] += count
+        return self._build(columns.row(-1), snapshot)
+
+    def lap_rollup(self) -> Dict[str, Any]:
+        """Lap summary since the last rollup; resets the lap accumulators"""
+        events = counter_delta(self.slip_events, self._lap_slip_events)
+        self._lap_slip_events = dict(self.slip_events)
+        return {
+            'temps_celsius': {corner: series.rollup() for corner, series in self.lap_temps.items()},
+            'slip_ratio': {corner: {**self.lap_slip[corner].rollup(), 'events': events[corner]}
+                           for corner in CORNERS}
+        }
+
+    def _build(self, p: DecodedPacket, snapshot: bool) -> Dict[str, Any]:
+        """Domain output from accumulated state plus the latest packet"""
+        # Tire rotation speeds (RPS - revolutions per second)
+        tire_rps_fl, tire_rps_fr, tire_rps_rl, tire_rps_rr = p.tire_rps
+
         return {
             'temps_celsius': {
-                'FL': self.temp_fl.get_stats(),
-                'FR': self.temp_fr.get_stats(),
-                'RL': self.temp_rl.get_stats(),
-                'RR': self.temp_rr.get_stats()
+                'FL': self.temp_fl.get_stats(snapshot),
+                'FR': self.temp_fr.get_stats(snapshot),
+                'RL': self.temp_rl.get_stats(snapshot),
+                'RR': self.temp_rr.get_stats(snapshot)
             },
             'slip_ratio': {
-                'FL': {**self.slip_fl.get_stats(), 'events': self.slip_events['FL']},
-                'FR': {**self.slip_fr.get_stats(), 'events': self.slip_events['FR']},
-                'RL': {**self.slip_rl.get_stats(), 'events': self.slip_events['RL']},
-                'RR': {**self.slip_rr.get_stats(), 'events': self.slip_events['RR']}
+                'FL': {**self.slip_fl.get_stats(snapshot), 'events': self.slip_events['FL']},
+                'FR': {**self.slip_fr.get_stats(snapshot), 'events': self.slip_events['FR']},
+                'RL': {**self.slip_rl.get_stats(snapshot), 'events': self.slip_events['RL']},
+                'RR': {**self.slip_rr.get_stats(snapshot), 'events': self.slip_events['RR']}
             },
             'rotation_speed_rps': {
                 'FL': tire_rps_fl,
@@ -315,27 +958,28 @@ class AeroExtractor:
         self.high_speed_samples = []
         self.HIGH_SPEED_THRESHOLD = 150  # kph
 
-    def extract(self, ddata: bytes, car_code: int) -> Dict[str, Any]:
-        """Extract aero data from UDP packet"""
+        # Current lap
+        self.lap_front_height = LapSeries()
+        self.lap_rear_height = LapSeries()
 
-        # Body height (ride height)
-        body_height = struct.unpack('f', ddata[0x38:0x3C])[0] * 1000  # m to mm
+    def extract(self, packet: Union[bytes, DecodedPacket], car_code: int,
+                snapshot: bool = True) -> Dict[str, Any]:
+        """Extract aero data from UDP packet (snapshot=False skips sample lists)"""
+        p = decode_packet(packet)
 
         # Suspension heights (for front/rear differentiation)
-        susp_fl = struct.unpack('f', ddata[0xC4:0xC8])[0] * 1000
-        susp_fr = struct.unpack('f', ddata[0xC8:0xCC])[0] * 1000
-        susp_rl = struct.unpack('f', ddata[0xCC:0xD0])[0] * 1000
-        susp_rr = struct.unpack('f', ddata[0xD0:0xD4])[0] * 1000
+        susp_fl, susp_fr, susp_rl, susp_rr = (v * 1000 for v in p.suspension)
 
         front_height = (susp_fl + susp_fr) / 2
         rear_height = (susp_rl + susp_rr) / 2
 
         self.front_height_buffer.add(front_height)
         self.rear_height_buffer.add(rear_height)
+        self.lap_front_height.add(front_height)
+        self.lap_rear_height.add(rear_height)
 
         # Speed (for high-speed tracking)
-        speed_mps = struct.unpack('f', ddata[0x4C:0x50])[0]
-        speed_kph = 3.6 * speed_mps
+        speed_kph = p.speed_kph
 
         if speed_kph > self.HIGH_SPEED_THRESHOLD:
             self.high_speed_samples.append(speed_kph)
@@ -343,11 +987,42 @@ class AeroExtractor:
             if len(self.high_speed_samples) > 10:
                 self.high_speed_samples.pop(0)
 
+        return self._build(car_code, snapshot)
+
+    def extract_batch(self, columns: PacketColumns, car_code: int,
+                      snapshot: bool = True) -> Dict[str, Any]:
+        """Batch extract(): same output and final state as streaming every packet in columns"""
+        travel = columns.suspension * 1000
+        front_height = ((travel[:, 0] + travel[:, 1]) / 2).tolist()
+        rear_height = ((travel[:, 2] + travel[:, 3]) / 2).tolist()
+        self.front_height_buffer.extend(front_height)
+        self.rear_height_buffer.extend(rear_height)
+        self.lap_front_height.extend(front_height)
+        self.lap_rear_height.extend(rear_height)
+
+        high_speed = columns.speed_kph[columns.speed_kph > self.HIGH_SPEED_THRESHOLD].tolist()
+        self.high_speed_samples[:] = (self.high_speed_samples + high_speed[-10:])[-10:]
+        return self._build(car_code, snapshot)
+
+    def lap_rollup(self) -> Dict[str, Any]:
+        """Lap summary since the last rollup; resets the lap accumulators"""
+        front = self.lap_front_height.rollup()
+        rear = self.lap_rear_height.rollup()
+        return {
+            'ride_height_mm': {
+                'front': front,
+                'rear': rear,
+                'rake_mm': rear['avg'] - front['avg'] if front['samples'] else 0.0
+            }
+        }
+
+    def _build(self, car_code: int, snapshot: bool) -> Dict[str, Any]:
+        """Domain output from accumulated state"""
         # Downforce estimate from database
         downforce_estimate = self.downforce_db.get(car_code, 0)
 
-        front_stats = self.front_height_buffer.get_stats()
-        rear_stats = self.rear_height_buffer.get_stats()
+        front_stats = self.front_height_buffer.get_stats(snapshot)
+        rear_stats = self.rear_height_buffer.get_stats(snapshot)
 
         return {
             'ride_height_mm': {
@@ -356,8 +1031,8 @@ class AeroExtractor:
                 'min_front': front_stats['min'],
                 'min_rear': rear_stats['min'],
                 'rake_mm': rear_stats['avg'] - front_stats['avg'],
-                'samples_front': front_stats['samples'],
-                'samples_rear': rear_stats['samples']
+                **({'samples_front': front_stats['samples'],
+                    'samples_rear': rear_stats['samples']} if snapshot else {})
             },
             'downforce_estimate_lbs': {
                 'total': downforce_estimate,
@@ -379,49 +1054,110 @@ class DrivetrainExtractor:
         self.wheel_spin_events = {'FL': 0, 'FR': 0, 'RL': 0, 'RR': 0}
         self.gear_time = {str(i): 0 for i in range(9)}  # Gears 0-8
         self.total_samples = 0
+        self.spin_severity_sum = 0.0  # accumulated excess slip over spin events
         self.SPIN_THRESHOLD = 1.15  # 15% slip while on throttle
 
-    def extract(self, ddata: bytes) -> Dict[str, Any]:
-        """Extract drivetrain data from UDP packet"""
+        # Current lap
+        self.lap_rpm = LapSeries()
+        self.lap_throttle = LapSeries()
+        self._lap_base = self._lap_counters()
+
+    def extract(self, packet: Union[bytes, DecodedPacket], snapshot: bool = True) -> Dict[str, Any]:
+        """Extract drivetrain data from UDP packet (snapshot=False skips sample lists)"""
+        p = decode_packet(packet)
 
         # Engine RPM
-        rpm = struct.unpack('f', ddata[0x3C:0x40])[0]
+        rpm = p.rpm
         self.rpm_buffer.add(rpm)
+        self.lap_rpm.add(rpm)
 
         # Throttle & Brake
-        throttle = struct.unpack('B', ddata[0x91:0x92])[0] / 2.55  # 0-100%
-        brake = struct.unpack('B', ddata[0x92:0x93])[0] / 2.55
+        throttle = p.throttle_pct  # 0-100%
         self.throttle_buffer.add(throttle)
-
-        # Gear data
-        gear_raw = struct.unpack('B', ddata[0x90:0x91])[0]
-        current_gear = gear_raw & 0b00001111
-        suggested_gear = gear_raw >> 4
+        self.lap_throttle.add(throttle)
 
         # Track gear usage
-        self.gear_time[str(current_gear)] += 1
+        self.gear_time[str(p.current_gear)] += 1
         self.total_samples += 1
 
+        # Wheel spin detection (slip > threshold while throttle > 50%)
+        if throttle > 50:
+            for corner, slip in zip(CORNERS, p.slip_ratio):
+                if slip > self.SPIN_THRESHOLD:
+                    self.wheel_spin_events[corner] += 1
+                    self.spin_severity_sum += slip - 1.0
+
+        return self._build(p, snapshot)
+
+    def extract_batch(self, columns: PacketColumns, snapshot: bool = True) -> Dict[str, Any]:
+        """Batch extract(): same output and final state as streaming every packet in columns"""
+        rpm = columns.rpm.tolist()
+        throttle = columns.throttle_pct.tolist()
+        self.rpm_buffer.extend(rpm)
+        self.throttle_buffer.extend(throttle)
+        self.lap_rpm.extend(rpm)
+        self.lap_throttle.extend(throttle)
+
+        for gear, count in enumerate(np.bincount(columns.current_gear).tolist()):
+            if count:
+                self.gear_time[str(gear)] += count
+        self.total_samples += len(columns)
+
+        spinning = (columns.throttle_pct > 50)[:, None] & (columns.slip_ratio > self.SPIN_THRESHOLD)
+        for corner, count in zip(CORNERS, spinning.sum(axis=0).tolist()):
+            self.wheel_spin_events[corner] += count
+        # Same packet/corner order as streaming, so the float sum matches exactly
+        self.spin_severity_sum = sum((columns.slip_ratio[spinning] - 1.0).tolist(), self.spin_severity_sum)
+
+        return self._build(columns.row(-1), snapshot)
+
+    def lap_rollup(self) -> Dict[str, Any]:
+        """Lap summary since the last rollup; resets the lap accumulators"""
+        now = self._lap_counters()
+        delta = counter_delta(now, self._lap_base)
+        self._lap_base = now
+        spin_count = sum(delta['wheel_spin'].values())
+        return {
+            'rpm': self.lap_rpm.rollup(),
+            'throttle_pct': self.lap_throttle.rollup(),
+            'wheel_spin_events': {
+                'total_count': spin_count,
+                **{f'{corner}_count': delta['wheel_spin'][corner] for corner in CORNERS},
+                'severity_avg': (delta['spin_severity'] / spin_count) if spin_count else 0.0
+            },
+            'gear_usage': {gear: round(100 * count / delta['samples'], 1)
+                           for gear, count in delta['gear_time'].items()} if delta['samples'] else {}
+        }
+
+    def _lap_counters(self) -> Dict[str, Any]:
+        return {
+            'wheel_spin': dict(self.wheel_spin_events),
+            'gear_time': dict(self.gear_time),
+            'samples': self.total_samples,
+            'spin_severity': self.spin_severity_sum
+        }
+
+    def _build(self, p: DecodedPacket, snapshot: bool) -> Dict[str, Any]:
+        """Domain output from accumulated state plus the latest packet"""
+        # Gear data
+        current_gear = p.current_gear
+        suggested_gear = p.suggested_gear
+
         # Gear ratios
-        gear_ratios = [
-            struct.unpack('f', ddata[0x104 + i*4:0x108 + i*4])[0]
-            for i in range(8)
-        ]
+        gear_ratios = list(p.gear_ratios)
 
         # Transmission top speed
-        trans_top_speed = struct.unpack('f', ddata[0x100:0x104])[0]
+        trans_top_speed = p.transmission_top_speed
 
         # Engine limits
-        rev_warning = struct.unpack('H', ddata[0x88:0x8A])[0]
-        rev_limiter = struct.unpack('H', ddata[0x8A:0x8C])[0]
+        rev_warning = p.rev_warning
+        rev_limiter = p.rev_limiter
 
         # Engine temps
-        water_temp = struct.unpack('f', ddata[0x58:0x5C])[0]
-        oil_temp = struct.unpack('f', ddata[0x5C:0x60])[0]
-        oil_pressure = struct.unpack('f', ddata[0x54:0x58])[0]
+        water_temp = p.water_temp
+        oil_temp = p.oil_temp
+        oil_pressure = p.oil_pressure
 
-        # Wheel spin detection (if slip > threshold while throttle > 50%)
-        # (We'd need tire slip data here - this is simplified)
         total_spin_count = sum(self.wheel_spin_events.values())
 
         # Calculate gear usage percentages
@@ -430,8 +1166,8 @@ class DrivetrainExtractor:
             for gear, count in self.gear_time.items():
                 gear_usage[gear] = round(100 * count / self.total_samples, 1)
 
-        rpm_stats = self.rpm_buffer.get_stats()
-        throttle_stats = self.throttle_buffer.get_stats()
+        rpm_stats = self.rpm_buffer.get_stats(snapshot)
+        throttle_stats = self.throttle_buffer.get_stats(snapshot)
 
         return {
             'power_delivery': {
@@ -440,8 +1176,8 @@ class DrivetrainExtractor:
                 'max_rpm': rev_limiter,
                 'throttle_pct': throttle_stats['current'],
                 'avg_throttle_pct': throttle_stats['avg'],
-                'samples_rpm': rpm_stats['samples'],
-                'samples_throttle': throttle_stats['samples']
+                **({'samples_rpm': rpm_stats['samples'],
+                    'samples_throttle': throttle_stats['samples']} if snapshot else {})
             },
             'wheel_spin_events': {
                 'total_count': total_spin_count,
@@ -449,7 +1185,7 @@ class DrivetrainExtractor:
                 'FR_count': self.wheel_spin_events['FR'],
                 'RL_count': self.wheel_spin_events['RL'],
                 'RR_count': self.wheel_spin_events['RR'],
-                'severity_avg': 0.0  # Calculate from slip ratios
+                'severity_avg': (self.spin_severity_sum / total_spin_count) if total_spin_count else 0.0
             },
             'gear_usage': gear_usage,
             'gearing': {
@@ -467,61 +1203,174 @@ class DrivetrainExtractor:
 
 
 class BalanceExtractor:
-    """Extract weight transfer, stability, g-forces"""
+    """
+    Extract weight transfer, stability, g-forces
+
+    - Accelerations: world velocity differentiated on the packet-id time base,
+      rotated into the body frame with the orientation quaternion
+      (rotation x/y/z + north orientation as w; body x = lateral, z = forward)
+    - Balance per sample: measured yaw rate (ang_vel_y) vs kinematic yaw rate
+      (speed x path curvature = course-angle rate of the velocity vector).
+      Ratio < UNDERSTEER_RATIO -> understeer, > OVERSTEER_RATIO -> oversteer
+    - Corner phase state machine: straight -> entry (braking) -> mid -> exit (throttle)
+    All O(1) per packet.
+    """
+
+    GRAVITY = 9.81
+    ACCEL_SMOOTHING = 0.3          # EMA weight for differentiated accelerations
+    MIN_SPEED_MPS = 10.0           # below this, course rate is too noisy to classify
+    CORNER_ENTER_G = 0.30          # |lateral g| to start a corner
+    CORNER_LEAVE_G = 0.15          # |lateral g| to end it (hysteresis)
+    MIN_KINEMATIC_YAW = 0.05       # rad/s - below this the car is effectively straight
+    UNDERSTEER_RATIO = 0.85
+    OVERSTEER_RATIO = 1.15
+    MIN_PHASE_SAMPLES = 30         # ~0.5 s of cornering before a phase gets a verdict
+    EVENT_MIN_SAMPLES = 6          # ~0.1 s in a state before it counts as an event
+
+    PHASES = ('entry', 'mid', 'exit')
+    PHASE_LABELS = {
+        'entry': {'understeer': 'pushing', 'oversteer': 'unstable', 'neutral': 'stable'},
+        'mid': {'understeer': 'understeer', 'oversteer': 'oversteer', 'neutral': 'balanced'},
+        'exit': {'understeer': 'push', 'oversteer': 'power_oversteer', 'neutral': 'good'},
+    }
 
     def __init__(self):
         self.lateral_g_buffer = StatBuffer(10)
         self.longitudinal_g_buffer = StatBuffer(10)
-        self.prev_vel_x = 0.0
-        self.prev_vel_z = 0.0
-        self.prev_time = dt.now()
         self.understeer_events = 0
         self.oversteer_events = 0
-
-    def extract(self, ddata: bytes) -> Dict[str, Any]:
-        """Extract balance data from UDP packet"""
+        self.corner_count = 0
+
+        self._last_packet_id: Optional[int] = None
+        self._prev_vel = (0.0, 0.0, 0.0)
+        self._prev_course: Optional[float] = None
+        self._accel_body = [0.0, 0.0, 0.0]
+        self._kinematic_yaw = 0.0
+        self._measured_yaw = 0.0
+        self._prev_ang_vel_y = 0.0
+        self._state = 'neutral'
+        self._candidate = 'neutral'
+        self._candidate_count = 0
+        self.phase = 'straight'
+
+        # Per-phase sample counts by balance state
+        self.phase_counts = {phase: {'understeer': 0, 'oversteer': 0, 'neutral': 0} for phase in self.PHASES}
+        self._ratio_sum = 0.0
+        self._ratio_count = 0
+        self._yaw_ratio: Optional[float] = None
+
+        # Current lap
+        self.lap_lateral_g = LapSeries()
+        self.lap_longitudinal_g = LapSeries()
+        self._lap_base = self._lap_counters()
+
+    def extract(self, packet: Union[bytes, DecodedPacket], snapshot: bool = True) -> Dict[str, Any]:
+        """Extract balance data from UDP packet (snapshot=False skips sample lists)"""
+        p = decode_packet(packet)
 
         # Velocity vectors
-        vel_x = struct.unpack('f', ddata[0x10:0x14])[0]
-        vel_y = struct.unpack('f', ddata[0x14:0x18])[0]
-        vel_z = struct.unpack('f', ddata[0x18:0x1C])[0]
+        vel_x, vel_y, vel_z = p.vel_x, p.vel_y, p.vel_z
+
+        gap = None if self._last_packet_id is None else p.packet_id - self._last_packet_id
+        accel_body = None
+        if gap is not None and 0 < gap <= MAX_PACKET_GAP:
+            dt_seconds = gap / PACKET_RATE_HZ
+            accel_world = ((vel_x - self._prev_vel[0]) / dt_seconds,
+                           (vel_y - self._prev_vel[1]) / dt_seconds,
+                           (vel_z - self._prev_vel[2]) / dt_seconds)
+            quaternion = (p.rot_pitch, p.rot_yaw, p.rot_roll, p.north_orientation)
+            accel_body = rotate_to_body(quaternion, accel_world)
+
+        self._advance(p.packet_id, gap, accel_body, (vel_x, vel_y, vel_z), p.ang_vel_y, p.brake_pct, p.throttle_pct)
+        return self._build(p, snapshot)
+
+    def extract_batch(self, columns: PacketColumns, snapshot: bool = True) -> Dict[str, Any]:
+        """
+        Batch extract(): same output and final state as streaming every packet in columns
+
+        Differentiation and body-frame rotation are vectorized; the filters and
+        the corner state machine are inherently sequential and run per packet.
+        """
+        n = len(columns)
+        velocity = np.stack((columns.vel_x, columns.vel_y, columns.vel_z), axis=1)
+        accepted, gaps = accepted_packets(columns.packet_id, self._last_packet_id)
+
+        # Velocity of the previously accepted packet (row 0 = state before this batch)
+        accepted_index = np.where(accepted, np.arange(n), -1)
+        previous_index = np.maximum.accumulate(np.concatenate(([-1], accepted_index)))[:-1]
+        previous_velocity = np.vstack((self._prev_vel, velocity))[previous_index + 1]
+
+        valid = (gaps > 0) & (gaps <= MAX_PACKET_GAP)
+        dt_seconds = np.where(valid, gaps, 1) / PACKET_RATE_HZ
+        accel_world = (velocity - previous_velocity) / dt_seconds[:, None]
+        quaternions = np.stack((columns.rot_pitch, columns.rot_yaw, columns.rot_roll,
+                                columns.north_orientation), axis=1)
+        accel_body = rotate_to_body_columns(quaternions, accel_world).tolist()
+
+        no_history = self._last_packet_id is None
+        advance = self._advance
+        for i, (packet_id, gap, is_valid, vel, ang_vel_y, brake, throttle) in enumerate(zip(
+                columns.packet_id.tolist(), gaps.tolist(), valid.tolist(), velocity.tolist(),
+                columns.ang_vel_y.tolist(), columns.brake_pct.tolist(), columns.throttle_pct.tolist())):
+            if i == 0 and no_history:
+                gap = None
+            advance(packet_id, gap, accel_body[i] if is_valid else None, tuple(vel), ang_vel_y, brake, throttle)
+
+        return self._build(columns.row(-1), snapshot)
+
+    def _advance(self, packet_id: int, gap: Optional[int], accel_body: Optional[Tuple[float, float, float]],
+                 velocity: Tuple[float, float, float], ang_vel_y: float, brake_pct: float, throttle_pct: float):
+        """Sequential part of one packet: filters, corner phase, classification"""
+        vel_x, vel_y, vel_z = velocity
+        speed = math.hypot(vel_x, vel_z)
+        course = math.atan2(vel_x, vel_z) if speed > self.MIN_SPEED_MPS else None
+
+        if accel_body is not None:
+            dt_seconds = gap / PACKET_RATE_HZ
+            a = self.ACCEL_SMOOTHING
+            self._accel_body = [prev + a * (new - prev) for prev, new in zip(self._accel_body, accel_body)]
+
+            if course is not None and self._prev_course is not None:
+                dcourse = (course - self._prev_course + math.pi) % (2 * math.pi) - math.pi
+                self._kinematic_yaw += a * (dcourse / dt_seconds - self._kinematic_yaw)
+            # Same filter on the measured side so both rates share one lag; averaging
+            # over the packet interval centres it like the course-angle difference
+            self._measured_yaw += a * ((ang_vel_y + self._prev_ang_vel_y) / 2 - self._measured_yaw)
+        elif gap is not None and gap <= 0:
+            pass  # duplicate / reordered packet: keep previous state
+        else:
+            self._accel_body = [0.0, 0.0, 0.0]
+            self._kinematic_yaw = 0.0
+            self._measured_yaw = ang_vel_y
 
-        # Rotation
-        rot_pitch = struct.unpack('f', ddata[0x1C:0x20])[0]
-        rot_yaw = struct.unpack('f', ddata[0x20:0x24])[0]
-        rot_roll = struct.unpack('f', ddata[0x24:0x28])[0]
+        if gap is None or gap > 0:
+            self._last_packet_id = packet_id
+            self._prev_vel = velocity
+            self._prev_course = course
+            self._prev_ang_vel_y = ang_vel_y
 
-        # Angular velocity
-        ang_vel_x = struct.unpack('f', ddata[0x2C:0x30])[0]
-        ang_vel_y = struct.unpack('f', ddata[0x30:0x34])[0]
-        ang_vel_z = struct.unpack('f', ddata[0x34:0x38])[0]
-
-        # Calculate g-forces (simplified)
-        # Lateral G: from angular velocity Z (yaw rate)
-        lateral_g = abs(ang_vel_z) / 9.81  # Rough approximation
-
-        # Longitudinal G: from velocity Z change (accel/brake)
-        now = dt.now()
-        dt_seconds = (now - self.prev_time).total_seconds()
-        if dt_seconds > 0:
-            accel_z = (vel_z - self.prev_vel_z) / dt_seconds
-            longitudinal_g = accel_z / 9.81
-        else:
-            longitudinal_g = 0.0
+        lateral_g = self._accel_body[0] / self.GRAVITY
+        longitudinal_g = self._accel_body[2] / self.GRAVITY
 
-        self.lateral_g_buffer.add(lateral_g)
+        # Buffers keep lateral magnitude (downstream consumers average it)
+        self.lateral_g_buffer.add(abs(lateral_g))
         self.longitudinal_g_buffer.add(longitudinal_g)
+        self.lap_lateral_g.add(abs(lateral_g))
+        self.lap_longitudinal_g.add(longitudinal_g)
 
-        self.prev_vel_x = vel_x
-        self.prev_vel_z = vel_z
-        self.prev_time = now
+        self._update_phase(abs(lateral_g), brake_pct, throttle_pct)
+        self._yaw_ratio = self._classify(self._measured_yaw, course is not None)
 
-        lateral_stats = self.lateral_g_buffer.get_stats()
-        long_stats = self.longitudinal_g_buffer.get_stats()
+    def _build(self, p: DecodedPacket, snapshot: bool) -> Dict[str, Any]:
+        """Domain output from accumulated state plus the latest packet"""
+        # Rotation
+        rot_pitch, rot_yaw, rot_roll = p.rot_pitch, p.rot_yaw, p.rot_roll
+
+        # Angular velocity
+        ang_vel_x, ang_vel_y, ang_vel_z = p.ang_vel_x, p.ang_vel_y, p.ang_vel_z
 
-        # Analyze balance bias (simplified)
-        balance_bias = 'neutral'
-        # TODO: Implement proper understeer/oversteer detection
+        lateral_stats = self.lateral_g_buffer.get_stats(snapshot)
+        long_stats = self.longitudinal_g_buffer.get_stats(snapshot)
 
         return {
             'weight_transfer': {
@@ -538,14 +1387,171 @@ class BalanceExtractor:
                 'y': ang_vel_y,
                 'z': ang_vel_z
             },
+            'yaw_rate': {
+                'measured': self._measured_yaw,
+                'kinematic': self._kinematic_yaw,
+                'ratio': self._yaw_ratio
+            },
             'stability_metrics': {
                 'understeer_events': self.understeer_events,
                 'oversteer_events': self.oversteer_events,
-                'balance_bias': balance_bias
+                'balance_bias': self._balance_bias(),
+                'current_state': self._state,
+                'yaw_ratio_avg': self._ratio_sum / self._ratio_count if self._ratio_count else None
             },
             'corner_analysis': {
-                'entry_stability': 'unknown',
-                'mid_corner_grip': 'unknown',
-                'exit_traction': 'unknown'
+                'phase': self.phase,
+                'corners': self.corner_count,
+                'entry_stability': self._phase_verdict('entry'),
+                'mid_corner_grip': self._phase_verdict('mid'),
+                'exit_traction': self._phase_verdict('exit')
             }
         }
+
+    def lap_rollup(self) -> Dict[str, Any]:
+        """Lap summary since the last rollup; resets the lap accumulators"""
+        now = self._lap_counters()
+        delta = counter_delta(now, self._lap_base)
+        self._lap_base = now
+        phase_counts = delta['phase_counts']
+        totals = {state: sum(phase_counts[phase][state] for phase in self.PHASES)
+                  for state in ('understeer', 'oversteer', 'neutral')}
+        verdicts = {}
+        for phase in self.PHASES:
+            dominant = self._dominant(phase_counts[phase])
+            verdicts[phase] = self.PHASE_LABELS[phase][dominant] if dominant else 'unknown'
+        return {
+            'lateral_g': self.lap_lateral_g.rollup(),
+            'longitudinal_g': self.lap_longitudinal_g.rollup(),
+            'understeer_events': delta['understeer_events'],
+            'oversteer_events': delta['oversteer_events'],
+            'balance_bias': self._dominant(totals) or 'neutral',
+            'yaw_ratio_avg': delta['ratio_sum'] / delta['ratio_count'] if delta['ratio_count'] else None,
+            'corners': delta['corners'],
+            'entry_stability': verdicts['entry'],
+            'mid_corner_grip': verdicts['mid'],
+            'exit_traction': verdicts['exit']
+        }
+
+    def _lap_counters(self) -> Dict[str, Any]:
+        return {
+            'understeer_events': self.understeer_events,
+            'oversteer_events': self.oversteer_events,
+            'corners': self.corner_count,
+            'phase_counts': {phase: dict(counts) for phase, counts in self.phase_counts.items()},
+            'ratio_sum': self._ratio_sum,
+            'ratio_count': self._ratio_count
+        }
+
+    def _update_phase(self, abs_lateral_g: float, brake_pct: float, throttle_pct: float):
+        """Advance the straight -> entry -> mid -> exit state machine"""
+        phase = self.phase
+        if phase == 'straight':
+            if abs_lateral_g > self.CORNER_ENTER_G:
+                self.corner_count += 1
+                phase = 'entry' if brake_pct > 5 else 'mid'
+        elif abs_lateral_g < self.CORNER_LEAVE_G:
+            phase = 'straight'
+        elif phase == 'entry' and brake_pct <= 5:
+            phase = 'mid'
+        elif phase == 'mid' and throttle_pct > 50:
+            phase = 'exit'
+        self.phase = phase
+
+    def _classify(self, measured_yaw: float, course_valid: bool) -> Optional[float]:
+        """Classify this sample from the yaw-rate ratio (magnitudes, sign-convention free)"""
+        kinematic = abs(self._kinematic_yaw)
+        if self.phase == 'straight' or not course_valid or kinematic < self.MIN_KINEMATIC_YAW:
+            self._state = self._candidate = 'neutral'
+            self._candidate_count = 0
+            return None
+
+        ratio = abs(measured_yaw) / kinematic
+        if ratio < self.UNDERSTEER_RATIO:
+            state = 'understeer'
+        elif ratio > self.OVERSTEER_RATIO:
+            state = 'oversteer'
+        else:
+            state = 'neutral'
+
+        # Events = entries into a state held for EVENT_MIN_SAMPLES, samples = time spent in it
+        if state == self._state:
+            self._candidate_count = 0
+        elif state == self._candidate:
+            self._candidate_count += 1
+            if self._candidate_count >= self.EVENT_MIN_SAMPLES:
+                if state == 'understeer':
+                    self.understeer_events += 1
+                elif state == 'oversteer':
+                    self.oversteer_events += 1
+                self._state = state
+                self._candidate_count = 0
+        else:
+            self._candidate = state
+            self._candidate_count = 1
+        self.phase_counts[self.phase][state] += 1
+        self._ratio_sum += ratio
+        self._ratio_count += 1
+        return ratio
+
+    def _dominant(self, counts: Dict[str, int]) -> Optional[str]:
+        total = sum(counts.values())
+        if total < self.MIN_PHASE_SAMPLES:
+            return None
+        under, over = counts['understeer'], counts['oversteer']
+        if under > 1.5 * over and under > 0.25 * total:
+            return 'understeer'
+        if over > 1.5 * under and over > 0.25 * total:
+            return 'oversteer'
+        return 'neutral'
+
+    def _balance_bias(self) -> str:
+        totals = {state: sum(self.phase_counts[phase][state] for phase in self.PHASES)
+                  for state in ('understeer', 'oversteer', 'neutral')}
+        return self._dominant(totals) or 'neutral'
+
+    def _phase_verdict(self, phase: str) -> str:
+        dominant = self._dominant(self.phase_counts[phase])
+        return self.PHASE_LABELS[phase][dominant] if dominant else 'unknown'
+
+
+def rotate_to_body(quaternion: Tuple[float, float, float, float],
+                   vector: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """
+    Rotate a world-frame vector into the body frame (inverse quaternion rotation)
+
+    Args:
+        quaternion: (x, y, z, w) body orientation; normalized here
+        vector: World-frame vector
+    """
+    qx, qy, qz, qw = quaternion
+    norm = math.sqrt(qx * qx + qy * qy + qz * qz + qw * qw)
+    if norm < 1e-6:
+        return vector
+    # Conjugate (inverse) rotation: negate the vector part
+    qx, qy, qz, qw = -qx / norm, -qy / norm, -qz / norm, qw / norm
+    vx, vy, vz = vector
+    # v' = v + 2w(u x v) + 2u x (u x v)
+    tx = 2 * (qy * vz - qz * vy)
+    ty = 2 * (qz * vx - qx * vz)
+    tz = 2 * (qx * vy - qy * vx)
+    return (vx + qw * tx + (qy * tz - qz * ty),
+            vy + qw * ty + (qz * tx - qx * tz),
+            vz + qw * tz + (qx * ty - qy * tx))
+
+
+def rotate_to_body_columns(quaternions, vectors):
+    """rotate_to_body() over (n, 4) quaternions and (n, 3) vectors (same arithmetic)"""
+    qx, qy, qz, qw = quaternions.T
+    norm = np.sqrt(qx * qx + qy * qy + qz * qz + qw * qw)
+    degenerate = norm < 1e-6
+    safe_norm = np.where(degenerate, 1.0, norm)
+    qx, qy, qz, qw = -qx / safe_norm, -qy / safe_norm, -qz / safe_norm, qw / safe_norm
+    vx, vy, vz = vectors.T
+    tx = 2 * (qy * vz - qz * vy)
+    ty = 2 * (qz * vx - qx * vz)
+    tz = 2 * (qx * vy - qy * vx)
+    rotated = np.stack((vx + qw * tx + (qy * tz - qz * ty),
+                        vy + qw * ty + (qz * tx - qx * tz),
+                        vz + qw * tz + (qx * ty - qy * tx)), axis=1)
+    return np.where(degenerate[:, None], vectors, rotated)
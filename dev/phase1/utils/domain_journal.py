@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Append-only Domain Journal
+Phase 1: Domain JSON Architecture
+
+Keeps the time-series history that the latest-state domain files overwrite.
+
+Files (in the session folder):
+- journal.jsonl: one compact JSON record per line
+    {"seq": 12, "t": 1735580000.12, "lap": 7, "kf": false, "d": {"tires": {...}}}
+  Keyframes ("kf": true) carry every domain; other records carry only the
+  domains whose content changed since the previous record.
+- journal.idx: fixed-size binary index entry per record
+  (sequence, lap, timestamp, byte offset, keyframe flag)
+
+A keyframe is written at every lap change and every `keyframe_interval`
+records, so any lap can be replayed by reading only that lap's lines.
+"""
+
+import json
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+
+JOURNAL_FILENAME = 'journal.jsonl'
+JOURNAL_INDEX_FILENAME = 'journal.idx'
+
+# seq(Q) lap(i) timestamp(d) offset(Q) keyframe(B) + pad -> 32 bytes
+INDEX_ENTRY = struct.Struct('<QidQB3x')
+
+
+class DomainJournal:
+    """Append-only writer for domain snapshots"""
+
+    def __init__(self, session_folder: str, keyframe_interval: int = 100):
+        """
+        Open (or continue) the journal in a session folder
+
+        Args:
+            session_folder: Path to session directory
+            keyframe_interval: Records between forced keyframes (default: 100)
+        """
+        self.session_folder = Path(session_folder)
+        self.session_folder.mkdir(parents=True, exist_ok=True)
+        self.keyframe_interval = keyframe_interval
+
+        self.journal_path = self.session_folder / JOURNAL_FILENAME
+        self.index_path = self.session_folder / JOURNAL_INDEX_FILENAME
+
+        entries = read_index(self.index_path)
+        self.sequence = entries[-1][0] if entries else 0
+        self.last_lap: Optional[int] = entries[-1][1] if entries else None
+
+        # Drop a torn index tail and any unindexed journal bytes from a crash
+        valid_index_size = len(entries) * INDEX_ENTRY.size
+        if self.index_path.exists() and self.index_path.stat().st_size != valid_index_size:
+            os.truncate(self.index_path, valid_index_size)
+        if entries and self.journal_path.exists():
+            with open(self.journal_path, 'rb') as f:
+                f.seek(entries[-1][3])
+                f.readline()
+                os.truncate(self.journal_path, f.tell())
+        elif not entries and self.journal_path.exists():
+            os.truncate(self.journal_path, 0)
+
+        self._journal = open(self.journal_path, 'ab')
+        self._index = open(self.index_path, 'ab')
+        self._offset = self._journal.tell()
+        self._last_texts: Dict[str, str] = {}  # empty -> next record is a keyframe
+        self._since_keyframe = 0
+
+    def append(self, domains: Dict[str, Dict[str, Any]], lap: int,
+               timestamp: Optional[float] = None) -> bool:
+        """
+        Append one record (domain-level delta, or keyframe when due)
+
+        Args:
+            domains: Domain name -> latest data
+            lap: Current lap number
+            timestamp: Epoch seconds (default: now)
+
+        Returns:
+            True if a record was written, False if nothing changed
+        """
+        texts = {name: json.dumps(data, separators=(',', ':')) for name, data in domains.items()}
+        return self.append_texts(texts, lap, timestamp)
+
+    def append_texts(self, texts: Dict[str, str], lap: int,
+                     timestamp: Optional[float] = None) -> bool:
+        """Same as append(), for domains already serialized as compact JSON"""
+        keyframe = (not self._last_texts
+                    or lap != self.last_lap
+                    or self._since_keyframe >= self.keyframe_interval)
+        if keyframe:
+            changed = {**self._last_texts, **texts}
+        else:
+            changed = {name: text for name, text in texts.items() if self._last_texts.get(name) != text}
+            if not changed:
+                return False
+
+        self.sequence += 1
+        timestamp = time.time() if timestamp is None else timestamp
+        # Domain payloads are already serialized - splice them instead of re-encoding
+        body = ','.join(f'{json.dumps(name)}:{text}' for name, text in changed.items())
+        line = (f'{{"seq":{self.sequence},"t":{timestamp!r},"lap":{lap},'
+                f'"kf":{"true" if keyframe else "false"},"d":{{{body}}}}}\n').encode('utf-8')
+
+        self._journal.write(line)
+        self._index.write(INDEX_ENTRY.pack(self.sequence, lap, timestamp, self._offset, keyframe))
+        self._offset += len(line)
+
+        self._last_texts.update(texts)
+        self._since_keyframe = 0 if keyframe else self._since_keyframe + 1
+        self.last_lap = lap
+        return True
+
+    def flush(self) -> None:
+        """Push buffered records to the OS (journal first, so the index never points past it)"""
+        self._journal.flush()
+        self._index.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._journal.close()
+        self._index.close()
+
+
+def read_index(index_path) -> List[Tuple[int, int, float, int, bool]]:
+    """Load all complete index entries: (sequence, lap, timestamp, offset, keyframe)"""
+    try:
+        with open(index_path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return []
+    usable = len(raw) - len(raw) % INDEX_ENTRY.size
+    return [(seq, lap, t, offset, bool(kf))
+            for seq, lap, t, offset, kf in INDEX_ENTRY.iter_unpack(raw[:usable])]
+
+
+class DomainJournalReader:
+    """Range reads over a session's domain journal"""
+
+    def __init__(self, session_folder: str):
+        self.session_folder = Path(session_folder)
+        self.journal_path = self.session_folder / JOURNAL_FILENAME
+        self.entries = read_index(self.session_folder / JOURNAL_INDEX_FILENAME)
+
+    def laps(self) -> List[int]:
+        """Laps present in the journal, in first-seen order"""
+        return list(dict.fromkeys(entry[1] for entry in self.entries))
+
+    def read_lap(self, lap: int, domain: str) -> List[Dict[str, Any]]:
+        """
+        Time series of one domain within a lap
+
+        Only the lap's own lines are read (each lap starts with a keyframe).
+
+        Returns:
+            [{'seq': n, 't': timestamp, 'data': domain_state}, ...] - one item per
+            record where the domain changed (the first item is the lap-start state)
+        """
+        positions = [i for i, entry in enumerate(self.entries) if entry[1] == lap]
+        return self._read_positions(positions, domain)
+
+    def read_range(self, start_seq: int, end_seq: int, domain: str) -> List[Dict[str, Any]]:
+        """Time series of one domain for sequence numbers [start_seq, end_seq]"""
+        positions = [i for i, entry in enumerate(self.entries) if start_seq <= entry[0] <= end_seq]
+        if positions:
+            # Rewind to the nearest keyframe so the first state is complete
+            first = positions[0]
+            while first > 0 and not self.entries[first][4]:
+                first -= 1
+            positions = list(range(first, positions[0])) + positions
+        series = self._read_positions(positions, domain)
+        return [item for item in series if item['seq'] >= start_seq] or series[-1:]
+
+    def _read_positions(self, positions: List[int], domain: str) -> List[Dict[str, Any]]:
+        series = []
+        if not positions:
+            return series
+        with open(self.journal_path, 'rb') as f:
+            for i in positions:
+                seq, _, t, offset, _ = self.entries[i]
+                f.seek(offset)
+                record = json.loads(f.readline())
+                if domain in record['d']:
+                    series.append({'seq': seq, 't': t, 'data': record['d'][domain]})
+        return series
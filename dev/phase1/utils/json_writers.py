@@ -8,11 +8,36 @@ Supports both full writes and incremental updates.
 """
 
 import json
+import mmap
 import os
+import struct
 import tempfile
-from typing import Dict, Any
+import threading
+import time
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from .domain_extractors import PACKET_LOG_FILENAME, PACKET_SIZE
+from .domain_journal import DomainJournal
+
+
+DOMAIN_NAMES = ('metadata', 'suspension', 'tires', 'aero', 'drivetrain', 'balance')
+
+# Consolidated snapshot container (domains.snapshot):
+#   header : magic(8s) version(H) domain_count(H) reserved(I) sequence(Q)
+#   table  : domain_count x [name(16s) offset(I) length(I)]   (offsets from file start)
+#   payload: compact UTF-8 JSON per domain
+SNAPSHOT_FILENAME = 'domains.snapshot'
+SNAPSHOT_MAGIC = b'GT7DSNAP'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('<8sHHIQ')
+SNAPSHOT_ENTRY = struct.Struct('<16sII')
+
+# Per-lap rollups: laps/lap_001.json (lap_001_2.json if lap 1 is driven again)
+# plus laps/index.json listing every rollup in the order it was written
+LAPS_DIRNAME = 'laps'
+LAP_INDEX_FILENAME = 'index.json'
+
 
 class DomainJSONWriter:
     """Atomic JSON file writer with crash safety"""
@@ -39,6 +64,26 @@ class DomainJSONWriter:
             data: Dictionary to write as JSON
             filename: JSON filename (e.g., 'metadata.json')
         """
+        self.write_text_atomic(json.dumps(data, indent=2), filename)
+
+    def write_text_atomic(self, text: str, filename: str) -> None:
+        """
+        Write already-serialized JSON text atomically (temp file + os.replace)
+
+        Args:
+            text: Serialized JSON
+            filename: JSON filename (e.g., 'metadata.json')
+        """
+        self.write_bytes_atomic(text.encode('utf-8'), filename)
+
+    def write_bytes_atomic(self, payload: bytes, filename: str) -> None:
+        """
+        Write bytes atomically (temp file in same directory + os.replace)
+
+        Args:
+            payload: File contents
+            filename: Target filename within the session folder
+        """
         filepath = self.session_folder / filename
 
         # Write to temp file in same directory (for atomic rename)
@@ -49,9 +94,9 @@ class DomainJSONWriter:
         )
 
         try:
-            # Write JSON to temp file
-            with os.fdopen(fd, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Write payload to temp file
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
 
             # Atomic rename (replaces existing file if present)
             os.replace(temp_path, filepath)
@@ -64,6 +109,18 @@ class DomainJSONWriter:
                 pass
             raise e
 
+    def write_snapshot(self, domain_texts: Dict[str, str], sequence: int) -> None:
+        """
+        Write all domains into one atomically replaced snapshot container
+
+        Readers see every domain from the same flush and need a single open.
+
+        Args:
+            domain_texts: Domain name -> serialized JSON text
+            sequence: Monotonic snapshot sequence number (stored in header)
+        """
+        self.write_bytes_atomic(pack_snapshot(domain_texts, sequence), SNAPSHOT_FILENAME)
+
     def read_or_init(self, filename: str, default: Dict[str, Any]) -> Dict[str, Any]:
         """
         Read existing JSON file or return default if doesn't exist
@@ -159,6 +216,123 @@ class DomainJSONWriter:
         return self.session_folder
 
 
+def pack_snapshot(domain_texts: Dict[str, str], sequence: int) -> bytes:
+    """Build a snapshot container from serialized domain JSON texts"""
+    payloads = [(name, text.encode('utf-8')) for name, text in domain_texts.items()]
+    offset = SNAPSHOT_HEADER.size + SNAPSHOT_ENTRY.size * len(payloads)
+    parts = [SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(payloads), 0, sequence)]
+    for name, payload in payloads:
+        parts.append(SNAPSHOT_ENTRY.pack(name.encode('ascii'), offset, len(payload)))
+        offset += len(payload)
+    parts.extend(payload for _, payload in payloads)
+    return b''.join(parts)
+
+
+class DomainSnapshotReader:
+    """
+    Reader for the consolidated domains.snapshot container
+
+    sequence() reads only the fixed-size header, so polling for changes is
+    one small read. read() memory-maps the file once and parses every domain
+    from that single consistent view.
+    """
+
+    def __init__(self, session_folder: str):
+        self.path = Path(session_folder) / SNAPSHOT_FILENAME
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def sequence(self) -> Optional[int]:
+        """Current snapshot sequence number, or None if no snapshot yet"""
+        try:
+            with open(self.path, 'rb') as f:
+                header = f.read(SNAPSHOT_HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < SNAPSHOT_HEADER.size:
+            return None
+        magic, version, _, _, sequence = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            return None
+        return sequence
+
+    def has_changed(self, last_sequence: Optional[int]) -> bool:
+        """Cheap change check against a previously seen sequence number"""
+        current = self.sequence()
+        return current is not None and current != last_sequence
+
+    def read(self, domains=None) -> Optional[Dict[str, Any]]:
+        """
+        Parse the snapshot
+
+        Args:
+            domains: Optional iterable of domain names to parse (default: all)
+
+        Returns:
+            {'sequence': int, 'domains': {name: data}} or None if missing/invalid
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._parse(mm, set(domains) if domains else None)
+        except (FileNotFoundError, ValueError, struct.error, json.JSONDecodeError):
+            return None
+
+    def _parse(self, buf, wanted) -> Optional[Dict[str, Any]]:
+        magic, version, count, _, sequence = SNAPSHOT_HEADER.unpack_from(buf, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            return None
+        result = {}
+        for i in range(count):
+            raw_name, offset, length = SNAPSHOT_ENTRY.unpack_from(buf, SNAPSHOT_HEADER.size + i * SNAPSHOT_ENTRY.size)
+            name = raw_name.rstrip(b'\0').decode('ascii')
+            if wanted is None or name in wanted:
+                result[name] = json.loads(buf[offset:offset + length])
+        return {'sequence': sequence, 'domains': result}
+
+
+class LapRollupStore:
+    """Lap-indexed store of per-lap domain rollups under <session>/laps/"""
+
+    def __init__(self, session_folder: str):
+        self.laps_folder = Path(session_folder) / LAPS_DIRNAME
+        self.writer = DomainJSONWriter(self.laps_folder)
+        self.index: List[Dict[str, Any]] = self.writer.read_or_init(LAP_INDEX_FILENAME, {'laps': []})['laps']
+
+    def write(self, rollup: Dict[str, Any]) -> str:
+        """
+        Store one lap rollup (atomic) and add it to the index
+
+        Returns:
+            Filename of the rollup inside laps/
+        """
+        lap = rollup['lap']
+        repeat = sum(1 for entry in self.index if entry['lap'] == lap)
+        filename = f'lap_{lap:03d}.json' if not repeat else f'lap_{lap:03d}_{repeat + 1}.json'
+
+        self.writer.write_text_atomic(json.dumps(rollup, separators=(',', ':')), filename)
+        self.index.append({
+            'lap': lap,
+            'file': filename,
+            'complete': rollup['complete'],
+            'lap_time_ms': rollup['lap_time_ms']
+        })
+        self.writer.write_atomic({'laps': self.index}, LAP_INDEX_FILENAME)
+        return filename
+
+    def laps(self) -> List[Dict[str, Any]]:
+        """Index entries in the order the laps were driven"""
+        return list(self.index)
+
+    def read(self, lap: int) -> Optional[Dict[str, Any]]:
+        """Latest rollup for a lap number (None if that lap has not been rolled up)"""
+        for entry in reversed(self.index):
+            if entry['lap'] == lap:
+                return json.loads((self.laps_folder / entry['file']).read_text())
+        return None
+
+
 class BufferedDomainWriter:
     """
     Buffered writer that accumulates data and writes every N updates
@@ -191,19 +365,29 @@ class BufferedDomainWriter:
             'balance': None        # Last balance data
         }
 
-    def update_domain(self, domain_name: str, data: Dict[str, Any]) -> bool:
+    @property
+    def snapshot_due(self) -> bool:
+        """
+        True if the next round of domain updates will fill the buffer.
+        Extractors use this to build sample lists only for data that gets written.
+        """
+        return self.update_count + len(self.domain_buffers) >= self.buffer_size
+
+    def update_domain(self, domain_name: str, data: Dict[str, Any], snapshot: bool = True) -> bool:
         """
         Update a domain buffer with new data
 
         Args:
             domain_name: Domain name (metadata/suspension/tires/aero/drivetrain/balance)
             data: Extracted domain data
+            snapshot: False if data was extracted with snapshot=False (counted, not stored)
 
         Returns:
             True if buffer is full and needs flushing, False otherwise
         """
-        # Store latest data
-        self.domain_buffers[domain_name] = data
+        # Store latest data (partial per-packet data never replaces a snapshot)
+        if snapshot:
+            self.domain_buffers[domain_name] = data
 
         # Increment counter
         self.update_count += 1
@@ -236,3 +420,217 @@ class BufferedDomainWriter:
         Force write current buffer state (e.g., on session end)
         """
         self.flush()
+
+
+class BackgroundDomainWriter:
+    """
+    Domain writer that keeps all disk I/O off the capture thread
+
+    - update_domain() only stores the newest snapshot per domain (stale
+      intermediates are dropped before they are ever serialized; per-packet
+      updates built with snapshot=False are never stored, so whatever the
+      thread, a lap change or close() writes has its sample lists)
+    - A writer thread wakes every `interval` seconds, serializes compactly and
+      rewrites only domains whose content changed since the last write
+    - The interval adapts to load: it backs off when writes are slow
+      (keeps the writer busy at most ~1/BUSY_FACTOR of the time)
+    - Raw packets handed to add_packet() are appended to packets.bin by the
+      same thread (bounded backlog: packets beyond it are counted and dropped)
+
+    Drop-in for BufferedDomainWriter: update_domain/flush/force_write/snapshot_due.
+    """
+
+    BUSY_FACTOR = 5.0
+    SNAPSHOT_LEAD = 0.05  # seconds (~3 packets) before pickup that extractors start building samples
+    PACKET_BACKLOG = 36000  # raw packets (10 min at 60Hz, ~11 MB) held while the disk stalls
+
+    def __init__(self, session_folder: str, min_interval: float = 0.2, max_interval: float = 2.0,
+                 write_domain_files: bool = True, write_snapshot: bool = False,
+                 journal: bool = False, lap_rollups: bool = False, packet_log: bool = False):
+        """
+        Initialize background writer and start its thread
+
+        Args:
+            session_folder: Path to session directory
+            min_interval: Fastest write cadence in seconds (default: 0.2)
+            max_interval: Slowest write cadence under load in seconds (default: 2.0)
+            write_domain_files: Write the six <domain>.json files (default: True)
+            write_snapshot: Also write the consolidated domains.snapshot (default: False)
+            journal: Also append each flush to journal.jsonl history (default: False)
+            lap_rollups: Store lap rollups handed to add_lap_rollup() in laps/ (default: False)
+            packet_log: Append packets handed to add_packet() to packets.bin (default: False)
+        """
+        self.writer = DomainJSONWriter(session_folder)
+        self.write_domain_files = write_domain_files
+        self.write_snapshot = write_snapshot
+        self.snapshot_sequence = 0
+        self.journal = DomainJournal(session_folder) if journal else None
+        self._journal_lap = 0
+        self.lap_store = LapRollupStore(session_folder) if lap_rollups else None
+        self.packet_log = (open(os.path.join(session_folder, PACKET_LOG_FILENAME), 'ab', buffering=1 << 16)
+                           if packet_log else None)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._pending_laps: List[Dict[str, Any]] = []
+        self._pending_packets: List[bytes] = []
+        self._last_written: Dict[str, str] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._next_pickup = time.monotonic()
+
+        # Counters for diagnostics
+        self.updates_received = 0
+        self.files_written = 0
+        self.files_skipped_unchanged = 0
+        self.packets_logged = 0
+        self.packets_log_dropped = 0
+        self.write_errors = 0
+        self.last_error: Optional[Exception] = None
+
+        self._thread = threading.Thread(target=self._run, name='domain-json-writer', daemon=True)
+        self._thread.start()
+
+    @property
+    def snapshot_due(self) -> bool:
+        """True if the writer is about to pick up snapshots (extractors build sample lists then)"""
+        return time.monotonic() >= self._next_pickup - self.SNAPSHOT_LEAD
+
+    def update_domain(self, domain_name: str, data: Dict[str, Any], snapshot: bool = True) -> bool:
+        """
+        Hand over the newest data for a domain (never blocks on disk)
+
+        Args:
+            domain_name: Domain name
+            data: Extracted domain data
+            snapshot: False if data was extracted with snapshot=False (ignored:
+                it lacks sample lists and must not replace the last snapshot)
+
+        Returns:
+            Always False - flushing is driven by the writer thread
+        """
+        if not snapshot:
+            return False
+        with self._lock:
+            self._pending[domain_name] = data
+            self.updates_received += 1
+        return False
+
+    def add_lap_rollup(self, rollup: Dict[str, Any]) -> None:
+        """Queue a finished lap's rollup; the writer thread stores it right away"""
+        if self.lap_store is None:
+            return
+        with self._lock:
+            self._pending_laps.append(rollup)
+        self._wake.set()
+
+    def add_packet(self, raw: bytes) -> None:
+        """Queue a decrypted packet (immutable bytes) for packets.bin; never blocks on disk"""
+        if self.packet_log is None:
+            return
+        with self._lock:
+            if len(self._pending_packets) < self.PACKET_BACKLOG:
+                self._pending_packets.append(raw)
+            else:
+                self.packets_log_dropped += 1
+
+    def flush(self) -> None:
+        """Ask the writer thread to write pending domains now"""
+        self._wake.set()
+
+    def force_write(self) -> None:
+        """Write pending domains synchronously (e.g. on session end)"""
+        self._write_pending()
+
+    def close(self) -> None:
+        """Stop the writer thread after a final write"""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._write_pending()
+        if self.journal is not None:
+            self.journal.close()
+        if self.packet_log is not None:
+            self.packet_log.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            started = time.monotonic()
+            self._write_pending()
+            elapsed = time.monotonic() - started
+            self.interval = min(self.max_interval, max(self.min_interval, elapsed * self.BUSY_FACTOR))
+            self._next_pickup = time.monotonic() + self.interval
+
+    def _write_pending(self) -> None:
+        # Serialize writers (thread vs force_write) so sequence numbers stay ordered
+        with self._write_lock:
+            self._write_pending_locked()
+
+    def _write_pending_locked(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            pending_laps, self._pending_laps = self._pending_laps, []
+            pending_packets, self._pending_packets = self._pending_packets, []
+
+        if pending_packets:
+            try:
+                self.packet_log.write(b''.join(packet[:PACKET_SIZE] for packet in pending_packets))
+                self.packets_logged += len(pending_packets)
+            except Exception as e:
+                self.write_errors += 1
+                self.last_error = e
+
+        for rollup in pending_laps:
+            try:
+                self.lap_store.write(rollup)
+            except Exception as e:
+                self.write_errors += 1
+                self.last_error = e
+
+        changed = False
+        for domain_name, data in pending.items():
+            filename = f'{domain_name}.json'
+            try:
+                text = json.dumps(data, separators=(',', ':'))
+                if self._last_written.get(filename) == text:
+                    self.files_skipped_unchanged += 1
+                    continue
+                if self.write_domain_files:
+                    self.writer.write_text_atomic(text, filename)
+                    self.files_written += 1
+                self._last_written[filename] = text
+                changed = True
+            except Exception as e:
+                # Keep the writer alive; the next snapshot retries this domain
+                self.write_errors += 1
+                self.last_error = e
+
+        if changed and self.write_snapshot:
+            try:
+                self.snapshot_sequence += 1
+                self.writer.write_snapshot(
+                    {filename[:-len('.json')]: text for filename, text in self._last_written.items()},
+                    self.snapshot_sequence)
+            except Exception as e:
+                self.write_errors += 1
+                self.last_error = e
+
+        if changed and self.journal is not None:
+            if 'metadata' in pending:
+                self._journal_lap = pending['metadata'].get('session_summary', {}).get('current_lap', self._journal_lap)
+            try:
+                self.journal.append_texts(
+                    {filename[:-len('.json')]: text for filename, text in self._last_written.items()},
+                    self._journal_lap)
+                self.journal.flush()
+            except Exception as e:
+                self.write_errors += 1
+                self.last_error = e
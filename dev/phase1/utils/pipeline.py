@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Extractor Pipeline with Per-Extractor Timing
+Phase 1: Domain JSON Architecture
+
+Runs the six domain extractors for each packet and records how long each
+one takes, so it is obvious which extractor eats the 16.7 ms packet budget.
+
+- LatencyHistogram: log-bucketed nanosecond histogram, O(1) record,
+  p50/p99 within ~12% (bucket width), exact max
+- ExtractorPipeline: times every extract() call, publishes a summary in the
+  metadata domain, and when the total keeps exceeding the budget it disables
+  optional metrics (e.g. suspension damper/frequency estimators) until there
+  is headroom again. Core domain values are never skipped.
+- Lap boundaries: when the packet's lap changes, every extractor's per-lap
+  accumulators are rolled up (build_lap_rollup) before the new lap starts.
+"""
+
+import time
+from datetime import datetime as dt
+from typing import Dict, Any, List, Optional
+
+from .domain_extractors import (
+    DecodedPacket,
+    MetadataExtractor,
+    SuspensionExtractor,
+    TireExtractor,
+    AeroExtractor,
+    DrivetrainExtractor,
+    BalanceExtractor
+)
+
+
+def build_lap_rollup(extractors: Dict[str, Any], lap: int,
+                     next_packet: Optional[DecodedPacket] = None) -> Dict[str, Any]:
+    """
+    Snapshot and reset every extractor's per-lap accumulators
+
+    Args:
+        extractors: Domain name -> extractor (all six)
+        lap: Lap the accumulated packets belong to
+        next_packet: First packet of the following lap (carries the lap time);
+            None when the session ends mid-lap
+
+    Returns:
+        Lap rollup: lap number, completion, lap time and one block per domain
+    """
+    complete = next_packet is not None and next_packet.current_lap == lap + 1
+    rollup = {
+        'lap': lap,
+        'complete': complete,
+        'lap_time_ms': next_packet.last_lap_ms if complete else None
+    }
+    for name, extractor in extractors.items():
+        rollup[name] = extractor.lap_rollup()
+    return rollup
+
+
+class LatencyHistogram:
+    """
+    Nanosecond latency histogram with 8 sub-buckets per power of two
+
+    Recording is a bit_length() and a list increment; percentiles walk the
+    (small, fixed) bucket list only when a summary is requested.
+    """
+
+    SUB_BUCKET_BITS = 3
+    MAX_BITS = 40  # ~18 minutes in ns - anything longer lands in the last bucket
+
+    def __init__(self):
+        self.counts = [0] * ((self.MAX_BITS + 1) << self.SUB_BUCKET_BITS)
+        self.total = 0
+        self.max_ns = 0
+        self.sum_ns = 0
+
+    def record(self, ns: int):
+        bits = ns.bit_length()
+        if bits <= self.SUB_BUCKET_BITS:
+            index = ns
+        else:
+            bits = min(bits, self.MAX_BITS)
+            shift = bits - self.SUB_BUCKET_BITS - 1
+            index = (bits << self.SUB_BUCKET_BITS) | ((ns >> shift) & ((1 << self.SUB_BUCKET_BITS) - 1))
+        self.counts[index] += 1
+        self.total += 1
+        self.sum_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @classmethod
+    def _bucket_upper_ns(cls, index: int) -> int:
+        """Upper bound of a bucket (what percentiles report)"""
+        bits, sub = index >> cls.SUB_BUCKET_BITS, index & ((1 << cls.SUB_BUCKET_BITS) - 1)
+        if bits == 0:
+            return index
+        shift = bits - cls.SUB_BUCKET_BITS - 1
+        return ((1 << cls.SUB_BUCKET_BITS) | sub) + 1 << shift if shift >= 0 else index
+
+    def percentile(self, pct: float) -> int:
+        """Latency (ns) at or below which pct% of calls completed"""
+        if not self.total:
+            return 0
+        target = pct / 100.0 * self.total
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return min(self._bucket_upper_ns(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, Any]:
+        """Microsecond summary for JSON / display"""
+        return {
+            'calls': self.total,
+            'avg_us': round(self.sum_ns / self.total / 1000, 1) if self.total else 0.0,
+            'p50_us': round(self.percentile(50) / 1000, 1),
+            'p99_us': round(self.percentile(99) / 1000, 1),
+            'max_us': round(self.max_ns / 1000, 1)
+        }
+
+    def reset(self):
+        self.__init__()
+
+
+class ExtractorPipeline:
+    """Run all six domain extractors per packet with timing and budget enforcement"""
+
+    DOMAINS = ('metadata', 'suspension', 'tires', 'aero', 'drivetrain', 'balance')
+    DEGRADE_AFTER = 10      # consecutive over-budget packets before optional metrics are skipped
+    RESTORE_AFTER = 600     # consecutive packets under half the budget (~10 s) before restoring them
+
+    def __init__(self, car_database: Dict[int, str], downforce_database: Dict[int, int],
+                 budget_ms: float = 8.0, auto_degrade: bool = True):
+        """
+        Create the extractors
+
+        Args:
+            car_database: Car code -> name
+            downforce_database: Car code -> downforce estimate (lbs)
+            budget_ms: Extraction budget per packet (default: 8.0 ms, half the 60 Hz interval)
+            auto_degrade: Skip optional metrics while over budget (default: True)
+        """
+        self.extractors = {
+            'metadata': MetadataExtractor(car_database),
+            'suspension': SuspensionExtractor(),
+            'tires': TireExtractor(),
+            'aero': AeroExtractor(downforce_database),
+            'drivetrain': DrivetrainExtractor(),
+            'balance': BalanceExtractor()
+        }
+        self.budget_ns = int(budget_ms * 1e6)
+        self.auto_degrade = auto_degrade
+
+        self.latency = {name: LatencyHistogram() for name in self.DOMAINS}
+        self.total_latency = LatencyHistogram()
+        self.over_budget_packets = 0
+        self.degraded = False
+        self.degrade_count = 0
+        self.last_warning: Optional[str] = None
+        self._over_streak = 0
+        self._under_streak = 0
+
+        self.current_lap: Optional[int] = None
+        self.completed_lap: Optional[Dict[str, Any]] = None  # rollup produced by the latest process() call
+        self._last_packet: Optional[DecodedPacket] = None
+        self._last_metadata: Optional[Dict[str, Any]] = None
+
+    def process(self, packet: DecodedPacket, timestamp: dt, snapshot: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Extract all domains from one packet
+
+        Args:
+            packet: Decoded packet shared by all extractors
+            timestamp: Receive time (for metadata)
+            snapshot: Build sample lists / timing summary (only when a write is due)
+
+        Returns:
+            Domain name -> domain data (a lap change also leaves the finished
+            lap's rollup in self.completed_lap)
+        """
+        self.completed_lap = None
+        if packet.current_lap != self.current_lap:
+            if self.current_lap is not None:
+                self.completed_lap = build_lap_rollup(self.extractors, self.current_lap, packet)
+            self.current_lap = packet.current_lap
+
+        clock = time.perf_counter_ns
+        ex = self.extractors
+        latency = self.latency
+
+        t0 = clock()
+        metadata = ex['metadata'].extract(packet, timestamp)
+        t1 = clock()
+        suspension = ex['suspension'].extract(packet, snapshot)
+        t2 = clock()
+        tires = ex['tires'].extract(packet, snapshot)
+        t3 = clock()
+        aero = ex['aero'].extract(packet, packet.car_code, snapshot)
+        t4 = clock()
+        drivetrain = ex['drivetrain'].extract(packet, snapshot)
+        t5 = clock()
+        balance = ex['balance'].extract(packet, snapshot)
+        t6 = clock()
+
+        latency['metadata'].record(t1 - t0)
+        latency['suspension'].record(t2 - t1)
+        latency['tires'].record(t3 - t2)
+        latency['aero'].record(t4 - t3)
+        latency['drivetrain'].record(t5 - t4)
+        latency['balance'].record(t6 - t5)
+        self._check_budget(t6 - t0)
+
+        self._last_packet = packet
+        self._last_metadata = metadata
+        if snapshot:
+            metadata['pipeline'] = self.timing_summary()
+
+        return {
+            'metadata': metadata,
+            'suspension': suspension,
+            'tires': tires,
+            'aero': aero,
+            'drivetrain': drivetrain,
+            'balance': balance
+        }
+
+    def lap_changes(self, packet: DecodedPacket) -> bool:
+        """True if process(packet) will close the current lap (the writer is woken for its rollup)"""
+        return self.current_lap is not None and packet.current_lap != self.current_lap
+
+    def snapshot_domains(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Full domain output (sample lists, timing summary) from the accumulated
+        state and the last processed packet - nothing is accumulated again.
+        Used before the final write, when the last packet was not a snapshot.
+        """
+        if self._last_packet is None:
+            return {}
+        p = self._last_packet
+        ex = self.extractors
+        return {
+            'metadata': dict(self._last_metadata, pipeline=self.timing_summary()),
+            'suspension': ex['suspension']._build(p, True),
+            'tires': ex['tires']._build(p, True),
+            'aero': ex['aero']._build(p.car_code, True),
+            'drivetrain': ex['drivetrain']._build(p, True),
+            'balance': ex['balance']._build(p, True)
+        }
+
+    def finish_lap(self) -> Optional[Dict[str, Any]]:
+        """Roll up the lap in progress (session end); None if nothing was processed"""
+        if self.current_lap is None:
+            return None
+        rollup = build_lap_rollup(self.extractors, self.current_lap)
+        self.current_lap = None
+        return rollup
+
+    def _check_budget(self, total_ns: int):
+        self.total_latency.record(total_ns)
+        if total_ns > self.budget_ns:
+            self.over_budget_packets += 1
+            self._over_streak += 1
+            self._under_streak = 0
+            if self._over_streak == self.DEGRADE_AFTER:
+                self.last_warning = (f"extraction over {self.budget_ns / 1e6:.1f} ms budget for "
+                                     f"{self.DEGRADE_AFTER} packets (slowest: {self.slowest()})")
+                if self.auto_degrade and not self.degraded:
+                    self._set_optional_metrics(False)
+        else:
+            self._over_streak = 0
+            if total_ns * 2 <= self.budget_ns:
+                self._under_streak += 1
+                if self.degraded and self._under_streak >= self.RESTORE_AFTER:
+                    self._set_optional_metrics(True)
+            else:
+                self._under_streak = 0
+
+    def _set_optional_metrics(self, enabled: bool):
+        for extractor in self.extractors.values():
+            if hasattr(extractor, 'optional_metrics'):
+                extractor.optional_metrics = enabled
+        self.degraded = not enabled
+        if not enabled:
+            self.degrade_count += 1
+
+    def slowest(self) -> str:
+        """Domain with the highest p99 latency"""
+        return max(self.DOMAINS, key=lambda name: self.latency[name].percentile(99))
+
+    def degraded_metrics(self) -> List[str]:
+        """Extractors currently running without their optional metrics"""
+        return [name for name, extractor in self.extractors.items()
+                if getattr(extractor, 'optional_metrics', True) is False]
+
+    def timing_summary(self) -> Dict[str, Any]:
+        """Per-extractor and total latency, budget state (published in metadata.json)"""
+        return {
+            'budget_ms': self.budget_ns / 1e6,
+            'extractors': {name: self.latency[name].summary() for name in self.DOMAINS},
+            'total': self.total_latency.summary(),
+            'over_budget_packets': self.over_budget_packets,
+            'degraded': self.degraded,
+            'degraded_metrics': self.degraded_metrics(),
+            'degrade_count': self.degrade_count,
+            'last_warning': self.last_warning
+        }
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+ClaudeTunes Batch - Generate setups for many car/telemetry/track combinations
+
+Loads the protocol once, fans the combinations out over a process pool and
+writes every setup sheet plus a machine-readable batch_summary.json.
+
+Usage:
+    python3 claudetunes_batch.py --cars 'cars/*.txt' --telemetry 'telemetry/*.json' -t all -o batch_out
+    python3 claudetunes_batch.py --manifest manifest.json -o batch_out -j 4
+
+Manifest (JSON, paths relative to the manifest file):
+    {"jobs": [
+        {"car": "cars/f430.txt", "telemetry": "tsukuba.json", "track_type": "technical"},
+        {"car": "cars/gtr.txt", "telemetry": "monza.json", "track_type": "all",
+         "output": "gtr/monza_setup.txt"}
+    ]}
+    track_type may be a name, a list of names or "all" (default: balanced).
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from claudetunes_cli import ClaudeTunesCLI
+from claudetunes_engine import SetupSession, TELEMETRY_PATHS, parse_car_data
+from json_paths import extract_paths
+from protocol_model import load_protocol_model, ProtocolError
+
+
+SUMMARY_FILENAME = 'batch_summary.json'
+DEFAULT_PROTOCOL = str(Path(__file__).resolve().parent.parent / 'config' / 'ClaudeTunes_v8.5.3c.yaml')
+
+
+def expand_track_types(value):
+    """'all' / name / list of names -> tuple of track types"""
+    names = [value] if isinstance(value, str) else list(value or ['balanced'])
+    if 'all' in names:
+        return ClaudeTunesCLI.TRACK_TYPES
+    for name in names:
+        if name not in ClaudeTunesCLI.TRACK_TYPES:
+            raise ValueError(f"Unknown track type '{name}' (expected one of {', '.join(ClaudeTunesCLI.TRACK_TYPES)}, all)")
+    return tuple(dict.fromkeys(names))
+
+
+def default_output(output_dir, car, telemetry, track_type):
+    """<output>/<car file>/<telemetry file>_<track type>_setup.txt"""
+    return str(Path(output_dir) / Path(car).stem / f"{Path(telemetry).stem}_{track_type}_setup.txt")
+
+
+def expand_patterns(patterns):
+    """Sorted paths matching the glob patterns; literal paths are kept even when missing"""
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern)
+        if matches:
+            paths.update(matches)
+        elif not glob.has_magic(pattern):
+            paths.add(pattern)  # named explicitly: its jobs fail instead of vanishing
+    return sorted(paths)
+
+
+def jobs_from_globs(car_patterns, telemetry_patterns, track_types, output_dir):
+    """Every car x telemetry x track type combination (jobs for missing literal paths fail)"""
+    cars = expand_patterns(car_patterns)
+    telemetry_files = expand_patterns(telemetry_patterns)
+    if not cars:
+        raise ValueError(f"No car data files match {' '.join(car_patterns)}")
+    if not telemetry_files:
+        raise ValueError(f"No telemetry files match {' '.join(telemetry_patterns)}")
+
+    jobs = []
+    for car in cars:
+        for telemetry in telemetry_files:
+            for track_type in track_types:
+                job = {'car': car, 'telemetry': telemetry, 'track_type': track_type,
+                       'output': default_output(output_dir, car, telemetry, track_type)}
+                missing = [f"{kind} file '{path}' not found"
+                           for kind, path in (('Car data', car), ('Telemetry', telemetry)) if not os.path.exists(path)]
+                if missing:
+                    job['error'] = '; '.join(missing)
+                jobs.append(job)
+    return jobs
+
+
+def jobs_from_manifest(manifest_path, output_dir):
+    """Expand a JSON manifest (list of jobs or {"jobs": [...]})"""
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    entries = manifest.get('jobs', []) if isinstance(manifest, dict) else manifest
+    base = manifest_path.parent
+
+    jobs = []
+    for number, entry in enumerate(entries, 1):
+        if 'car' not in entry or 'telemetry' not in entry:
+            raise ValueError(f"Manifest job {number} needs 'car' and 'telemetry'")
+        car = str(base / entry['car'])
+        telemetry = str(base / entry['telemetry'])
+        track_types = expand_track_types(entry.get('track_type'))
+        for track_type in track_types:
+            if entry.get('output') and len(track_types) == 1:
+                output = str(Path(output_dir) / entry['output'])
+            elif entry.get('output'):
+                # One sheet per track type: suffix the requested name
+                requested = Path(output_dir) / entry['output']
+                output = str(requested.with_name(f"{requested.stem}_{track_type}{requested.suffix}"))
+            else:
+                output = default_output(output_dir, car, telemetry, track_type)
+            jobs.append({'car': car, 'telemetry': telemetry, 'track_type': track_type, 'output': output,
+                         'conservative_ride_height': bool(entry.get('conservative_ride_height', False))})
+    return jobs
+
+
+# Per worker process: protocol model (set once by init_worker), parsed input files and
+# one memoized session per car/telemetry pair, so other track types only re-run Phase D
+_worker_model = None
+_input_cache = {}
+_sessions = {}
+MAX_SESSIONS = 16
+
+
+def init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def load_inputs(car_path, telemetry_path):
+    """
+    Parsed car data and telemetry, each file read once per worker
+
+    Returns:
+        (car_data, telemetry, warnings) - telemetry is {} if it could not be loaded
+    """
+    if car_path not in _input_cache:
+        with open(car_path, 'r') as f:
+            _input_cache[car_path] = parse_car_data(f.read())
+
+    warnings = []
+    telemetry = _input_cache.get(telemetry_path)
+    if telemetry is None:
+        try:
+            telemetry = _input_cache[telemetry_path] = extract_paths(telemetry_path, TELEMETRY_PATHS)
+        except FileNotFoundError:
+            telemetry = {}
+            warnings.append(f"Telemetry file '{telemetry_path}' not found, using defaults")
+        except json.JSONDecodeError as e:
+            telemetry = {}
+            warnings.append(f"Error parsing telemetry JSON: {e}")
+    return _input_cache[car_path], telemetry, warnings
+
+
+def run_job(job):
+    """
+    Generate and save one setup sheet (runs inside a worker process)
+
+    A job carrying an 'error' (set while expanding it) fails without running.
+
+    Returns:
+        Summary record: inputs, output path, status, frequencies, setup
+        parameters, reasons and warnings
+    """
+    started = time.perf_counter()
+    record = {'car': job['car'], 'telemetry': job['telemetry'],
+              'track_type': job['track_type'], 'output': job['output']}
+    warnings = []
+    try:
+        if job.get('error'):
+            raise FileNotFoundError(job['error'])
+        car_data, telemetry, warnings = load_inputs(job['car'], job['telemetry'])
+        session_key = (job['car'], job['telemetry'])
+        session = _sessions.get(session_key)
+        if session is None or session.telemetry is not telemetry:
+            session = _sessions[session_key] = SetupSession(_worker_model, car_data, telemetry)
+            while len(_sessions) > MAX_SESSIONS:
+                _sessions.pop(next(iter(_sessions)))
+        result = session.evaluate(job['track_type'], job.get('conservative_ride_height', False))
+        setup_sheet = ClaudeTunesCLI.render_setup_sheet(car_data, result.setup)
+
+        Path(job['output']).parent.mkdir(parents=True, exist_ok=True)
+        with open(job['output'], 'w') as f:
+            f.write(setup_sheet)
+
+        record['status'] = 'ok'
+        record['car_name'] = result.car_name
+        record['balance'] = result.analysis['balance']
+        record['frequencies'] = result.frequencies
+        record['setup'] = result.setup
+        record['reasons'] = result.reasons
+        warnings = warnings + result.warnings
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f"{type(e).__name__}: {e}"
+
+    record['warnings'] = warnings
+    record['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return record
+
+
+def run_batch(jobs, model, output_dir, workers=None):
+    """
+    Run all jobs and write batch_summary.json
+
+    Args:
+        jobs: Job dicts (car, telemetry, track_type, output)
+        model: Loaded ProtocolModel (sent to each worker once)
+        output_dir: Where the summary is written
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        Summary dict (also written to <output_dir>/batch_summary.json)
+    """
+    outputs = [job['output'] for job in jobs]
+    if len(set(outputs)) != len(outputs):
+        duplicate = next(path for path in outputs if outputs.count(path) > 1)
+        raise ValueError(f"Two jobs would write {duplicate} - give them distinct outputs")
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    started = time.perf_counter()
+    if workers == 1:
+        init_worker(model)
+        records = [run_job(job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(model,)) as pool:
+            records = list(pool.map(run_job, jobs, chunksize=chunksize))
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(1 for record in records if record['status'] == 'ok')
+    summary = {
+        'protocol': {'version': model.version, 'sha256': model.source_sha256},
+        'workers': workers,
+        'total': len(records),
+        'succeeded': succeeded,
+        'failed': len(records) - succeeded,
+        'elapsed_s': round(elapsed, 3),
+        'setups_per_second': round(len(records) / elapsed, 1) if elapsed > 0 else None,
+        'jobs': records
+    }
+
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    with open(Path(output_dir) / SUMMARY_FILENAME, 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ClaudeTunes - batch setup generation')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--manifest', help='JSON manifest of jobs')
+    source.add_argument('--cars', nargs='+', help='Car data files or glob patterns')
+    parser.add_argument('--telemetry', nargs='+', help='Telemetry JSON files or glob patterns (with --cars)')
+    parser.add_argument('-t', '--track-type', action='append',
+                        choices=ClaudeTunesCLI.TRACK_TYPES + ('all',),
+                        help='Track type (repeatable, or "all"; default: balanced, with --cars)')
+    parser.add_argument('-o', '--output', default='batch_output', help='Output folder (default: batch_output)')
+    parser.add_argument('-p', '--protocol', default=DEFAULT_PROTOCOL, help='Path to ClaudeTunes protocol YAML file')
+    parser.add_argument('-j', '--jobs', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    if args.cars and not args.telemetry:
+        parser.error('--cars needs --telemetry')
+
+    try:
+        model = load_protocol_model(args.protocol)
+        if args.manifest:
+            jobs = jobs_from_manifest(args.manifest, args.output)
+        else:
+            jobs = jobs_from_globs(args.cars, args.telemetry, expand_track_types(args.track_type), args.output)
+        summary = run_batch(jobs, model, args.output, args.jobs)
+    except (FileNotFoundError, ProtocolError, ValueError) as e:
+        print(f"❌ {e}")
+        return False
+
+    print(f"✅ {summary['succeeded']}/{summary['total']} setups in {summary['elapsed_s']:.2f}s "
+          f"({summary['setups_per_second']} setups/s, {summary['workers']} workers)")
+    for record in summary['jobs']:
+        if record['status'] != 'ok':
+            print(f"   ❌ {record['car']} + {record['telemetry']} ({record['track_type']}): {record['error']}")
+    print(f"   Summary: {Path(args.output) / SUMMARY_FILENAME}")
+    return summary['failed'] == 0
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
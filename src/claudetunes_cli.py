@@ -9,206 +9,179 @@ following the ClaudeTunes protocol.
 
 import json
 import argparse
+import difflib
 import sys
-import math
+import time
 from datetime import datetime
 from pathlib import Path
-import yaml
+
+from claudetunes_engine import (
+    generate_setup, parse_car_data, telemetry_data_points, telemetry_from_analysis, telemetry_from_domains,
+    SetupSession, ANALYSIS_PATHS, DOMAIN_NAMES, TELEMETRY_PATHS, TRACK_TYPES
+)
+from json_paths import extract_paths
+from protocol_model import load_protocol_model, ProtocolError
+from session_watcher import FolderWatcher
 
 
 class ClaudeTunesCLI:
     """Main ClaudeTunes CLI application"""
 
-    # Reference Tables loaded from YAML in __init__ (see _load_downforce_database, _load_differential_baselines)
-
-    PERFORMANCE_EXPECTATIONS = {
-        'frequency_corrections': '0.3-2.0s',
-        'drivetrain_architecture_fixes': '2.0-5.0s when bias wrong',
-        'ride_height_optimization': '0.3-0.8s through CG/geometry',
-        'cg_improvement': '5-8% per 25mm reduction',
-        'corner_type_differential': '0.2-0.5s track-specific'
-    }
+    TRACK_TYPES = TRACK_TYPES
+    ALL_TRACK_TYPES = ('balanced', 'high_speed', 'technical')  # --track-type all, in comparison order
+    ANALYSIS_FILENAME = 'telemetry_analysis_v3.json'  # gt7_2r.py output in a session folder
 
-    def __init__(self, protocol_path="ClaudeTunes v8.5.3c.yaml", track_type="balanced", conservative_ride_height=False):
-        """Initialize with ClaudeTunes protocol"""
-        self.protocol = self._load_protocol(protocol_path)
+    def __init__(self, protocol_path="ClaudeTunes v8.5.3c.yaml", track_type="balanced", conservative_ride_height=False,
+                 model=None):
+        """Initialize with ClaudeTunes protocol (or an already loaded ProtocolModel)"""
+        self.model = model or self._load_protocol(protocol_path)
+        self.protocol = self.model.raw
         self.car_data = {}
         self.telemetry = {}
         self.results = {}
+        self.result = None  # SetupResult from the engine (claudetunes_engine.py)
         self.track_type = track_type  # 'high_speed', 'technical', or 'balanced'
         self.conservative_ride_height = conservative_ride_height  # Add 10mm buffer from minimum
 
-        # Load reference tables from YAML (Phase 0 refactor)
-        self.gt7_downforce_database = self._load_downforce_database()
-        self.differential_baselines = self._load_differential_baselines()
-
     def _load_protocol(self, path):
-        """Load ClaudeTunes YAML protocol"""
+        """Load the compiled ClaudeTunes protocol (cached on disk, keyed by YAML hash)"""
         try:
-            with open(path, 'r') as f:
-                return yaml.safe_load(f)
+            return load_protocol_model(path)
         except FileNotFoundError:
             print(f"Error: Protocol file '{path}' not found")
             sys.exit(1)
-        except yaml.YAMLError as e:
-            print(f"Error parsing protocol YAML: {e}")
+        except ProtocolError as e:
+            print(e)
             sys.exit(1)
 
-    def _parse_range_string(self, range_str):
-        """Parse YAML range string to tuple (e.g., "3000-4000" → (3000, 4000))"""
-        parts = range_str.split('-')
-        if len(parts) == 2:
-            try:
-                return (int(parts[0]), int(parts[1]))
-            except ValueError:
-                pass
-        return (0, 0)
-
-    def _parse_freq_add_string(self, freq_str):
-        """Parse YAML frequency add string to tuple (e.g., "+0.4-0.5 Hz" → (0.4, 0.5))"""
-        # Remove " Hz" suffix and "+" prefix
-        freq_str = freq_str.replace(' Hz', '').replace('+', '').strip()
-
-        # Check if it's a range
-        if '-' in freq_str:
-            parts = freq_str.split('-')
-            if len(parts) == 2:
-                try:
-                    return (float(parts[0]), float(parts[1]))
-                except ValueError:
-                    pass
-        else:
-            # Single value
-            try:
-                val = float(freq_str)
-                return (val, val)
-            except ValueError:
-                pass
-
-        return (0.0, 0.0)
-
-    def _load_downforce_database(self):
-        """Load GT7 downforce database from YAML protocol (YAML-driven)"""
-        # YAML: reference_tables.gt7_downforce_database.classes (lines 397-441)
-        yaml_db = self.protocol['reference_tables']['gt7_downforce_database']['classes']
-
-        downforce_db = {}
-
-        for car_class, data in yaml_db.items():
-            # Parse df_lbs: "3000-4000" → (3000, 4000)
-            df_range = self._parse_range_string(data['df_lbs'])
-
-            # Parse freq_add: "+0.4-0.5 Hz" → (0.4, 0.5)
-            freq_add = self._parse_freq_add_string(data['freq_add'])
-
-            # Get gt7_impact (already a string)
-            gt7_impact = data['gt7_impact']
-
-            downforce_db[car_class] = {
-                'df_range': df_range,
-                'freq_add': freq_add,
-                'gt7_impact': gt7_impact
-            }
-
-        return downforce_db
-
-    def _load_differential_baselines(self):
-        """Load differential baselines from YAML protocol (YAML-driven)"""
-        # YAML: reference_tables.differential_baselines (lines 443-462)
-        yaml_diff = self.protocol['reference_tables']['differential_baselines']
+    def run(self, car_data_path, telemetry_path, output_path=None, session_folder=None):
+        """Main execution workflow: A -> B -> C -> D"""
+        if self.track_type == 'all':
+            return self.run_all_track_types(car_data_path, telemetry_path, output_path, session_folder)
 
-        diff_baselines = {}
+        self._print_banner()
 
-        # Map YAML drivetrain names to Python names
-        drivetrain_map = {
-            'FWD': 'FF',
-            'RWD': 'FR',  # Use FR for generic RWD
-            'RR_AWD': 'RR_AWD',
-            'RR_PURE': 'RR'
-        }
+        # Phase A: File Intake
+        print("\n[Phase A] Loading and analyzing data...")
+        self.phase_a_intake(car_data_path, telemetry_path)
 
-        for yaml_name, python_name in drivetrain_map.items():
-            if yaml_name in yaml_diff:
-                data = yaml_diff[yaml_name]
+        # Phases A-D are computed quietly by the engine; replay its narrative per phase
+        self.result = generate_setup(self.car_data, self.telemetry, self.model, self.track_type,
+                                     self.conservative_ride_height)
+        self.results = self.result.results
+        self._print_phase_log('A')
 
-                # Check if this entry has baseline values (AWD might not)
-                if 'initial' in data and 'accel' in data and 'brake' in data:
-                    # Parse ranges: "10-15" → (10, 15)
-                    initial = self._parse_range_string(data['initial'])
-                    accel = self._parse_range_string(data['accel'])
-                    brake = self._parse_range_string(data['brake'])
+        # Phase B: Physics Chain
+        print("\n[Phase B] Calculating optimal frequencies...")
+        self._print_phase_log('B')
 
-                    diff_baselines[python_name] = {
-                        'initial': initial,
-                        'accel': accel,
-                        'brake': brake
-                    }
+        # Phase C: Constraint Evaluation
+        print("\n[Phase C] Evaluating constraints and compensation...")
+        self._print_phase_log('C')
 
-        # Add MR (same as RWD/FR)
-        if 'FR' in diff_baselines:
-            diff_baselines['MR'] = diff_baselines['FR'].copy()
+        # Phase D: Setup Sheet Output
+        print("\n[Phase D] Generating setup sheet...")
+        self._print_phase_log('D')
+        setup_sheet = self.phase_d_output()
 
-        # Add AWD (use RR_AWD as baseline - rear-biased AWD)
-        if 'RR_AWD' in diff_baselines:
-            diff_baselines['AWD'] = diff_baselines['RR_AWD'].copy()
+        self._save_sheet(setup_sheet, self._output_path(output_path, session_folder, self.track_type))
+        print("\n" + setup_sheet)
+        return setup_sheet
 
-        return diff_baselines
+    def run_all_track_types(self, car_data_path, telemetry_path, output_path=None, session_folder=None):
+        """
+        Phases A-C once, Phase D per track type, then a side-by-side comparison
 
-    def run(self, car_data_path, telemetry_path, output_path=None, session_folder=None):
-        """Main execution workflow: A -> B -> C -> D"""
-        print("═" * 60)
-        print(f"  CLAUDETUNES v{self.protocol['claudetunes']['version']}")
-        print("═" * 60)
+        Returns:
+            Track type -> setup sheet
+        """
+        self._print_banner()
 
-        # Phase A: File Intake
         print("\n[Phase A] Loading and analyzing data...")
         self.phase_a_intake(car_data_path, telemetry_path)
 
-        # Phase B: Physics Chain
+        # Only Phase D depends on the track type; the session reuses Phases A-C
+        session = SetupSession(self.model, self.car_data, self.telemetry)
+        track_results = {track_type: session.evaluate(track_type, self.conservative_ride_height)
+                         for track_type in self.ALL_TRACK_TYPES}
+        self.result = track_results['balanced']
+        self.results = self.result.results
+        self._print_phase_log('A')
+
         print("\n[Phase B] Calculating optimal frequencies...")
-        self.phase_b_physics_chain()
+        self._print_phase_log('B')
 
-        # Phase C: Constraint Evaluation
         print("\n[Phase C] Evaluating constraints and compensation...")
-        self.phase_c_constraints()
+        self._print_phase_log('C')
+
+        sheets = {}
+        for track_type, result in track_results.items():
+            print(f"\n[Phase D] Generating setup sheet ({track_type})...")
+            self._print_phase_log('D', result)
+            sheets[track_type] = self.render_setup_sheet(self.car_data, result.setup)
+            self._save_sheet(sheets[track_type], self._output_path(output_path, session_folder, track_type, True))
+
+        comparison = self.render_comparison_table(self.car_data, {t: r.setup for t, r in track_results.items()})
+        self._save_sheet(comparison, self._output_path(output_path, session_folder, 'comparison', True),
+                         label="Comparison table")
+
+        if not (output_path or session_folder):
+            for sheet in sheets.values():
+                print("\n" + sheet)
+        print("\n" + comparison)
+        return sheets
+
+    def _print_banner(self):
+        print("═" * 60)
+        print(f"  CLAUDETUNES v{self.protocol['claudetunes']['version']}")
+        print("═" * 60)
 
-        # Phase D: Setup Sheet Output
-        print("\n[Phase D] Generating setup sheet...")
-        setup_sheet = self.phase_d_output()
+    def _output_path(self, output_path, session_folder, track_type, per_track_type=False):
+        """
+        Where a sheet goes (None = display only)
 
-        # Determine output location
+        per_track_type: several sheets from one run, so -o names get a _<track type> suffix
+        """
         if output_path:
             # If user specified a path, check if it should go in a session folder
             if session_folder:
                 output_path = str(Path(session_folder) / Path(output_path).name)
-            final_output_path = output_path
+            if per_track_type:
+                path = Path(output_path)
+                output_path = str(path.with_name(f"{path.stem}_{track_type}{path.suffix}"))
+            return output_path
         elif session_folder:
             # Auto-generate filename in session folder
             car_name = self.car_data.get('name', 'Unknown').replace(' ', '_')
-            track_suffix = f"_{self.track_type}" if self.track_type != 'balanced' else ""
+            if track_type == 'comparison':
+                return str(Path(session_folder) / f"{car_name}_comparison.txt")
+            track_suffix = f"_{track_type}" if track_type != 'balanced' else ""
             filename = f"{car_name}{track_suffix}_setup.txt"
-            final_output_path = str(Path(session_folder) / filename)
-        else:
-            final_output_path = None
+            return str(Path(session_folder) / filename)
+        return None
 
-        # Save or display
-        if final_output_path:
-            # Ensure parent directory exists
-            Path(final_output_path).parent.mkdir(parents=True, exist_ok=True)
+    def _save_sheet(self, text, path, label="Setup sheet"):
+        if not path:
+            return
+        # Ensure parent directory exists
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
 
-            with open(final_output_path, 'w') as f:
-                f.write(setup_sheet)
-            print(f"\n✓ Setup sheet saved to: {final_output_path}")
+        with open(path, 'w') as f:
+            f.write(text)
+        print(f"\n✓ {label} saved to: {path}")
 
-        print("\n" + setup_sheet)
-        return setup_sheet
+    def _print_phase_log(self, phase, result=None):
+        """Print what the engine reported for one phase"""
+        for line_phase, line in (result or self.result).log:
+            if line_phase == phase:
+                print(line)
 
     # ═══════════════════════════════════════════════════════════
-    # PHASE A: TELEMETRY CORE
+    # PHASE A: FILE INTAKE
     # ═══════════════════════════════════════════════════════════
 
     def phase_a_intake(self, car_data_path, telemetry_path):
-        """Phase A: Parse car data and telemetry, analyze suspension/balance"""
+        """Phase A: Parse car data and telemetry"""
 
         # Load car data
         self.car_data = self._parse_car_data(car_data_path)
@@ -217,167 +190,19 @@ class ClaudeTunesCLI:
 
         # Load telemetry JSON
         self.telemetry = self._parse_telemetry(telemetry_path)
-
-        # Count data points from either format
-        data_point_count = 0
-        if 'suspension_travel' in self.telemetry:
-            # Format 1: Direct suspension_travel arrays
-            data_point_count = len(self.telemetry.get('suspension_travel', {}))
-        elif 'individual_laps' in self.telemetry:
-            # Format 2: gt7_2r.py analyzer format
-            laps = self.telemetry.get('individual_laps', [])
-            if laps and len(laps) > 0 and 'lap_summary' in laps[0]:
-                data_point_count = laps[0]['lap_summary'].get('total_data_points', len(laps))
-            else:
-                data_point_count = len(laps)
-
-        print(f"  ✓ Telemetry loaded: {data_point_count} data points")
-
-        # Analyze suspension travel patterns
-        self._analyze_suspension()
-
-        # Analyze balance from telemetry
-        self._analyze_balance()
-
-        # Analyze tire temperatures
-        self._analyze_tires()
-
-        # Cross-validate all Phase A analyses (YAML protocol requirement)
-        self._cross_validate_phase_a()
+        print(f"  ✓ Telemetry loaded: {telemetry_data_points(self.telemetry)} data points")
 
     def _parse_car_data(self, path):
         """Parse car data file into structured format"""
-        data = {}
         with open(path, 'r') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            if line == "CAR NAME":
-                data['name'] = lines[i + 1]
-                i += 2
-            elif line == "DRIVETRAIN":
-                data['drivetrain'] = lines[i + 1]
-                i += 2
-            elif line == "POWER OUTPUT AND WEIGHT":
-                parts = lines[i + 1].split()
-                data['hp'] = int(parts[0])
-                data['torque'] = int(parts[2])
-                data['weight'] = int(parts[4])
-                data['balance'] = lines[i + 1].split('balance')[0].split(',')[1].strip()
-                i += 2
-            elif line == "TIRE COMPOUND":
-                data['tire_compound'] = lines[i + 1]
-                i += 2
-            elif line == "CENTER OF GRAVITY HEIGHT":
-                cg_line = lines[i + 1] if i + 1 < len(lines) else "450"
-                # Parse CG height in mm (e.g., "450 mm" or just "450")
-                data['cg_height'] = float(cg_line.replace('mm', '').strip())
-                i += 2
-            elif line == "SUSPENSION SETUP Front/Rear":
-                # Parse ranges
-                data['ranges'] = {}
-                i += 1
-            elif line == "BODY HEIGHT ADJUSTMENT":
-                range_line = lines[i + 2] if i + 2 < len(lines) else ""
-                if "range:" in range_line:
-                    data['ranges']['ride_height'] = self._parse_range(range_line)
-                i += 3
-            elif line.startswith("NATURAL FREQUENCY"):
-                range_line = lines[i + 1] if i + 1 < len(lines) else ""
-                if "range:" in range_line:
-                    data['ranges']['frequency'] = self._parse_range(range_line)
-                i += 2
-            elif line == "ARB":
-                data['ranges']['arb'] = {'front': (1, 10), 'rear': (1, 10)}
-                i += 2
-            elif line == "DIFFERENTIAL GEAR SETTINGS":
-                data['ranges']['diff'] = {'min': 5, 'max': 60}
-                # Parse front and rear differential current values
-                # Format: "Front: 0/0/0 (range: 5 to 60 for all values)"
-                # Format: "Rear: 10/20/30 (range: 5 to 60 for all values)"
-                # Note: 0/0/0 means fully open diff (minimum locking), NOT "no diff"
-                # Only absence of "Front:" line means no front differential
-                if i + 1 < len(lines):
-                    front_line = lines[i + 1]
-                    if "Front:" in front_line:
-                        # Has a front differential (even if values are 0/0/0)
-                        data['has_front_diff'] = True
-                    else:
-                        data['has_front_diff'] = False
-                if i + 2 < len(lines):
-                    rear_line = lines[i + 2]
-                # Parse torque split
-                if i + 4 < len(lines) and "TORQUE SPLIT" in lines[i + 4]:
-                    data['torque_split'] = lines[i + 5] if i + 5 < len(lines) else "0:100"
-                    i += 6
-                else:
-                    data['torque_split'] = "0:100"
-                    i += 3
-            elif line == "AERODYNAMICS":
-                if i + 2 < len(lines):
-                    front_line = lines[i + 2]
-                    rear_line = lines[i + 3] if i + 3 < len(lines) else ""
-                    data['aero'] = {
-                        'front': self._parse_aero_line(front_line),
-                        'rear': self._parse_aero_line(rear_line)
-                    }
-                i += 4
-            else:
-                i += 1
-
-        return data
-
-    def _parse_range(self, line):
-        """Parse range string like 'range: front: 2.50-3.40 hz rear: 2.60-3.50 hz'"""
-        result = {}
-        parts = line.split('range:')[1].strip()
-
-        if 'front:' in parts and 'rear:' in parts:
-            front_part = parts.split('front:')[1].split('rear:')[0].strip()
-            rear_part = parts.split('rear:')[1].strip()
-
-            result['front'] = self._extract_range(front_part)
-            result['rear'] = self._extract_range(rear_part)
-
-        return result
-
-    def _extract_range(self, text):
-        """Extract (min, max) from text like '2.50-3.40 hz' or '85-140mm'"""
-        # Remove units and parentheses
-        text = text.replace('mm', '').replace('hz', '').replace('°', '').replace(')', '').replace('(', '').strip()
-        if '-' in text:
-            parts = text.split('-')
-            return (float(parts[0]), float(parts[1]))
-        return (0, 0)
-
-    def _parse_aero_line(self, line):
-        """Parse aero line like 'front) current-xxx (range: min-250 max 350)' or 'front) current 25 (range: min 0 max 100)'"""
-        if 'range:' in line:
-            range_part = line.split('range:')[1].strip()
-            # Handle both "min-250" and "min 250" formats
-            if 'min-' in range_part:
-                min_val = int(range_part.split('min-')[1].split()[0])
-            elif 'min ' in range_part:
-                min_val = int(range_part.split('min ')[1].split()[0])
-            else:
-                min_val = 0
-
-            if 'max' in range_part:
-                max_val = int(range_part.split('max')[1].strip().rstrip(')'))
-            else:
-                max_val = 0
-
-            return {'min': min_val, 'max': max_val, 'current': (min_val + max_val) / 2}
-        return {'min': 0, 'max': 0, 'current': 0}
-
-    def _parse_telemetry(self, path):
-        """Load telemetry JSON file"""
+            return parse_car_data(f.read())
+
+    def _parse_telemetry(self, path, paths=TELEMETRY_PATHS):
+        """Load the telemetry JSON file's phase inputs (or analyze a session folder of lap CSVs)"""
+        if Path(path).is_dir():
+            return self._analyze_session(path)
         try:
-            with open(path, 'r') as f:
-                return json.load(f)
+            return extract_paths(path, paths)
         except FileNotFoundError:
             print(f"Warning: Telemetry file '{path}' not found, using defaults")
             return {}
@@ -385,974 +210,30 @@ class ClaudeTunesCLI:
             print(f"Warning: Error parsing telemetry JSON: {e}")
             return {}
 
-    def _analyze_suspension(self):
-        """Analyze suspension travel patterns from telemetry"""
-        # Try to extract suspension data from multiple possible formats
-        avg_compression = None
-
-        # Format 1: Direct suspension_travel arrays (sample_telemetry.json format)
-        if 'suspension_travel' in self.telemetry and isinstance(self.telemetry['suspension_travel'], dict):
-            travel = self.telemetry['suspension_travel']
-            if 'FL' in travel and isinstance(travel['FL'], list):
-                avg_compression = {
-                    'FL': sum(travel.get('FL', [0])) / max(len(travel.get('FL', [1])), 1),
-                    'FR': sum(travel.get('FR', [0])) / max(len(travel.get('FR', [1])), 1),
-                    'RL': sum(travel.get('RL', [0])) / max(len(travel.get('RL', [1])), 1),
-                    'RR': sum(travel.get('RR', [0])) / max(len(travel.get('RR', [1])), 1)
-                }
-
-        # Format 2: gt7_2r.py format - individual_laps[0].suspension_behavior.suspension_travel
-        if avg_compression is None and 'individual_laps' in self.telemetry:
-            laps = self.telemetry['individual_laps']
-            if len(laps) > 0 and 'suspension_behavior' in laps[0]:
-                susp = laps[0]['suspension_behavior'].get('suspension_travel', {})
-                avg_compression = {
-                    'FL': susp.get('fl_avg', 0),
-                    'FR': susp.get('fr_avg', 0),
-                    'RL': susp.get('rl_avg', 0),
-                    'RR': susp.get('rr_avg', 0)
-                }
-
-        # Format 3: Summary format
-        if avg_compression is None and 'suspension_summary' in self.telemetry:
-            corners = self.telemetry['suspension_summary'].get('corner_compression_avg', {})
-            avg_compression = {
-                'FL': corners.get('fl', 0),
-                'FR': corners.get('fr', 0),
-                'RL': corners.get('rl', 0),
-                'RR': corners.get('rr', 0)
-            }
-
-        if avg_compression is None or all(v == 0 for v in avg_compression.values()):
-            print("  ! No suspension data in telemetry")
-            self.results['suspension_analysis'] = "No telemetry data"
-            return
-
-        # Calculate averages per axle and per side
-        front_avg = (avg_compression['FL'] + avg_compression['FR']) / 2
-        rear_avg = (avg_compression['RL'] + avg_compression['RR']) / 2
-        left_avg = (avg_compression['FL'] + avg_compression['RL']) / 2
-        right_avg = (avg_compression['FR'] + avg_compression['RR']) / 2
-
-        # Per-corner analysis
-        max_corner = max(avg_compression.items(), key=lambda x: x[1])
-        min_corner = min(avg_compression.items(), key=lambda x: x[1])
-
-        # Get max travel values if available
-        max_travel = {}
-        if 'individual_laps' in self.telemetry and len(self.telemetry['individual_laps']) > 0:
-            susp_travel = self.telemetry['individual_laps'][0].get('suspension_behavior', {}).get('suspension_travel', {})
-            max_travel = {
-                'FL': susp_travel.get('fl_max', 0),
-                'FR': susp_travel.get('fr_max', 0),
-                'RL': susp_travel.get('rl_max', 0),
-                'RR': susp_travel.get('rr_max', 0)
-            }
-
-        # Diagnose front vs rear
-        if front_avg > rear_avg + 0.01:
-            fr_interp = f"Front softer (+{(front_avg - rear_avg) * 1000:.0f}mm)"
-        elif rear_avg > front_avg + 0.01:
-            fr_interp = f"Rear softer (+{(rear_avg - front_avg) * 1000:.0f}mm)"
-        else:
-            fr_interp = "F/R balanced"
-
-        # Diagnose left vs right (lateral balance)
-        if left_avg > right_avg + 0.005:
-            lr_interp = f"Left softer (+{(left_avg - right_avg) * 1000:.0f}mm)"
-        elif right_avg > left_avg + 0.005:
-            lr_interp = f"Right softer (+{(right_avg - left_avg) * 1000:.0f}mm)"
-        else:
-            lr_interp = "L/R balanced"
-
-        # Check for bottoming vs suspension at travel limits
-        # We distinguish between two scenarios:
-        # 1. Chassis bottoming (body_height very low) = suspension too soft
-        # 2. Suspension maxed (high travel but body_height OK) = suspension too stiff
-
-        chassis_bottoming_corners = []
-        suspension_maxed_corners = []
-        min_body_height = None
-
-        # Get minimum body height from telemetry
-        if 'individual_laps' in self.telemetry and len(self.telemetry['individual_laps']) > 0:
-            min_body_height = self.telemetry['individual_laps'][0].get('suspension_behavior', {}).get('min_body_height', None)
-
-        # Threshold for chassis bottoming (15mm is dangerously low)
-        CHASSIS_BOTTOMING_THRESHOLD = 0.015  # 15mm
-
-        if max_travel:
-            for corner, max_val in max_travel.items():
-                if max_val > 0.28:  # Suspension travel exceeds threshold
-                    severity = "SEVERE" if max_val > 0.30 else ""
-                    corner_str = f"{corner}:{max_val*1000:.0f}mm {severity}".strip()
-
-                    # Check if this is chassis bottoming or suspension maxing out
-                    if min_body_height is not None and min_body_height < CHASSIS_BOTTOMING_THRESHOLD:
-                        # Chassis is hitting the ground - suspension too soft
-                        chassis_bottoming_corners.append(corner_str)
-                    else:
-                        # Suspension hitting travel limits but chassis has clearance - suspension too stiff
-                        suspension_maxed_corners.append(corner_str)
-
-        # Legacy support: combine both for backwards compatibility
-        bottoming_corners = chassis_bottoming_corners + suspension_maxed_corners
-
-        self.results['suspension_analysis'] = {
-            'front_compression': front_avg,
-            'rear_compression': rear_avg,
-            'left_compression': left_avg,
-            'right_compression': right_avg,
-            'per_corner': avg_compression,
-            'max_travel': max_travel,
-            'min_body_height': min_body_height,
-            'chassis_bottoming_corners': chassis_bottoming_corners,
-            'suspension_maxed_corners': suspension_maxed_corners,
-            'bottoming_corners': bottoming_corners,  # Legacy
-            'fr_interpretation': fr_interp,
-            'lr_interpretation': lr_interp,
-            'softest_corner': max_corner[0],
-            'stiffest_corner': min_corner[0]
-        }
-
-        print(f"  • Suspension travel:")
-        print(f"    F/R: {fr_interp}")
-        print(f"    L/R: {lr_interp}")
-
-        # Improved diagnostics output
-        if chassis_bottoming_corners:
-            print(f"    ⚠ Chassis bottoming: {', '.join(chassis_bottoming_corners)}")
-            if min_body_height is not None:
-                print(f"      Min body height: {min_body_height*1000:.0f}mm (too low!)")
-
-        if suspension_maxed_corners:
-            print(f"    ⚠ Suspension at travel limits: {', '.join(suspension_maxed_corners)}")
-            if min_body_height is not None:
-                print(f"      Min body height: {min_body_height*1000:.0f}mm (chassis clearance OK)")
-
-        print(f"    Softest: {max_corner[0]} ({max_corner[1]*1000:.0f}mm avg)")
-
-    def _analyze_balance(self):
-        """Analyze understeer/oversteer balance from telemetry"""
-        gradient = None
-
-        # Format 1: Direct balance.understeer_gradient (sample_telemetry.json format)
-        if 'balance' in self.telemetry:
-            balance_data = self.telemetry.get('balance', {})
-            gradient = balance_data.get('understeer_gradient', None)
-
-        # Format 2: gt7_2r.py format - tire_slip_analysis.balance_analysis.balance_metric
-        if gradient is None and 'tire_slip_analysis' in self.telemetry:
-            slip_balance = self.telemetry['tire_slip_analysis'].get('balance_analysis', {})
-            balance_metric = slip_balance.get('balance_metric', None)
-            tendency = slip_balance.get('tendency', '')
-
-            # Convert balance_metric to understeer gradient approximation
-            # Negative balance_metric means rear slip > front slip = oversteer
-            # Positive means understeer
-            if balance_metric is not None:
-                # Scale from [-0.1, 0.1] to understeer gradient [-2, 6]
-                gradient = -balance_metric * 40  # Rough conversion
-
-                print(f"  • Balance: {tendency} (metric: {balance_metric:.3f})")
-                self.results['balance'] = tendency
-                return
-
-        if gradient is None:
-            self.results['balance'] = "Neutral (no telemetry)"
-            print("  ! No balance data in telemetry")
-            return
+    def _analyze_session(self, session_folder):
+        """Run the gt7_2r.py analysis in-process (per-lap metrics cached) and keep what the phases read"""
+        import gt7_2r  # needs numpy; only session folder input uses it
 
-        if gradient < 0:
-            classification = "Oversteer"
-        elif gradient <= 2:
-            classification = "Neutral"
-        elif gradient <= 4:
-            classification = "Moderate Understeer"
-        else:
-            classification = "Severe Understeer"
-
-        self.results['balance'] = classification
-        print(f"  • Balance: {classification} (gradient: {gradient:.2f})")
-
-    def _analyze_tires(self):
-        """Analyze tire temperature patterns"""
-        temps = None
-        diagnosis = []
-
-        # Format 1: Direct tire_temps with I/M/O suffixes (sample_telemetry.json)
-        if 'tire_temps' in self.telemetry:
-            temps = self.telemetry['tire_temps']
-            if temps.get('FL_O', 0) > temps.get('FL_I', 0) + 5:
-                diagnosis.append("Hot front-outside → understeer")
-            if temps.get('RL_O', 0) > temps.get('RL_I', 0) + 5:
-                diagnosis.append("Hot rear-outside → oversteer")
-
-        # Format 2: gt7_2r.py format - individual_laps[0].tire_analysis.temperatures
-        elif 'individual_laps' in self.telemetry:
-            laps = self.telemetry['individual_laps']
-            if len(laps) > 0 and 'tire_analysis' in laps[0]:
-                tire_temps = laps[0]['tire_analysis'].get('temperatures', {})
-                fl_avg = tire_temps.get('fl_avg', 0)
-                fr_avg = tire_temps.get('fr_avg', 0)
-                rl_avg = tire_temps.get('rl_avg', 0)
-                rr_avg = tire_temps.get('rr_avg', 0)
-
-                front_avg = (fl_avg + fr_avg) / 2
-                rear_avg = (rl_avg + rr_avg) / 2
-
-                if rear_avg > front_avg + 3:
-                    diagnosis.append(f"Rear tires hotter ({rear_avg:.1f}°C vs {front_avg:.1f}°C)")
-                elif front_avg > rear_avg + 3:
-                    diagnosis.append(f"Front tires hotter ({front_avg:.1f}°C vs {rear_avg:.1f}°C)")
-                else:
-                    diagnosis.append(f"Balanced temps (F:{front_avg:.1f}°C R:{rear_avg:.1f}°C)")
-
-        # Format 3: tire_summary
-        elif 'tire_summary' in self.telemetry:
-            tire_temps = self.telemetry['tire_summary'].get('temperature_averages', {})
-            fl = tire_temps.get('fl', 0)
-            fr = tire_temps.get('fr', 0)
-            rl = tire_temps.get('rl', 0)
-            rr = tire_temps.get('rr', 0)
-
-            front_avg = (fl + fr) / 2
-            rear_avg = (rl + rr) / 2
-
-            if rear_avg > front_avg + 3:
-                diagnosis.append(f"Rear tires hotter ({rear_avg:.1f}°C vs {front_avg:.1f}°C)")
-            elif front_avg > rear_avg + 3:
-                diagnosis.append(f"Front tires hotter ({front_avg:.1f}°C vs {rear_avg:.1f}°C)")
-            else:
-                diagnosis.append(f"Balanced temps (F:{front_avg:.1f}°C R:{rear_avg:.1f}°C)")
-
-        if not diagnosis:
-            diagnosis = ["No tire data"]
-
-        self.results['tire_diagnosis'] = diagnosis
-        print(f"  • Tires: {', '.join(self.results['tire_diagnosis'])}")
-
-    def _cross_validate_phase_a(self):
-        """
-        Cross-validate suspension + balance + tire temps (YAML Protocol Phase A requirement)
-        Synthesizes all three analyses to provide comprehensive diagnosis and recommendations
-        """
-        if not self.telemetry:
-            return
-
-        # Skip if we don't have all three components
-        if ('suspension_analysis' not in self.results or
-            self.results['suspension_analysis'] == "No telemetry data"):
-            return
-
-        # Extract key data points
-        susp = self.results.get('suspension_analysis', {})
-        balance = self.results.get('balance', 'Unknown')
-        tire_diag = self.results.get('tire_diagnosis', [])
-
-        # Build cross-validation insights
-        insights = []
-        recommendations = []
-
-        # Get numeric values for correlation
-        front_comp = susp.get('front_compression', 0)
-        rear_comp = susp.get('rear_compression', 0)
-        left_comp = susp.get('left_compression', 0)
-        right_comp = susp.get('right_compression', 0)
-
-        # CORRELATION 1: Suspension compliance vs Balance vs Tire temps
-        # Example: Rear softer + Oversteer + Rear temps higher = consistent diagnosis
-
-        # Check if rear is softer
-        rear_softer = rear_comp > front_comp + 0.01
-        front_softer = front_comp > rear_comp + 0.01
-
-        # Check balance
-        is_oversteer = "Oversteer" in balance
-        is_understeer = "Understeer" in balance
-        is_neutral = "Neutral" in balance
-
-        # Check tire temps (simplified - looking for "hotter" keywords)
-        rear_hotter = any("Rear tires hotter" in d for d in tire_diag)
-        front_hotter = any("Front tires hotter" in d for d in tire_diag)
-        temps_balanced = any("Balanced temps" in d for d in tire_diag)
-
-        # PATTERN 1: Rear softer + Neutral/Oversteer + Rear temps higher
-        if rear_softer and (is_neutral or is_oversteer) and rear_hotter:
-            insights.append("⚠ Rear softer + Balance neutral/oversteer + Rear temps higher")
-            insights.append("  → Diagnosis: Rear suspension compliant, rear working harder")
-            recommendations.append("Consider +0.05-0.10 Hz front to balance load distribution")
-
-        # PATTERN 2: Front softer + Understeer + Front temps higher
-        elif front_softer and is_understeer and front_hotter:
-            insights.append("⚠ Front softer + Understeer + Front temps higher")
-            insights.append("  → Diagnosis: Front suspension compliant, front overworked")
-            recommendations.append("Consider +0.05-0.10 Hz rear to shift load rearward")
-
-        # PATTERN 3: Mismatch - rear softer but understeer
-        elif rear_softer and is_understeer:
-            insights.append("⚠ Rear softer BUT understeer present")
-            insights.append("  → Diagnosis: Rear compliance good, but ARB/diff causing push")
-            recommendations.append("Check ARB balance (may need softer front ARB)")
-            recommendations.append("Check diff accel sensitivity (may be too high)")
-
-        # PATTERN 4: Mismatch - front softer but oversteer
-        elif front_softer and is_oversteer:
-            insights.append("⚠ Front softer BUT oversteer present")
-            insights.append("  → Diagnosis: Front compliance good, but rear ARB/diff causing loose")
-            recommendations.append("Check ARB balance (may need softer rear ARB)")
-            recommendations.append("Check diff accel sensitivity (may be too low)")
-
-        # PATTERN 5: All aligned (ideal)
-        elif (rear_softer and is_neutral and rear_hotter) or (is_neutral and "Balanced temps" in str(tire_diag)):
-            insights.append("✓ Suspension + Balance + Temps aligned")
-            insights.append("  → Diagnosis: Setup fundamentally sound")
-
-        # CORRELATION 2: Lateral balance (L vs R)
-        left_softer = left_comp > right_comp + 0.005
-        right_softer = right_comp > left_comp + 0.005
-
-        if left_softer or right_softer:
-            side = "left" if left_softer else "right"
-            diff_mm = abs(left_comp - right_comp) * 1000
-            insights.append(f"⚠ Lateral imbalance: {side} softer by {diff_mm:.0f}mm")
-            recommendations.append(f"Check {side} spring rates or track banking effects")
-
-        # CORRELATION 3: Chassis bottoming vs suspension maxed out
-        chassis_bottoming = susp.get('chassis_bottoming_corners', [])
-        suspension_maxed = susp.get('suspension_maxed_corners', [])
-        min_body_height = susp.get('min_body_height', None)
-
-        # Handle chassis bottoming (suspension too soft)
-        if chassis_bottoming:
-            insights.append(f"⚠ Chassis bottoming: {', '.join(chassis_bottoming)}")
-            if min_body_height is not None:
-                insights.append(f"  → Min body height: {min_body_height*1000:.0f}mm (chassis hitting ground!)")
-
-            rear_bottoming = any('RL' in corner or 'RR' in corner for corner in chassis_bottoming)
-            front_bottoming = any('FL' in corner or 'FR' in corner for corner in chassis_bottoming)
-            all_corners = rear_bottoming and front_bottoming
-
-            if all_corners:
-                insights.append("  → All corners bottoming = suspension globally too soft")
-                recommendations.append("Increase frequency by +0.15-0.30 Hz (already applied via telemetry override)")
-            elif rear_bottoming:
-                insights.append("  → Rear bottoming = excessive rear compliance")
-                recommendations.append("Increase rear frequency by +0.15-0.30 Hz (already applied via telemetry override)")
-            elif front_bottoming:
-                insights.append("  → Front bottoming = excessive front compliance")
-                recommendations.append("Increase front frequency by +0.15-0.30 Hz (already applied via telemetry override)")
-
-        # Handle suspension at travel limits (suspension too stiff)
-        if suspension_maxed:
-            insights.append(f"⚠ Suspension at travel limits: {', '.join(suspension_maxed)}")
-            if min_body_height is not None:
-                insights.append(f"  → Min body height: {min_body_height*1000:.0f}mm (chassis clearance OK)")
-
-            rear_maxed = any('RL' in corner or 'RR' in corner for corner in suspension_maxed)
-            front_maxed = any('FL' in corner or 'FR' in corner for corner in suspension_maxed)
-            all_corners = rear_maxed and front_maxed
-
-            if all_corners:
-                insights.append("  → All corners maxing travel = suspension globally too stiff")
-                recommendations.append("Decrease frequency by -0.15-0.30 Hz (already applied via telemetry override)")
-            elif rear_maxed:
-                insights.append("  → Rear maxing travel = rear too stiff")
-                recommendations.append("Decrease rear frequency by -0.15-0.30 Hz (already applied via telemetry override)")
-            elif front_maxed:
-                insights.append("  → Front maxing travel = front too stiff")
-                recommendations.append("Decrease front frequency by -0.15-0.30 Hz (already applied via telemetry override)")
-
-        # Store results
-        if insights or recommendations:
-            self.results['cross_validation'] = {
-                'insights': insights,
-                'recommendations': recommendations
-            }
-
-            print("\n  ━━━ Cross-Validation (Suspension + Balance + Temps) ━━━")
-            for insight in insights:
-                print(f"  {insight}")
-            if recommendations:
-                print(f"\n  📋 Recommendations:")
-                for rec in recommendations:
-                    print(f"    • {rec}")
-
-    # ═══════════════════════════════════════════════════════════
-    # PHASE B: PHYSICS CHAIN
-    # ═══════════════════════════════════════════════════════════
-
-    def phase_b_physics_chain(self):
-        """Calculate optimal frequencies using ClaudeTunes methodology"""
-
-        # 1. Base frequency from tire compound
-        base_freq = self._get_base_frequency()
-        print(f"  • Base frequency ({self.car_data['tire_compound']}): {base_freq:.2f} Hz")
-
-        # 1b. TELEMETRY OVERRIDE: Adjust base frequency based on anomalies
-        telemetry_adjustment = self._get_telemetry_frequency_override()
-        if telemetry_adjustment != 0:
-            base_freq += telemetry_adjustment
-            reasons = self.results.get('telemetry_override', {}).get('reasons', [])
-            reason_str = ", ".join(reasons) if reasons else "telemetry anomalies"
-            print(f"  ⚡ Telemetry override: {telemetry_adjustment:+.2f} Hz (adjusted to {base_freq:.2f} Hz)")
-            print(f"    Reason: {reason_str}")
-
-        # 2. Apply drivetrain bias
-        dt_bias = self._get_drivetrain_bias()
-        front_freq = base_freq + dt_bias['front']
-        rear_freq = base_freq + dt_bias['rear']
-        print(f"  • Drivetrain bias ({self.car_data['drivetrain']}): F+{dt_bias['front']:.2f} R+{dt_bias['rear']:.2f}")
-
-        # 3. Power platform control
-        power_add = self._get_power_adder()
-        front_freq += power_add
-        rear_freq += power_add
-        print(f"  • Power platform ({self.car_data['hp']} HP): +{power_add:.2f} Hz")
-
-        # 4. CG height adjustments
-        cg_add = self._get_cg_adjustment()
-        front_freq += cg_add
-        rear_freq += cg_add
-        if cg_add != 0:
-            print(f"  • CG height adjustment ({self.car_data.get('cg_height', 450):.0f}mm): {cg_add:+.2f} Hz")
-
-        # 5. Aero adders (minimal in GT7)
-        aero_add = self._get_aero_adder()
-        front_freq += aero_add
-        rear_freq += aero_add
-        print(f"  • Aero adjustment: +{aero_add:.2f} Hz")
-
-        # 6. Calculate roll center compensation
-        self.results['roll_center'] = self._calculate_roll_center()
-
-        # 7. Calculate stability index
-        stability = (rear_freq - front_freq) / front_freq
-
-        self.results['physics'] = {
-            'front_frequency': front_freq,
-            'rear_frequency': rear_freq,
-            'stability_index': stability
-        }
-
-        print(f"  ✓ Target: F={front_freq:.2f} Hz | R={rear_freq:.2f} Hz | Stability={stability:.2f}")
-
-        # Safety check
-        if stability > 0:
-            print("  ⚠ WARNING: Positive stability (oversteer tendency)")
-        elif stability < -1.0:
-            print("  ⚠ WARNING: Extreme understeer (<-1.00)")
-
-    def _get_base_frequency(self):
-        """Get base frequency from tire compound (YAML-driven)"""
-        # YAML: phase_B.base_frequency_by_compound (lines 86-98)
-        # Build compound map from YAML (convert underscores to spaces for GT7 format)
-        compound_data = self.protocol['phase_B']['base_frequency_by_compound']
-        compound_map = {
-            key.replace('_', ' '): value['hz']
-            for key, value in compound_data.items()
-        }
-
-        compound = self.car_data.get('tire_compound', 'Racing Hard').strip()
-
-        # Try exact match first
-        if compound in compound_map:
-            return compound_map[compound]
-
-        # Try normalized match (remove spaces, lowercase)
-        compound_normalized = compound.lower().replace(' ', '').replace('tires', '').replace('tire', '').strip()
-        for key in compound_map:
-            key_normalized = key.lower().replace(' ', '')
-            if compound_normalized == key_normalized or key_normalized in compound_normalized:
-                return compound_map[key]
-
-        # If still no match, default to Racing Hard
-        default_freq = compound_data['Racing_Hard']['hz']
-        print(f"  ⚠ Warning: Unknown tire compound '{compound}', defaulting to Racing Hard ({default_freq} Hz)")
-        return default_freq
-
-    def _get_telemetry_frequency_override(self):
-        """
-        Analyze telemetry anomalies and override base frequency if needed.
-        Returns adjustment in Hz (positive = stiffen, negative = soften)
-        """
-        if not self.telemetry:
-            return 0.0
-
-        adjustment = 0.0
-        reasons = []
-
-        # ANOMALY 1: Chassis bottoming vs suspension at travel limits
-        # This is the critical fix: we need to distinguish between:
-        # - Chassis bottoming (body_height very low) = suspension too soft → need stiffer (+Hz)
-        # - Suspension maxed (high travel but body_height OK) = suspension too stiff → need softer (-Hz)
-        if 'individual_laps' in self.telemetry:
-            laps = self.telemetry['individual_laps']
-            if len(laps) > 0 and 'suspension_behavior' in laps[0]:
-                susp_behavior = laps[0]['suspension_behavior']
-                susp_travel = susp_behavior.get('suspension_travel', {})
-                min_body_height = susp_behavior.get('min_body_height', None)
-
-                max_values = [
-                    susp_travel.get('fl_max', 0),
-                    susp_travel.get('fr_max', 0),
-                    susp_travel.get('rl_max', 0),
-                    susp_travel.get('rr_max', 0)
-                ]
-
-                # Threshold for chassis bottoming (15mm is dangerously low)
-                CHASSIS_BOTTOMING_THRESHOLD = 0.015  # 15mm
-
-                # Check if we have high suspension travel
-                has_severe_travel = any(v > 0.30 for v in max_values)
-                has_moderate_travel = any(v > 0.28 for v in max_values)
-
-                if has_severe_travel or has_moderate_travel:
-                    # Determine if this is chassis bottoming or suspension maxing out
-                    if min_body_height is not None and min_body_height < CHASSIS_BOTTOMING_THRESHOLD:
-                        # CHASSIS BOTTOMING - suspension too soft, need to stiffen
-                        if has_severe_travel:
-                            adjustment += 0.30
-                            reasons.append("severe chassis bottoming")
-                        else:
-                            adjustment += 0.15
-                            reasons.append("moderate chassis bottoming")
-                    else:
-                        # SUSPENSION AT TRAVEL LIMITS - suspension too stiff, need to soften
-                        if has_severe_travel:
-                            adjustment -= 0.30
-                            reasons.append("severe suspension travel limit (too stiff)")
-                        else:
-                            adjustment -= 0.15
-                            reasons.append("moderate suspension travel limit (too stiff)")
-
-        # ANOMALY 2: Excessive slip (suspension too stiff or soft)
-        if 'tire_slip_analysis' in self.telemetry:
-            slip_analysis = self.telemetry['tire_slip_analysis']
-
-            # Check phase-specific slip
-            phase_slip = slip_analysis.get('phase_slip_analysis', {})
-
-            # Braking phase: Front locking excessively (too stiff compression)
-            braking = phase_slip.get('braking', {})
-            front_brake_slip = braking.get('front_avg_slip', 1.0)
-            if front_brake_slip < 0.85:  # >15% slip = locking
-                adjustment -= 0.10
-                reasons.append("front brake locking")
-
-            # Acceleration phase: Rear wheelspin (too soft or diff issue)
-            accel = phase_slip.get('acceleration', {})
-            rear_accel_slip = accel.get('rear_avg_slip', 1.0)
-            if rear_accel_slip > 1.10:  # >10% slip = wheelspin
-                adjustment += 0.10
-                reasons.append("rear wheelspin")
-
-        # ANOMALY 3: Extreme tire temperature imbalance (camber/frequency mismatch)
-        if 'tire_summary' in self.telemetry:
-            tire_temps = self.telemetry['tire_summary'].get('temperature_averages', {})
-            fl = tire_temps.get('fl', 0)
-            fr = tire_temps.get('fr', 0)
-            rl = tire_temps.get('rl', 0)
-            rr = tire_temps.get('rr', 0)
-
-            front_avg = (fl + fr) / 2 if (fl and fr) else 0
-            rear_avg = (rl + rr) / 2 if (rl and rr) else 0
-
-            # Rear massively hotter (>5°C) = rear working too hard (too soft front?)
-            if rear_avg > front_avg + 5:
-                adjustment += 0.10
-                reasons.append("rear overheating")
-            # Front massively hotter (>5°C) = front working too hard (too soft rear?)
-            elif front_avg > rear_avg + 5:
-                adjustment -= 0.05  # Less aggressive, might be aero
-                reasons.append("front overheating")
-
-        # ANOMALY 4: Platform instability (pitch/roll variance)
-        if 'individual_laps' in self.telemetry:
-            laps = self.telemetry['individual_laps']
-            if len(laps) > 0 and 'platform_dynamics' in laps[0]:
-                platform = laps[0]['platform_dynamics']
-
-                # High pitch instability (>0.05 CoV) = too soft
-                pitch_stability = platform.get('pitch_stability', 0)
-                if pitch_stability > 0.05:
-                    adjustment += 0.15
-                    reasons.append("pitch instability")
-
-                # High roll instability (>0.05 CoV) = ARB too soft (but freq related)
-                roll_stability = platform.get('roll_stability', 0)
-                if roll_stability > 0.05:
-                    adjustment += 0.10
-                    reasons.append("roll instability")
-
-        # Log the telemetry-based adjustment
-        if adjustment != 0.0 and reasons:
-            self.results['telemetry_override'] = {
-                'adjustment_hz': adjustment,
-                'reasons': reasons
-            }
-
-        return round(adjustment, 2)
-
-    def _parse_bias_string(self, bias_str):
-        """
-        Parse YAML bias string to front/rear dict
-        Examples: "+0.4F" → {'front': 0.4, 'rear': 0.0}
-                  "+0.1R" → {'front': 0.0, 'rear': 0.1}
-                  "+0.2F +0.2R" → {'front': 0.2, 'rear': 0.2}
-        """
-        result = {'front': 0.0, 'rear': 0.0}
-
-        # Split by spaces to handle combined bias (e.g., "+0.2F +0.2R")
-        parts = bias_str.strip().split()
-
-        for part in parts:
-            part = part.strip()
-            if not part:
-                continue
-
-            # Extract value and direction
-            if part.endswith('F'):
-                value = float(part[:-1])
-                result['front'] = value
-            elif part.endswith('R'):
-                value = float(part[:-1])
-                result['rear'] = value
-
-        return result
-
-    def _get_drivetrain_bias(self):
-        """Calculate drivetrain-specific frequency bias (YAML-driven)"""
-        # YAML: phase_B.drivetrain_bias (lines 100-108)
-        dt = self.car_data.get('drivetrain', 'FR')
-
-        # Build bias map from YAML
-        bias_data = self.protocol['phase_B']['drivetrain_bias']
-        bias_map = {}
-
-        for key, value in bias_data.items():
-            if isinstance(value, dict) and 'bias' in value:
-                bias_map[key] = self._parse_bias_string(value['bias'])
-
-        # Handle AWD variants
-        # If user specified AWD_FRONT/REAR/BALANCED, use that directly
-        if dt in bias_map:
-            return bias_map[dt]
-
-        # If generic "AWD" without variant, try to use AWD_DEFAULT
-        if dt == 'AWD' and 'AWD_DEFAULT' in bias_map:
-            return bias_map['AWD_DEFAULT']
-
-        # Fallback to FR bias (most common)
-        return bias_map.get('FR', {'front': 0.2, 'rear': 0.0})
-
-    def _get_power_adder(self):
-        """Calculate power platform frequency adder using power-to-weight ratio"""
-        hp = self.car_data.get('hp', 400)
-        weight_lbs = self.car_data.get('weight', 3000)
-
-        # Get base frequency
-        base_freq = self._get_base_frequency()
-
-        # Calculate power-to-weight ratio (HP per lb)
-        power_to_weight = hp / weight_lbs
-
-        # Reference ratio: 0.154 HP/lb (typical balanced sports car: 400HP / 2600lbs)
-        # This is the baseline where no power adjustment is needed
-        reference_ratio = 0.154
-
-        # Formula: Base × (sqrt(PWR / reference_ratio) - 1.0)
-        # - Cars above reference ratio get positive adjustment (need stiffer springs)
-        # - Cars below reference ratio get negative adjustment (can use softer springs)
-        # - Square root provides diminishing returns at very high PWR
-        pwr_multiplier = math.sqrt(power_to_weight / reference_ratio)
-        adder = base_freq * (pwr_multiplier - 1.0)
-
-        # High absolute power brackets for very powerful cars
-        # (Even heavy cars with 850+ HP need some extra stiffness)
-        if hp > 850:
-            adder += 0.2
-        elif hp > 700:
-            adder += 0.1
-
-        return max(0, adder)
-
-    def _parse_adjustment_value(self, add_str):
-        """
-        Parse YAML adjustment string to numeric value
-        Examples: "+0.1–0.3 Hz" → 0.2 (middle of range)
-                  "-0.1 Hz" → -0.1
-                  "0" → 0.0
-        """
-        if not add_str or add_str == "0":
-            return 0.0
-
-        # Remove " Hz" suffix
-        add_str = add_str.replace(' Hz', '').strip()
-
-        # Check if it's a range (contains –)
-        if '–' in add_str or '-' in add_str[1:]:  # Check for range dash (not negative sign)
-            # Extract range bounds
-            # Handle both en-dash (–) and hyphen (-)
-            parts = add_str.replace('–', '-').split('-')
-            # Filter out empty strings from negative numbers
-            parts = [p for p in parts if p]
-
-            if len(parts) >= 2:
-                # Get first and last non-empty parts
-                try:
-                    low = float(parts[0])
-                    high = float(parts[-1])
-                    # Return middle of range
-                    return (low + high) / 2
-                except ValueError:
-                    pass
-
-        # Single value
-        try:
-            return float(add_str)
-        except ValueError:
-            return 0.0
-
-    def _get_cg_adjustment(self):
-        """Calculate CG height frequency adjustment (YAML-driven)"""
-        # YAML: phase_B.cg_adjustments (lines 127-131)
-        cg_height = self.car_data.get('cg_height', 450)  # Default to standard
-
-        # Get CG adjustment data from YAML
-        cg_data = self.protocol['phase_B']['cg_adjustments']
-
-        # High CG (>500mm)
-        if cg_height > 500:
-            add_str = cg_data['high']['add']
-            return self._parse_adjustment_value(add_str)
-
-        # Very low CG (<400mm)
-        elif cg_height < 400:
-            add_str = cg_data['very_low']['add']
-            return self._parse_adjustment_value(add_str)
-
-        # Standard CG (400-500mm)
-        else:
-            add_str = cg_data['standard']['add']
-            return self._parse_adjustment_value(add_str)
-
-    def _calculate_roll_center(self):
-        """Calculate roll center height using YAML protocol formula (YAML-driven)"""
-        # YAML: phase_B.roll_center_compensation (lines 133-143)
-        cg_height = self.car_data.get('cg_height', 450)
-        dt = self.car_data.get('drivetrain', 'FR')
-        aero = self.car_data.get('aero', {})
-        total_df = aero.get('front', {}).get('current', 0) + aero.get('rear', {}).get('current', 0)
-
-        # Get roll center compensation data from YAML
-        rc_data = self.protocol['phase_B']['roll_center_compensation']
-
-        # Determine DF level multiplier from YAML
-        df_multipliers = rc_data['df_multiplier']
-        if total_df > 1200:
-            # High: "0.25–0.30" → use middle
-            df_mult = self._parse_adjustment_value(df_multipliers['high'])
-        elif total_df > 500:
-            # Moderate: "0.20–0.25" → use middle
-            df_mult = self._parse_adjustment_value(df_multipliers['moderate'])
-        else:
-            # Low: "0.15–0.20" → use middle
-            df_mult = self._parse_adjustment_value(df_multipliers['low'])
-
-        # Apply drivetrain-specific adjustments from YAML
-        dt_ranges = rc_data['layout']
-        dt_mult_map = {}
-        for dt_name, range_str in dt_ranges.items():
-            dt_mult_map[dt_name] = self._parse_adjustment_value(range_str)
-
-        # Use average of DF and drivetrain multipliers
-        final_mult = (df_mult + dt_mult_map.get(dt, 0.20)) / 2
-        rc_height = final_mult * cg_height
-
-        return {
-            'multiplier': final_mult,
-            'height': rc_height,
-            'cg_height': cg_height
-        }
-
-    def _get_aero_adder(self):
-        """Calculate aero frequency adder using GT7 Downforce Database"""
-        aero = self.car_data.get('aero', {})
-        total_df = aero.get('front', {}).get('current', 0) + aero.get('rear', {}).get('current', 0)
-
-        # Classify car using GT7 Downforce Database
-        car_class = None
-        for class_name, data in self.gt7_downforce_database.items():
-            df_min, df_max = data['df_range']
-            if df_min <= total_df <= df_max:
-                car_class = class_name
-                freq_min, freq_max = data['freq_add']
-                # Use middle of range for balanced approach
-                aero_adder = (freq_min + freq_max) / 2
-
-                # Store classification for reference
-                self.results['car_class'] = {
-                    'class': class_name,
-                    'downforce': total_df,
-                    'expected_impact': data['gt7_impact']
-                }
-
-                return aero_adder
-
-        # Fallback for unclassified (shouldn't happen with our ranges)
-        if total_df > 2000:
-            return 0.4
-        elif total_df > 1200:
-            return 0.25
-        elif total_df > 500:
-            return 0.15
-        else:
-            return 0.0
-
-    # ═══════════════════════════════════════════════════════════
-    # PHASE C: CONSTRAINT EVALUATION
-    # ═══════════════════════════════════════════════════════════
-
-    def phase_c_constraints(self):
-        """Evaluate constraints and apply compensation"""
-        target_front = self.results['physics']['front_frequency']
-        target_rear = self.results['physics']['rear_frequency']
-
-        ranges = self.car_data.get('ranges', {}).get('frequency', {})
-        front_range = ranges.get('front', (0, 10))
-        rear_range = ranges.get('rear', (0, 10))
-
-        # Preserve drivetrain frequency bias when constraining (CRITICAL for MR/FR/RR/etc)
-        # Option 3: Shift both equally to reach minimum, maintaining absolute differential
-        original_differential = target_rear - target_front  # e.g., 3.32 - 3.22 = +0.10 Hz
-
-        # Check if either target violates constraints
-        front_needs_shift = max(0, front_range[0] - target_front)  # How much to shift up if below min
-        rear_needs_shift = max(0, rear_range[0] - target_rear)
-        front_over_max = max(0, target_front - front_range[1])    # How much to shift down if above max
-        rear_over_max = max(0, target_rear - rear_range[1])
-
-        # Determine the shift needed (use the largest constraint violation)
-        shift_up = max(front_needs_shift, rear_needs_shift)
-        shift_down = max(front_over_max, rear_over_max)
-
-        if shift_up > 0:
-            # Both frequencies need to shift up to meet minimum
-            achievable_front = target_front + shift_up
-            achievable_rear = target_rear + shift_up
-        elif shift_down > 0:
-            # Both frequencies need to shift down to meet maximum
-            achievable_front = target_front - shift_down
-            achievable_rear = target_rear - shift_down
-        else:
-            # No shift needed, targets are within range
-            achievable_front = target_front
-            achievable_rear = target_rear
-
-        # Final safety clamp (in case one shifted value still exceeds the other limit)
-        achievable_front = min(max(achievable_front, front_range[0]), front_range[1])
-        achievable_rear = min(max(achievable_rear, rear_range[0]), rear_range[1])
-
-        # Verify we preserved the differential (within rounding tolerance)
-        final_differential = achievable_rear - achievable_front
-        if abs(final_differential - original_differential) > 0.01:
-            print(f"  ⚠ Warning: Frequency differential changed from {original_differential:.2f} to {final_differential:.2f} Hz")
-
-        # Calculate deficits
-        front_deficit = target_front - achievable_front
-        rear_deficit = target_rear - achievable_rear
-
-        # Calculate severity
-        front_pct = (achievable_front / target_front * 100) if target_front > 0 else 100
-        rear_pct = (achievable_rear / target_rear * 100) if target_rear > 0 else 100
-        avg_achievable = (front_pct + rear_pct) / 2
-
-        severity = self._classify_severity(avg_achievable)
-
-        self.results['constraints'] = {
-            'severity': severity,
-            'achievable_front': achievable_front,
-            'achievable_rear': achievable_rear,
-            'front_deficit': front_deficit,
-            'rear_deficit': rear_deficit,
-            'achievable_pct': avg_achievable
-        }
-
-        print(f"  • Achievable: {avg_achievable:.1f}% | Severity: {severity}")
-
-        if front_deficit > 0.1 or rear_deficit > 0.1:
-            print(f"  • Applying ARB/damper compensation...")
-            self._apply_compensation()
-
-    def _classify_severity(self, pct):
-        """Classify constraint severity level"""
-        if pct >= 90:
-            return "L1 (Full Optimization)"
-        elif pct >= 75:
-            return "L2 (Moderate Constraints)"
-        elif pct >= 60:
-            return "L3 (Significant Constraints)"
-        elif pct >= 45:
-            return "L4 (Severe Constraints)"
-        else:
-            return "L5 (Critical Constraints)"
-
-    def _apply_compensation(self):
-        """Apply ARB/damper/diff compensation for frequency deficits"""
-        front_deficit = self.results['constraints']['front_deficit']
-        rear_deficit = self.results['constraints']['rear_deficit']
-        total_deficit = max(front_deficit, rear_deficit)
-
-        # ARB compensation: +1 level ≈ 0.15 Hz recovery
-        self.results['arb_compensation'] = {
-            'front': min(3, int(front_deficit / 0.15)),
-            'rear': min(3, int(rear_deficit / 0.15))
-        }
-
-        # Damper compensation: +10% compression, +15% rebound
-        self.results['damper_compensation'] = {
-            'compression_add': 10 if (front_deficit > 0.2 or rear_deficit > 0.2) else 0,
-            'expansion_add': 15 if (front_deficit > 0.2 or rear_deficit > 0.2) else 0
-        }
-
-        # Differential compensation per YAML: Accel +10-15, Initial +5, Brake +5
-        # Recovery: 0.08 Hz per 10-point change
-        if total_deficit > 0.3:
-            diff_accel_add = min(15, int(total_deficit / 0.08) * 10)
-            diff_initial_add = 5 if total_deficit > 0.4 else 0
-            diff_brake_add = 5 if total_deficit > 0.4 else 0
-
-            self.results['diff_compensation'] = {
-                'accel': diff_accel_add,
-                'initial': diff_initial_add,
-                'brake': diff_brake_add,
-                'recovery_hz': (diff_accel_add / 10) * 0.08
-            }
-        else:
-            self.results['diff_compensation'] = {
-                'accel': 0,
-                'initial': 0,
-                'brake': 0,
-                'recovery_hz': 0.0
-            }
-
-        print(f"    ARB: +{self.results['arb_compensation']['front']}F / +{self.results['arb_compensation']['rear']}R")
-        print(f"    Dampers: +{self.results['damper_compensation']['compression_add']}% comp, +{self.results['damper_compensation']['expansion_add']}% exp")
-
-        if self.results['diff_compensation']['accel'] > 0:
-            print(f"    Diff: +{self.results['diff_compensation']['initial']} initial, +{self.results['diff_compensation']['accel']} accel, +{self.results['diff_compensation']['brake']} brake (recovery: {self.results['diff_compensation']['recovery_hz']:.2f} Hz)")
+        started = time.perf_counter()
+        summary = gt7_2r.analyze_session(str(session_folder), log=lambda *args: None)
+        if not summary:
+            print(f"Warning: No usable lap CSVs in '{session_folder}', using defaults")
+            return {}
+        print(f"  ✓ Analyzed {summary['session_info']['total_laps']} laps from {session_folder} "
+              f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+        return telemetry_from_analysis(summary)
 
     # ═══════════════════════════════════════════════════════════
     # PHASE D: SETUP SHEET OUTPUT
     # ═══════════════════════════════════════════════════════════
 
     def phase_d_output(self):
-        """Generate GT7-formatted setup sheet"""
-
-        # Calculate all setup parameters
-        setup = self._calculate_complete_setup()
+        """Generate GT7-formatted setup sheet from the engine result"""
+        return self.render_setup_sheet(self.car_data, self.result.setup)
 
+    @staticmethod
+    def render_setup_sheet(car_data, setup):
+        """Format setup parameters as a GT7 setup sheet"""
         # Check if vehicle has front differential
         has_front_diff = 'front' in setup['diff'] and 'rear' in setup['diff']
 
@@ -1378,14 +259,14 @@ Front/Rear Torque Distribution              {setup['torque_split']}"""
 
         # Format output
         sheet = f"""═══════════════════════════════════════════════════════
-   CLAUDETUNES GT7 SETUP SHEET - {self.car_data['name']}
+   CLAUDETUNES GT7 SETUP SHEET - {car_data['name']}
 ═══════════════════════════════════════════════════════
 TRACK: [Track Name]         VERSION: v1.0
 DATE: {datetime.now().strftime('%Y-%m-%d')}                BASELINE: ClaudeTunes Auto
 
 ─────────────────────────── Tires ────────────────────────────
-Front    (33)  {self.car_data.get('tire_compound', 'Racing Hard')}
-Rear     (33)  {self.car_data.get('tire_compound', 'Racing Hard')}
+Front    (33)  {car_data.get('tire_compound', 'Racing Hard')}
+Rear     (33)  {car_data.get('tire_compound', 'Racing Hard')}
 
 ─────────────────────────── Suspension ───────────────────────
 Suspension              Fully Customized Suspension
@@ -1411,441 +292,173 @@ PHYSICS: {setup['philosophy']} | Stability: {setup['stability']:.2f} | Gain: {se
 
         return sheet
 
-    def _calculate_complete_setup(self):
-        """Calculate all setup parameters following ClaudeTunes protocol"""
-        setup = {}
-
-        # Get common parameters used throughout
-        dt = self.car_data.get('drivetrain', 'FR')
-        hp = self.car_data.get('hp', 400)
-        cg_height = self.car_data.get('cg_height', 450)
-
-        # Frequencies (from Phase B, constrained from Phase C)
-        setup['frequency'] = {
-            'front': self.results['constraints']['achievable_front'],
-            'rear': self.results['constraints']['achievable_rear']
-        }
-
-        # Ride height - lowest available with positive rake
-        # Check for CHASSIS bottoming detection from telemetry (multiple format support)
-        # IMPORTANT: Only raise ride height for CHASSIS bottoming, not suspension at travel limits
-        chassis_bottoming_detected = False
-
-        # Format 1: Direct bottoming_detected flag (legacy)
-        if 'bottoming_detected' in self.telemetry:
-            chassis_bottoming_detected = self.telemetry.get('bottoming_detected', False)
-
-        # Format 2: gt7_2r.py format - distinguish chassis bottoming from suspension maxed
-        if not chassis_bottoming_detected and 'individual_laps' in self.telemetry:
-            laps = self.telemetry['individual_laps']
-            if len(laps) > 0 and 'suspension_behavior' in laps[0]:
-                susp_behavior = laps[0]['suspension_behavior']
-                susp_travel = susp_behavior.get('suspension_travel', {})
-                min_body_height = susp_behavior.get('min_body_height', None)
-
-                # Check max travel values
-                max_values = [
-                    susp_travel.get('fl_max', 0),
-                    susp_travel.get('fr_max', 0),
-                    susp_travel.get('rl_max', 0),
-                    susp_travel.get('rr_max', 0)
-                ]
-
-                # Threshold for chassis bottoming (15mm is dangerously low)
-                CHASSIS_BOTTOMING_THRESHOLD = 0.015  # 15mm
-
-                # Only flag as chassis bottoming if BOTH conditions are met:
-                # 1. High suspension travel (>0.28m)
-                # 2. Low body height (<15mm)
-                if any(v > 0.28 for v in max_values):
-                    if min_body_height is not None and min_body_height < CHASSIS_BOTTOMING_THRESHOLD:
-                        chassis_bottoming_detected = True
-                    # If body_height is OK, this is suspension maxed, NOT chassis bottoming
-                    # DO NOT raise ride height in this case!
-
-        ride_ranges = self.car_data.get('ranges', {}).get('ride_height', {})
-
-        # Calculate ride height offset
-        # Priority: chassis bottoming detection > conservative mode > aggressive (minimum)
-        if chassis_bottoming_detected:
-            ride_height_offset = 10
-        elif self.conservative_ride_height:
-            ride_height_offset = 10
-        else:
-            ride_height_offset = 0
-
-        setup['ride_height'] = {
-            'front': int(ride_ranges.get('front', (85, 140))[0]) + ride_height_offset,  # Minimum + offset
-            'rear': int(ride_ranges.get('rear', (110, 165))[0]) + 5 + ride_height_offset  # Minimum + rake + offset
-        }
-
-        if chassis_bottoming_detected:
-            print(f"  ⚠ Chassis bottoming detected in telemetry - ride height raised by {ride_height_offset}mm")
-        elif self.conservative_ride_height:
-            print(f"  ℹ Conservative ride height mode: +{ride_height_offset}mm buffer from minimum")
-
-        # ARB - base calculation + compensation + track type per YAML
-        base_arb_f = int(setup['frequency']['front'] * 2.5)
-        base_arb_r = int(setup['frequency']['rear'] * 2.5)
-
-        # Drivetrain adjustments per YAML (line 246)
-        # FF/FR: +1F, MR: -1R, RR: +1R, AWD: +0.5F
-        dt_arb_adj_f = 0
-        dt_arb_adj_r = 0
-        if dt == 'FF' or dt == 'FR':
-            dt_arb_adj_f = 1  # Front-biased drivetrains get stiffer front ARB
-        elif dt == 'MR':
-            dt_arb_adj_r = -1  # MR gets softer rear ARB for traction
-        elif dt == 'RR':
-            dt_arb_adj_r = 1  # RR gets stiffer rear ARB for stability
-        elif dt == 'AWD':
-            dt_arb_adj_f = 1  # AWD gets slight front bias (0.5 rounded to 1)
-
-        # Track type adjustments
-        track_arb_adj_f = 0
-        track_arb_adj_r = 0
-        if self.track_type == 'high_speed':
-            track_arb_adj_f = 1  # +1 both for high-speed
-            track_arb_adj_r = 1
-        elif self.track_type == 'technical':
-            track_arb_adj_r = -1  # -1 rear for technical rotation
-
-        arb_comp = self.results.get('arb_compensation', {'front': 0, 'rear': 0})
-
-        setup['arb'] = {
-            'front': min(10, max(1, base_arb_f + dt_arb_adj_f + track_arb_adj_f + arb_comp['front'])),
-            'rear': min(10, max(1, base_arb_r + dt_arb_adj_r + track_arb_adj_r + arb_comp['rear']))
-        }
-
-        # Damping - OptimumG Physics-Based Calculation (YAML: tuning_subsystems.damping)
-        # Philosophy: docs/claudetunes_philosophy.md, docs/damper_tuning_guide.md
-
-        # Step 1: Calculate sprung mass per corner
-        weight_lbs = self.car_data.get('weight', 2800)
-        weight_kg = weight_lbs * 0.453592
-        sprung_mass_total = weight_kg * 0.80  # 80% is sprung mass
-
-        weight_dist = self.car_data.get('weight_distribution', {'front': 55, 'rear': 45})
-        front_pct = weight_dist.get('front', 55) / 100
-        rear_pct = weight_dist.get('rear', 45) / 100
-
-        sprung_mass_front_corner = (sprung_mass_total * front_pct) / 2  # kg per corner
-        sprung_mass_rear_corner = (sprung_mass_total * rear_pct) / 2
-
-        # Step 2: Get target frequencies from Phase B
-        freq_front = setup['frequency']['front']  # Hz
-        freq_rear = setup['frequency']['rear']
-
-        # Step 3: OptimumG formula - Initial slope = 4π × ζ × ω × m_sm
-        import math
-        zeta = 0.67  # Damping ratio (0.65-0.70 for racing, use mid-range)
-
-        initial_slope_front = 4 * math.pi * zeta * freq_front * sprung_mass_front_corner  # N/(m/s)
-        initial_slope_rear = 4 * math.pi * zeta * freq_rear * sprung_mass_rear_corner
-
-        # Step 4: Energy flow split (compression 2/3, rebound 3/2)
-        comp_force_front = (2/3) * initial_slope_front
-        comp_force_rear = (2/3) * initial_slope_rear
-
-        rebound_force_front = (3/2) * initial_slope_front
-        rebound_force_rear = (3/2) * initial_slope_rear
-
-        # Step 5: Convert physics forces to GT7 percentages
-        # Use OptimumG ratio to differentiate F/R, anchor to YAML baselines (25%/35%)
-
-        # Calculate average force to use as baseline anchor
-        avg_comp_force = (comp_force_front + comp_force_rear) / 2
-        avg_rebound_force = (rebound_force_front + rebound_force_rear) / 2
-
-        # YAML baseline values (from philosophy: 25% comp, 35% rebound)
-        baseline_comp = 25
-        baseline_rebound = 35
-
-        # Calculate F/R percentages maintaining OptimumG ratio
-        comp_pct_front = baseline_comp * (comp_force_front / avg_comp_force)
-        comp_pct_rear = baseline_comp * (comp_force_rear / avg_comp_force)
-
-        rebound_pct_front = baseline_rebound * (rebound_force_front / avg_rebound_force)
-        rebound_pct_rear = baseline_rebound * (rebound_force_rear / avg_rebound_force)
-
-        # Step 6: Apply modifiers (drivetrain, power, CG, track)
-        dt_adj = {'FF': 3, 'FR': 1, 'MR': 0, 'RR': -2, 'AWD': 1}.get(dt, 1)
-
-        if hp > 700:
-            power_adj = 8
-        elif hp > 600:
-            power_adj = 6
-        elif hp > 400:
-            power_adj = 2
-        else:
-            power_adj = 0
+    @staticmethod
+    def render_comparison_table(car_data, setups):
+        """Side-by-side table of setups (track type -> setup parameters)"""
+        def pair(values, fmt='{}'):
+            return f"{fmt.format(values[0])}/{fmt.format(values[1])}"
+
+        rows = [
+            ('Body Height F/R (mm)', lambda s: pair((s['ride_height']['front'], s['ride_height']['rear']))),
+            ('Anti-Roll Bar F/R', lambda s: pair((s['arb']['front'], s['arb']['rear']))),
+            ('Compression F/R (%)', lambda s: pair((s['damping']['compression_front'], s['damping']['compression_rear']))),
+            ('Expansion F/R (%)', lambda s: pair((s['damping']['expansion_front'], s['damping']['expansion_rear']))),
+            ('Natural Freq F/R (Hz)', lambda s: pair((s['frequency']['front'], s['frequency']['rear']), '{:.2f}')),
+            ('Camber F/R (°)', lambda s: pair((s['camber']['front'], s['camber']['rear']), '{:.1f}')),
+            ('Toe F/R (°)', lambda s: pair((s['toe']['front'], s['toe']['rear']), '{:.2f}')),
+        ]
+        first = next(iter(setups.values()))
+        for axle in ('front', 'rear') if 'front' in first['diff'] else (None,):
+            label = f"Diff {axle.capitalize()} " if axle else "Diff "
+            rows.append((label + 'Init/Acc/Brk', lambda s, axle=axle: '/'.join(
+                str((s['diff'][axle] if axle else s['diff'])[key]) for key in ('initial', 'accel', 'brake'))))
+        rows.append(('Expected Gain', lambda s: s['expected_gain']))
+
+        header = f"{'Parameter':<26}" + ''.join(f"{track_type:>14}" for track_type in setups)
+        lines = [
+            "═" * len(header),
+            f"   TRACK TYPE COMPARISON - {car_data.get('name', 'Unknown')}",
+            "═" * len(header),
+            header,
+            "─" * len(header),
+        ]
+        for label, value in rows:
+            lines.append(f"{label:<26}" + ''.join(f"{value(setup):>14}" for setup in setups.values()))
+        lines.append("═" * len(header))
+        return '\n'.join(lines) + '\n'
 
-        if cg_height > 500:
-            cg_adj = 2
-        elif cg_height < 400:
-            cg_adj = -1
-        else:
-            cg_adj = 0
-
-        track_adj = 0
-        if self.track_type == 'high_speed':
-            track_adj = 3
-        elif self.track_type == 'technical':
-            track_adj = -2
-
-        # Step 7: Telemetry reconciliation (if available)
-        telem_adj_comp_f = 0
-        telem_adj_comp_r = 0
-        telem_adj_exp_f = 0
-        telem_adj_exp_r = 0
-
-        susp = self.results.get('suspension_analysis', {})
-        # Only process telemetry if we have valid dict data (not the "No telemetry data" string)
-        if susp and isinstance(susp, dict):
-            front_comp = susp.get('front_compression', 0)
-            rear_comp = susp.get('rear_compression', 0)
-
-            # Front softer than rear
-            if front_comp > rear_comp + 0.02:  # >20mm difference
-                telem_adj_comp_f += 5
-                print("  📊 Telemetry: Front compressing more → +5% front compression")
-            # Rear softer than front
-            elif rear_comp > front_comp + 0.02:
-                telem_adj_comp_r += 5
-                print("  📊 Telemetry: Rear compressing more → +5% rear compression")
-
-            # Temperature-based adjustment
-            tire_temps = self.results.get('tire_analysis', {})
-            if tire_temps:
-                front_avg = tire_temps.get('front_avg', 0)
-                rear_avg = tire_temps.get('rear_avg', 0)
-                if front_avg > rear_avg + 5:  # Front >5°C hotter
-                    telem_adj_comp_f -= 2
-                    telem_adj_comp_r += 2
-                    print("  📊 Telemetry: Front tires hot → -2% front, +2% rear compression")
-
-        damper_comp = self.results.get('damper_compensation', {'compression_add': 0, 'expansion_add': 0})
-
-        # Final damping values (clamp to GT7 ranges: 20-40% comp, 30-50% rebound)
-        setup['damping'] = {
-            'compression_front': min(40, max(20, int(comp_pct_front + dt_adj + power_adj + cg_adj + track_adj + telem_adj_comp_f + damper_comp['compression_add']))),
-            'compression_rear': min(40, max(20, int(comp_pct_rear + dt_adj + power_adj + cg_adj + track_adj + telem_adj_comp_r + damper_comp['compression_add']))),
-            'expansion_front': min(50, max(30, int(rebound_pct_front + dt_adj + power_adj + cg_adj + track_adj + telem_adj_exp_f + damper_comp['expansion_add']))),
-            'expansion_rear': min(50, max(30, int(rebound_pct_rear + dt_adj + power_adj + cg_adj + track_adj + telem_adj_exp_r + damper_comp['expansion_add'])))
-        }
-
-        # Camber - based on tire compound, track type, and CG per YAML
-        tire = self.car_data.get('tire_compound', 'Racing Hard')
-        if 'Racing' in tire:
-            camber_base_f = -2.0
-            camber_base_r = -1.5
-            tire_adj = -0.5  # Racing: more negative camber for stiff sidewalls
-        elif 'Sport' in tire:
-            camber_base_f = -2.0
-            camber_base_r = -1.5
-            tire_adj = 0.0  # Sport: baseline
-        else:
-            camber_base_f = -2.0
-            camber_base_r = -1.5
-            tire_adj = +0.3  # Comfort: less negative camber for soft sidewalls
-
-        # Track type adjustments
-        track_camber_adj = 0
-        if self.track_type == 'high_speed':
-            track_camber_adj = 0.3  # +0.3° for high-speed
-        elif self.track_type == 'technical':
-            track_camber_adj = -0.2  # -0.2° for technical
-
-        # CG adjustments
-        cg_camber_adj = 0
-        if cg_height > 500:
-            cg_camber_adj = 0.2  # High CG: +0.2°
-        elif cg_height < 400:
-            cg_camber_adj = -0.1  # Low CG: -0.1°
-
-        setup['camber'] = {
-            'front': camber_base_f + tire_adj + track_camber_adj + cg_camber_adj,
-            'rear': camber_base_r + tire_adj + track_camber_adj + cg_camber_adj
-        }
-
-        # Toe - with track type adjustments per YAML
-        if dt == 'FF':
-            toe_front = -0.10  # Toe out for FWD
-        else:
-            toe_front = 0.00
-
-        # Rear toe adjustments for stability and track type
-        toe_rear_base = 0.10
-
-        # Track type adjustments
-        if self.track_type == 'high_speed':
-            toe_rear_base += 0.10  # +0.1° for high-speed stability
-        elif self.track_type == 'technical':
-            toe_rear_base = 0.00  # 0° for technical (rotation)
-
-        # CG adjustments (high CG needs more stability)
-        if cg_height > 500:
-            toe_rear_base += 0.05
-
-        setup['toe'] = {
-            'front': toe_front,
-            'rear': min(1.0, toe_rear_base)  # Cap at 1.0°
-        }
-
-        # Differential - base + compensation + track type per YAML
-        diff_base = self._calculate_diff_settings()
-
-        # Apply diff compensation from Phase C
-        diff_comp = self.results.get('diff_compensation', {'initial': 0, 'accel': 0, 'brake': 0})
-
-        # Track type adjustments per YAML
-        track_diff_adj = {'accel': 0, 'brake': 0}
-        if self.track_type == 'high_speed':
-            track_diff_adj = {'accel': 12, 'brake': -7}  # +10-15 accel, -5-10 brake
-        elif self.track_type == 'technical':
-            track_diff_adj = {'accel': -7, 'brake': 7}  # -5-10 accel, +5-10 brake
-
-        # Check if vehicle has front differential (AWD/4WD)
-        if 'front' in diff_base and 'rear' in diff_base:
-            # AWD/4WD vehicle with front and rear diffs
-            setup['diff'] = {
-                'front': {
-                    'initial': min(60, max(5, diff_base['front']['initial'] + diff_comp['initial'])),
-                    'accel': min(60, max(5, diff_base['front']['accel'] + diff_comp['accel'] + track_diff_adj['accel'])),
-                    'brake': min(60, max(5, diff_base['front']['brake'] + diff_comp['brake'] + track_diff_adj['brake']))
-                },
-                'rear': {
-                    'initial': min(60, max(5, diff_base['rear']['initial'] + diff_comp['initial'])),
-                    'accel': min(60, max(5, diff_base['rear']['accel'] + diff_comp['accel'] + track_diff_adj['accel'])),
-                    'brake': min(60, max(5, diff_base['rear']['brake'] + diff_comp['brake'] + track_diff_adj['brake']))
-                }
-            }
+    # ═══════════════════════════════════════════════════════════
+    # WATCH MODE
+    # ═══════════════════════════════════════════════════════════
+
+    def watch(self, car_data_path, watch_folder, output_path=None, session_folder=None, debounce=1.0,
+              use_inotify=True):
+        """
+        Regenerate the setup whenever the session folder gets new telemetry (until Ctrl+C)
+
+        New lap CSVs are analyzed in-process (only new laps are parsed); an updated
+        telemetry_analysis_v3.json or rewritten Phase 1 domain JSONs are read directly. Only the phases whose inputs
+        changed are recomputed, and every rewritten sheet gets a .diff against the previous one.
+        """
+        self._print_banner()
+        watch_folder = Path(watch_folder)
+        if not watch_folder.is_dir():
+            print(f"Error: Session folder '{watch_folder}' not found")
+            return False
+
+        self.car_data = self._parse_car_data(car_data_path)
+        print(f"  ✓ Loaded: {self.car_data['name']}")
+        print(f"    Drivetrain: {self.car_data['drivetrain']} | {self.car_data['hp']} HP | {self.car_data['weight']} lbs")
+
+        watcher = FolderWatcher(watch_folder, self._is_session_input, debounce=debounce, use_inotify=use_inotify)
+        print(f"\n👀 Watching {watch_folder} ({watcher.backend.name}, {debounce:g}s debounce) - Ctrl+C to stop")
+
+        # Start from whichever input was written last
+        inputs = watcher.snapshot()
+        changed = {max(inputs, key=lambda name: inputs[name][0])} if inputs else set()
+        session = None
+        try:
+            while True:
+                if changed:
+                    session = self._watch_update(watch_folder, changed, session, output_path,
+                                                 session_folder or watch_folder)
+                changed = watcher.wait()
+        finally:
+            watcher.close()
+
+    def _is_session_input(self, name):
+        return self._is_lap_csv(name) or name == self.ANALYSIS_FILENAME or self._is_domain_json(name)
+
+    @staticmethod
+    def _is_lap_csv(name):
+        return name.lower().endswith('.csv') and 'lap_' in name.lower()  # same filter as gt7_2r.py
+
+    @staticmethod
+    def _is_domain_json(name):
+        return name.endswith('.json') and name[:-len('.json')] in DOMAIN_NAMES
+
+    def _watch_update(self, watch_folder, changed, session, output_path, session_folder):
+        """Reload the telemetry that changed, recompute and rewrite the sheet(s); returns the session"""
+        started = time.perf_counter()
+        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] Changed: {', '.join(sorted(changed))}")
+
+        if any(self._is_lap_csv(name) for name in changed):
+            source = 'lap CSVs'
+            telemetry = self._analyze_session(watch_folder)
+        elif self.ANALYSIS_FILENAME in changed:
+            source = self.ANALYSIS_FILENAME
+            # gt7_2r.py output only: reading stops right after lap 0
+            telemetry = self._parse_telemetry(watch_folder / self.ANALYSIS_FILENAME, ANALYSIS_PATHS)
         else:
-            # RWD/FWD vehicle with rear diff only
-            setup['diff'] = {
-                'initial': min(60, max(5, diff_base['initial'] + diff_comp['initial'])),
-                'accel': min(60, max(5, diff_base['accel'] + diff_comp['accel'] + track_diff_adj['accel'])),
-                'brake': min(60, max(5, diff_base['brake'] + diff_comp['brake'] + track_diff_adj['brake']))
-            }
-
-        # Torque split
-        split = self.car_data.get('torque_split', '0:100')
-        setup['torque_split'] = split
-
-        # Aero - balanced around 40% front
-        aero = self.car_data.get('aero', {})
-        setup['aero'] = {
-            'front': int(aero.get('front', {}).get('current', 250)),
-            'rear': int(aero.get('rear', {}).get('current', 450))
-        }
-
-        # Philosophy and stability
-        setup['philosophy'] = f"{dt} {self.car_data.get('hp', 400)}HP Natural Frequency"
-        setup['stability'] = self.results['physics']['stability_index']
-
-        # Calculate expected performance gain from Performance Expectations table
-        setup['expected_gain'] = self._estimate_performance_gain()
-
-        return setup
-
-    def _estimate_performance_gain(self):
-        """Estimate performance gain using Performance Expectations reference table"""
-        # Base gain from frequency optimization (always present)
-        gain_min = 0.5
-        gain_max = 2.0
-
-        # Check for additional gains from specific optimizations
-        if self.results.get('telemetry_override'):
-            # Telemetry-driven frequency correction
-            gain_max += 0.5  # Can add 0.3-2.0s
-
-        if self.results.get('constraints', {}).get('severity', '').startswith('L3'):
-            # Significant constraints requiring compensation
-            gain_min += 0.2  # ARB/damper/diff recovery adds time
-
-        # Check for bottoming correction
-        if self.telemetry:
-            if 'individual_laps' in self.telemetry:
-                laps = self.telemetry['individual_laps']
-                if len(laps) > 0 and 'suspension_behavior' in laps[0]:
-                    susp_travel = laps[0]['suspension_behavior'].get('suspension_travel', {})
-                    max_values = [
-                        susp_travel.get('fl_max', 0),
-                        susp_travel.get('fr_max', 0),
-                        susp_travel.get('rl_max', 0),
-                        susp_travel.get('rr_max', 0)
-                    ]
-                    if any(v > 0.28 for v in max_values):
-                        # Ride height optimization
-                        gain_min += 0.3
-                        gain_max += 0.8
-
-        # Track type optimization
-        if self.track_type != 'balanced':
-            gain_min += 0.2
-            gain_max += 0.5  # Corner-type differential: 0.2-0.5s
-
-        return f"{gain_min:.1f}-{gain_max:.1f}s"
-
-    def _calculate_diff_settings(self):
-        """Calculate LSD settings using YAML Differential Baselines reference table"""
-        dt = self.car_data.get('drivetrain', 'FR')
-        hp = self.car_data.get('hp', 400)
-        has_front_diff = self.car_data.get('has_front_diff', False)
-
-        # Get baseline ranges from reference table (YAML lines 400-419)
-        baselines = self.differential_baselines.get(dt, self.differential_baselines['FR'])
-
-        # Use middle of range for each setting
-        base_initial = sum(baselines['initial']) / 2
-        base_accel = sum(baselines['accel']) / 2
-        base_brake = sum(baselines['brake']) / 2
-
-        # Power multipliers from YAML protocol (line 233)
-        mult_map = {
-            'FF': 0.035,
-            'FR': 0.03,
-            'MR': 0.025,
-            'RR': 0.025,
-            'AWD': 0.02
-        }
-        mult = mult_map.get(dt, 0.03)
-
-        # Calculate power-based adjustment using YAML formula (line 232)
-        power_add = int((hp - 300) * mult)
-
-        # Rear differential (primary)
-        rear_diff = {
-            'initial': int(min(60, max(5, base_initial + power_add // 3))),
-            'accel': int(min(60, max(5, base_accel + power_add))),
-            'brake': int(min(60, max(5, base_brake + power_add // 2)))
-        }
-
-        # Front differential (for AWD/4WD vehicles)
-        if has_front_diff:
-            # Front diff is typically more conservative (lower values)
-            # Use AWD baselines for front, scaled by 70-80%
-            front_baselines = self.differential_baselines['AWD']
-            front_base_initial = sum(front_baselines['initial']) / 2
-            front_base_accel = sum(front_baselines['accel']) / 2
-            front_base_brake = sum(front_baselines['brake']) / 2
-
-            # Front gets less power-based adjustment (60% of rear)
-            front_power_add = int(power_add * 0.6)
-
-            front_diff = {
-                'initial': int(min(60, max(5, front_base_initial + front_power_add // 3))),
-                'accel': int(min(60, max(5, front_base_accel + front_power_add))),
-                'brake': int(min(60, max(5, front_base_brake + front_power_add // 2)))
-            }
-
-            return {
-                'front': front_diff,
-                'rear': rear_diff
-            }
+            source = 'domain JSONs'
+            telemetry = self._load_domain_jsons(watch_folder)
+        if not telemetry:
+            print(f"  ! No usable telemetry in {source} - keeping the previous setup")
+            return session
+
+        if session is None:
+            session = SetupSession(self.model, self.car_data, telemetry)
+        elif telemetry == session.telemetry:
+            print(f"  • {source} content unchanged - setup not recomputed")
+            return session
         else:
-            # Return rear only for RWD/FWD vehicles
-            return rear_diff
+            session.update(telemetry=telemetry)
+        self.telemetry = telemetry
+        print(f"  ✓ Telemetry ({source}): {telemetry_data_points(telemetry)} data points")
+
+        track_types = self.ALL_TRACK_TYPES if self.track_type == 'all' else (self.track_type,)
+        track_results = {t: session.evaluate(t, self.conservative_ride_height) for t in track_types}
+        self.result = track_results[track_types[0]]
+        self.results = self.result.results
+        print(f"  ✓ Balance: {self.result.analysis['balance']} | Frequencies F/R: "
+              f"{self.result.frequencies['achievable']['front']:.2f}/{self.result.frequencies['achievable']['rear']:.2f} Hz")
+        for warning in self.result.warnings:
+            print(f"  ⚠ {warning}")
+
+        for track_type, result in track_results.items():
+            sheet = self.render_setup_sheet(self.car_data, result.setup)
+            path = self._output_path(output_path, session_folder, track_type, len(track_types) > 1)
+            self._save_sheet_with_diff(sheet, path)
+        if len(track_types) > 1:
+            comparison = self.render_comparison_table(self.car_data, {t: r.setup for t, r in track_results.items()})
+            self._save_sheet(comparison, self._output_path(output_path, session_folder, 'comparison', True),
+                             label="Comparison table")
+
+        print(f"  ⏱ Updated in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return session
+
+    def _load_domain_jsons(self, session_folder):
+        """Phase 1 domain JSONs from a session folder, as Phase A telemetry"""
+        domains = {}
+        for name in DOMAIN_NAMES:
+            try:
+                with open(Path(session_folder) / f"{name}.json", 'r') as f:
+                    domains[name] = json.load(f)
+            except FileNotFoundError:
+                continue
+            except json.JSONDecodeError as e:
+                print(f"  ! Warning: Error parsing {name}.json: {e}")
+        return telemetry_from_domains(domains)
+
+    def _save_sheet_with_diff(self, sheet, path):
+        """Rewrite a sheet; if it changed, write <sheet>.diff against the previous version"""
+        sheet_path = Path(path)
+        previous = sheet_path.read_text() if sheet_path.exists() else None
+        if previous == sheet:
+            print(f"  • Setup unchanged: {sheet_path}")
+            return
+        self._save_sheet(sheet, path)
+        if previous is None:
+            return
+
+        diff = ''.join(difflib.unified_diff(previous.splitlines(True), sheet.splitlines(True),
+                                            f"{sheet_path.name} (previous)", f"{sheet_path.name} (current)", n=0))
+        diff_path = sheet_path.with_suffix('.diff')
+        diff_path.write_text(diff)
+        for line in diff.splitlines():
+            if line[:1] in '+-' and line[:3] not in ('+++', '---'):
+                print(f"    {line}")
+        print(f"✓ Diff saved to: {diff_path}")
 
 
 def main():
@@ -1859,7 +472,17 @@ Examples:
   %(prog)s car_data.txt telemetry.json -o setup_sheet.txt
   %(prog)s car_data.txt telemetry.json -t high_speed
   %(prog)s car_data.txt telemetry.json -t technical -o technical_setup.txt
+  %(prog)s car_data.txt telemetry.json -t all -o setup.txt
+      Creates: setup_balanced.txt, setup_high_speed.txt, setup_technical.txt,
+               setup_comparison.txt (Phases A-C run once)
   %(prog)s car_data.txt telemetry.json --protocol custom_protocol.yaml
+  %(prog)s car_data.txt sessions/session_20251113_151156
+      Analyzes the session's lap CSVs in-process (per-lap results cached)
+
+Watch Mode:
+  %(prog)s car_data.txt --watch sessions/session_20251113_151156 -t technical
+      Regenerates Car_Name_technical_setup.txt (+ .diff vs the previous sheet)
+      whenever a lap CSV, telemetry_analysis_v3.json or a domain JSON is written
 
 Session Management:
   %(prog)s car_data.txt telemetry.json --auto-session
@@ -1877,27 +500,36 @@ Track Types:
                 -2%% damping, -1 rear ARB, -0.2° camber, 0° rear toe
                 -7 diff accel, +7 diff brake
   balanced    - Default balanced setup for mixed tracks
+  all         - All three sheets plus a side-by-side comparison table
 
 For more information, visit: https://github.com/yourrepo/claudetunes
         """
     )
 
     parser.add_argument('car_data', help='Path to car data file')
-    parser.add_argument('telemetry', help='Path to telemetry JSON file')
+    parser.add_argument('telemetry', nargs='?',
+                        help='Path to telemetry JSON file or a session folder of lap CSVs (not needed with --watch)')
     parser.add_argument('-o', '--output', help='Output file path (optional)')
     parser.add_argument('-s', '--session', help='Session folder for organized output (optional)')
     parser.add_argument('--auto-session', action='store_true',
                         help='Automatically create session folder with timestamp')
     parser.add_argument('-p', '--protocol', default='ClaudeTunes v8.5.3b.yaml',
                         help='Path to ClaudeTunes protocol YAML file')
-    parser.add_argument('-t', '--track-type', choices=['high_speed', 'technical', 'balanced'],
+    parser.add_argument('-t', '--track-type', choices=ClaudeTunesCLI.TRACK_TYPES + ('all',),
                         default='balanced',
-                        help='Track type for setup optimization (default: balanced)')
+                        help='Track type for setup optimization, or all three (default: balanced)')
     parser.add_argument('--conservative-ride-height', action='store_true',
                         help='Add 10mm buffer from minimum ride height to prevent suspension binding')
+    parser.add_argument('--watch', metavar='SESSION_FOLDER',
+                        help='Keep regenerating the setup as new telemetry lands in a session folder')
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help='Seconds of quiet that end a burst of writes in watch mode (default: 1.0)')
+    parser.add_argument('--poll', action='store_true', help='Watch by polling instead of inotify')
     parser.add_argument('-v', '--version', action='version', version='ClaudeTunes CLI v8.5.3b')
 
     args = parser.parse_args()
+    if not args.telemetry and not args.watch:
+        parser.error('the following arguments are required: telemetry (or --watch)')
 
     # Determine session folder
     session_folder = None
@@ -1916,8 +548,16 @@ For more information, visit: https://github.com/yourrepo/claudetunes
     try:
         cli = ClaudeTunesCLI(args.protocol, track_type=args.track_type,
                             conservative_ride_height=args.conservative_ride_height)
-        cli.run(args.car_data, args.telemetry, args.output, session_folder=session_folder)
+        if args.watch:
+            if not cli.watch(args.car_data, args.watch, args.output, session_folder, args.debounce,
+                             use_inotify=not args.poll):
+                sys.exit(1)
+        else:
+            cli.run(args.car_data, args.telemetry, args.output, session_folder=session_folder)
     except KeyboardInterrupt:
+        if args.watch:
+            print("\n\nStopped watching")
+            return
         print("\n\nInterrupted by user")
         sys.exit(1)
     except Exception as e:
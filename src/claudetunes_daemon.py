@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+ClaudeTunes Daemon - Long-running tuning service with a local JSON API
+
+Keeps the compiled protocol, the car library and recent telemetry in memory and
+answers setup requests from the engine (memoized per car/telemetry pair, so a
+track-type change only re-runs Phase D). The protocol YAML is watched and
+hot-reloaded when it changes.
+
+Usage:
+    python3 claudetunes_daemon.py --cars cars/ --telemetry session/telemetry_analysis_v3.json
+    python3 claudetunes_daemon.py --socket /tmp/claudetunes.sock
+
+API (JSON over HTTP/1.1, keep-alive):
+    GET  /health                      protocol version, library sizes, request stats
+    GET  /cars                        car library (id -> name)
+    POST /telemetry {"id": "spa", "telemetry": {...}}   or   {"id": "spa", "path": "analysis.json"}
+    POST /setup {"car": "laferrari", "telemetry": "spa", "track_type": "technical"}
+        car: library id / car name, or "car_data": "<car data file text>"
+        telemetry: stored id, {"path": ...} (reloaded when the file changes) or an inline dict
+        track_type: high_speed / technical / balanced / all; "sheet": true adds the setup sheet text
+    POST /reload                      re-read the protocol YAML now
+
+    curl -s localhost:8765/setup -d '{"car": "laferrari", "telemetry": "spa", "sheet": true}'
+    curl -s --unix-socket /tmp/claudetunes.sock http://x/health
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from claudetunes_cli import ClaudeTunesCLI
+from claudetunes_engine import SetupSession, TELEMETRY_PATHS, parse_car_data, telemetry_data_points
+from json_paths import extract_paths, path_tree
+from protocol_model import load_protocol_model, ProtocolError
+
+
+DEFAULT_PROTOCOL = str(Path(__file__).resolve().parent.parent / 'config' / 'protocol.yaml')  # symlink to the active version
+DEFAULT_PORT = 8765
+TELEMETRY_SCALARS = {'bottoming_detected', 'understeer_gradient'}  # the only non-object values the engine reads
+
+
+class RequestError(ValueError):
+    """Bad request (answered with HTTP 400)"""
+
+
+def check_telemetry(telemetry, tree=path_tree(TELEMETRY_PATHS), where='telemetry'):
+    """Raise RequestError unless every section the engine reads is an object (a list of objects when indexed)"""
+    for key, subtree in tree.items():
+        if isinstance(key, int):
+            if not isinstance(telemetry, list):
+                raise RequestError(f"'{where}' must be a list")
+            if key >= len(telemetry):
+                continue
+            name = f'{where}[{key}]'
+        else:
+            if key not in telemetry:
+                continue
+            name = f'{where}.{key}'
+        if key in TELEMETRY_SCALARS:
+            continue
+        value = telemetry[key]
+        indexed = subtree is not None and all(isinstance(child, int) for child in subtree)
+        if not isinstance(value, list if indexed else dict):
+            raise RequestError(f"'{name}' must be {'a list' if indexed else 'an object'}")
+        if subtree is not None:
+            check_telemetry(value, subtree, name)
+
+
+class TuningService:
+    """In-memory state shared by all client connections"""
+
+    MAX_TELEMETRY = 32   # stored / file telemetry sets kept (least recently used dropped)
+    MAX_SESSIONS = 128   # memoized car/telemetry sessions kept
+
+    def __init__(self, protocol_path, reload_interval=1.0):
+        self.protocol_path = protocol_path
+        self.reload_interval = reload_interval
+        self.model = load_protocol_model(protocol_path)
+        self._protocol_stat = self._stat(protocol_path)
+        self.reloads = 0
+        self.last_reload_error = None
+
+        self.cars = {}                       # id -> parsed car data
+        self.car_names = {}                  # lowercase car name -> id
+        self.telemetry = OrderedDict()       # key -> telemetry dict
+        self._telemetry_files = {}           # path -> (inode, mtime_ns, size)
+        self.sessions = OrderedDict()        # (car key, telemetry key) -> SetupSession
+
+        self.lock = threading.RLock()
+        self.started = time.time()
+        self.requests = 0
+        self.request_time_ns = 0
+        self._stop = threading.Event()
+
+    # ── Protocol hot reload ────────────────────────────────────
+
+    @staticmethod
+    def _stat(path):
+        stat = os.stat(path)  # follows symlinks: re-pointing protocol.yaml changes st_ino
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def reload_protocol(self, force=False):
+        """Reload the protocol if the YAML changed; True if a new model is in use"""
+        try:
+            current = self._stat(self.protocol_path)
+        except OSError as e:
+            self.last_reload_error = str(e)
+            return False
+        if not force and current == self._protocol_stat:
+            return False
+        self._protocol_stat = current
+
+        try:
+            model = load_protocol_model(self.protocol_path)
+        except (OSError, ProtocolError) as e:
+            self.last_reload_error = str(e)  # keep serving the previous model
+            print(f"⚠ Protocol reload failed, keeping v{self.model.version}: {e}")
+            return False
+
+        self.last_reload_error = None
+        if model is self.model:
+            return False
+        with self.lock:
+            self.model = model
+            for session in self.sessions.values():
+                session.update(model=model)
+        self.reloads += 1
+        print(f"✓ Protocol reloaded: v{model.version} ({model.source_sha256[:12]})")
+        return True
+
+    def watch_protocol(self):
+        """Background thread: poll the YAML's inode/mtime/size"""
+        while not self._stop.wait(self.reload_interval):
+            self.reload_protocol()
+
+    def stop(self):
+        self._stop.set()
+
+    # ── Car library / telemetry ────────────────────────────────
+
+    def load_car_library(self, patterns):
+        """Parse every car data file (id = file name without extension)"""
+        for pattern in patterns:
+            paths = glob.glob(os.path.join(pattern, '*.txt')) if os.path.isdir(pattern) else glob.glob(pattern)
+            for path in sorted(paths):
+                with open(path, 'r') as f:
+                    car_data = parse_car_data(f.read())
+                if 'name' not in car_data or 'drivetrain' not in car_data:
+                    continue  # not a car data file
+                car_id = Path(path).stem
+                self.cars[car_id] = car_data
+                self.car_names[car_data['name'].lower()] = car_id
+        return len(self.cars)
+
+    def store_telemetry(self, key, telemetry):
+        with self.lock:
+            self.telemetry[key] = telemetry
+            self.telemetry.move_to_end(key)
+            while len(self.telemetry) > self.MAX_TELEMETRY:
+                self.telemetry.popitem(last=False)
+
+    def _file_telemetry(self, path):
+        """Telemetry from a JSON file, re-read only when the file changes"""
+        key = f'file:{os.path.abspath(path)}'
+        try:
+            current = self._stat(path)
+        except OSError:
+            raise RequestError(f"Telemetry file '{path}' not found")
+        if self._telemetry_files.get(key) != current or key not in self.telemetry:
+            try:
+                telemetry = extract_paths(path, TELEMETRY_PATHS)
+            except json.JSONDecodeError as e:
+                raise RequestError(f"Error parsing telemetry JSON: {e}")
+            self.store_telemetry(key, telemetry)
+            self._telemetry_files[key] = current
+        return key, self.telemetry[key]
+
+    def _resolve_car(self, request):
+        if 'car_data' in request:
+            text = request['car_data']
+            car_data = parse_car_data(text)
+            if 'name' not in car_data:
+                raise RequestError("car_data has no CAR NAME section")
+            return 'inline:' + hashlib.sha1(text.encode()).hexdigest(), car_data
+        car = request.get('car')
+        if car is None:
+            raise RequestError("Request needs 'car' or 'car_data'")
+        car_id = car if car in self.cars else self.car_names.get(str(car).lower())
+        if car_id is None:
+            raise RequestError(f"Unknown car '{car}'")
+        return car_id, self.cars[car_id]
+
+    def _resolve_telemetry(self, request):
+        telemetry = request.get('telemetry')
+        if telemetry is None:
+            return None, {}
+        if isinstance(telemetry, str):
+            if telemetry not in self.telemetry:
+                raise RequestError(f"Unknown telemetry '{telemetry}'")
+            self.telemetry.move_to_end(telemetry)
+            return telemetry, self.telemetry[telemetry]
+        if isinstance(telemetry, dict) and set(telemetry) == {'path'}:
+            return self._file_telemetry(telemetry['path'])
+        if isinstance(telemetry, dict):
+            check_telemetry(telemetry)
+            return None, telemetry  # inline: used once, not memoized
+        raise RequestError("'telemetry' must be an id, {\"path\": ...} or a telemetry object")
+
+    # ── Requests ───────────────────────────────────────────────
+
+    def setup(self, request):
+        """Answer a setup request (see module docstring)"""
+        track_type = request.get('track_type', 'balanced')
+        if track_type != 'all' and track_type not in ClaudeTunesCLI.TRACK_TYPES:
+            raise RequestError(f"Unknown track type '{track_type}'")
+        conservative = bool(request.get('conservative_ride_height', False))
+
+        track_types = ClaudeTunesCLI.ALL_TRACK_TYPES if track_type == 'all' else (track_type,)
+
+        with self.lock:
+            car_key, car_data = self._resolve_car(request)
+            telemetry_key, telemetry = self._resolve_telemetry(request)
+            if telemetry_key is None:
+                session = SetupSession(self.model, car_data, telemetry)
+            else:
+                session = self._session(car_key, car_data, telemetry_key, telemetry)
+            results = {t: session.evaluate(t, conservative) for t in track_types}
+
+        response = {'protocol': self.model.version}
+        for t, result in results.items():
+            entry = result.to_dict()
+            if request.get('sheet'):
+                entry['sheet'] = ClaudeTunesCLI.render_setup_sheet(car_data, result.setup)
+            response[t] = entry
+        if track_type == 'all' and request.get('sheet'):
+            response['comparison'] = ClaudeTunesCLI.render_comparison_table(
+                car_data, {t: r.setup for t, r in results.items()})
+        return response
+
+    def _session(self, car_key, car_data, telemetry_key, telemetry):
+        """Memoized session for a car/telemetry pair (caller holds the lock)"""
+        key = (car_key, telemetry_key)
+        session = self.sessions.get(key)
+        if session is None:
+            session = self.sessions[key] = SetupSession(self.model, car_data, telemetry)
+            while len(self.sessions) > self.MAX_SESSIONS:
+                self.sessions.popitem(last=False)
+        else:
+            session.update(car_data=car_data, telemetry=telemetry)
+            self.sessions.move_to_end(key)
+        return session
+
+    def add_telemetry(self, request):
+        key = request.get('id')
+        if not key or not isinstance(key, str):
+            raise RequestError("Request needs a telemetry 'id'")
+        if 'path' in request:
+            _, telemetry = self._file_telemetry(request['path'])
+        elif isinstance(request.get('telemetry'), dict):
+            telemetry = request['telemetry']
+            check_telemetry(telemetry)
+        else:
+            raise RequestError("Request needs 'telemetry' (object) or 'path'")
+        self.store_telemetry(key, telemetry)
+        return {'id': key, 'data_points': telemetry_data_points(telemetry)}
+
+    def health(self):
+        return {
+            'status': 'ok',
+            'protocol': {'version': self.model.version, 'sha256': self.model.source_sha256,
+                         'path': self.protocol_path, 'reloads': self.reloads,
+                         'last_reload_error': self.last_reload_error},
+            'cars': len(self.cars),
+            'telemetry': list(self.telemetry),
+            'sessions': len(self.sessions),
+            'requests': self.requests,
+            'avg_request_us': round(self.request_time_ns / self.requests / 1000, 1) if self.requests else 0.0,
+            'uptime_s': round(time.time() - self.started, 1)
+        }
+
+    def handle(self, method, path, request):
+        """Route one API call; returns the JSON-ready response"""
+        routes = {
+            ('GET', '/health'): lambda: self.health(),
+            ('GET', '/cars'): lambda: {car_id: data['name'] for car_id, data in self.cars.items()},
+            ('POST', '/setup'): lambda: self.setup(request),
+            ('POST', '/telemetry'): lambda: self.add_telemetry(request),
+            ('POST', '/reload'): lambda: {'reloaded': self.reload_protocol(force=True),
+                                          'version': self.model.version},
+        }
+        route = routes.get((method, path.split('?')[0].rstrip('/') or '/'))
+        if route is None:
+            raise LookupError(f"No route for {method} {path}")
+        return route()
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    """JSON request/response over HTTP/1.1 (persistent connections)"""
+
+    protocol_version = 'HTTP/1.1'
+    verbose = False
+
+    def do_GET(self):
+        self._dispatch('GET', None)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b'{}'
+        try:
+            request = json.loads(body)
+        except json.JSONDecodeError as e:
+            self._send(400, {'error': f"Invalid JSON: {e}"})
+            return
+        if not isinstance(request, dict):
+            self._send(400, {'error': 'Request body must be a JSON object'})
+            return
+        self._dispatch('POST', request)
+
+    def _dispatch(self, method, request):
+        service = self.server.service
+        started = time.perf_counter_ns()
+        try:
+            status, response = 200, service.handle(method, self.path, request or {})
+        except LookupError as e:
+            status, response = 404, {'error': str(e)}
+        except RequestError as e:
+            status, response = 400, {'error': str(e)}
+        except Exception as e:
+            status, response = 500, {'error': f"{type(e).__name__}: {e}"}
+        self._send(status, response)
+        elapsed = time.perf_counter_ns() - started
+        with service.lock:  # one handler thread per connection
+            service.requests += 1
+            service.request_time_ns += elapsed
+
+    def _send(self, status, response):
+        body = json.dumps(response, separators=(',', ':')).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def setup(self):
+        # Headers and body are separate writes: without TCP_NODELAY each keep-alive
+        # response stalls ~40 ms on Nagle + delayed ACK (Unix sockets have no Nagle)
+        self.disable_nagle_algorithm = isinstance(self.client_address, tuple)
+        super().setup()
+
+    def address_string(self):
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, host='127.0.0.1', port=DEFAULT_PORT, socket_path=None):
+    """HTTP server on localhost or a Unix socket, one thread per connection"""
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = ThreadingUnixHTTPServer(socket_path, APIHandler)
+    else:
+        server = ThreadingHTTPServer((host, port), APIHandler)
+        server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ClaudeTunes - tuning daemon (local JSON API)')
+    parser.add_argument('-p', '--protocol', default=DEFAULT_PROTOCOL, help='Path to ClaudeTunes protocol YAML file')
+    parser.add_argument('--cars', nargs='*', default=[], help='Car data files, globs or folders to preload')
+    parser.add_argument('--telemetry', nargs='*', default=[],
+                        help='Telemetry JSON files to preload (id = file name without extension)')
+    parser.add_argument('--host', default='127.0.0.1', help='Listen address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Listen port (default: {DEFAULT_PORT})')
+    parser.add_argument('--socket', help='Listen on a Unix socket instead of TCP')
+    parser.add_argument('--reload-interval', type=float, default=1.0,
+                        help='Seconds between protocol YAML change checks (default: 1.0)')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    args = parser.parse_args()
+
+    try:
+        service = TuningService(args.protocol, args.reload_interval)
+        service.load_car_library(args.cars)
+        for path in args.telemetry:
+            service.add_telemetry({'id': Path(path).stem, 'path': path})
+        server = make_server(service, args.host, args.port, args.socket)
+    except (OSError, ProtocolError, RequestError) as e:
+        print(f"❌ {e}")
+        return False
+
+    APIHandler.verbose = args.verbose
+    threading.Thread(target=service.watch_protocol, daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))  # clean up like Ctrl-C
+    where = args.socket or f"http://{args.host}:{args.port}"
+    print(f"✅ ClaudeTunes daemon v{service.model.version} listening on {where}")
+    print(f"   {len(service.cars)} cars, {len(service.telemetry)} telemetry sets; watching {args.protocol}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping daemon")
+    finally:
+        service.stop()
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+    return True
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,1867 @@
+#!/usr/bin/env python3
+"""
+ClaudeTunes Engine - Quiet setup computation
+Version 8.5.3a-lite-hybrid
+
+Runs the ClaudeTunes protocol phases (A: telemetry analysis, B: physics chain,
+C: constraints/compensation, D: setup parameters) on already-parsed inputs and
+returns a SetupResult. Nothing is printed or read from disk: the narrative the
+CLI shows is recorded in SetupResult.log and rendered by claudetunes_cli.py.
+
+    from claudetunes_engine import generate_setup, parse_car_data
+    from protocol_model import load_protocol_model
+
+    model = load_protocol_model('config/ClaudeTunes_v8.5.3c.yaml')
+    result = generate_setup(parse_car_data(car_text), telemetry, model, 'technical')
+    result.setup['arb'], result.frequencies['achievable'], result.warnings
+"""
+
+import math
+from functools import cached_property
+
+
+TRACK_TYPES = ('high_speed', 'technical', 'balanced')
+
+
+# ═══════════════════════════════════════════════════════════
+# CAR DATA PARSING
+# ═══════════════════════════════════════════════════════════
+
+def parse_car_data(text):
+    """Parse car data file contents into structured format"""
+    data = {}
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+
+        if line == "CAR NAME":
+            data['name'] = lines[i + 1]
+            i += 2
+        elif line == "DRIVETRAIN":
+            data['drivetrain'] = lines[i + 1]
+            i += 2
+        elif line == "POWER OUTPUT AND WEIGHT":
+            parts = lines[i + 1].split()
+            data['hp'] = int(parts[0])
+            data['torque'] = int(parts[2])
+            data['weight'] = int(parts[4])
+            data['balance'] = lines[i + 1].split('balance')[0].split(',')[1].strip()
+            i += 2
+        elif line == "TIRE COMPOUND":
+            data['tire_compound'] = lines[i + 1]
+            i += 2
+        elif line == "CENTER OF GRAVITY HEIGHT":
+            cg_line = lines[i + 1] if i + 1 < len(lines) else "450"
+            # Parse CG height in mm (e.g., "450 mm" or just "450")
+            data['cg_height'] = float(cg_line.replace('mm', '').strip())
+            i += 2
+        elif line == "SUSPENSION SETUP Front/Rear":
+            # Parse ranges
+            data['ranges'] = {}
+            i += 1
+        elif line == "BODY HEIGHT ADJUSTMENT":
+            range_line = lines[i + 2] if i + 2 < len(lines) else ""
+            if "range:" in range_line:
+                data['ranges']['ride_height'] = _parse_range(range_line)
+            i += 3
+        elif line.startswith("NATURAL FREQUENCY"):
+            range_line = lines[i + 1] if i + 1 < len(lines) else ""
+            if "range:" in range_line:
+                data['ranges']['frequency'] = _parse_range(range_line)
+            i += 2
+        elif line == "ARB":
+            data['ranges']['arb'] = {'front': (1, 10), 'rear': (1, 10)}
+            i += 2
+        elif line == "DIFFERENTIAL GEAR SETTINGS":
+            data['ranges']['diff'] = {'min': 5, 'max': 60}
+            # Parse front and rear differential current values
+            # Format: "Front: 0/0/0 (range: 5 to 60 for all values)"
+            # Format: "Rear: 10/20/30 (range: 5 to 60 for all values)"
+            # Note: 0/0/0 means fully open diff (minimum locking), NOT "no diff"
+            # Only absence of "Front:" line means no front differential
+            if i + 1 < len(lines):
+                front_line = lines[i + 1]
+                if "Front:" in front_line:
+                    # Has a front differential (even if values are 0/0/0)
+                    data['has_front_diff'] = True
+                else:
+                    data['has_front_diff'] = False
+            # Parse torque split
+            if i + 4 < len(lines) and "TORQUE SPLIT" in lines[i + 4]:
+                data['torque_split'] = lines[i + 5] if i + 5 < len(lines) else "0:100"
+                i += 6
+            else:
+                data['torque_split'] = "0:100"
+                i += 3
+        elif line == "AERODYNAMICS":
+            if i + 2 < len(lines):
+                front_line = lines[i + 2]
+                rear_line = lines[i + 3] if i + 3 < len(lines) else ""
+                data['aero'] = {
+                    'front': _parse_aero_line(front_line),
+                    'rear': _parse_aero_line(rear_line)
+                }
+            i += 4
+        else:
+            i += 1
+
+    return data
+
+
+def _parse_range(line):
+    """Parse range string like 'range: front: 2.50-3.40 hz rear: 2.60-3.50 hz'"""
+    result = {}
+    parts = line.split('range:')[1].strip()
+
+    if 'front:' in parts and 'rear:' in parts:
+        front_part = parts.split('front:')[1].split('rear:')[0].strip()
+        rear_part = parts.split('rear:')[1].strip()
+
+        result['front'] = _extract_range(front_part)
+        result['rear'] = _extract_range(rear_part)
+
+    return result
+
+
+def _extract_range(text):
+    """Extract (min, max) from text like '2.50-3.40 hz' or '85-140mm'"""
+    # Remove units and parentheses
+    text = text.replace('mm', '').replace('hz', '').replace('°', '').replace(')', '').replace('(', '').strip()
+    if '-' in text:
+        parts = text.split('-')
+        return (float(parts[0]), float(parts[1]))
+    return (0, 0)
+
+
+def _parse_aero_line(line):
+    """Parse aero line like 'front) current-xxx (range: min-250 max 350)' or 'front) current 25 (range: min 0 max 100)'"""
+    if 'range:' in line:
+        range_part = line.split('range:')[1].strip()
+        # Handle both "min-250" and "min 250" formats
+        if 'min-' in range_part:
+            min_val = int(range_part.split('min-')[1].split()[0])
+        elif 'min ' in range_part:
+            min_val = int(range_part.split('min ')[1].split()[0])
+        else:
+            min_val = 0
+
+        if 'max' in range_part:
+            max_val = int(range_part.split('max')[1].strip().rstrip(')'))
+        else:
+            max_val = 0
+
+        return {'min': min_val, 'max': max_val, 'current': (min_val + max_val) / 2}
+    return {'min': 0, 'max': 0, 'current': 0}
+
+
+def telemetry_data_points(telemetry):
+    """Data point count for any telemetry format (shown in Phase A)"""
+    return TelemetryView(telemetry).data_points
+
+
+# Phase 1 logger output: one JSON per domain in the session folder
+DOMAIN_NAMES = ('metadata', 'suspension', 'tires', 'aero', 'drivetrain', 'balance')
+
+
+def telemetry_from_domains(domains):
+    """
+    Phase 1 domain JSONs (domain name -> parsed JSON) as the telemetry
+    structure Phase A reads (same fields as dev/phase1/claudetunes_cli_phase1.py)
+    """
+    telemetry = {}
+
+    # Suspension data (from suspension.json)
+    if 'suspension' in domains and 'travel_mm' in domains['suspension']:
+        travel_data = domains['suspension']['travel_mm']
+        telemetry['suspension_travel'] = {
+            'FL': travel_data.get('FL', {}).get('samples', []),
+            'FR': travel_data.get('FR', {}).get('samples', []),
+            'RL': travel_data.get('RL', {}).get('samples', []),
+            'RR': travel_data.get('RR', {}).get('samples', [])
+        }
+
+    # Measured ride frequency (online zero-crossing estimate from the logger)
+    if 'suspension' in domains and domains['suspension'].get('ride_frequency_hz'):
+        telemetry['ride_frequency'] = domains['suspension']['ride_frequency_hz']
+
+    # Balance data (from balance.json)
+    yaw_ratio = domains.get('balance', {}).get('stability_metrics', {}).get('yaw_ratio_avg')
+    if yaw_ratio is not None:
+        # Measured / kinematic yaw rate: 1.0 = neutral, <1 = understeer, >1 = oversteer
+        # Scaled so 0.8 lands on the Neutral/Moderate boundary (gradient 2)
+        telemetry['balance'] = {
+            'understeer_gradient': (1.0 - yaw_ratio) * 10,
+            'yaw_ratio': yaw_ratio
+        }
+    elif 'balance' in domains and 'weight_transfer' in domains['balance']:
+        # Older sessions: no yaw data, fall back to lateral G approximation
+        lateral_g = domains['balance']['weight_transfer'].get('lateral_g', {})
+        telemetry['balance'] = {
+            'understeer_gradient': lateral_g.get('avg', 0) * 2  # Simple conversion
+        }
+
+    # Tire temperature data (from tires.json)
+    if 'tires' in domains and 'temps_celsius' in domains['tires']:
+        temps_data = domains['tires']['temps_celsius']
+        telemetry['tire_summary'] = {
+            'temperature_averages': {
+                'fl': temps_data.get('FL', {}).get('avg', 0),
+                'fr': temps_data.get('FR', {}).get('avg', 0),
+                'rl': temps_data.get('RL', {}).get('avg', 0),
+                'rr': temps_data.get('RR', {}).get('avg', 0)
+            }
+        }
+
+    return telemetry
+
+
+# gt7_2r.py session summary sections the phases read (besides the first lap)
+ANALYSIS_SECTIONS = ('suspension_summary', 'tire_slip_analysis', 'tire_summary')
+
+
+def telemetry_from_analysis(summary):
+    """
+    The part of a gt7_2r.py session summary the phases read: the session-wide
+    sections above plus individual_laps[0] (later laps are never looked at)
+    """
+    telemetry = {section: summary[section] for section in ANALYSIS_SECTIONS if section in summary}
+    if summary.get('individual_laps'):
+        telemetry['individual_laps'] = summary['individual_laps'][:1]
+    return telemetry
+
+
+# ═══════════════════════════════════════════════════════════
+# TELEMETRY VIEW
+# ═══════════════════════════════════════════════════════════
+
+CORNERS = ('FL', 'FR', 'RL', 'RR')
+
+# What TelemetryView reads, as json_paths.extract_paths() paths - telemetry files
+# are loaded with only these, so long analyzer sessions are not decoded whole
+ANALYSIS_PATHS = (
+    'suspension_summary.corner_compression_avg',
+    'tire_slip_analysis.balance_analysis',
+    'tire_slip_analysis.phase_slip_analysis',
+    'tire_summary.temperature_averages',
+    'individual_laps[0].lap_summary',
+    'individual_laps[0].suspension_behavior',
+    'individual_laps[0].tire_analysis',
+    'individual_laps[0].platform_dynamics',
+)
+TELEMETRY_PATHS = ('suspension_travel', 'balance.understeer_gradient', 'tire_temps', 'bottoming_detected') + ANALYSIS_PATHS
+
+
+class TelemetryView:
+    """
+    Read-only, format-independent access to one telemetry dict
+
+    The supported formats (sample_telemetry.json / Phase 1 domain JSONs,
+    gt7_2r.py analyzer output, its session summary) are probed here and
+    nowhere else. Each property is computed on first access and cached, so
+    the phases and every track type evaluated on the same view share the work.
+    Properties are None when the telemetry has no such data (unless noted).
+    """
+
+    def __init__(self, telemetry):
+        self.raw = telemetry or {}
+
+    def __bool__(self):
+        return bool(self.raw)
+
+    @cached_property
+    def first_lap(self):
+        """individual_laps[0] (gt7_2r.py format; later laps are never read)"""
+        laps = self.raw.get('individual_laps') or []
+        return laps[0] if laps else None
+
+    @cached_property
+    def suspension_behavior(self):
+        lap = self.first_lap
+        if lap is None or 'suspension_behavior' not in lap:
+            return None
+        return lap['suspension_behavior']
+
+    @cached_property
+    def _lap_travel(self):
+        """First lap's suspension_travel stats ({} without them)"""
+        return (self.suspension_behavior or {}).get('suspension_travel', {})
+
+    @cached_property
+    def data_points(self):
+        """Data point count (shown in Phase A)"""
+        if 'suspension_travel' in self.raw:
+            return len(self.raw.get('suspension_travel', {}))
+        if 'individual_laps' in self.raw:
+            laps = self.raw.get('individual_laps', [])
+            if self.first_lap is not None and 'lap_summary' in self.first_lap:
+                return self.first_lap['lap_summary'].get('total_data_points', len(laps))
+            return len(laps)
+        return 0
+
+    @cached_property
+    def corner_compression(self):
+        """Average compression per corner {FL, FR, RL, RR} (m)"""
+        # Format 1: Direct suspension_travel arrays (sample_telemetry.json format)
+        travel = self.raw.get('suspension_travel')
+        if isinstance(travel, dict) and isinstance(travel.get('FL'), list):
+            return {
+                corner: sum(travel.get(corner, [0])) / max(len(travel.get(corner, [1])), 1)
+                for corner in CORNERS
+            }
+
+        # Format 2: gt7_2r.py format - individual_laps[0].suspension_behavior.suspension_travel
+        if self.suspension_behavior is not None:
+            return {corner: self._lap_travel.get(f'{corner.lower()}_avg', 0) for corner in CORNERS}
+
+        # Format 3: Summary format
+        if 'suspension_summary' in self.raw:
+            corners = self.raw['suspension_summary'].get('corner_compression_avg', {})
+            return {corner: corners.get(corner.lower(), 0) for corner in CORNERS}
+        return None
+
+    @cached_property
+    def max_travel(self):
+        """
+        Max travel per corner ({} without analyzer laps) - the analyzer's
+        spike-filtered max, or the raw max for files written before it had one.
+        Every bottoming / travel-limit check reads this (or peak_travel).
+        """
+        if self.first_lap is None:
+            return {}
+        return {
+            corner: self._lap_travel.get(f'{corner.lower()}_max_filtered',
+                                         self._lap_travel.get(f'{corner.lower()}_max', 0))
+            for corner in CORNERS
+        }
+
+    @cached_property
+    def peak_travel(self):
+        """max_travel as a list [FL, FR, RL, RR] (zeros without analyzer laps)"""
+        return [self.max_travel.get(corner, 0) for corner in CORNERS]
+
+    @cached_property
+    def min_body_height(self):
+        """Spike-filtered min body height, or the raw min for older analyzer files"""
+        behavior = self.suspension_behavior or {}
+        return behavior.get('min_body_height_filtered', behavior.get('min_body_height', None))
+
+    @cached_property
+    def ride_frequency(self):
+        """Measured {'front', 'rear', ...} ride frequency in Hz (Phase 1 domain JSONs only)"""
+        measured = self.raw.get('ride_frequency')
+        if isinstance(measured, dict) and measured.get('front') and measured.get('rear'):
+            return measured
+        return None
+
+    @cached_property
+    def bottoming_flag(self):
+        """Legacy direct bottoming_detected flag"""
+        return self.raw.get('bottoming_detected', False)
+
+    @cached_property
+    def understeer_gradient(self):
+        """balance.understeer_gradient (sample / Phase 1 format)"""
+        return self.raw.get('balance', {}).get('understeer_gradient', None)
+
+    @cached_property
+    def slip_balance(self):
+        """(balance_metric, tendency) from gt7_2r.py tire_slip_analysis.balance_analysis"""
+        if 'tire_slip_analysis' not in self.raw:
+            return None
+        slip_balance = self.raw['tire_slip_analysis'].get('balance_analysis', {})
+        return slip_balance.get('balance_metric', None), slip_balance.get('tendency', '')
+
+    @cached_property
+    def phase_slip(self):
+        """(front braking slip, rear acceleration slip) ratios, 1.0 = no slip"""
+        if 'tire_slip_analysis' not in self.raw:
+            return None
+        phase_slip = self.raw['tire_slip_analysis'].get('phase_slip_analysis', {})
+        return (phase_slip.get('braking', {}).get('front_avg_slip', 1.0),
+                phase_slip.get('acceleration', {}).get('rear_avg_slip', 1.0))
+
+    @cached_property
+    def tire_temps_imo(self):
+        """Inner/middle/outer temps keyed FL_I, FL_M, FL_O, ... (sample_telemetry.json)"""
+        return self.raw.get('tire_temps') if 'tire_temps' in self.raw else None
+
+    @cached_property
+    def summary_tire_temps(self):
+        """Session average temp per corner {fl, fr, rl, rr} (tire_summary)"""
+        if 'tire_summary' not in self.raw:
+            return None
+        temps = self.raw['tire_summary'].get('temperature_averages', {})
+        return {corner: temps.get(corner, 0) for corner in ('fl', 'fr', 'rl', 'rr')}
+
+    @cached_property
+    def axle_tire_temps(self):
+        """(front, rear) average temps when there are no I/M/O temps: first lap, else tire_summary"""
+        if self.tire_temps_imo is not None:
+            return None
+        if 'individual_laps' in self.raw:
+            lap = self.first_lap
+            if lap is None or 'tire_analysis' not in lap:
+                return None
+            temps = lap['tire_analysis'].get('temperatures', {})
+            return ((temps.get('fl_avg', 0) + temps.get('fr_avg', 0)) / 2,
+                    (temps.get('rl_avg', 0) + temps.get('rr_avg', 0)) / 2)
+        temps = self.summary_tire_temps
+        if temps is None:
+            return None
+        return (temps['fl'] + temps['fr']) / 2, (temps['rl'] + temps['rr']) / 2
+
+    @cached_property
+    def platform_stability(self):
+        """(pitch, roll) coefficient of variation from the first lap's platform_dynamics"""
+        lap = self.first_lap
+        if lap is None or 'platform_dynamics' not in lap:
+            return None
+        platform = lap['platform_dynamics']
+        return platform.get('pitch_stability', 0), platform.get('roll_stability', 0)
+
+
+# ═══════════════════════════════════════════════════════════
+# RESULT
+# ═══════════════════════════════════════════════════════════
+
+class SetupResult:
+    """Everything one engine run produced (read attributes, or to_dict() for JSON)"""
+
+    __slots__ = (
+        'car_name',
+        'track_type',
+        'frequencies',      # base / target / achievable / measured Hz and stability index
+        'physics',          # Phase B breakdown (bias, power, CG, aero adders, roll center, car class)
+        'constraints',      # Phase C severity, achievable %, deficits
+        'compensation',     # ARB / damper / diff compensation (empty when not needed)
+        'setup',            # every GT7 setup parameter (what the sheet shows)
+        'analysis',         # Phase A suspension / balance / tire diagnosis / cross-validation
+        'reasons',          # why the base frequency was overridden from telemetry
+        'recommendations',  # cross-validation recommendations
+        'warnings',         # warning messages (deduplicated, no formatting)
+        'log',              # ((phase, line), ...) narrative in CLI order
+        'results',          # raw per-step results dict
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def to_dict(self):
+        """JSON-ready view (without the raw results and log)"""
+        return {name: getattr(self, name) for name in self.__slots__ if name not in ('log', 'results')}
+
+
+# ═══════════════════════════════════════════════════════════
+# ENGINE
+# ═══════════════════════════════════════════════════════════
+
+class SetupEngine:
+    """One ClaudeTunes run over parsed inputs; state lives only as long as the run"""
+
+    PERFORMANCE_EXPECTATIONS = {
+        'frequency_corrections': '0.3-2.0s',
+        'drivetrain_architecture_fixes': '2.0-5.0s when bias wrong',
+        'ride_height_optimization': '0.3-0.8s through CG/geometry',
+        'cg_improvement': '5-8% per 25mm reduction',
+        'corner_type_differential': '0.2-0.5s track-specific'
+    }
+
+    # Stage name, log phase, method, inputs / upstream stages it depends on (topological order)
+    STAGES = (
+        ('analysis', 'A', 'phase_a_analysis', ('telemetry',)),
+        ('physics', 'B', 'phase_b_physics_chain', ('car_data', 'telemetry', 'model')),
+        ('constraints', 'C', 'phase_c_constraints', ('physics', 'car_data')),
+        ('setup', 'D', 'phase_d_setup', ('analysis', 'physics', 'constraints', 'car_data', 'telemetry', 'model',
+                                         'track_type', 'conservative_ride_height')),
+    )
+
+    def __init__(self, car_data, telemetry, model, track_type="balanced", conservative_ride_height=False):
+        """
+        Args:
+            car_data: Parsed car data (parse_car_data)
+            telemetry: Telemetry dict (sample or gt7_2r.py analyzer format; {} if none),
+                or a TelemetryView of one to share its cached properties across runs
+            model: Compiled ProtocolModel
+            track_type: 'high_speed', 'technical' or 'balanced'
+            conservative_ride_height: Add 10mm buffer from minimum ride height
+        """
+        self.car_data = car_data
+        self.view = telemetry if isinstance(telemetry, TelemetryView) else TelemetryView(telemetry)
+        self.telemetry = self.view.raw
+        self.model = model
+        self.track_type = track_type
+        self.conservative_ride_height = conservative_ride_height
+        self.gt7_downforce_database = model.downforce_database
+        self.differential_baselines = model.differential_baselines
+
+        self.results = {}
+        self.log = []
+        self.warnings = []
+        self._phase = None
+
+    def _log(self, line):
+        self.log.append((self._phase, line))
+
+    def _warn(self, line):
+        """Log a ⚠ line and record its message"""
+        self._log(line)
+        message = line.strip().lstrip('⚠').strip()
+        for prefix in ('WARNING: ', 'Warning: '):
+            if message.startswith(prefix):
+                message = message[len(prefix):]
+        if message not in self.warnings:
+            self.warnings.append(message)
+
+    def run(self):
+        """Run phases A-D and return the SetupResult"""
+        for name, _, _, _ in self.STAGES:
+            self.run_stage(name)
+        return build_result(self.car_data, self.track_type, self.results, self.warnings, self.log)
+
+    def run_stage(self, name):
+        """
+        Run one stage on top of the results already in self.results
+
+        Returns:
+            (results added by the stage, its log lines, its new warnings)
+        """
+        phase, method = next((phase, method) for stage, phase, method, _ in self.STAGES if stage == name)
+        known = set(self.results)
+        log_start, warning_start = len(self.log), len(self.warnings)
+
+        self._phase = phase
+        getattr(self, method)()
+        self._phase = None
+
+        added = {key: value for key, value in self.results.items() if key not in known}
+        return added, tuple(self.log[log_start:]), tuple(self.warnings[warning_start:])
+
+    # ═══════════════════════════════════════════════════════════
+    # PHASE A: TELEMETRY ANALYSIS
+    # ═══════════════════════════════════════════════════════════
+
+    def phase_a_analysis(self):
+        """Phase A: Analyze suspension/balance/tires and cross-validate them"""
+        self._analyze_suspension()
+        self._analyze_balance()
+        self._analyze_tires()
+
+        # Cross-validate all Phase A analyses (YAML protocol requirement)
+        self._cross_validate_phase_a()
+
+    def _analyze_suspension(self):
+        """Analyze suspension travel patterns from telemetry"""
+        avg_compression = self.view.corner_compression
+
+        if avg_compression is None or all(v == 0 for v in avg_compression.values()):
+            self._log("  ! No suspension data in telemetry")
+            self.results['suspension_analysis'] = "No telemetry data"
+            return
+
+        # Calculate averages per axle and per side
+        front_avg = (avg_compression['FL'] + avg_compression['FR']) / 2
+        rear_avg = (avg_compression['RL'] + avg_compression['RR']) / 2
+        left_avg = (avg_compression['FL'] + avg_compression['RL']) / 2
+        right_avg = (avg_compression['FR'] + avg_compression['RR']) / 2
+
+        # Per-corner analysis
+        max_corner = max(avg_compression.items(), key=lambda x: x[1])
+        min_corner = min(avg_compression.items(), key=lambda x: x[1])
+
+        max_travel = self.view.max_travel
+
+        # Diagnose front vs rear
+        if front_avg > rear_avg + 0.01:
+            fr_interp = f"Front softer (+{(front_avg - rear_avg) * 1000:.0f}mm)"
+        elif rear_avg > front_avg + 0.01:
+            fr_interp = f"Rear softer (+{(rear_avg - front_avg) * 1000:.0f}mm)"
+        else:
+            fr_interp = "F/R balanced"
+
+        # Diagnose left vs right (lateral balance)
+        if left_avg > right_avg + 0.005:
+            lr_interp = f"Left softer (+{(left_avg - right_avg) * 1000:.0f}mm)"
+        elif right_avg > left_avg + 0.005:
+            lr_interp = f"Right softer (+{(right_avg - left_avg) * 1000:.0f}mm)"
+        else:
+            lr_interp = "L/R balanced"
+
+        # Check for bottoming vs suspension at travel limits
+        # We distinguish between two scenarios:
+        # 1. Chassis bottoming (body_height very low) = suspension too soft
+        # 2. Suspension maxed (high travel but body_height OK) = suspension too stiff
+
+        chassis_bottoming_corners = []
+        suspension_maxed_corners = []
+        min_body_height = self.view.min_body_height
+
+        # Threshold for chassis bottoming (15mm is dangerously low)
+        CHASSIS_BOTTOMING_THRESHOLD = 0.015  # 15mm
+
+        if max_travel:
+            for corner, max_val in max_travel.items():
+                if max_val > 0.28:  # Suspension travel exceeds threshold
+                    severity = "SEVERE" if max_val > 0.30 else ""
+                    corner_str = f"{corner}:{max_val*1000:.0f}mm {severity}".strip()
+
+                    # Check if this is chassis bottoming or suspension maxing out
+                    if min_body_height is not None and min_body_height < CHASSIS_BOTTOMING_THRESHOLD:
+                        # Chassis is hitting the ground - suspension too soft
+                        chassis_bottoming_corners.append(corner_str)
+                    else:
+                        # Suspension hitting travel limits but chassis has clearance - suspension too stiff
+                        suspension_maxed_corners.append(corner_str)
+
+        # Legacy support: combine both for backwards compatibility
+        bottoming_corners = chassis_bottoming_corners + suspension_maxed_corners
+
+        self.results['suspension_analysis'] = {
+            'front_compression': front_avg,
+            'rear_compression': rear_avg,
+            'left_compression': left_avg,
+            'right_compression': right_avg,
+            'per_corner': avg_compression,
+            'max_travel': max_travel,
+            'min_body_height': min_body_height,
+            'chassis_bottoming_corners': chassis_bottoming_corners,
+            'suspension_maxed_corners': suspension_maxed_corners,
+            'bottoming_corners': bottoming_corners,  # Legacy
+            'fr_interpretation': fr_interp,
+            'lr_interpretation': lr_interp,
+            'softest_corner': max_corner[0],
+            'stiffest_corner': min_corner[0]
+        }
+
+        self._log(f"  • Suspension travel:")
+        self._log(f"    F/R: {fr_interp}")
+        self._log(f"    L/R: {lr_interp}")
+
+        # Improved diagnostics output
+        if chassis_bottoming_corners:
+            self._warn(f"    ⚠ Chassis bottoming: {', '.join(chassis_bottoming_corners)}")
+            if min_body_height is not None:
+                self._log(f"      Min body height: {min_body_height*1000:.0f}mm (too low!)")
+
+        if suspension_maxed_corners:
+            self._warn(f"    ⚠ Suspension at travel limits: {', '.join(suspension_maxed_corners)}")
+            if min_body_height is not None:
+                self._log(f"      Min body height: {min_body_height*1000:.0f}mm (chassis clearance OK)")
+
+        self._log(f"    Softest: {max_corner[0]} ({max_corner[1]*1000:.0f}mm avg)")
+
+    def _analyze_balance(self):
+        """Analyze understeer/oversteer balance from telemetry"""
+        gradient = self.view.understeer_gradient
+
+        # gt7_2r.py format: tire_slip_analysis balance metric and tendency
+        if gradient is None and self.view.slip_balance is not None:
+            balance_metric, tendency = self.view.slip_balance
+
+            # Convert balance_metric to understeer gradient approximation
+            # Negative balance_metric means rear slip > front slip = oversteer
+            # Positive means understeer
+            if balance_metric is not None:
+                # Scale from [-0.1, 0.1] to understeer gradient [-2, 6]
+                gradient = -balance_metric * 40  # Rough conversion
+
+                self._log(f"  • Balance: {tendency} (metric: {balance_metric:.3f})")
+                self.results['balance'] = tendency
+                return
+
+        if gradient is None:
+            self.results['balance'] = "Neutral (no telemetry)"
+            self._log("  ! No balance data in telemetry")
+            return
+
+        if gradient < 0:
+            classification = "Oversteer"
+        elif gradient <= 2:
+            classification = "Neutral"
+        elif gradient <= 4:
+            classification = "Moderate Understeer"
+        else:
+            classification = "Severe Understeer"
+
+        self.results['balance'] = classification
+        self._log(f"  • Balance: {classification} (gradient: {gradient:.2f})")
+
+    def _analyze_tires(self):
+        """Analyze tire temperature patterns"""
+        temps = None
+        diagnosis = []
+
+        # Inner/middle/outer temps (sample_telemetry.json)
+        if self.view.tire_temps_imo is not None:
+            temps = self.view.tire_temps_imo
+            if temps.get('FL_O', 0) > temps.get('FL_I', 0) + 5:
+                diagnosis.append("Hot front-outside → understeer")
+            if temps.get('RL_O', 0) > temps.get('RL_I', 0) + 5:
+                diagnosis.append("Hot rear-outside → oversteer")
+
+        # Axle averages (gt7_2r.py first lap or tire_summary)
+        elif self.view.axle_tire_temps is not None:
+            front_avg, rear_avg = self.view.axle_tire_temps
+
+            if rear_avg > front_avg + 3:
+                diagnosis.append(f"Rear tires hotter ({rear_avg:.1f}°C vs {front_avg:.1f}°C)")
+            elif front_avg > rear_avg + 3:
+                diagnosis.append(f"Front tires hotter ({front_avg:.1f}°C vs {rear_avg:.1f}°C)")
+            else:
+                diagnosis.append(f"Balanced temps (F:{front_avg:.1f}°C R:{rear_avg:.1f}°C)")
+
+        if not diagnosis:
+            diagnosis = ["No tire data"]
+
+        self.results['tire_diagnosis'] = diagnosis
+        self._log(f"  • Tires: {', '.join(self.results['tire_diagnosis'])}")
+
+    def _cross_validate_phase_a(self):
+        """
+        Cross-validate suspension + balance + tire temps (YAML Protocol Phase A requirement)
+        Synthesizes all three analyses to provide comprehensive diagnosis and recommendations
+        """
+        if not self.view:
+            return
+
+        # Skip if we don't have all three components
+        if ('suspension_analysis' not in self.results or
+            self.results['suspension_analysis'] == "No telemetry data"):
+            return
+
+        # Extract key data points
+        susp = self.results.get('suspension_analysis', {})
+        balance = self.results.get('balance', 'Unknown')
+        tire_diag = self.results.get('tire_diagnosis', [])
+
+        # Build cross-validation insights
+        insights = []
+        recommendations = []
+
+        # Get numeric values for correlation
+        front_comp = susp.get('front_compression', 0)
+        rear_comp = susp.get('rear_compression', 0)
+        left_comp = susp.get('left_compression', 0)
+        right_comp = susp.get('right_compression', 0)
+
+        # CORRELATION 1: Suspension compliance vs Balance vs Tire temps
+        # Example: Rear softer + Oversteer + Rear temps higher = consistent diagnosis
+
+        # Check if rear is softer
+        rear_softer = rear_comp > front_comp + 0.01
+        front_softer = front_comp > rear_comp + 0.01
+
+        # Check balance
+        is_oversteer = "Oversteer" in balance
+        is_understeer = "Understeer" in balance
+        is_neutral = "Neutral" in balance
+
+        # Check tire temps (simplified - looking for "hotter" keywords)
+        rear_hotter = any("Rear tires hotter" in d for d in tire_diag)
+        front_hotter = any("Front tires hotter" in d for d in tire_diag)
+        temps_balanced = any("Balanced temps" in d for d in tire_diag)
+
+        # PATTERN 1: Rear softer + Neutral/Oversteer + Rear temps higher
+        if rear_softer and (is_neutral or is_oversteer) and rear_hotter:
+            insights.append("⚠ Rear softer + Balance neutral/oversteer + Rear temps higher")
+            insights.append("  → Diagnosis: Rear suspension compliant, rear working harder")
+            recommendations.append("Consider +0.05-0.10 Hz front to balance load distribution")
+
+        # PATTERN 2: Front softer + Understeer + Front temps higher
+        elif front_softer and is_understeer and front_hotter:
+            insights.append("⚠ Front softer + Understeer + Front temps higher")
+            insights.append("  → Diagnosis: Front suspension compliant, front overworked")
+            recommendations.append("Consider +0.05-0.10 Hz rear to shift load rearward")
+
+        # PATTERN 3: Mismatch - rear softer but understeer
+        elif rear_softer and is_understeer:
+            insights.append("⚠ Rear softer BUT understeer present")
+            insights.append("  → Diagnosis: Rear compliance good, but ARB/diff causing push")
+            recommendations.append("Check ARB balance (may need softer front ARB)")
+            recommendations.append("Check diff accel sensitivity (may be too high)")
+
+        # PATTERN 4: Mismatch - front softer but oversteer
+        elif front_softer and is_oversteer:
+            insights.append("⚠ Front softer BUT oversteer present")
+            insights.append("  → Diagnosis: Front compliance good, but rear ARB/diff causing loose")
+            recommendations.append("Check ARB balance (may need softer rear ARB)")
+            recommendations.append("Check diff accel sensitivity (may be too low)")
+
+        # PATTERN 5: All aligned (ideal)
+        elif (rear_softer and is_neutral and rear_hotter) or (is_neutral and "Balanced temps" in str(tire_diag)):
+            insights.append("✓ Suspension + Balance + Temps aligned")
+            insights.append("  → Diagnosis: Setup fundamentally sound")
+
+        # CORRELATION 2: Lateral balance (L vs R)
+        left_softer = left_comp > right_comp + 0.005
+        right_softer = right_comp > left_comp + 0.005
+
+        if left_softer or right_softer:
+            side = "left" if left_softer else "right"
+            diff_mm = abs(left_comp - right_comp) * 1000
+            insights.append(f"⚠ Lateral imbalance: {side} softer by {diff_mm:.0f}mm")
+            recommendations.append(f"Check {side} spring rates or track banking effects")
+
+        # CORRELATION 3: Chassis bottoming vs suspension maxed out
+        chassis_bottoming = susp.get('chassis_bottoming_corners', [])
+        suspension_maxed = susp.get('suspension_maxed_corners', [])
+        min_body_height = susp.get('min_body_height', None)
+
+        # Handle chassis bottoming (suspension too soft)
+        if chassis_bottoming:
+            insights.append(f"⚠ Chassis bottoming: {', '.join(chassis_bottoming)}")
+            if min_body_height is not None:
+                insights.append(f"  → Min body height: {min_body_height*1000:.0f}mm (chassis hitting ground!)")
+
+            rear_bottoming = any('RL' in corner or 'RR' in corner for corner in chassis_bottoming)
+            front_bottoming = any('FL' in corner or 'FR' in corner for corner in chassis_bottoming)
+            all_corners = rear_bottoming and front_bottoming
+
+            if all_corners:
+                insights.append("  → All corners bottoming = suspension globally too soft")
+                recommendations.append("Increase frequency by +0.15-0.30 Hz (already applied via telemetry override)")
+            elif rear_bottoming:
+                insights.append("  → Rear bottoming = excessive rear compliance")
+                recommendations.append("Increase rear frequency by +0.15-0.30 Hz (already applied via telemetry override)")
+            elif front_bottoming:
+                insights.append("  → Front bottoming = excessive front compliance")
+                recommendations.append("Increase front frequency by +0.15-0.30 Hz (already applied via telemetry override)")
+
+        # Handle suspension at travel limits (suspension too stiff)
+        if suspension_maxed:
+            insights.append(f"⚠ Suspension at travel limits: {', '.join(suspension_maxed)}")
+            if min_body_height is not None:
+                insights.append(f"  → Min body height: {min_body_height*1000:.0f}mm (chassis clearance OK)")
+
+            rear_maxed = any('RL' in corner or 'RR' in corner for corner in suspension_maxed)
+            front_maxed = any('FL' in corner or 'FR' in corner for corner in suspension_maxed)
+            all_corners = rear_maxed and front_maxed
+
+            if all_corners:
+                insights.append("  → All corners maxing travel = suspension globally too stiff")
+                recommendations.append("Decrease frequency by -0.15-0.30 Hz (already applied via telemetry override)")
+            elif rear_maxed:
+                insights.append("  → Rear maxing travel = rear too stiff")
+                recommendations.append("Decrease rear frequency by -0.15-0.30 Hz (already applied via telemetry override)")
+            elif front_maxed:
+                insights.append("  → Front maxing travel = front too stiff")
+                recommendations.append("Decrease front frequency by -0.15-0.30 Hz (already applied via telemetry override)")
+
+        # Store results
+        if insights or recommendations:
+            self.results['cross_validation'] = {
+                'insights': insights,
+                'recommendations': recommendations
+            }
+
+            self._log("\n  ━━━ Cross-Validation (Suspension + Balance + Temps) ━━━")
+            for insight in insights:
+                self._log(f"  {insight}")
+            if recommendations:
+                self._log(f"\n  📋 Recommendations:")
+                for rec in recommendations:
+                    self._log(f"    • {rec}")
+
+    # ═══════════════════════════════════════════════════════════
+    # PHASE B: PHYSICS CHAIN
+    # ═══════════════════════════════════════════════════════════
+
+    def phase_b_physics_chain(self):
+        """Calculate optimal frequencies using ClaudeTunes methodology"""
+
+        # 1. Base frequency from tire compound
+        base_freq = compound_freq = self._get_base_frequency()
+        self._log(f"  • Base frequency ({self.car_data['tire_compound']}): {base_freq:.2f} Hz")
+
+        # 1b. TELEMETRY OVERRIDE: Adjust base frequency based on anomalies
+        telemetry_adjustment = self._get_telemetry_frequency_override()
+        if telemetry_adjustment != 0:
+            base_freq += telemetry_adjustment
+            reasons = self.results.get('telemetry_override', {}).get('reasons', [])
+            reason_str = ", ".join(reasons) if reasons else "telemetry anomalies"
+            self._log(f"  ⚡ Telemetry override: {telemetry_adjustment:+.2f} Hz (adjusted to {base_freq:.2f} Hz)")
+            self._log(f"    Reason: {reason_str}")
+
+        # 2. Apply drivetrain bias
+        dt_bias = self._get_drivetrain_bias()
+        front_freq = base_freq + dt_bias['front']
+        rear_freq = base_freq + dt_bias['rear']
+        self._log(f"  • Drivetrain bias ({self.car_data['drivetrain']}): F+{dt_bias['front']:.2f} R+{dt_bias['rear']:.2f}")
+
+        # 3. Power platform control
+        power_add = self._get_power_adder()
+        front_freq += power_add
+        rear_freq += power_add
+        self._log(f"  • Power platform ({self.car_data['hp']} HP): +{power_add:.2f} Hz")
+
+        # 4. CG height adjustments
+        cg_add = self._get_cg_adjustment()
+        front_freq += cg_add
+        rear_freq += cg_add
+        if cg_add != 0:
+            self._log(f"  • CG height adjustment ({self.car_data.get('cg_height', 450):.0f}mm): {cg_add:+.2f} Hz")
+
+        # 5. Aero adders (minimal in GT7)
+        aero_add = self._get_aero_adder()
+        front_freq += aero_add
+        rear_freq += aero_add
+        self._log(f"  • Aero adjustment: +{aero_add:.2f} Hz")
+
+        # 6. Calculate roll center compensation
+        self.results['roll_center'] = self._calculate_roll_center()
+
+        # 7. Calculate stability index
+        stability = (rear_freq - front_freq) / front_freq
+
+        self.results['physics'] = {
+            'front_frequency': front_freq,
+            'rear_frequency': rear_freq,
+            'stability_index': stability,
+            'compound_frequency': compound_freq,
+            'base_frequency': base_freq,  # after telemetry override
+            'telemetry_adjustment': telemetry_adjustment,
+            'drivetrain_bias': dt_bias,
+            'power_add': power_add,
+            'cg_add': cg_add,
+            'aero_add': aero_add
+        }
+
+        self._log(f"  ✓ Target: F={front_freq:.2f} Hz | R={rear_freq:.2f} Hz | Stability={stability:.2f}")
+
+        # Compare against what the car actually did on track (Phase 1 domain JSONs)
+        measured = self.view.ride_frequency
+        if measured is not None:
+            self.results['physics']['measured_frequency'] = {
+                'front': measured['front'],
+                'rear': measured['rear'],
+                'front_delta': measured['front'] - front_freq,
+                'rear_delta': measured['rear'] - rear_freq
+            }
+            self._log(f"  • Measured: F={measured['front']:.2f} Hz ({measured['front'] - front_freq:+.2f}) | "
+                      f"R={measured['rear']:.2f} Hz ({measured['rear'] - rear_freq:+.2f})")
+
+        # Safety check
+        if stability > 0:
+            self._warn("  ⚠ WARNING: Positive stability (oversteer tendency)")
+        elif stability < -1.0:
+            self._warn("  ⚠ WARNING: Extreme understeer (<-1.00)")
+
+    def _get_base_frequency(self):
+        """Get base frequency from tire compound (YAML-driven)"""
+        # YAML: phase_B.base_frequency_by_compound (lines 86-98), precompiled with normalized aliases
+        compound = self.car_data.get('tire_compound', 'Racing Hard').strip()
+        base_freq = self.model.base_frequency(compound)
+        if base_freq is not None:
+            return base_freq
+
+        # If still no match, default to Racing Hard
+        default_freq = self.model.default_compound_hz
+        self._warn(f"  ⚠ Warning: Unknown tire compound '{compound}', defaulting to Racing Hard ({default_freq} Hz)")
+        return default_freq
+
+    def _get_telemetry_frequency_override(self):
+        """
+        Analyze telemetry anomalies and override base frequency if needed.
+        Returns adjustment in Hz (positive = stiffen, negative = soften)
+        """
+        if not self.view:
+            return 0.0
+
+        adjustment = 0.0
+        reasons = []
+
+        # ANOMALY 1: Chassis bottoming vs suspension at travel limits
+        # This is the critical fix: we need to distinguish between:
+        # - Chassis bottoming (body_height very low) = suspension too soft → need stiffer (+Hz)
+        # - Suspension maxed (high travel but body_height OK) = suspension too stiff → need softer (-Hz)
+        if self.view.suspension_behavior is not None:
+            min_body_height = self.view.min_body_height
+            max_values = self.view.peak_travel
+
+            # Threshold for chassis bottoming (15mm is dangerously low)
+            CHASSIS_BOTTOMING_THRESHOLD = 0.015  # 15mm
+
+            # Check if we have high suspension travel
+            has_severe_travel = any(v > 0.30 for v in max_values)
+            has_moderate_travel = any(v > 0.28 for v in max_values)
+
+            if has_severe_travel or has_moderate_travel:
+                # Determine if this is chassis bottoming or suspension maxing out
+                if min_body_height is not None and min_body_height < CHASSIS_BOTTOMING_THRESHOLD:
+                    # CHASSIS BOTTOMING - suspension too soft, need to stiffen
+                    if has_severe_travel:
+                        adjustment += 0.30
+                        reasons.append("severe chassis bottoming")
+                    else:
+                        adjustment += 0.15
+                        reasons.append("moderate chassis bottoming")
+                else:
+                    # SUSPENSION AT TRAVEL LIMITS - suspension too stiff, need to soften
+                    if has_severe_travel:
+                        adjustment -= 0.30
+                        reasons.append("severe suspension travel limit (too stiff)")
+                    else:
+                        adjustment -= 0.15
+                        reasons.append("moderate suspension travel limit (too stiff)")
+
+        # ANOMALY 2: Excessive slip (suspension too stiff or soft)
+        if self.view.phase_slip is not None:
+            front_brake_slip, rear_accel_slip = self.view.phase_slip
+
+            # Braking phase: Front locking excessively (too stiff compression)
+            if front_brake_slip < 0.85:  # >15% slip = locking
+                adjustment -= 0.10
+                reasons.append("front brake locking")
+
+            # Acceleration phase: Rear wheelspin (too soft or diff issue)
+            if rear_accel_slip > 1.10:  # >10% slip = wheelspin
+                adjustment += 0.10
+                reasons.append("rear wheelspin")
+
+        # ANOMALY 3: Extreme tire temperature imbalance (camber/frequency mismatch)
+        if self.view.summary_tire_temps is not None:
+            tire_temps = self.view.summary_tire_temps
+            fl, fr, rl, rr = tire_temps['fl'], tire_temps['fr'], tire_temps['rl'], tire_temps['rr']
+
+            front_avg = (fl + fr) / 2 if (fl and fr) else 0
+            rear_avg = (rl + rr) / 2 if (rl and rr) else 0
+
+            # Rear massively hotter (>5°C) = rear working too hard (too soft front?)
+            if rear_avg > front_avg + 5:
+                adjustment += 0.10
+                reasons.append("rear overheating")
+            # Front massively hotter (>5°C) = front working too hard (too soft rear?)
+            elif front_avg > rear_avg + 5:
+                adjustment -= 0.05  # Less aggressive, might be aero
+                reasons.append("front overheating")
+
+        # ANOMALY 4: Platform instability (pitch/roll variance)
+        if self.view.platform_stability is not None:
+            pitch_stability, roll_stability = self.view.platform_stability
+
+            # High pitch instability (>0.05 CoV) = too soft
+            if pitch_stability > 0.05:
+                adjustment += 0.15
+                reasons.append("pitch instability")
+
+            # High roll instability (>0.05 CoV) = ARB too soft (but freq related)
+            if roll_stability > 0.05:
+                adjustment += 0.10
+                reasons.append("roll instability")
+
+        # Log the telemetry-based adjustment
+        if adjustment != 0.0 and reasons:
+            self.results['telemetry_override'] = {
+                'adjustment_hz': adjustment,
+                'reasons': reasons
+            }
+
+        return round(adjustment, 2)
+
+    def _get_drivetrain_bias(self):
+        """Calculate drivetrain-specific frequency bias (YAML-driven)"""
+        # YAML: phase_B.drivetrain_bias (lines 100-108); AWD variants resolved by the model
+        return self.model.drivetrain_bias(self.car_data.get('drivetrain', 'FR'))
+
+    def _get_power_adder(self):
+        """Calculate power platform frequency adder using power-to-weight ratio"""
+        hp = self.car_data.get('hp', 400)
+        weight_lbs = self.car_data.get('weight', 3000)
+
+        # Get base frequency
+        base_freq = self._get_base_frequency()
+
+        # Calculate power-to-weight ratio (HP per lb)
+        power_to_weight = hp / weight_lbs
+
+        # Reference ratio: 0.154 HP/lb (typical balanced sports car: 400HP / 2600lbs)
+        # This is the baseline where no power adjustment is needed
+        reference_ratio = 0.154
+
+        # Formula: Base × (sqrt(PWR / reference_ratio) - 1.0)
+        # - Cars above reference ratio get positive adjustment (need stiffer springs)
+        # - Cars below reference ratio get negative adjustment (can use softer springs)
+        # - Square root provides diminishing returns at very high PWR
+        pwr_multiplier = math.sqrt(power_to_weight / reference_ratio)
+        adder = base_freq * (pwr_multiplier - 1.0)
+
+        # High absolute power brackets for very powerful cars
+        # (Even heavy cars with 850+ HP need some extra stiffness)
+        if hp > 850:
+            adder += 0.2
+        elif hp > 700:
+            adder += 0.1
+
+        return max(0, adder)
+
+    def _get_cg_adjustment(self):
+        """Calculate CG height frequency adjustment (YAML-driven)"""
+        # YAML: phase_B.cg_adjustments (lines 127-131)
+        cg_height = self.car_data.get('cg_height', 450)  # Default to standard
+        cg_adjustments = self.model.cg_adjustments
+
+        # High CG (>500mm)
+        if cg_height > 500:
+            return cg_adjustments['high']
+
+        # Very low CG (<400mm)
+        elif cg_height < 400:
+            return cg_adjustments['very_low']
+
+        # Standard CG (400-500mm)
+        else:
+            return cg_adjustments['standard']
+
+    def _calculate_roll_center(self):
+        """Calculate roll center height using YAML protocol formula (YAML-driven)"""
+        # YAML: phase_B.roll_center_compensation (lines 133-143)
+        cg_height = self.car_data.get('cg_height', 450)
+        dt = self.car_data.get('drivetrain', 'FR')
+        aero = self.car_data.get('aero', {})
+        total_df = aero.get('front', {}).get('current', 0) + aero.get('rear', {}).get('current', 0)
+
+        # Determine DF level multiplier (YAML: phase_B.roll_center_compensation, precompiled)
+        df_multipliers = self.model.roll_center_df_multipliers
+        if total_df > 1200:
+            # High: "0.25–0.30" → use middle
+            df_mult = df_multipliers['high']
+        elif total_df > 500:
+            # Moderate: "0.20–0.25" → use middle
+            df_mult = df_multipliers['moderate']
+        else:
+            # Low: "0.15–0.20" → use middle
+            df_mult = df_multipliers['low']
+
+        # Apply drivetrain-specific adjustments from YAML
+        dt_mult_map = self.model.roll_center_layout
+
+        # Use average of DF and drivetrain multipliers
+        final_mult = (df_mult + dt_mult_map.get(dt, 0.20)) / 2
+        rc_height = final_mult * cg_height
+
+        return {
+            'multiplier': final_mult,
+            'height': rc_height,
+            'cg_height': cg_height
+        }
+
+    def _get_aero_adder(self):
+        """Calculate aero frequency adder using GT7 Downforce Database"""
+        aero = self.car_data.get('aero', {})
+        total_df = aero.get('front', {}).get('current', 0) + aero.get('rear', {}).get('current', 0)
+
+        # Classify car using GT7 Downforce Database
+        car_class = None
+        for class_name, data in self.gt7_downforce_database.items():
+            df_min, df_max = data['df_range']
+            if df_min <= total_df <= df_max:
+                car_class = class_name
+                freq_min, freq_max = data['freq_add']
+                # Use middle of range for balanced approach
+                aero_adder = (freq_min + freq_max) / 2
+
+                # Store classification for reference
+                self.results['car_class'] = {
+                    'class': class_name,
+                    'downforce': total_df,
+                    'expected_impact': data['gt7_impact']
+                }
+
+                return aero_adder
+
+        # Fallback for unclassified (shouldn't happen with our ranges)
+        if total_df > 2000:
+            return 0.4
+        elif total_df > 1200:
+            return 0.25
+        elif total_df > 500:
+            return 0.15
+        else:
+            return 0.0
+
+    # ═══════════════════════════════════════════════════════════
+    # PHASE C: CONSTRAINT EVALUATION
+    # ═══════════════════════════════════════════════════════════
+
+    def phase_c_constraints(self):
+        """Evaluate constraints and apply compensation"""
+        target_front = self.results['physics']['front_frequency']
+        target_rear = self.results['physics']['rear_frequency']
+
+        ranges = self.car_data.get('ranges', {}).get('frequency', {})
+        front_range = ranges.get('front', (0, 10))
+        rear_range = ranges.get('rear', (0, 10))
+
+        # Preserve drivetrain frequency bias when constraining (CRITICAL for MR/FR/RR/etc)
+        # Option 3: Shift both equally to reach minimum, maintaining absolute differential
+        original_differential = target_rear - target_front  # e.g., 3.32 - 3.22 = +0.10 Hz
+
+        # Check if either target violates constraints
+        front_needs_shift = max(0, front_range[0] - target_front)  # How much to shift up if below min
+        rear_needs_shift = max(0, rear_range[0] - target_rear)
+        front_over_max = max(0, target_front - front_range[1])    # How much to shift down if above max
+        rear_over_max = max(0, target_rear - rear_range[1])
+
+        # Determine the shift needed (use the largest constraint violation)
+        shift_up = max(front_needs_shift, rear_needs_shift)
+        shift_down = max(front_over_max, rear_over_max)
+
+        if shift_up > 0:
+            # Both frequencies need to shift up to meet minimum
+            achievable_front = target_front + shift_up
+            achievable_rear = target_rear + shift_up
+        elif shift_down > 0:
+            # Both frequencies need to shift down to meet maximum
+            achievable_front = target_front - shift_down
+            achievable_rear = target_rear - shift_down
+        else:
+            # No shift needed, targets are within range
+            achievable_front = target_front
+            achievable_rear = target_rear
+
+        # Final safety clamp (in case one shifted value still exceeds the other limit)
+        achievable_front = min(max(achievable_front, front_range[0]), front_range[1])
+        achievable_rear = min(max(achievable_rear, rear_range[0]), rear_range[1])
+
+        # Verify we preserved the differential (within rounding tolerance)
+        final_differential = achievable_rear - achievable_front
+        if abs(final_differential - original_differential) > 0.01:
+            self._warn(f"  ⚠ Warning: Frequency differential changed from {original_differential:.2f} to {final_differential:.2f} Hz")
+
+        # Calculate deficits
+        front_deficit = target_front - achievable_front
+        rear_deficit = target_rear - achievable_rear
+
+        # Calculate severity
+        front_pct = (achievable_front / target_front * 100) if target_front > 0 else 100
+        rear_pct = (achievable_rear / target_rear * 100) if target_rear > 0 else 100
+        avg_achievable = (front_pct + rear_pct) / 2
+
+        severity = self._classify_severity(avg_achievable)
+
+        self.results['constraints'] = {
+            'severity': severity,
+            'achievable_front': achievable_front,
+            'achievable_rear': achievable_rear,
+            'front_deficit': front_deficit,
+            'rear_deficit': rear_deficit,
+            'achievable_pct': avg_achievable
+        }
+
+        self._log(f"  • Achievable: {avg_achievable:.1f}% | Severity: {severity}")
+
+        if front_deficit > 0.1 or rear_deficit > 0.1:
+            self._log(f"  • Applying ARB/damper compensation...")
+            self._apply_compensation()
+
+    def _classify_severity(self, pct):
+        """Classify constraint severity level"""
+        if pct >= 90:
+            return "L1 (Full Optimization)"
+        elif pct >= 75:
+            return "L2 (Moderate Constraints)"
+        elif pct >= 60:
+            return "L3 (Significant Constraints)"
+        elif pct >= 45:
+            return "L4 (Severe Constraints)"
+        else:
+            return "L5 (Critical Constraints)"
+
+    def _apply_compensation(self):
+        """Apply ARB/damper/diff compensation for frequency deficits"""
+        front_deficit = self.results['constraints']['front_deficit']
+        rear_deficit = self.results['constraints']['rear_deficit']
+        total_deficit = max(front_deficit, rear_deficit)
+
+        # ARB compensation: +1 level ≈ 0.15 Hz recovery
+        self.results['arb_compensation'] = {
+            'front': min(3, int(front_deficit / 0.15)),
+            'rear': min(3, int(rear_deficit / 0.15))
+        }
+
+        # Damper compensation: +10% compression, +15% rebound
+        self.results['damper_compensation'] = {
+            'compression_add': 10 if (front_deficit > 0.2 or rear_deficit > 0.2) else 0,
+            'expansion_add': 15 if (front_deficit > 0.2 or rear_deficit > 0.2) else 0
+        }
+
+        # Differential compensation per YAML: Accel +10-15, Initial +5, Brake +5
+        # Recovery: 0.08 Hz per 10-point change
+        if total_deficit > 0.3:
+            diff_accel_add = min(15, int(total_deficit / 0.08) * 10)
+            diff_initial_add = 5 if total_deficit > 0.4 else 0
+            diff_brake_add = 5 if total_deficit > 0.4 else 0
+
+            self.results['diff_compensation'] = {
+                'accel': diff_accel_add,
+                'initial': diff_initial_add,
+                'brake': diff_brake_add,
+                'recovery_hz': (diff_accel_add / 10) * 0.08
+            }
+        else:
+            self.results['diff_compensation'] = {
+                'accel': 0,
+                'initial': 0,
+                'brake': 0,
+                'recovery_hz': 0.0
+            }
+
+        self._log(f"    ARB: +{self.results['arb_compensation']['front']}F / +{self.results['arb_compensation']['rear']}R")
+        self._log(f"    Dampers: +{self.results['damper_compensation']['compression_add']}% comp, +{self.results['damper_compensation']['expansion_add']}% exp")
+
+        if self.results['diff_compensation']['accel'] > 0:
+            self._log(f"    Diff: +{self.results['diff_compensation']['initial']} initial, +{self.results['diff_compensation']['accel']} accel, +{self.results['diff_compensation']['brake']} brake (recovery: {self.results['diff_compensation']['recovery_hz']:.2f} Hz)")
+
+    # ═══════════════════════════════════════════════════════════
+    # PHASE D: SETUP PARAMETERS
+    # ═══════════════════════════════════════════════════════════
+
+    def phase_d_setup(self):
+        """Phase D: Every GT7 setup parameter (track type / ride height mode apply only here)"""
+        self.results['setup'] = self._calculate_complete_setup()
+
+    def _calculate_complete_setup(self):
+        """Calculate all setup parameters following ClaudeTunes protocol"""
+        setup = {}
+
+        # Get common parameters used throughout
+        dt = self.car_data.get('drivetrain', 'FR')
+        hp = self.car_data.get('hp', 400)
+        cg_height = self.car_data.get('cg_height', 450)
+
+        # Frequencies (from Phase B, constrained from Phase C)
+        setup['frequency'] = {
+            'front': self.results['constraints']['achievable_front'],
+            'rear': self.results['constraints']['achievable_rear']
+        }
+
+        # Ride height - lowest available with positive rake
+        # Check for CHASSIS bottoming detection from telemetry (multiple format support)
+        # IMPORTANT: Only raise ride height for CHASSIS bottoming, not suspension at travel limits
+        # Format 1: Direct bottoming_detected flag (legacy)
+        chassis_bottoming_detected = self.view.bottoming_flag
+
+        # Format 2: gt7_2r.py format - distinguish chassis bottoming from suspension maxed
+        if not chassis_bottoming_detected and self.view.suspension_behavior is not None:
+            min_body_height = self.view.min_body_height
+
+            # Threshold for chassis bottoming (15mm is dangerously low)
+            CHASSIS_BOTTOMING_THRESHOLD = 0.015  # 15mm
+
+            # Only flag as chassis bottoming if BOTH conditions are met:
+            # 1. High suspension travel (>0.28m)
+            # 2. Low body height (<15mm)
+            if any(v > 0.28 for v in self.view.peak_travel):
+                if min_body_height is not None and min_body_height < CHASSIS_BOTTOMING_THRESHOLD:
+                    chassis_bottoming_detected = True
+                # If body_height is OK, this is suspension maxed, NOT chassis bottoming
+                # DO NOT raise ride height in this case!
+
+        ride_ranges = self.car_data.get('ranges', {}).get('ride_height', {})
+
+        # Calculate ride height offset
+        # Priority: chassis bottoming detection > conservative mode > aggressive (minimum)
+        if chassis_bottoming_detected:
+            ride_height_offset = 10
+        elif self.conservative_ride_height:
+            ride_height_offset = 10
+        else:
+            ride_height_offset = 0
+
+        setup['ride_height'] = {
+            'front': int(ride_ranges.get('front', (85, 140))[0]) + ride_height_offset,  # Minimum + offset
+            'rear': int(ride_ranges.get('rear', (110, 165))[0]) + 5 + ride_height_offset  # Minimum + rake + offset
+        }
+
+        if chassis_bottoming_detected:
+            self._warn(f"  ⚠ Chassis bottoming detected in telemetry - ride height raised by {ride_height_offset}mm")
+        elif self.conservative_ride_height:
+            self._log(f"  ℹ Conservative ride height mode: +{ride_height_offset}mm buffer from minimum")
+
+        # ARB - base calculation + compensation + track type per YAML
+        base_arb_f = int(setup['frequency']['front'] * 2.5)
+        base_arb_r = int(setup['frequency']['rear'] * 2.5)
+
+        # Drivetrain adjustments per YAML (line 246)
+        # FF/FR: +1F, MR: -1R, RR: +1R, AWD: +0.5F
+        dt_arb_adj_f = 0
+        dt_arb_adj_r = 0
+        if dt == 'FF' or dt == 'FR':
+            dt_arb_adj_f = 1  # Front-biased drivetrains get stiffer front ARB
+        elif dt == 'MR':
+            dt_arb_adj_r = -1  # MR gets softer rear ARB for traction
+        elif dt == 'RR':
+            dt_arb_adj_r = 1  # RR gets stiffer rear ARB for stability
+        elif dt == 'AWD':
+            dt_arb_adj_f = 1  # AWD gets slight front bias (0.5 rounded to 1)
+
+        # Track type adjustments
+        track_arb_adj_f = 0
+        track_arb_adj_r = 0
+        if self.track_type == 'high_speed':
+            track_arb_adj_f = 1  # +1 both for high-speed
+            track_arb_adj_r = 1
+        elif self.track_type == 'technical':
+            track_arb_adj_r = -1  # -1 rear for technical rotation
+
+        arb_comp = self.results.get('arb_compensation', {'front': 0, 'rear': 0})
+
+        setup['arb'] = {
+            'front': min(10, max(1, base_arb_f + dt_arb_adj_f + track_arb_adj_f + arb_comp['front'])),
+            'rear': min(10, max(1, base_arb_r + dt_arb_adj_r + track_arb_adj_r + arb_comp['rear']))
+        }
+
+        # Damping - OptimumG Physics-Based Calculation (YAML: tuning_subsystems.damping)
+        # Philosophy: docs/claudetunes_philosophy.md, docs/damper_tuning_guide.md
+
+        # Step 1: Calculate sprung mass per corner
+        weight_lbs = self.car_data.get('weight', 2800)
+        weight_kg = weight_lbs * 0.453592
+        sprung_mass_total = weight_kg * 0.80  # 80% is sprung mass
+
+        weight_dist = self.car_data.get('weight_distribution', {'front': 55, 'rear': 45})
+        front_pct = weight_dist.get('front', 55) / 100
+        rear_pct = weight_dist.get('rear', 45) / 100
+
+        sprung_mass_front_corner = (sprung_mass_total * front_pct) / 2  # kg per corner
+        sprung_mass_rear_corner = (sprung_mass_total * rear_pct) / 2
+
+        # Step 2: Get target frequencies from Phase B
+        freq_front = setup['frequency']['front']  # Hz
+        freq_rear = setup['frequency']['rear']
+
+        # Step 3: OptimumG formula - Initial slope = 4π × ζ × ω × m_sm
+        zeta = 0.67  # Damping ratio (0.65-0.70 for racing, use mid-range)
+
+        initial_slope_front = 4 * math.pi * zeta * freq_front * sprung_mass_front_corner  # N/(m/s)
+        initial_slope_rear = 4 * math.pi * zeta * freq_rear * sprung_mass_rear_corner
+
+        # Step 4: Energy flow split (compression 2/3, rebound 3/2)
+        comp_force_front = (2/3) * initial_slope_front
+        comp_force_rear = (2/3) * initial_slope_rear
+
+        rebound_force_front = (3/2) * initial_slope_front
+        rebound_force_rear = (3/2) * initial_slope_rear
+
+        # Step 5: Convert physics forces to GT7 percentages
+        # Use OptimumG ratio to differentiate F/R, anchor to YAML baselines (25%/35%)
+
+        # Calculate average force to use as baseline anchor
+        avg_comp_force = (comp_force_front + comp_force_rear) / 2
+        avg_rebound_force = (rebound_force_front + rebound_force_rear) / 2
+
+        # YAML baseline values (from philosophy: 25% comp, 35% rebound)
+        baseline_comp = 25
+        baseline_rebound = 35
+
+        # Calculate F/R percentages maintaining OptimumG ratio
+        comp_pct_front = baseline_comp * (comp_force_front / avg_comp_force)
+        comp_pct_rear = baseline_comp * (comp_force_rear / avg_comp_force)
+
+        rebound_pct_front = baseline_rebound * (rebound_force_front / avg_rebound_force)
+        rebound_pct_rear = baseline_rebound * (rebound_force_rear / avg_rebound_force)
+
+        # Step 6: Apply modifiers (drivetrain, power, CG, track)
+        dt_adj = {'FF': 3, 'FR': 1, 'MR': 0, 'RR': -2, 'AWD': 1}.get(dt, 1)
+
+        if hp > 700:
+            power_adj = 8
+        elif hp > 600:
+            power_adj = 6
+        elif hp > 400:
+            power_adj = 2
+        else:
+            power_adj = 0
+
+        if cg_height > 500:
+            cg_adj = 2
+        elif cg_height < 400:
+            cg_adj = -1
+        else:
+            cg_adj = 0
+
+        track_adj = 0
+        if self.track_type == 'high_speed':
+            track_adj = 3
+        elif self.track_type == 'technical':
+            track_adj = -2
+
+        # Step 7: Telemetry reconciliation (if available)
+        telem_adj_comp_f = 0
+        telem_adj_comp_r = 0
+        telem_adj_exp_f = 0
+        telem_adj_exp_r = 0
+
+        susp = self.results.get('suspension_analysis', {})
+        # Only process telemetry if we have valid dict data (not the "No telemetry data" string)
+        if susp and isinstance(susp, dict):
+            front_comp = susp.get('front_compression', 0)
+            rear_comp = susp.get('rear_compression', 0)
+
+            # Front softer than rear
+            if front_comp > rear_comp + 0.02:  # >20mm difference
+                telem_adj_comp_f += 5
+                self._log("  📊 Telemetry: Front compressing more → +5% front compression")
+            # Rear softer than front
+            elif rear_comp > front_comp + 0.02:
+                telem_adj_comp_r += 5
+                self._log("  📊 Telemetry: Rear compressing more → +5% rear compression")
+
+            # Temperature-based adjustment
+            tire_temps = self.results.get('tire_analysis', {})
+            if tire_temps:
+                front_avg = tire_temps.get('front_avg', 0)
+                rear_avg = tire_temps.get('rear_avg', 0)
+                if front_avg > rear_avg + 5:  # Front >5°C hotter
+                    telem_adj_comp_f -= 2
+                    telem_adj_comp_r += 2
+                    self._log("  📊 Telemetry: Front tires hot → -2% front, +2% rear compression")
+
+        damper_comp = self.results.get('damper_compensation', {'compression_add': 0, 'expansion_add': 0})
+
+        # Final damping values (clamp to GT7 ranges: 20-40% comp, 30-50% rebound)
+        setup['damping'] = {
+            'compression_front': min(40, max(20, int(comp_pct_front + dt_adj + power_adj + cg_adj + track_adj + telem_adj_comp_f + damper_comp['compression_add']))),
+            'compression_rear': min(40, max(20, int(comp_pct_rear + dt_adj + power_adj + cg_adj + track_adj + telem_adj_comp_r + damper_comp['compression_add']))),
+            'expansion_front': min(50, max(30, int(rebound_pct_front + dt_adj + power_adj + cg_adj + track_adj + telem_adj_exp_f + damper_comp['expansion_add']))),
+            'expansion_rear': min(50, max(30, int(rebound_pct_rear + dt_adj + power_adj + cg_adj + track_adj + telem_adj_exp_r + damper_comp['expansion_add'])))
+        }
+
+        # Camber - based on tire compound, track type, and CG per YAML
+        tire = self.car_data.get('tire_compound', 'Racing Hard')
+        if 'Racing' in tire:
+            camber_base_f = -2.0
+            camber_base_r = -1.5
+            tire_adj = -0.5  # Racing: more negative camber for stiff sidewalls
+        elif 'Sport' in tire:
+            camber_base_f = -2.0
+            camber_base_r = -1.5
+            tire_adj = 0.0  # Sport: baseline
+        else:
+            camber_base_f = -2.0
+            camber_base_r = -1.5
+            tire_adj = +0.3  # Comfort: less negative camber for soft sidewalls
+
+        # Track type adjustments
+        track_camber_adj = 0
+        if self.track_type == 'high_speed':
+            track_camber_adj = 0.3  # +0.3° for high-speed
+        elif self.track_type == 'technical':
+            track_camber_adj = -0.2  # -0.2° for technical
+
+        # CG adjustments
+        cg_camber_adj = 0
+        if cg_height > 500:
+            cg_camber_adj = 0.2  # High CG: +0.2°
+        elif cg_height < 400:
+            cg_camber_adj = -0.1  # Low CG: -0.1°
+
+        setup['camber'] = {
+            'front': camber_base_f + tire_adj + track_camber_adj + cg_camber_adj,
+            'rear': camber_base_r + tire_adj + track_camber_adj + cg_camber_adj
+        }
+
+        # Toe - with track type adjustments per YAML
+        if dt == 'FF':
+            toe_front = -0.10  # Toe out for FWD
+        else:
+            toe_front = 0.00
+
+        # Rear toe adjustments for stability and track type
+        toe_rear_base = 0.10
+
+        # Track type adjustments
+        if self.track_type == 'high_speed':
+            toe_rear_base += 0.10  # +0.1° for high-speed stability
+        elif self.track_type == 'technical':
+            toe_rear_base = 0.00  # 0° for technical (rotation)
+
+        # CG adjustments (high CG needs more stability)
+        if cg_height > 500:
+            toe_rear_base += 0.05
+
+        setup['toe'] = {
+            'front': toe_front,
+            'rear': min(1.0, toe_rear_base)  # Cap at 1.0°
+        }
+
+        # Differential - base + compensation + track type per YAML
+        diff_base = self._calculate_diff_settings()
+
+        # Apply diff compensation from Phase C
+        diff_comp = self.results.get('diff_compensation', {'initial': 0, 'accel': 0, 'brake': 0})
+
+        # Track type adjustments per YAML
+        track_diff_adj = {'accel': 0, 'brake': 0}
+        if self.track_type == 'high_speed':
+            track_diff_adj = {'accel': 12, 'brake': -7}  # +10-15 accel, -5-10 brake
+        elif self.track_type == 'technical':
+            track_diff_adj = {'accel': -7, 'brake': 7}  # -5-10 accel, +5-10 brake
+
+        # Check if vehicle has front differential (AWD/4WD)
+        if 'front' in diff_base and 'rear' in diff_base:
+            # AWD/4WD vehicle with front and rear diffs
+            setup['diff'] = {
+                'front': {
+                    'initial': min(60, max(5, diff_base['front']['initial'] + diff_comp['initial'])),
+                    'accel': min(60, max(5, diff_base['front']['accel'] + diff_comp['accel'] + track_diff_adj['accel'])),
+                    'brake': min(60, max(5, diff_base['front']['brake'] + diff_comp['brake'] + track_diff_adj['brake']))
+                },
+                'rear': {
+                    'initial': min(60, max(5, diff_base['rear']['initial'] + diff_comp['initial'])),
+                    'accel': min(60, max(5, diff_base['rear']['accel'] + diff_comp['accel'] + track_diff_adj['accel'])),
+                    'brake': min(60, max(5, diff_base['rear']['brake'] + diff_comp['brake'] + track_diff_adj['brake']))
+                }
+            }
+        else:
+            # RWD/FWD vehicle with rear diff only
+            setup['diff'] = {
+                'initial': min(60, max(5, diff_base['initial'] + diff_comp['initial'])),
+                'accel': min(60, max(5, diff_base['accel'] + diff_comp['accel'] + track_diff_adj['accel'])),
+                'brake': min(60, max(5, diff_base['brake'] + diff_comp['brake'] + track_diff_adj['brake']))
+            }
+
+        # Torque split
+        split = self.car_data.get('torque_split', '0:100')
+        setup['torque_split'] = split
+
+        # Aero - balanced around 40% front
+        aero = self.car_data.get('aero', {})
+        setup['aero'] = {
+            'front': int(aero.get('front', {}).get('current', 250)),
+            'rear': int(aero.get('rear', {}).get('current', 450))
+        }
+
+        # Philosophy and stability
+        setup['philosophy'] = f"{dt} {self.car_data.get('hp', 400)}HP Natural Frequency"
+        setup['stability'] = self.results['physics']['stability_index']
+
+        # Calculate expected performance gain from Performance Expectations table
+        setup['expected_gain'] = self._estimate_performance_gain()
+
+        return setup
+
+    def _estimate_performance_gain(self):
+        """Estimate performance gain using Performance Expectations reference table"""
+        # Base gain from frequency optimization (always present)
+        gain_min = 0.5
+        gain_max = 2.0
+
+        # Check for additional gains from specific optimizations
+        if self.results.get('telemetry_override'):
+            # Telemetry-driven frequency correction
+            gain_max += 0.5  # Can add 0.3-2.0s
+
+        if self.results.get('constraints', {}).get('severity', '').startswith('L3'):
+            # Significant constraints requiring compensation
+            gain_min += 0.2  # ARB/damper/diff recovery adds time
+
+        # Check for bottoming correction
+        if self.view.suspension_behavior is not None:
+            if any(v > 0.28 for v in self.view.peak_travel):
+                # Ride height optimization
+                gain_min += 0.3
+                gain_max += 0.8
+
+        # Track type optimization
+        if self.track_type != 'balanced':
+            gain_min += 0.2
+            gain_max += 0.5  # Corner-type differential: 0.2-0.5s
+
+        return f"{gain_min:.1f}-{gain_max:.1f}s"
+
+    def _calculate_diff_settings(self):
+        """Calculate LSD settings using YAML Differential Baselines reference table"""
+        dt = self.car_data.get('drivetrain', 'FR')
+        hp = self.car_data.get('hp', 400)
+        has_front_diff = self.car_data.get('has_front_diff', False)
+
+        # Get baseline ranges from reference table (YAML lines 400-419)
+        baselines = self.differential_baselines.get(dt, self.differential_baselines['FR'])
+
+        # Use middle of range for each setting
+        base_initial = sum(baselines['initial']) / 2
+        base_accel = sum(baselines['accel']) / 2
+        base_brake = sum(baselines['brake']) / 2
+
+        # Power multipliers from YAML protocol (line 233)
+        mult_map = {
+            'FF': 0.035,
+            'FR': 0.03,
+            'MR': 0.025,
+            'RR': 0.025,
+            'AWD': 0.02
+        }
+        mult = mult_map.get(dt, 0.03)
+
+        # Calculate power-based adjustment using YAML formula (line 232)
+        power_add = int((hp - 300) * mult)
+
+        # Rear differential (primary)
+        rear_diff = {
+            'initial': int(min(60, max(5, base_initial + power_add // 3))),
+            'accel': int(min(60, max(5, base_accel + power_add))),
+            'brake': int(min(60, max(5, base_brake + power_add // 2)))
+        }
+
+        # Front differential (for AWD/4WD vehicles)
+        if has_front_diff:
+            # Front diff is typically more conservative (lower values)
+            # Use AWD baselines for front, scaled by 70-80%
+            front_baselines = self.differential_baselines['AWD']
+            front_base_initial = sum(front_baselines['initial']) / 2
+            front_base_accel = sum(front_baselines['accel']) / 2
+            front_base_brake = sum(front_baselines['brake']) / 2
+
+            # Front gets less power-based adjustment (60% of rear)
+            front_power_add = int(power_add * 0.6)
+
+            front_diff = {
+                'initial': int(min(60, max(5, front_base_initial + front_power_add // 3))),
+                'accel': int(min(60, max(5, front_base_accel + front_power_add))),
+                'brake': int(min(60, max(5, front_base_brake + front_power_add // 2)))
+            }
+
+            return {
+                'front': front_diff,
+                'rear': rear_diff
+            }
+        else:
+            # Return rear only for RWD/FWD vehicles
+            return rear_diff
+
+
+
+def build_result(car_data, track_type, results, warnings, log):
+    """SetupResult from a complete results dict"""
+    physics = results['physics']
+    constraints = results['constraints']
+    return SetupResult(
+        car_name=car_data.get('name'),
+        track_type=track_type,
+        frequencies={
+            'compound': physics['compound_frequency'],
+            'base': physics['base_frequency'],
+            'target': {'front': physics['front_frequency'], 'rear': physics['rear_frequency']},
+            'achievable': {'front': constraints['achievable_front'], 'rear': constraints['achievable_rear']},
+            'measured': physics.get('measured_frequency'),
+            'stability_index': physics['stability_index']
+        },
+        physics={
+            'telemetry_adjustment': physics['telemetry_adjustment'],
+            'drivetrain_bias': dict(physics['drivetrain_bias']),
+            'power_add': physics['power_add'],
+            'cg_add': physics['cg_add'],
+            'aero_add': physics['aero_add'],
+            'roll_center': results['roll_center'],
+            'car_class': results.get('car_class')
+        },
+        constraints=constraints,
+        compensation={name: results[f'{name}_compensation'] for name in ('arb', 'damper', 'diff')
+                      if f'{name}_compensation' in results},
+        setup=results['setup'],
+        analysis={
+            'suspension': results.get('suspension_analysis'),
+            'balance': results.get('balance'),
+            'tires': results.get('tire_diagnosis'),
+            'cross_validation': results.get('cross_validation')
+        },
+        reasons=list(results.get('telemetry_override', {}).get('reasons', [])),
+        recommendations=list(results.get('cross_validation', {}).get('recommendations', [])),
+        warnings=list(warnings),
+        log=tuple(log),
+        results=results
+    )
+
+
+class SetupSession:
+    """
+    Memoized stage graph for what-if re-evaluation
+
+    Each stage's output is cached under the versions of the inputs it depends
+    on (SetupEngine.STAGES), so changing track_type or conservative_ride_height
+    only re-runs Phase D, and re-asking a combination already seen is a dict
+    lookup. Inputs are treated as immutable: pass a new dict via update() to
+    change car data or telemetry. Returned results share cached stage data -
+    treat them as read-only.
+    """
+
+    MAX_ENTRIES = 64  # per stage; oldest dropped first
+
+    def __init__(self, model, car_data, telemetry):
+        self._inputs = {'model': model, 'car_data': car_data, 'telemetry': telemetry or {}}
+        self._view = TelemetryView(self._inputs['telemetry'])  # shared by every engine run
+        self._versions = {'model': 0, 'car_data': 0, 'telemetry': 0}
+        self._memo = {name: {} for name, _, _, _ in SetupEngine.STAGES}
+        self._results = {}
+        self.computed = {name: 0 for name, _, _, _ in SetupEngine.STAGES}
+
+    @property
+    def car_data(self):
+        return self._inputs['car_data']
+
+    @property
+    def telemetry(self):
+        return self._inputs['telemetry']
+
+    def update(self, model=None, car_data=None, telemetry=None):
+        """Replace inputs; stages depending on a replaced input are recomputed on next evaluate()"""
+        for name, value in (('model', model), ('car_data', car_data), ('telemetry', telemetry)):
+            if value is not None and value is not self._inputs[name]:
+                self._inputs[name] = value
+                self._versions[name] += 1
+        if self._view.raw is not self._inputs['telemetry']:
+            self._view = TelemetryView(self._inputs['telemetry'])
+
+    def evaluate(self, track_type="balanced", conservative_ride_height=False):
+        """SetupResult for these options, recomputing only stages whose inputs changed"""
+        keys = dict(self._versions, track_type=track_type, conservative_ride_height=conservative_ride_height)
+        for name, _, _, depends in SetupEngine.STAGES:
+            keys[name] = (name,) + tuple(keys[dependency] for dependency in depends)
+
+        result = self._results.get(keys['setup'])
+        if result is not None:
+            return result
+
+        engine = SetupEngine(self.car_data, self._view, self._inputs['model'], track_type,
+                             conservative_ride_height)
+        results, warnings, log = {}, [], []
+        for name, _, _, _ in SetupEngine.STAGES:
+            memo = self._memo[name]
+            output = memo.get(keys[name])
+            if output is None:
+                engine.results = dict(results)  # upstream stage outputs only
+                output = memo[keys[name]] = engine.run_stage(name)
+                self.computed[name] += 1
+                self._trim(memo)
+            added, stage_log, stage_warnings = output
+            results.update(added)
+            log.extend(stage_log)
+            warnings.extend(warning for warning in stage_warnings if warning not in warnings)
+
+        result = self._results[keys['setup']] = build_result(self.car_data, track_type, results, warnings, log)
+        self._trim(self._results)
+        return result
+
+    def _trim(self, memo):
+        while len(memo) > self.MAX_ENTRIES:
+            memo.pop(next(iter(memo)))
+
+
+def generate_setup(car_data, telemetry, model, track_type="balanced", conservative_ride_height=False):
+    """
+    Compute a ClaudeTunes setup without any I/O
+
+    Args:
+        car_data: Parsed car data (parse_car_data)
+        telemetry: Telemetry dict ({} when there is none)
+        model: Compiled ProtocolModel (protocol_model.load_protocol_model)
+        track_type: 'high_speed', 'technical' or 'balanced'
+        conservative_ride_height: Add 10mm buffer from minimum ride height
+
+    Returns:
+        SetupResult
+    """
+    return SetupEngine(car_data, telemetry, model, track_type, conservative_ride_height).run()
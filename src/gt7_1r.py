@@ -6,6 +6,9 @@ import struct
 import csv
 import os
 import signal
+import time
+from array import array
+from operator import itemgetter
 # pip3 install pycryptodome
 from Crypto.Cipher import Salsa20
 
@@ -17,9 +20,11 @@ SendPort = 33739
 ReceivePort = 33740
 
 # Data logging setup
+# Rows carry time.monotonic_ns() integers; this single wall-clock anchor turns
+# them into ISO timestamps only when a lap is written to CSV
 session_start_time = dt.now()
+session_start_ns = time.monotonic_ns()
 session_folder = f"gt7_session_{session_start_time.strftime('%Y%m%d_%H%M%S')}"
-current_lap_data = []
 current_lap_number = 0
 
 # Create session folder
@@ -321,6 +326,97 @@ csv_headers = [
     'current_lap_time'
 ]
 
+# Column storage classes for LapBuffer (timestamp is int64 ns, everything else is a float64)
+INT_COLUMNS = {
+    'lap_number', 'packet_id', 'is_electric', 'has_turbo',
+    'total_laps', 'best_lap_time_ms', 'last_lap_time_ms', 'time_on_track_ms',
+    'current_position', 'total_positions', 'pre_race_start_position', 'pre_race_num_cars',
+    'rev_warning', 'rev_limiter', 'estimated_top_speed',
+    'current_gear', 'suggested_gear',
+} | {h for h in csv_headers if h.startswith('flag_')}
+PER_LAP_COLUMNS = ('car_code', 'car_name')  # constant within a lap - stored once
+
+class LapBuffer:
+    """
+    Compact per-lap row storage.
+
+    Rows are split once on append into flat typed arrays (float64 and int32
+    row-major, plus int64 monotonic timestamps) instead of being kept as lists
+    of boxed Python objects; car code/name are kept once per lap. Floats stay
+    float64 so the CSV text is exactly what the row values print as.
+    ~0.7 KB per sample instead of ~3.6 KB.
+    """
+
+    def __init__(self, headers=csv_headers):
+        self.headers = list(headers)
+        self.float_columns = [h for h in self.headers
+                              if h not in INT_COLUMNS and h not in PER_LAP_COLUMNS and h != 'timestamp']
+        self.int_columns = [h for h in self.headers if h in INT_COLUMNS]
+        index = {h: i for i, h in enumerate(self.headers)}
+        self._take_floats = itemgetter(*(index[h] for h in self.float_columns))
+        self._take_ints = itemgetter(*(index[h] for h in self.int_columns))
+        self._stamp_index = index['timestamp']
+        # Where each header lives: (0, k) float slot, (1, k) int slot, (2, name) per-lap value,
+        # (3, 0) timestamp
+        self._layout = {'timestamp': (3, 0)}
+        for k, h in enumerate(self.float_columns):
+            self._layout[h] = (0, k)
+        for k, h in enumerate(self.int_columns):
+            self._layout[h] = (1, k)
+        for h in PER_LAP_COLUMNS:
+            self._layout[h] = (2, h)
+        self.clear()
+
+    def clear(self):
+        self.stamps = array('q')
+        self.floats = array('d')
+        self.ints = array('i')
+        self.per_lap = {'car_code': 0, 'car_name': ''}
+        self.row_width = 0  # width of the rows handed to append() (header sanity check)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, row):
+        """Store one extract_telemetry_data() row"""
+        if not self.count:
+            self.row_width = len(row)
+            self.per_lap['car_code'] = row[self.headers.index('car_code')]
+            self.per_lap['car_name'] = row[self.headers.index('car_name')]
+        self.stamps.append(row[self._stamp_index])
+        self.floats.extend(self._take_floats(row))
+        self.ints.extend(self._take_ints(row))
+        self.count += 1
+
+    def latest(self, name):
+        """Value of a named column for the most recent row"""
+        kind, k = self._layout[name]
+        if kind == 0:
+            return self.floats[(self.count - 1) * len(self.float_columns) + k]
+        if kind == 1:
+            return self.ints[(self.count - 1) * len(self.int_columns) + k]
+        if kind == 3:
+            return self.stamps[self.count - 1]
+        return self.per_lap[k]
+
+    def rows(self):
+        """Yield rows in header order (for CSV writing)"""
+        nf, ni = len(self.float_columns), len(self.int_columns)
+        layout = [self._layout[h] for h in self.headers]
+        for r in range(self.count):
+            f = self.floats[r * nf:(r + 1) * nf]
+            i = self.ints[r * ni:(r + 1) * ni]
+            stamp = self.stamps[r]
+            yield [f[k] if kind == 0 else i[k] if kind == 1 else stamp if kind == 3 else self.per_lap[k]
+                   for kind, k in layout]
+
+current_lap_data = LapBuffer()
+
+def monotonic_to_iso(t_ns):
+    """Format a monotonic_ns() reading as wall-clock ISO time via the session anchor"""
+    return (session_start_time + td(microseconds=(t_ns - session_start_ns) // 1000)).isoformat()
+
 def save_lap_data():
     """Save current lap data to CSV file"""
     global current_lap_data, current_lap_number
@@ -330,13 +426,14 @@ def save_lap_data():
         
         with open(filename, 'w', newline='') as csvfile:
             writer = csv.writer(csvfile)
-            if len(csv_headers) != len(current_lap_data[0]):
-                printAt(f'WARNING: header/data mismatch! {len(csv_headers)} vs {len(current_lap_data[0])}', 20, 1, reverse=1)
+            if len(csv_headers) != current_lap_data.row_width:
+                printAt(f'WARNING: header/data mismatch! {len(csv_headers)} vs {current_lap_data.row_width}', 20, 1, reverse=1)
             writer.writerow(csv_headers)
-            writer.writerows(current_lap_data)
+            # Timestamps stay monotonic ints in memory - format only here
+            writer.writerows([monotonic_to_iso(row[0])] + row[1:] for row in current_lap_data.rows())
         
         printAt(f"Saved lap {current_lap_number} data: {len(current_lap_data)} data points   ", 19, 1)
-        current_lap_data = []
+        current_lap_data.clear()
 
 def decode_flags(flags_raw):
     """Decode the 16-bit simulator flags"""
@@ -357,8 +454,11 @@ def decode_flags(flags_raw):
         'tcs_active': 1 if (flags & (1 << 11)) else 0
     }
 
-def extract_telemetry_data(ddata, lap_time_seconds):
-    """Extract ALL telemetry data from GT7 Packet A with CORRECT OFFSETS"""
+def extract_telemetry_data(ddata, recv_ns, lap_time_seconds):
+    """
+    Extract ALL telemetry data from GT7 Packet A with CORRECT OFFSETS
+    recv_ns is the time.monotonic_ns() receive time (formatted at CSV write)
+    """
     
     # Basic packet info (0x70, 0x74)
     pktid = struct.unpack('i', ddata[0x70:0x70+4])[0]
@@ -544,7 +644,7 @@ def extract_telemetry_data(ddata, lap_time_seconds):
     
     return [
         # Basic tracking
-        dt.now().isoformat(), curlap, pktid, car_code, car_name,
+        recv_ns, curlap, pktid, car_code, car_name,
         
         # Position & motion
         pos_x, pos_y, pos_z,
@@ -767,7 +867,7 @@ printAt('Track:', 18, 30)
 prevlap = -1
 pktid = 0
 pknt = 0
-dt_start = dt.now()
+lap_start_ns = time.monotonic_ns()
 
 # Position tracking for display
 current_position = -1
@@ -788,20 +888,20 @@ while True:
             total_positions = struct.unpack('h', ddata[0x86:0x88])[0]
             
             if curlap > 0:
-                dt_now = dt.now()
+                now_ns = time.monotonic_ns()
                 
                 if prevlap == -1:
-                    dt_start = dt_now
+                    lap_start_ns = now_ns
                 
                 if curlap != prevlap and prevlap != -1:
                     save_lap_data()
-                    dt_start = dt_now
+                    lap_start_ns = now_ns
                     
                 prevlap = curlap
                 current_lap_number = curlap
-                curLapTime = dt_now - dt_start
+                curLapTime = (now_ns - lap_start_ns) / 1e9
                 
-                telemetry_data = extract_telemetry_data(ddata, curLapTime.total_seconds())
+                telemetry_data = extract_telemetry_data(ddata, now_ns, curLapTime)
                 current_lap_data.append(telemetry_data)
                 
                 # Update display
@@ -809,19 +909,19 @@ while True:
                 printAt(f'{len(current_lap_data):5d}', 6, 15)
                 if current_lap_number > 1:
                     printAt(f'{current_lap_number-1:3d}', 7, 15)
-                printAt(f'{secondsToLaptime(curLapTime.total_seconds()):>9}', 5, 30)
+                printAt(f'{secondsToLaptime(curLapTime):>9}', 5, 30)
                 
                 if len(current_lap_data) > 0:
-                    latest = current_lap_data[-1]
+                    latest = current_lap_data.latest
                     
-                    # Vehicle data - using correct indices
-                    speed_kph = latest[20]  # speed_kph index
+                    # Vehicle data - read by column name
+                    speed_kph = latest('speed_kph')
                     printAt(f'{speed_kph:6.1f} kph', 10, 7)
                     
-                    rpm = latest[16]  # rpm index
+                    rpm = latest('rpm')
                     printAt(f'{rpm:7.0f}', 11, 6)
                     
-                    gear = int(latest[54])  # current_gear index
+                    gear = int(latest('current_gear'))
                     if gear == 0:
                         printAt(' R', 12, 7)
                     elif gear == 15:
@@ -829,20 +929,20 @@ while True:
                     else:
                         printAt(f'{gear:2d}', 12, 7)
                     
-                    car_code = int(latest[3])  # car_code
-                    car_name = str(latest[4])  # car_name
+                    car_code = int(latest('car_code'))
+                    car_name = str(latest('car_name'))
                     # Display shortened car name (first 25 chars to fit screen)
                     car_display = car_name[:25] if len(car_name) > 25 else car_name
                     printAt(f'{car_display:<25}', 13, 6)
                     printAt(f'{car_code:5d}', 14, 7)
                     
-                    # Gear ratios - using correct indices (at end of array before lap time)
-                    gear_ratio_1 = latest[-9]  # gear_ratio_1
-                    gear_ratio_2 = latest[-8]  # gear_ratio_2
-                    gear_ratio_3 = latest[-7]  # gear_ratio_3
-                    gear_ratio_4 = latest[-6]  # gear_ratio_4
-                    gear_ratio_5 = latest[-5]  # gear_ratio_5
-                    gear_ratio_6 = latest[-4]  # gear_ratio_6
+                    # Gear ratios
+                    gear_ratio_1 = latest('gear_ratio_1')
+                    gear_ratio_2 = latest('gear_ratio_2')
+                    gear_ratio_3 = latest('gear_ratio_3')
+                    gear_ratio_4 = latest('gear_ratio_4')
+                    gear_ratio_5 = latest('gear_ratio_5')
+                    gear_ratio_6 = latest('gear_ratio_6')
                     
                     printAt(f'{gear_ratio_1:5.3f}' if gear_ratio_1 > 0 else '  -  ', 10, 45)
                     printAt(f'{gear_ratio_2:5.3f}' if gear_ratio_2 > 0 else '  -  ', 11, 45)
@@ -852,14 +952,14 @@ while True:
                     printAt(f'{gear_ratio_6:5.3f}' if gear_ratio_6 > 0 else '  -  ', 15, 45)
                     
                     # Road banking (road_plane data)
-                    road_plane_y = latest[57]  # road_plane_y index
+                    road_plane_y = latest('road_plane_y')
                     banking_angle = road_plane_y * 57.2958  # Convert to degrees
                     printAt(f'{banking_angle:+6.2f}°', 17, 10)
                     
-                    # Flags - using correct indices
-                    tcs_active = int(latest[53])  # flag_tcs_active
-                    asm_active = int(latest[52])  # flag_asm_active
-                    on_track = int(latest[42])    # flag_car_on_track
+                    # Flags
+                    tcs_active = int(latest('flag_tcs_active'))
+                    asm_active = int(latest('flag_asm_active'))
+                    on_track = int(latest('flag_car_on_track'))
                     
                     printAt('ON ' if tcs_active else 'OFF', 17, 35)
                     printAt('ON ' if asm_active else 'OFF', 17, 47)
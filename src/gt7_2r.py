@@ -11,6 +11,7 @@ GT7 Analyzer v3 - COMPLETE FIX
 - Outlier detection
 - Documents all units
 """
+import argparse
 import csv
 import os
 import sys
@@ -226,38 +227,300 @@ def safe_divide(numerator, denominator, default=0.0):
         return default
     return numerator / denominator
 
+def lap_columns(data, keys, default=0.0):
+    """Return {key: float64 array} for validated rows, one pass per column"""
+    n = len(data)
+    return {key: np.fromiter((to_float(row.get(key), default) for row in data), dtype=float, count=n)
+            for key in keys}
+
+# ==================== ROBUST STATISTICS ====================
+
+ROBUST_PERCENTILES = (1, 5, 50, 95, 99)
+HAMPEL_WINDOW = 31       # samples (~0.5s at 60Hz) - centered; shorter windows give noisy MADs
+HAMPEL_N_SIGMAS = 5.0    # spike = deviation > 5 scaled MADs (~1 false flag per 3000 noise samples)
+MAD_SCALE = 1.4826       # MAD -> sigma for Gaussian noise
+
+# Channels that feed setup decisions - reported with spike-filtered percentiles
+ROBUST_CHANNELS = [
+    'suspension_fl', 'suspension_fr', 'suspension_rl', 'suspension_rr',
+    'tire_slip_ratio_fl', 'tire_slip_ratio_fr', 'tire_slip_ratio_rl', 'tire_slip_ratio_rr',
+    'tire_temp_fl', 'tire_temp_fr', 'tire_temp_rl', 'tire_temp_rr',
+    'body_height', 'speed_kph', 'rpm',
+]
+
+def _rolling_median(windows):
+    """Median of each row of a (n, window) view - odd window, partition not sort"""
+    half = windows.shape[1] // 2
+    return np.partition(windows, half, axis=1)[:, half]
+
+def hampel_filter(arr, window=HAMPEL_WINDOW, n_sigmas=HAMPEL_N_SIGMAS, quantum=None):
+    """
+    Vectorized Hampel filter: replace samples further than n_sigmas scaled MADs
+    from the centered rolling median with that median. The MAD of each window
+    is taken around that window's own median.
+
+    A flat window (MAD 0, e.g. a constant or quantized channel) still flags
+    outliers: the MAD is floored at `quantum`, the channel's quantization step
+    (default: float32 resolution at the median - GT7 sends float32 values).
+    Returns (filtered array, boolean spike mask).
+    """
+    arr = np.asarray(arr, dtype=float)
+    window = window | 1  # force odd
+    if arr.size < window:
+        return arr.copy(), np.zeros(arr.size, dtype=bool)
+
+    half = window // 2
+    windows = np.lib.stride_tricks.sliding_window_view(np.pad(arr, half, mode='reflect'), window)
+    med = _rolling_median(windows)
+    mad = MAD_SCALE * _rolling_median(np.abs(windows - med[:, None]))
+    if quantum is None:
+        quantum = np.spacing(np.abs(med).astype(np.float32)).astype(float)
+    mad = np.maximum(mad, quantum)
+
+    spikes = np.abs(arr - med) > n_sigmas * mad
+    return np.where(spikes, med, arr), spikes
+
+def robust_percentiles(arr, percentiles=ROBUST_PERCENTILES):
+    """
+    Percentiles from a single np.partition call (no full sort).
+    Uses the same linear interpolation as np.percentile.
+    """
+    arr = np.asarray(arr, dtype=float)
+    if arr.size == 0:
+        return {f'p{p}': 0.0 for p in percentiles}
+
+    positions = [p / 100.0 * (arr.size - 1) for p in percentiles]
+    kth = sorted({int(math.floor(pos)) for pos in positions} | {int(math.ceil(pos)) for pos in positions})
+    part = np.partition(arr, kth)
+
+    result = {}
+    for p, pos in zip(percentiles, positions):
+        lo, hi = int(math.floor(pos)), int(math.ceil(pos))
+        result[f'p{p}'] = float(part[lo] + (part[hi] - part[lo]) * (pos - lo))
+    return result
+
+def robust_channel_stats(arr):
+    """Spike-filter a channel then report its extremes, percentiles and how many samples were replaced"""
+    filtered, spikes = hampel_filter(arr)
+    stats = {
+        'min': float(filtered.min()) if filtered.size else 0.0,
+        'max': float(filtered.max()) if filtered.size else 0.0,
+    }
+    stats.update(robust_percentiles(filtered))
+    stats['spikes_filtered'] = int(np.count_nonzero(spikes))
+    return stats
+
+# ==================== TIME BASE ====================
+
+PACKET_RATE_HZ = 60.0        # GT7 sends one packet per frame; packet_id increments by 1
+MAX_INTERPOLATED_GAP = 6     # packets (0.1s) - longer gaps stay as holes
+GRAVITY = 9.81
+
+# Channels resampled onto the uniform packet grid for derivative metrics
+DERIVATIVE_COLUMNS = [
+    'packet_id', 'position_x', 'position_z', 'speed_mps', 'angular_velocity_y',
+    'suspension_fl', 'suspension_fr', 'suspension_rl', 'suspension_rr',
+]
+
+def build_time_base(packet_ids, max_gap=MAX_INTERPOLATED_GAP, rejected_ids=()):
+    """
+    Rebuild an exact 60Hz time base from packet ids.
+
+    Returns a dict with:
+      grid_ids  - every packet id from first to last received (uniform grid)
+      t         - seconds since the first packet for each grid point
+      src_index - per received sample, its index into the grid (duplicates/out-of-order dropped)
+      keep      - mask over the input rows that were used
+      received  - grid points that have a sample
+      valid     - grid points that were received or sit in a gap <= max_gap
+      report    - drop / gap statistics for the JSON
+    Missing ids listed in rejected_ids (rows the analyzer's validation threw
+    away) are reported apart from packets that never arrived.
+    Falls back to sample index (assumed 60Hz) when the CSV has no usable packet ids.
+    """
+    ids = np.asarray(packet_ids, dtype=float)
+    n = ids.size
+    source = 'packet_id'
+    if n < 2 or not np.any(ids > 0):
+        ids = np.arange(n, dtype=float)
+        source = 'sample_index'
+        rejected_ids = ()  # rejected rows cannot be placed without ids
+
+    ids = ids.astype(np.int64)
+    # Keep strictly increasing ids only (UDP can deliver duplicates/out-of-order)
+    keep = np.ones(n, dtype=bool)
+    if n > 1:
+        keep[1:] = ids[1:] > np.maximum.accumulate(ids)[:-1]
+    kept_ids = ids[keep]
+
+    grid_ids = np.arange(kept_ids[0], kept_ids[-1] + 1) if kept_ids.size else np.zeros(0, dtype=np.int64)
+    src_index = kept_ids - kept_ids[0] if kept_ids.size else kept_ids
+
+    received = np.zeros(grid_ids.size, dtype=bool)
+    received[src_index] = True
+
+    # Gap lengths between consecutive received packets
+    steps = np.diff(kept_ids)
+    gap_sizes = steps[steps > 1] - 1
+    valid = received.copy()
+    for start, step in zip(src_index[:-1][steps > 1], steps[steps > 1]):
+        if step - 1 <= max_gap:
+            valid[start + 1:start + step] = True
+    rejected = ~received & np.isin(grid_ids, np.asarray(rejected_ids, dtype=np.int64))
+
+    report = {
+        'source': source,
+        'rate_hz': PACKET_RATE_HZ,
+        'packets_expected': int(grid_ids.size),
+        'packets_received': int(kept_ids.size),
+        'packets_dropped': int(np.count_nonzero(~received & ~rejected)),
+        'rejected_by_validation': int(np.count_nonzero(rejected)),
+        'duplicate_or_out_of_order': int(n - kept_ids.size),
+        'gap_count': int(gap_sizes.size),
+        'longest_gap_packets': int(gap_sizes.max()) if gap_sizes.size else 0,
+        'interpolated_packets': int(np.count_nonzero(valid & ~received)),
+        'duration_s': round(float(max(grid_ids.size - 1, 0)) / PACKET_RATE_HZ, 4),
+    }
+    return {
+        'grid_ids': grid_ids,
+        't': (grid_ids - grid_ids[0]) / PACKET_RATE_HZ if grid_ids.size else np.zeros(0),
+        'src_index': src_index,
+        'keep': keep,
+        'received': received,
+        'valid': valid,
+        'report': report,
+    }
+
+def resample_uniform(values, time_base):
+    """
+    Put a per-row channel onto the uniform grid: received samples verbatim,
+    short gaps linearly interpolated, long gaps NaN.
+    """
+    values = np.asarray(values, dtype=float)[time_base['keep']]
+    grid_x = np.arange(time_base['grid_ids'].size)
+    out = np.interp(grid_x, time_base['src_index'], values) if values.size else np.zeros(0)
+    out[~time_base['valid']] = np.nan
+    return out
+
+def uniform_gradient(values):
+    """d/dt on the uniform 60Hz grid; samples next to a hole are NaN (no one-sided guesses)"""
+    if values.size < 2:
+        return np.full(values.size, np.nan)
+    grad = np.gradient(values, 1.0 / PACKET_RATE_HZ)
+    hole = np.isnan(values)
+    near_hole = hole.copy()
+    near_hole[1:] |= hole[:-1]
+    near_hole[:-1] |= hole[1:]
+    grad[near_hole] = np.nan
+    return grad
+
+def unwrap_segments(angle):
+    """np.unwrap over each finite run separately, so a NaN hole does not poison the rest"""
+    step = np.diff(angle)
+    wrapped = np.mod(step + np.pi, 2 * np.pi) - np.pi
+    wrapped[(wrapped == -np.pi) & (step > 0)] = np.pi
+    correction = wrapped - step
+    correction[~(np.abs(step) >= np.pi)] = 0.0  # also zeroes NaN steps
+    return angle + np.concatenate(([0.0], np.cumsum(correction)))
+
+def calculate_derivative_channels(data, rejected_ids=()):
+    """
+    Derivative metrics on the packet-id time base.
+    Velocities, accelerations and yaw rate use np.gradient on a uniform grid,
+    so dropped packets no longer distort dt. Heading only comes from received
+    positions: across an interpolated gap the straight chord would pile the
+    gap's whole turn onto its two ends.
+    """
+    cols = lap_columns(data, DERIVATIVE_COLUMNS)
+    tb = build_time_base(cols['packet_id'], rejected_ids=rejected_ids)
+    u = {key: resample_uniform(cols[key], tb) for key in DERIVATIVE_COLUMNS if key != 'packet_id'}
+
+    vx = uniform_gradient(u['position_x'])
+    vz = uniform_gradient(u['position_z'])
+    ground_speed = np.hypot(vx, vz)
+    long_accel = uniform_gradient(u['speed_mps'])
+    # Course (path) heading rate from the position track, radians/s
+    received = tb['received']
+    measured = received.copy()
+    measured[1:] &= received[:-1]
+    measured[:-1] &= received[1:]
+    heading = np.where(measured, np.arctan2(vx, vz), np.nan)
+    course_rate = uniform_gradient(unwrap_segments(heading))
+    lat_accel = u['speed_mps'] * course_rate
+
+    def stat(fn, arr, scale=1.0):
+        arr = arr[np.isfinite(arr)]
+        return float(fn(arr) * scale) if arr.size else 0.0
+
+    susp_vel = {}
+    for corner in ('fl', 'fr', 'rl', 'rr'):
+        vel = uniform_gradient(u[f'suspension_{corner}']) * 1000.0  # m/s -> mm/s
+        vel = np.abs(vel[np.isfinite(vel)])
+        susp_vel[f'{corner}_avg'] = float(vel.mean()) if vel.size else 0.0
+        susp_vel[f'{corner}_p99'] = robust_percentiles(vel, (99,))['p99'] if vel.size else 0.0
+
+    return {
+        'time_base': tb['report'],
+        'derived_dynamics': {
+            'max_ground_speed_kph': stat(np.max, ground_speed, 3.6),
+            'max_long_accel_g': stat(np.max, long_accel, 1.0 / GRAVITY),
+            'max_brake_decel_g': -stat(np.min, long_accel, 1.0 / GRAVITY),
+            'max_lateral_accel_g': stat(np.max, np.abs(lat_accel), 1.0 / GRAVITY),
+            'max_course_rate_deg_s': stat(np.max, np.abs(course_rate), 57.2958),
+            'max_yaw_rate_deg_s': stat(np.max, np.abs(u['angular_velocity_y']), 57.2958),
+            'suspension_velocity_mm_s': susp_vel,
+        },
+    }
+
 # ==================== CORE ANALYSIS ====================
 
-def process_session_folder(session_folder):
-    """Process all lap CSV files in a session folder"""
+# Per-lap metrics cache: <session>/.analysis_cache/<lap file>.json, valid while the
+# CSV's mtime/size and the car type match (bump the version when lap metrics change).
+# Plain JSON, never pickle: session folders are shared and their contents untrusted.
+LAP_CACHE_DIRNAME = '.analysis_cache'
+LAP_CACHE_VERSION = 3
+
+def list_lap_files(session_folder):
+    """Sorted lap_*.csv file names in a session folder"""
+    return sorted(f for f in os.listdir(session_folder)
+                  if f.lower().endswith('.csv') and 'lap_' in f.lower())
+
+def analyze_session(session_folder, track=None, heatmap_dir='heatmaps', use_cache=True, log=print):
+    """
+    Analyze all lap CSV files in a session folder (nothing written but caches).
+    Per-lap metrics are cached next to the laps, so re-analyzing after a new
+    lap only parses the new CSV. When a track name is given, laps are also
+    rasterized into that track's persisted heatmap grid (<heatmap_dir>/<track>.npz).
+
+    Returns:
+        Session summary (the telemetry_analysis_v3.json content) or None
+    """
     if not os.path.exists(session_folder):
-        print(f"Session folder '{session_folder}' not found")
+        log(f"Session folder '{session_folder}' not found")
         return None
 
-    lap_files = [f for f in os.listdir(session_folder) 
-                 if f.lower().endswith('.csv') and 'lap_' in f.lower()]
+    lap_files = list_lap_files(session_folder)
     if not lap_files:
-        print(f"No lap CSV files found in {session_folder}")
+        log(f"No lap CSV files found in {session_folder}")
         return None
 
-    lap_files.sort()
-    print(f"Found {len(lap_files)} lap files to process...")
+    log(f"Found {len(lap_files)} lap files to process...")
 
     # Detect car type from first lap
     first_lap_path = os.path.join(session_folder, lap_files[0])
-    car_type, car_name = detect_car_type(first_lap_path)
+    car_type, car_name = detect_car_type(first_lap_path, log)
     thresholds = CAR_THRESHOLDS[car_type]
-    
-    print(f"\n🏎️  Car Detected: {car_name}")
-    print(f"📊 Classification: {car_type.upper()}")
-    print(f"ℹ️  {thresholds['description']}")
-    print(f"\n⚙️  Thresholds:")
-    print(f"   Braking: >{thresholds['braking_threshold']}%")
-    print(f"   Cornering: >{thresholds['cornering_speed_min']} kph")
-    print(f"   Acceleration: >{thresholds['acceleration_threshold']}%")
-    print(f"   High-speed: >{thresholds['high_speed_threshold']} kph")
-    print(f"   Slip threshold: >{thresholds['slip_traction_loss']}")
-    print()
+
+    log(f"\n🏎️  Car Detected: {car_name}")
+    log(f"📊 Classification: {car_type.upper()}")
+    log(f"ℹ️  {thresholds['description']}")
+    log(f"\n⚙️  Thresholds:")
+    log(f"   Braking: >{thresholds['braking_threshold']}%")
+    log(f"   Cornering: >{thresholds['cornering_speed_min']} kph")
+    log(f"   Acceleration: >{thresholds['acceleration_threshold']}%")
+    log(f"   High-speed: >{thresholds['high_speed_threshold']} kph")
+    log(f"   Slip threshold: >{thresholds['slip_traction_loss']}")
+    log()
 
     all_lap_metrics = []
     total_stats = {
@@ -270,19 +533,33 @@ def process_session_folder(session_folder):
         'filtered_nan_inf': 0,
     }
 
+    heatmap = None
+    grid_file = None
+    if track:
+        grid_file = heatmap_path(heatmap_dir, track)
+        heatmap = load_heatmap_grid(grid_file)
+        heatmap['session'] = os.path.basename(os.path.normpath(session_folder))
+
+    cache_dir = os.path.join(session_folder, LAP_CACHE_DIRNAME) if use_cache else None
     for lap_file in lap_files:
         lap_path = os.path.join(session_folder, lap_file)
-        print(f"Processing {lap_file}...")
-        lap_metrics = process_single_lap(lap_path, thresholds, total_stats)
+        lap_metrics = process_single_lap_cached(lap_path, car_type, thresholds, total_stats, heatmap,
+                                                cache_dir, log)
         if lap_metrics:
             all_lap_metrics.append(lap_metrics)
 
     if not all_lap_metrics:
-        print("No valid lap data processed")
+        log("No valid lap data processed")
         return None
 
     session_summary = calculate_session_summary(all_lap_metrics, car_type, car_name, thresholds)
-    
+
+    if heatmap is not None:
+        save_heatmap_grid(heatmap, grid_file)
+        session_summary['track_heatmap'] = summarize_heatmap(heatmap, grid_file)
+        log(f"\n🗺️  Heatmap grid updated: {grid_file} "
+            f"({session_summary['track_heatmap']['laps_accumulated']} laps accumulated)")
+
     # Add data quality report
     session_summary['data_quality'] = {
         'total_rows_read': total_stats['total_rows'],
@@ -292,26 +569,37 @@ def process_session_folder(session_folder):
         'filtered_paused': total_stats['filtered_paused'],
         'filtered_invalid_range': total_stats['filtered_invalid_range'],
         'filtered_nan_inf': total_stats['filtered_nan_inf'],
-        'data_quality_percentage': round(safe_divide(total_stats['valid_rows'], 
+        'data_quality_percentage': round(safe_divide(total_stats['valid_rows'],
                                                       total_stats['total_rows'], 0) * 100, 2)
     }
+    return session_summary
+
+def process_session_folder(session_folder, track=None, heatmap_dir='heatmaps'):
+    """
+    Process all lap CSV files in a session folder and write
+    telemetry_analysis_v3.json next to them.
+    """
+    session_summary = analyze_session(session_folder, track=track, heatmap_dir=heatmap_dir)
+    if not session_summary:
+        return None
 
     output_file = os.path.join(session_folder, 'telemetry_analysis_v3.json')
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(session_summary, f, indent=2)
 
+    quality = session_summary['data_quality']
     print(f"\n✅ Session analysis saved to: {output_file}")
-    print(f"\n📊 Data Quality: {session_summary['data_quality']['data_quality_percentage']}% of data was valid")
-    print(f"   Valid rows: {total_stats['valid_rows']:,}")
-    print(f"   Filtered (off track): {total_stats['filtered_off_track']:,}")
-    print(f"   Filtered (loading): {total_stats['filtered_loading']:,}")
-    print(f"   Filtered (paused): {total_stats['filtered_paused']:,}")
-    print(f"   Filtered (invalid range): {total_stats['filtered_invalid_range']:,}")
-    print(f"   Filtered (NaN/Inf): {total_stats['filtered_nan_inf']:,}")
-    
+    print(f"\n📊 Data Quality: {quality['data_quality_percentage']}% of data was valid")
+    print(f"   Valid rows: {quality['valid_rows_analyzed']:,}")
+    print(f"   Filtered (off track): {quality['filtered_off_track']:,}")
+    print(f"   Filtered (loading): {quality['filtered_loading']:,}")
+    print(f"   Filtered (paused): {quality['filtered_paused']:,}")
+    print(f"   Filtered (invalid range): {quality['filtered_invalid_range']:,}")
+    print(f"   Filtered (NaN/Inf): {quality['filtered_nan_inf']:,}")
+
     return session_summary
 
-def detect_car_type(lap_file):
+def detect_car_type(lap_file, log=print):
     """Detect car type from first lap CSV"""
     try:
         with open(lap_file, 'r', encoding='utf-8') as f:
@@ -321,11 +609,54 @@ def detect_car_type(lap_file):
             car_type = classify_car(car_name)
             return car_type, car_name
     except Exception as e:
-        print(f"Warning: Could not detect car type: {e}")
+        log(f"Warning: Could not detect car type: {e}")
         return 'street', 'Unknown'
 
-def process_single_lap(lap_file, thresholds, total_stats):
-    """Process a single lap CSV file"""
+def heatmap_lap_key(heatmap, lap_file):
+    """Key on session + file so re-running a session never double counts"""
+    return f"{heatmap.get('session', '')}/{os.path.basename(lap_file)}"
+
+def process_single_lap_cached(lap_file, car_type, thresholds, total_stats, heatmap=None, cache_dir=None,
+                              log=print):
+    """process_single_lap(), reusing the cached metrics if the CSV is unchanged"""
+    stat = os.stat(lap_file)
+    key = [LAP_CACHE_VERSION, stat.st_mtime_ns, stat.st_size, car_type]
+    cache_path = os.path.join(cache_dir, os.path.basename(lap_file) + '.json') if cache_dir else None
+
+    # A lap missing from the heatmap grid has to be re-read to rasterize it
+    if cache_path and (heatmap is None or heatmap_lap_key(heatmap, lap_file) in heatmap['laps']):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+        stats = entry.get('stats') if isinstance(entry, dict) else None
+        if (isinstance(stats, dict) and entry.get('key') == key and set(stats) == set(total_stats)
+                and all(type(count) is int for count in stats.values())):
+            for name, count in stats.items():
+                total_stats[name] += count
+            return entry['metrics']
+
+    log(f"Processing {os.path.basename(lap_file)}...")
+    lap_stats = dict.fromkeys(total_stats, 0)
+    lap_metrics = process_single_lap(lap_file, thresholds, lap_stats, heatmap, log)
+    for name, count in lap_stats.items():
+        total_stats[name] += count
+
+    if cache_path:
+        try:
+            text = json.dumps({'key': key, 'metrics': lap_metrics, 'stats': lap_stats})
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            pass  # read-only session folder or non-JSON metrics: analysis still works, just uncached
+    return lap_metrics
+
+def process_single_lap(lap_file, thresholds, total_stats, heatmap=None, log=print):
+    """Process a single lap CSV file (optionally rasterizing it into a heatmap grid)"""
     try:
         with open(lap_file, 'r', encoding='utf-8') as f:
             reader = csv.DictReader(f)
@@ -334,11 +665,12 @@ def process_single_lap(lap_file, thresholds, total_stats):
         total_stats['total_rows'] += len(data)
 
         if len(data) < 10:
-            print(f"  Skipping {lap_file} - insufficient data points")
+            log(f"  Skipping {lap_file} - insufficient data points")
             return None
 
         # Convert numeric fields and validate
         validated_data = []
+        rejected_ids = []
         for row in data:
             # Convert all numeric fields
             for key in row.keys():
@@ -349,12 +681,14 @@ def process_single_lap(lap_file, thresholds, total_stats):
             clean_row = validate_data_row(row, total_stats)
             if clean_row:
                 validated_data.append(clean_row)
+            elif row.get('packet_id'):
+                rejected_ids.append(row['packet_id'])
 
         if len(validated_data) < 5:
-            print(f"  Skipping {lap_file} - insufficient valid data after cleaning")
+            log(f"  Skipping {lap_file} - insufficient valid data after cleaning")
             return None
 
-        lap_metrics = analyze_lap_data(validated_data, thresholds)
+        lap_metrics = analyze_lap_data(validated_data, thresholds, rejected_ids)
         
         # Extract lap number from filename
         base = os.path.basename(lap_file).lower()
@@ -368,15 +702,23 @@ def process_single_lap(lap_file, thresholds, total_stats):
         lap_metrics['lap_number'] = lap_number
         lap_metrics['data_points_analyzed'] = len(validated_data)
         lap_metrics['data_points_total'] = len(data)
+
+        if heatmap is not None:
+            lap_key = heatmap_lap_key(heatmap, lap_file)
+            if lap_key not in heatmap['laps']:
+                cols = lap_columns(validated_data, HEATMAP_COLUMNS)
+                accumulate_heatmap(heatmap, cols['position_x'], cols['position_z'],
+                                   heatmap_channel_values(cols))
+                heatmap['laps'].add(lap_key)
         
         return lap_metrics
 
     except Exception as e:
-        print(f"  Error processing {lap_file}: {e}")
+        log(f"  Error processing {lap_file}: {e}")
         return None
 
-def analyze_lap_data(data, thresholds):
-    """Complete lap analysis with validated telemetry data"""
+def analyze_lap_data(data, thresholds, rejected_ids=()):
+    """Complete lap analysis with validated telemetry data (rejected_ids: packet ids validation dropped)"""
     
     # Phase detection using adaptive thresholds
     braking_data = [row for row in data if to_float(row.get('brake_percent'),0) > thresholds['braking_threshold']]
@@ -390,6 +732,11 @@ def analyze_lap_data(data, thresholds):
     def mn(key): return safe_min(col(data, key))
     def st(key): return safe_std(col(data, key))
 
+    # Spike-filtered percentiles for decision channels (single extremes can be glitches)
+    robust = {key: robust_channel_stats(arr) for key, arr in lap_columns(data, ROBUST_CHANNELS).items()}
+    def p99(key): return robust[key]['p99']
+    def fmax(key): return robust[key]['max']
+
     metrics = {
         'lap_summary': {
             'total_data_points': len(data),
@@ -410,6 +757,8 @@ def analyze_lap_data(data, thresholds):
         'suspension_behavior': {
             'avg_body_height': m('body_height'),
             'min_body_height': mn('body_height'),
+            'min_body_height_filtered': robust['body_height']['min'],
+            'body_height_p1': robust['body_height']['p1'],
             'body_height_variation': st('body_height'),
             'suspension_travel': {
                 'fl_avg': m('suspension_fl'),
@@ -420,6 +769,14 @@ def analyze_lap_data(data, thresholds):
                 'fr_max': mx('suspension_fr'),
                 'rl_max': mx('suspension_rl'),
                 'rr_max': mx('suspension_rr'),
+                'fl_max_filtered': fmax('suspension_fl'),
+                'fr_max_filtered': fmax('suspension_fr'),
+                'rl_max_filtered': fmax('suspension_rl'),
+                'rr_max_filtered': fmax('suspension_rr'),
+                'fl_p99': p99('suspension_fl'),
+                'fr_p99': p99('suspension_fr'),
+                'rl_p99': p99('suspension_rl'),
+                'rr_p99': p99('suspension_rr'),
             },
             'front_rear_balance': {
                 'avg_front_compression': safe_mean([m('suspension_fl'), m('suspension_fr')]),
@@ -454,6 +811,8 @@ def analyze_lap_data(data, thresholds):
                 'rl_avg': m('tire_slip_ratio_rl'), 'rr_avg': m('tire_slip_ratio_rr'),
                 'fl_max': mx('tire_slip_ratio_fl'), 'fr_max': mx('tire_slip_ratio_fr'),
                 'rl_max': mx('tire_slip_ratio_rl'), 'rr_max': mx('tire_slip_ratio_rr'),
+                'fl_p99': p99('tire_slip_ratio_fl'), 'fr_p99': p99('tire_slip_ratio_fr'),
+                'rl_p99': p99('tire_slip_ratio_rl'), 'rr_p99': p99('tire_slip_ratio_rr'),
                 'front_slip_avg': safe_mean([m('tire_slip_ratio_fl'), m('tire_slip_ratio_fr')]),
                 'rear_slip_avg' : safe_mean([m('tire_slip_ratio_rl'), m('tire_slip_ratio_rr')]),
             },
@@ -507,7 +866,9 @@ def analyze_lap_data(data, thresholds):
             'acceleration_phase': analyze_driving_phase(acceleration_data) if acceleration_data else None,
             'high_speed_phase': analyze_driving_phase(high_speed_data) if high_speed_data else None,
         },
+        'robust_statistics': robust,
     }
+    metrics.update(calculate_derivative_channels(data, rejected_ids))
     return metrics
 
 def calculate_gear_usage(data):
@@ -893,22 +1254,207 @@ def analyze_tire_slip_patterns(all_lap_metrics, thresholds):
         'threshold_used': threshold,
     }
 
+# ==================== TRACK HEATMAPS ====================
+
+HEATMAP_CELL_SIZE = 5.0          # meters per grid cell (pos_x / pos_z plane)
+HEATMAP_BOTTOMING_TRAVEL = 0.28  # meters - same travel limit the CLI uses for bottoming
+
+# Channels rasterized onto the track map (per-sample value -> per-cell mean/max)
+HEATMAP_CHANNELS = [
+    'slip_ratio',         # worst of the 4 tires
+    'tire_temp',          # average of the 4 tires (Celsius)
+    'suspension_travel',  # deepest of the 4 corners (meters)
+    'tcs_active',         # 0/1 -> mean = activation rate
+    'asm_active',         # 0/1 -> mean = activation rate
+    'bottoming',          # 0/1 -> any corner beyond HEATMAP_BOTTOMING_TRAVEL
+    'speed_kph',
+]
+
+HEATMAP_COLUMNS = [
+    'position_x', 'position_z', 'speed_kph', 'flag_tcs_active', 'flag_asm_active',
+    'tire_slip_ratio_fl', 'tire_slip_ratio_fr', 'tire_slip_ratio_rl', 'tire_slip_ratio_rr',
+    'tire_temp_fl', 'tire_temp_fr', 'tire_temp_rl', 'tire_temp_rr',
+    'suspension_fl', 'suspension_fr', 'suspension_rl', 'suspension_rr',
+]
+
+def heatmap_channel_values(cols):
+    """Per-sample heatmap channel values from lap columns (vectorized)"""
+    corners = ('fl', 'fr', 'rl', 'rr')
+    slip = np.vstack([cols[f'tire_slip_ratio_{c}'] for c in corners])
+    temps = np.vstack([cols[f'tire_temp_{c}'] for c in corners])
+    travel = np.vstack([cols[f'suspension_{c}'] for c in corners]).max(axis=0)
+    return {
+        'slip_ratio': slip.max(axis=0),
+        'tire_temp': temps.mean(axis=0),
+        'suspension_travel': travel,
+        'tcs_active': cols['flag_tcs_active'],
+        'asm_active': cols['flag_asm_active'],
+        'bottoming': (travel > HEATMAP_BOTTOMING_TRAVEL).astype(float),
+        'speed_kph': cols['speed_kph'],
+    }
+
+def new_heatmap_grid(cell_size=HEATMAP_CELL_SIZE):
+    """Create an empty heatmap grid (grows as new track area is driven)"""
+    return {
+        'cell_size': float(cell_size),
+        'origin': (0, 0),  # (ix, iz) absolute cell index of count[0, 0]
+        'count': np.zeros((0, 0), dtype=np.int64),
+        'sum': {ch: np.zeros((0, 0)) for ch in HEATMAP_CHANNELS},
+        'max': {ch: np.zeros((0, 0)) for ch in HEATMAP_CHANNELS},
+        'laps': set(),
+    }
+
+def _grow_heatmap_grid(grid, ix_min, ix_max, iz_min, iz_max):
+    """Expand grid arrays so absolute cells [ix_min..ix_max] x [iz_min..iz_max] fit"""
+    nz, nx = grid['count'].shape
+    ox, oz = grid['origin']
+    if nx and nz:
+        ix_min, ix_max = min(ix_min, ox), max(ix_max, ox + nx - 1)
+        iz_min, iz_max = min(iz_min, oz), max(iz_max, oz + nz - 1)
+        if (ix_min, iz_min) == (ox, oz) and (ix_max - ix_min + 1, iz_max - iz_min + 1) == (nx, nz):
+            return
+    shape = (iz_max - iz_min + 1, ix_max - ix_min + 1)
+    rows = slice(oz - iz_min, oz - iz_min + nz)
+    cols = slice(ox - ix_min, ox - ix_min + nx)
+
+    def regrid(arr, fill):
+        out = np.full(shape, fill, dtype=arr.dtype)
+        out[rows, cols] = arr
+        return out
+
+    grid['count'] = regrid(grid['count'], 0)
+    grid['sum'] = {ch: regrid(a, 0.0) for ch, a in grid['sum'].items()}
+    grid['max'] = {ch: regrid(a, -np.inf) for ch, a in grid['max'].items()}
+    grid['origin'] = (ix_min, iz_min)
+
+def accumulate_heatmap(grid, pos_x, pos_z, channel_values):
+    """
+    Bin samples into the grid (np.histogram2d-style, via flat bincount).
+    Updates per-cell count, per-channel sum (for mean) and max in place.
+    """
+    pos_x = np.asarray(pos_x, dtype=float)
+    pos_z = np.asarray(pos_z, dtype=float)
+    finite = np.isfinite(pos_x) & np.isfinite(pos_z)
+    if not finite.any():
+        return grid
+
+    ix = np.floor(pos_x[finite] / grid['cell_size']).astype(np.int64)
+    iz = np.floor(pos_z[finite] / grid['cell_size']).astype(np.int64)
+    _grow_heatmap_grid(grid, int(ix.min()), int(ix.max()), int(iz.min()), int(iz.max()))
+
+    nz, nx = grid['count'].shape
+    ox, oz = grid['origin']
+    flat = (iz - oz) * nx + (ix - ox)
+
+    grid['count'] += np.bincount(flat, minlength=nz * nx).reshape(nz, nx)
+    for ch in HEATMAP_CHANNELS:
+        values = np.nan_to_num(np.asarray(channel_values[ch], dtype=float)[finite])
+        grid['sum'][ch] += np.bincount(flat, weights=values, minlength=nz * nx).reshape(nz, nx)
+        np.maximum.at(grid['max'][ch].reshape(-1), flat, values)
+    return grid
+
+def heatmap_mean(grid, channel):
+    """Per-cell mean of a channel (NaN where the car never went)"""
+    count = grid['count']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, grid['sum'][channel] / np.maximum(count, 1), np.nan)
+
+def heatmap_max(grid, channel):
+    """Per-cell max of a channel (NaN where the car never went)"""
+    return np.where(grid['count'] > 0, grid['max'][channel], np.nan)
+
+def heatmap_path(heatmap_dir, track):
+    """Persisted grid location for a track name"""
+    slug = ''.join(ch if ch.isalnum() else '_' for ch in track.strip().lower()).strip('_') or 'unknown_track'
+    return os.path.join(heatmap_dir, f'{slug}.npz')
+
+def load_heatmap_grid(path, cell_size=HEATMAP_CELL_SIZE):
+    """Load a persisted track grid, or start a new one"""
+    if not os.path.exists(path):
+        return new_heatmap_grid(cell_size)
+    with np.load(path) as z:
+        grid = new_heatmap_grid(float(z['cell_size']))
+        grid['origin'] = tuple(int(v) for v in z['origin'])
+        grid['count'] = z['count']
+        shape = grid['count'].shape
+        for ch in HEATMAP_CHANNELS:
+            grid['sum'][ch] = z[f'sum_{ch}'] if f'sum_{ch}' in z else np.zeros(shape)
+            grid['max'][ch] = z[f'max_{ch}'] if f'max_{ch}' in z else np.full(shape, -np.inf)
+        grid['laps'] = set(str(k) for k in z['laps'])
+    return grid
+
+def save_heatmap_grid(grid, path):
+    """Persist grid atomically (.npz, no pickle needed to reload)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    arrays = {
+        'cell_size': np.array(grid['cell_size']),
+        'origin': np.array(grid['origin'], dtype=np.int64),
+        'count': grid['count'],
+        'laps': np.array(sorted(grid['laps']), dtype=str),
+    }
+    for ch in HEATMAP_CHANNELS:
+        arrays[f'sum_{ch}'] = grid['sum'][ch]
+        arrays[f'max_{ch}'] = grid['max'][ch]
+    tmp_path = path + '.tmp.npz'
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+
+def write_heatmap_image(grid, channel, path, stat='mean'):
+    """Render one channel as an 8-bit PGM image (rows = z, columns = x, unvisited cells black)"""
+    values = heatmap_mean(grid, channel) if stat == 'mean' else heatmap_max(grid, channel)
+    visited = np.isfinite(values)
+    pixels = np.zeros(values.shape, dtype=np.uint8)
+    if visited.any():
+        lo, hi = float(np.min(values[visited])), float(np.max(values[visited]))
+        scale = 254.0 / (hi - lo) if hi > lo else 0.0
+        pixels[visited] = (1 + (values[visited] - lo) * scale).astype(np.uint8)
+    pixels = pixels[::-1]  # +z up
+    with open(path, 'wb') as f:
+        f.write(f'P5\n{pixels.shape[1]} {pixels.shape[0]}\n255\n'.encode('ascii'))
+        f.write(pixels.tobytes())
+
+def summarize_heatmap(grid, path):
+    """Compact heatmap info for the session JSON"""
+    count = grid['count']
+    return {
+        'grid_file': path,
+        'cell_size_m': grid['cell_size'],
+        'grid_shape': list(count.shape),
+        'cells_visited': int(np.count_nonzero(count)),
+        'samples_accumulated': int(count.sum()),
+        'laps_accumulated': len(grid['laps']),
+        'channels': HEATMAP_CHANNELS,
+    }
+
 # ==================== MAIN ====================
 
 def main():
-    if len(sys.argv) != 2:
-        print("Usage: python gt7_analyzer_fixed_v2.py <session_folder>")
-        return
-
-    session_folder = sys.argv[1]
+    parser = argparse.ArgumentParser(description='GT7 Telemetry Analyzer v3')
+    parser.add_argument('session_folder', help='Folder containing lap_*.csv files')
+    parser.add_argument('--track', help='Track name - accumulates laps into a persisted per-track heatmap grid')
+    parser.add_argument('--heatmap-dir', default='heatmaps', help='Directory holding per-track heatmap grids (default: heatmaps)')
+    parser.add_argument('--render-heatmaps', action='store_true',
+                        help='Write a PGM image per heatmap channel next to the grid file')
+    args = parser.parse_args()
+
+    session_folder = args.session_folder
     print(f"GT7 Telemetry Analyzer v3 - FIXED & ENHANCED")
     print(f"Processing telemetry session: {session_folder}")
     print("=" * 70)
 
-    result = process_session_folder(session_folder)
+    result = process_session_folder(session_folder, track=args.track, heatmap_dir=args.heatmap_dir)
     if not result:
         return
 
+    if args.render_heatmaps and 'track_heatmap' in result:
+        grid_file = result['track_heatmap']['grid_file']
+        grid = load_heatmap_grid(grid_file)
+        base = grid_file[:-len('.npz')]
+        for channel in HEATMAP_CHANNELS:
+            stat = 'max' if channel in ('slip_ratio', 'suspension_travel') else 'mean'
+            write_heatmap_image(grid, channel, f"{base}_{channel}_{stat}.pgm", stat=stat)
+        print(f"🗺️  Heatmap images written to {os.path.dirname(grid_file) or '.'}")
+
     print("\n" + "=" * 70)
     print("SESSION ANALYSIS SUMMARY")
     print("=" * 70)
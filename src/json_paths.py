@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON path extraction - read a few keys out of a large JSON file
+
+Only the requested paths are decoded (with the json module); everything else
+is skipped by bracket matching over a memory map of the file, without
+building Python objects. Skipping works on windows of up to 1 MB: each is
+reduced to its quotes and brackets with bytes.translate, strings are dropped,
+and the remaining brackets are summed - so the per-byte work stays in C.
+Scanning stops as soon as every requested path has been read.
+
+    extract_paths('telemetry_analysis_v3.json',
+                  ['tire_slip_analysis.balance_analysis', 'individual_laps[0].suspension_behavior'])
+    -> {'tire_slip_analysis': {'balance_analysis': {...}},
+        'individual_laps': [{'suspension_behavior': {...}}]}
+
+The result keeps the file's nesting. Objects and arrays on the way to a
+requested path are included (possibly empty) whenever they exist; arrays keep
+only the requested elements, in order. A value that cannot be descended into
+(e.g. a number where an object was expected) is kept whole. Skipped content
+is only bracket-matched, not validated.
+"""
+
+import json
+import mmap
+import re
+from itertools import accumulate
+
+
+PATH_PART = re.compile(r'([^.\[\]]+)|\[(\d+)\]')
+
+WHITESPACE = re.compile(rb'[ \t\n\r]*')
+STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.S)
+STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.S)   # rest of a string already opened
+SCALAR = re.compile(rb'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][-+]?\d+)?|true|false|null|NaN|-?Infinity')
+TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.S)
+
+WINDOW = 1 << 20       # largest skip window; skips start at 4 KB and double
+FIRST_WINDOW = 1 << 12
+STRUCTURAL = b'"\\[]{}'
+NON_STRUCTURAL = bytes(byte for byte in range(256) if byte not in STRUCTURAL)
+QUOTED = re.compile(rb'"[^"]*"')
+STEP = [0] * 256
+STEP[ord('{')] = STEP[ord('[')] = 1
+STEP[ord('}')] = STEP[ord(']')] = -1
+
+
+class _Done(Exception):
+    """Every requested path has been read"""
+
+
+def parse_path(path):
+    """'individual_laps[0].suspension_behavior' -> ('individual_laps', 0, 'suspension_behavior')"""
+    parts = []
+    position = 0
+    for match in PATH_PART.finditer(path):
+        if match.start() != position and path[position:match.start()] != '.':
+            raise ValueError(f"Invalid JSON path: {path!r}")
+        key, index = match.groups()
+        parts.append(key if key is not None else int(index))
+        position = match.end()
+    if not parts or position != len(path):
+        raise ValueError(f"Invalid JSON path: {path!r}")
+    return tuple(parts)
+
+
+def path_tree(paths):
+    """Nested {key or index: subtree} for the paths; None marks a value read whole"""
+    tree = {}
+    for path in paths:
+        node = tree
+        *parents, leaf = parse_path(path)
+        for part in parents:
+            if node.get(part, {}) is None:
+                break  # an ancestor is already read whole
+            node = node.setdefault(part, {})
+        else:
+            node[leaf] = None
+    return tree
+
+
+def _leaves(tree):
+    return sum(1 if subtree is None else _leaves(subtree) for subtree in tree.values())
+
+
+class _Extractor:
+    """One pass over a JSON document in a bytes-like buffer"""
+
+    def __init__(self, buf, tree):
+        self.buf = buf
+        self.size = len(buf)
+        self.remaining = _leaves(tree)
+
+    def error(self, message, pos):
+        doc = bytes(self.buf[:pos]).decode('utf-8', 'replace')
+        raise json.JSONDecodeError(message, doc, len(doc))
+
+    def skip_whitespace(self, pos):
+        return WHITESPACE.match(self.buf, pos).end()
+
+    def expect(self, pos, char):
+        pos = self.skip_whitespace(pos)
+        if self.buf[pos:pos + 1] != char:
+            self.error(f"Expecting {char.decode()!r} delimiter", pos)
+        return pos + 1
+
+    # ── skipping ────────────────────────────────────────────
+
+    def skip_value(self, pos):
+        """End of the value starting at pos (no whitespace before it)"""
+        first = self.buf[pos:pos + 1]
+        if first == b'"':
+            match = STRING.match(self.buf, pos)
+            if match is None:
+                self.error("Unterminated string starting at", pos)
+            return match.end()
+        if first in (b'{', b'['):
+            return self.skip_to_close(pos + 1, 1)
+        match = SCALAR.match(self.buf, pos)
+        if match is None:
+            self.error("Expecting value", pos)
+        return match.end()
+
+    def skip_to_close(self, pos, depth):
+        """End of the container that is `depth` levels open at pos (outside any string)"""
+        in_string = False
+        window_size = min(FIRST_WINDOW, WINDOW)
+        while pos < self.size:
+            end = min(pos + window_size, self.size)
+            window_size = min(window_size * 2, WINDOW)
+            window = self.buf[pos:end]
+            if b'\\' in window:
+                # Escapes would confuse the quote pairing below: walk token by token
+                pos, depth, closed = self.walk(pos, end, depth, in_string)
+                if closed:
+                    return pos
+                in_string = False
+                continue
+
+            # Dropping two adjacent quotes (an empty string, or the gap between two
+            # strings with nothing structural in it) keeps every bracket on its side
+            reduced = window.translate(None, NON_STRUCTURAL).replace(b'""', b'')
+            if in_string:
+                quote = reduced.find(b'"')
+                if quote < 0:
+                    pos = end
+                    continue  # still inside the same string
+                reduced = reduced[quote + 1:]
+            brackets = QUOTED.sub(b'', reduced) if b'"' in reduced else reduced
+            open_quote = brackets.find(b'"')
+            window_in_string = in_string
+            in_string = open_quote >= 0
+            if in_string:
+                brackets = brackets[:open_quote]  # string continues into the next window
+
+            levels = list(accumulate(map(STEP.__getitem__, brackets), initial=depth))
+            if min(levels) > 0:
+                depth = levels[-1]
+                pos = end
+                continue
+
+            # The container closes in this window: find exactly where
+            pos, depth, closed = self.walk(pos, end, depth, window_in_string)
+            if closed:
+                return pos
+            in_string = False
+        self.error("Unterminated container", self.size)
+
+    def walk(self, pos, end, depth, in_string):
+        """
+        Token-level scan from pos until the container closes or a token ends at/after end
+
+        Returns:
+            (position, depth, closed) - position is never inside a string
+        """
+        buf = self.buf
+        if in_string:
+            match = STRING_TAIL.match(buf, pos)
+            if match is None:
+                self.error("Unterminated string", pos)
+            pos = match.end()
+        while pos < end:
+            match = TOKEN.search(buf, pos)
+            if match is None:
+                self.error("Unterminated container", self.size)
+            pos = match.end()
+            token = buf[match.start()]
+            if token == 0x22:  # '"'
+                continue
+            depth += 1 if token in (0x7b, 0x5b) else -1  # '{' '['
+            if depth == 0:
+                return pos, 0, True
+        return pos, depth, False
+
+    # ── extraction ──────────────────────────────────────────
+
+    def capture(self, pos, count):
+        """Decode the value at pos whole; stop once nothing is left to read"""
+        end = self.skip_value(pos)
+        value = json.loads(bytes(self.buf[pos:end]))
+        self.remaining -= count
+        return value, end
+
+    def value(self, pos, tree, store):
+        """Read the value at pos following tree, handing it to store(value) before descending"""
+        pos = self.skip_whitespace(pos)
+        first = self.buf[pos:pos + 1]
+        if tree is not None and first == b'{' and all(isinstance(key, str) for key in tree):
+            result = {}
+            store(result)
+            return self.object(pos + 1, tree, result)
+        if tree is not None and first == b'[' and all(isinstance(key, int) for key in tree):
+            result = []
+            store(result)
+            return self.array(pos + 1, tree, result)
+        value, end = self.capture(pos, 1 if tree is None else _leaves(tree))
+        store(value)
+        if self.remaining == 0:
+            raise _Done
+        return end
+
+    def object(self, pos, tree, result):
+        pos = self.skip_whitespace(pos)
+        if self.buf[pos:pos + 1] == b'}':
+            return pos + 1
+        while True:
+            pos = self.skip_whitespace(pos)
+            match = STRING.match(self.buf, pos)
+            if match is None:
+                self.error("Expecting property name enclosed in double quotes", pos)
+            raw = match.group()
+            key = raw[1:-1].decode('utf-8') if b'\\' not in raw else json.loads(raw)
+            pos = self.skip_whitespace(self.expect(match.end(), b':'))
+            if key in tree:
+                pos = self.value(pos, tree[key], lambda value: result.__setitem__(key, value))
+            else:
+                pos = self.skip_value(pos)
+
+            pos = self.skip_whitespace(pos)
+            delimiter = self.buf[pos:pos + 1]
+            if delimiter == b'}':
+                return pos + 1
+            if delimiter != b',':
+                self.error("Expecting ',' delimiter", pos)
+            pos += 1
+
+    def array(self, pos, tree, result):
+        pos = self.skip_whitespace(pos)
+        if self.buf[pos:pos + 1] == b']':
+            return pos + 1
+        last = max(tree)
+        index = 0
+        while True:
+            pos = self.skip_whitespace(pos)
+            if index in tree:
+                pos = self.value(pos, tree[index], result.append)
+            else:
+                pos = self.skip_value(pos)
+
+            pos = self.skip_whitespace(pos)
+            delimiter = self.buf[pos:pos + 1]
+            if delimiter == b']':
+                return pos + 1
+            if delimiter != b',':
+                self.error("Expecting ',' delimiter", pos)
+            pos += 1
+            index += 1
+            if index > last:
+                return self.skip_to_close(pos, 1)  # nothing more wanted from this array
+
+
+def extract_from_buffer(buf, paths):
+    """extract_paths() on JSON already in a bytes-like object"""
+    tree = path_tree(paths)
+    if not tree:
+        return {}
+    extractor = _Extractor(buf, tree)
+    document = []
+    try:
+        extractor.value(0, tree, document.append)
+    except _Done:
+        pass
+    if not document:
+        extractor.error("Expecting value", extractor.skip_whitespace(0))
+    return document[0]
+
+
+def extract_paths(path, paths):
+    """
+    Read only the given paths out of a JSON file
+
+    Args:
+        path: JSON file
+        paths: Dotted paths with [n] list indices, e.g. 'individual_laps[0].lap_summary'
+
+    Returns:
+        The document pruned to those paths (see module docstring)
+
+    Raises:
+        FileNotFoundError / OSError, json.JSONDecodeError on malformed input
+    """
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise json.JSONDecodeError("Expecting value", "", 0)  # empty file
+        with buf:
+            return extract_from_buffer(buf, paths)
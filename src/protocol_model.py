@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+ClaudeTunes Protocol Model
+Compiled, read-only view of the ClaudeTunes YAML protocol.
+
+The YAML is parsed once and every reference table the CLI needs is turned into
+a precomputed lookup (compounds incl. normalized aliases, drivetrain biases,
+downforce classes, differential baselines, CG / roll-center adjustment
+values). The compiled model is pickled next to the YAML, keyed by the SHA-256
+of the YAML bytes, so later runs skip PyYAML entirely:
+
+    config/ClaudeTunes_v8.5.3c.yaml
+    config/.protocol_cache/ClaudeTunes_v8.5.3c-<sha256>-v1.pickle
+
+Editing the YAML changes its hash, so a stale cache is never used; writing
+the new entry removes that YAML's older ones.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from pathlib import Path
+
+
+MODEL_VERSION = 1  # bump when the compiled layout changes (invalidates caches)
+CACHE_DIRNAME = '.protocol_cache'
+
+# YAML differential_baselines names -> drivetrain names used in car data
+DIFF_DRIVETRAIN_MAP = {
+    'FWD': 'FF',
+    'RWD': 'FR',  # Use FR for generic RWD
+    'RR_AWD': 'RR_AWD',
+    'RR_PURE': 'RR'
+}
+
+
+class ProtocolError(ValueError):
+    """Protocol YAML could not be parsed or lacks a required table"""
+
+
+class FrozenDict(dict):
+    """dict that refuses mutation (picklable, JSON-serializable)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError('protocol model tables are read-only')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value):
+    """Recursively convert dicts / lists to FrozenDict / tuples"""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+# ═══════════════════════════════════════════════════════════
+# YAML STRING PARSERS
+# ═══════════════════════════════════════════════════════════
+
+def parse_range_string(range_str):
+    """Parse YAML range string to tuple (e.g., "3000-4000" → (3000, 4000))"""
+    parts = range_str.split('-')
+    if len(parts) == 2:
+        try:
+            return (int(parts[0]), int(parts[1]))
+        except ValueError:
+            pass
+    return (0, 0)
+
+
+def parse_freq_add_string(freq_str):
+    """Parse YAML frequency add string to tuple (e.g., "+0.4-0.5 Hz" → (0.4, 0.5))"""
+    # Remove " Hz" suffix and "+" prefix
+    freq_str = freq_str.replace(' Hz', '').replace('+', '').strip()
+
+    # Check if it's a range
+    if '-' in freq_str:
+        parts = freq_str.split('-')
+        if len(parts) == 2:
+            try:
+                return (float(parts[0]), float(parts[1]))
+            except ValueError:
+                pass
+    else:
+        # Single value
+        try:
+            val = float(freq_str)
+            return (val, val)
+        except ValueError:
+            pass
+
+    return (0.0, 0.0)
+
+
+def parse_bias_string(bias_str):
+    """
+    Parse YAML bias string to front/rear dict
+    Examples: "+0.4F" → {'front': 0.4, 'rear': 0.0}
+              "+0.1R" → {'front': 0.0, 'rear': 0.1}
+              "+0.2F +0.2R" → {'front': 0.2, 'rear': 0.2}
+    """
+    result = {'front': 0.0, 'rear': 0.0}
+
+    # Split by spaces to handle combined bias (e.g., "+0.2F +0.2R")
+    for part in bias_str.strip().split():
+        # Extract value and direction
+        if part.endswith('F'):
+            result['front'] = float(part[:-1])
+        elif part.endswith('R'):
+            result['rear'] = float(part[:-1])
+
+    return result
+
+
+def parse_adjustment_value(add_str):
+    """
+    Parse YAML adjustment string to numeric value
+    Examples: "+0.1–0.3 Hz" → 0.2 (middle of range)
+              "-0.1 Hz" → -0.1
+              "0" → 0.0
+    """
+    if not add_str or add_str == "0":
+        return 0.0
+
+    # Remove " Hz" suffix
+    add_str = add_str.replace(' Hz', '').strip()
+
+    # Check if it's a range (contains –)
+    if '–' in add_str or '-' in add_str[1:]:  # Check for range dash (not negative sign)
+        # Handle both en-dash (–) and hyphen (-); filter out empty strings from negative numbers
+        parts = [p for p in add_str.replace('–', '-').split('-') if p]
+
+        if len(parts) >= 2:
+            try:
+                # Middle of range (first and last non-empty parts)
+                return (float(parts[0]) + float(parts[-1])) / 2
+            except ValueError:
+                pass
+
+    # Single value
+    try:
+        return float(add_str)
+    except ValueError:
+        return 0.0
+
+
+def normalize_compound(name):
+    """Compound name for alias matching ("Racing Hard Tires" → "racinghard")"""
+    return name.lower().replace(' ', '').replace('tires', '').replace('tire', '').strip()
+
+
+# ═══════════════════════════════════════════════════════════
+# COMPILED MODEL
+# ═══════════════════════════════════════════════════════════
+
+class ProtocolModel:
+    """Immutable, precompiled ClaudeTunes protocol"""
+
+    __slots__ = (
+        'source_sha256',
+        'version',
+        'raw',                          # whole protocol, deep-frozen
+        'compounds',                    # 'Racing Hard' -> base Hz
+        'compound_aliases',             # ((normalized name, Hz), ...) in YAML order
+        'default_compound_hz',          # Racing Hard
+        'drivetrain_biases',            # 'FR' -> {'front', 'rear'} Hz
+        'downforce_database',           # class -> {'df_range', 'freq_add', 'gt7_impact'}
+        'differential_baselines',       # drivetrain -> {'initial', 'accel', 'brake'} (min, max)
+        'cg_adjustments',               # 'high' / 'standard' / 'very_low' -> Hz
+        'roll_center_df_multipliers',   # 'low' / 'moderate' / 'high' -> multiplier
+        'roll_center_layout',           # drivetrain -> multiplier
+    )
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('ProtocolModel is immutable')
+
+    def __reduce__(self):
+        return (ProtocolModel, tuple(getattr(self, name) for name in self.__slots__))
+
+    def base_frequency(self, compound):
+        """Base Hz for a tire compound name (exact, then normalized alias); None if unknown"""
+        compound = compound.strip()
+        if compound in self.compounds:
+            return self.compounds[compound]
+
+        normalized = normalize_compound(compound)
+        for alias, hz in self.compound_aliases:
+            if normalized == alias or alias in normalized:
+                return hz
+        return None
+
+    def drivetrain_bias(self, drivetrain):
+        """Front/rear frequency bias; generic AWD uses AWD_DEFAULT, unknown falls back to FR"""
+        if drivetrain in self.drivetrain_biases:
+            return self.drivetrain_biases[drivetrain]
+        if drivetrain == 'AWD' and 'AWD_DEFAULT' in self.drivetrain_biases:
+            return self.drivetrain_biases['AWD_DEFAULT']
+        return self.drivetrain_biases.get('FR', FrozenDict(front=0.2, rear=0.0))
+
+
+def compile_protocol(protocol, source_sha256=''):
+    """
+    Build the ProtocolModel from a parsed protocol dict
+
+    Raises:
+        ProtocolError: A required reference table is missing
+    """
+    try:
+        phase_b = protocol['phase_B']
+        reference = protocol['reference_tables']
+
+        # YAML: phase_B.base_frequency_by_compound (underscores -> spaces for GT7 names)
+        compound_data = phase_b['base_frequency_by_compound']
+        compounds = {key.replace('_', ' '): value['hz'] for key, value in compound_data.items()}
+        compound_aliases = tuple((key.lower().replace(' ', ''), hz) for key, hz in compounds.items())
+        default_compound_hz = compound_data['Racing_Hard']['hz']
+
+        # YAML: phase_B.drivetrain_bias
+        biases = {key: freeze(parse_bias_string(value['bias']))
+                  for key, value in phase_b['drivetrain_bias'].items()
+                  if isinstance(value, dict) and 'bias' in value}
+
+        # YAML: reference_tables.gt7_downforce_database.classes (first matching range wins)
+        downforce = {
+            car_class: FrozenDict(
+                df_range=parse_range_string(data['df_lbs']),
+                freq_add=parse_freq_add_string(data['freq_add']),
+                gt7_impact=data['gt7_impact'])
+            for car_class, data in reference['gt7_downforce_database']['classes'].items()
+        }
+
+        # YAML: reference_tables.differential_baselines (AWD entry has no values)
+        yaml_diff = reference['differential_baselines']
+        diff_baselines = {}
+        for yaml_name, python_name in DIFF_DRIVETRAIN_MAP.items():
+            data = yaml_diff.get(yaml_name, {})
+            if 'initial' in data and 'accel' in data and 'brake' in data:
+                diff_baselines[python_name] = FrozenDict(
+                    initial=parse_range_string(data['initial']),
+                    accel=parse_range_string(data['accel']),
+                    brake=parse_range_string(data['brake']))
+        if 'FR' in diff_baselines:
+            diff_baselines['MR'] = diff_baselines['FR']  # MR same as RWD/FR
+        if 'RR_AWD' in diff_baselines:
+            diff_baselines['AWD'] = diff_baselines['RR_AWD']  # rear-biased AWD baseline
+
+        # YAML: phase_B.cg_adjustments / roll_center_compensation
+        cg = {level: parse_adjustment_value(phase_b['cg_adjustments'][level]['add'])
+              for level in ('high', 'standard', 'very_low')}
+        rc_data = phase_b['roll_center_compensation']
+        df_multipliers = {level: parse_adjustment_value(value) for level, value in rc_data['df_multiplier'].items()}
+        layout = {dt: parse_adjustment_value(value) for dt, value in rc_data['layout'].items()}
+
+        return ProtocolModel(
+            source_sha256,
+            protocol['claudetunes']['version'],
+            freeze(protocol),
+            FrozenDict(compounds),
+            compound_aliases,
+            default_compound_hz,
+            FrozenDict(biases),
+            FrozenDict(downforce),
+            FrozenDict(diff_baselines),
+            FrozenDict(cg),
+            FrozenDict(df_multipliers),
+            FrozenDict(layout),
+        )
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ProtocolError(f"Protocol is missing or has a malformed table: {e}") from e
+
+
+# Models already loaded in this process, by YAML hash
+_loaded_models = {}
+
+
+def load_protocol_model(path, cache_dir=None, use_cache=True):
+    """
+    Load the compiled protocol for a YAML file
+
+    Args:
+        path: Protocol YAML path
+        cache_dir: Where compiled models are kept (default: .protocol_cache next to the YAML)
+        use_cache: Read / write the on-disk cache (default: True)
+
+    Returns:
+        ProtocolModel
+
+    Raises:
+        FileNotFoundError: YAML does not exist
+        ProtocolError: YAML could not be parsed or compiled
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest in _loaded_models:
+        return _loaded_models[digest]
+
+    cache_file = Path(cache_dir or path.parent / CACHE_DIRNAME) / f'{path.stem}-{digest}-v{MODEL_VERSION}.pickle'
+    model = _read_cache(cache_file) if use_cache else None
+    if model is None:
+        import yaml  # only needed on a cache miss
+        try:
+            protocol = yaml.safe_load(data)
+        except yaml.YAMLError as e:
+            raise ProtocolError(f"Error parsing protocol YAML: {e}") from e
+        if not isinstance(protocol, dict):
+            raise ProtocolError(f"Protocol YAML '{path}' is not a mapping")
+        model = compile_protocol(protocol, digest)
+        if use_cache:
+            _write_cache(cache_file, model)
+            _prune_cache(cache_file, path.stem)
+
+    _loaded_models[digest] = model
+    return model
+
+
+def _read_cache(cache_file):
+    try:
+        with open(cache_file, 'rb') as f:
+            model = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+        return None
+    return model if isinstance(model, ProtocolModel) else None
+
+
+def _write_cache(cache_file, model):
+    """Atomic write; an unwritable cache dir only costs the next run a YAML parse"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix='.tmp_', suffix='.pickle')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+def _prune_cache(cache_file, stem):
+    """Remove the YAML's other cache entries (older hashes / model versions) and unprefixed legacy ones"""
+    stale = re.compile(rf'(?:{re.escape(stem)}-)?[0-9a-f]{{64}}-v\d+\.pickle')
+    try:
+        entries = list(cache_file.parent.iterdir())
+    except OSError:
+        return
+    for entry in entries:
+        if entry != cache_file and stale.fullmatch(entry.name):
+            try:
+                entry.unlink()
+            except OSError:
+                pass  # another process pruned first, or a read-only cache dir
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Session folder watcher - wait for finished writes to a folder
+
+Uses Linux inotify (through ctypes, no extra dependency) and falls back to
+polling the folder's file stats elsewhere. Bursts of writes are debounced:
+wait() returns only once the folder has been quiet for `debounce` seconds
+(or `max_delay` seconds after the first write, so a busy folder cannot starve
+the caller), with the names of the files that were added or modified.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080     # atomic writers: temp file + rename
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+
+class InotifyBackend:
+    """Blocks on inotify events for one folder (Linux only)"""
+
+    name = 'inotify'
+
+    def __init__(self, folder):
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is Linux only")
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("libc has no inotify")
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(folder), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {folder}")
+
+    def wait(self, timeout):
+        """True if a file was written / moved in within timeout (None = forever)"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            os.read(self.fd, 65536)  # drain; the caller rescans the folder for what changed
+        except BlockingIOError:
+            return False
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingBackend:
+    """Compares file stats every poll_interval seconds"""
+
+    name = 'polling'
+
+    def __init__(self, scan, poll_interval=1.0):
+        self.scan = scan
+        self.poll_interval = poll_interval
+        self._seen = scan()
+
+    def wait(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+            current = self.scan()
+            if current != self._seen:
+                self._seen = current
+                return True
+
+    def close(self):
+        pass
+
+
+class FolderWatcher:
+    """
+    Debounced change detection for the files in one folder
+
+    Args:
+        folder: Folder to watch (not recursive)
+        relevant: Predicate on file names; other files are ignored
+        debounce: Quiet period (s) that ends a burst of writes
+        poll_interval: Scan interval (s) for the polling fallback
+        max_delay: Longest wait (s) after the first write of a burst
+        use_inotify: False forces polling (e.g. network shares)
+    """
+
+    def __init__(self, folder, relevant, debounce=1.0, poll_interval=1.0, max_delay=10.0, use_inotify=True):
+        self.folder = str(folder)
+        self.relevant = relevant
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._snapshot = self.snapshot()
+
+        self.backend = None
+        if use_inotify:
+            try:
+                self.backend = InotifyBackend(self.folder)
+            except OSError:
+                pass
+        if self.backend is None:
+            self.backend = PollingBackend(self.snapshot, min(poll_interval, debounce))
+
+    def snapshot(self):
+        """Relevant file name -> (mtime_ns, size)"""
+        files = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if self.relevant(entry.name):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue  # removed while scanning
+                    if entry.is_file():
+                        files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def wait(self):
+        """Block until relevant files were added or modified and writes settled; returns their names"""
+        while True:
+            self.backend.wait(None)
+            deadline = time.monotonic() + self.max_delay
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.backend.wait(min(self.debounce, remaining)):
+                    break  # quiet for a full debounce period (or waited long enough)
+
+            current = self.snapshot()
+            changed = {name for name, stat in current.items() if self._snapshot.get(name) != stat}
+            self._snapshot = current
+            if changed:
+                return changed
+
+    def close(self):
+        self.backend.close()
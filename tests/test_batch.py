@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test ClaudeTunes Batch (claudetunes_batch.py)
+
+Verifies job expansion (track types, manifest paths and output suffixes,
+glob / literal paths) and that run_batch writes the same sheets as the
+single-run engine, with per-job error records.
+"""
+
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from claudetunes_batch import expand_track_types, jobs_from_globs, jobs_from_manifest, run_batch, SUMMARY_FILENAME
+from claudetunes_cli import ClaudeTunesCLI
+from claudetunes_engine import generate_setup, parse_car_data, TELEMETRY_PATHS, TRACK_TYPES
+from json_paths import extract_paths
+from protocol_model import load_protocol_model
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+TEMPLATES = os.path.join(ROOT, 'templates')
+PROTOCOL = os.path.join(ROOT, 'config', 'ClaudeTunes_v8.5.3c.yaml')
+
+
+def test_job_expansion():
+    """Track types, manifest-relative paths, output suffixes, literal paths"""
+    print("\n" + "=" * 60)
+    print("Testing batch job expansion")
+    print("=" * 60)
+
+    assert expand_track_types('all') == TRACK_TYPES
+    assert expand_track_types(None) == ('balanced',)
+    assert expand_track_types(['technical', 'balanced', 'technical']) == ('technical', 'balanced')
+    try:
+        expand_track_types(['balanced', 'oval'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown track type accepted")
+    print("   expand_track_types: ✅")
+
+    tmp = tempfile.mkdtemp(prefix="test_batch_")
+    try:
+        manifest = os.path.join(tmp, 'jobs', 'manifest.json')
+        os.makedirs(os.path.dirname(manifest))
+        with open(manifest, 'w') as f:
+            json.dump({'jobs': [
+                {'car': '../cars/car.txt', 'telemetry': 'tsukuba.json', 'track_type': 'all', 'output': 'f430/setup.txt'},
+                {'car': '../cars/car.txt', 'telemetry': 'tsukuba.json', 'track_type': 'technical',
+                 'output': 'single.txt', 'conservative_ride_height': True},
+                {'car': '../cars/car.txt', 'telemetry': 'monza.json'},
+            ]}, f)
+        jobs = jobs_from_manifest(manifest, 'out')
+        base = os.path.join(tmp, 'jobs')
+        assert [job['output'] for job in jobs] == [
+            os.path.join('out', 'f430', f'setup_{track_type}.txt') for track_type in TRACK_TYPES
+        ] + [os.path.join('out', 'single.txt'), os.path.join('out', 'car', 'monza_balanced_setup.txt')]
+        assert all(job['car'] == os.path.join(base, '..', 'cars', 'car.txt') for job in jobs)
+        assert jobs[0]['telemetry'] == os.path.join(base, 'tsukuba.json')
+        assert [job['conservative_ride_height'] for job in jobs] == [False] * 3 + [True, False]
+        print("   manifest paths and output suffixes: ✅")
+
+        # Literal paths that do not exist become failing jobs; empty globs are an error
+        jobs = jobs_from_globs([os.path.join(TEMPLATES, '*MASTER.txt')],
+                               [os.path.join(TEMPLATES, 'sample_telemetry.json'), os.path.join(tmp, 'missing.json')],
+                               ('balanced',), 'out')
+        by_telemetry = {os.path.basename(job['telemetry']): job for job in jobs}
+        assert sorted(by_telemetry) == ['missing.json', 'sample_telemetry.json']
+        assert 'error' not in by_telemetry['sample_telemetry.json']
+        assert by_telemetry['missing.json']['error'] == f"Telemetry file '{os.path.join(tmp, 'missing.json')}' not found"
+        try:
+            jobs_from_globs([os.path.join(TEMPLATES, '*.txt')], [os.path.join(tmp, '*.json')], ('balanced',), 'out')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("empty telemetry glob accepted")
+        print("   literal / glob paths: ✅")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("\n✅ Job expansion working!")
+    return True
+
+
+def test_run_batch():
+    """Sheets match the engine byte for byte; missing telemetry warns, bad inputs are error records"""
+    print("\n" + "=" * 60)
+    print("Testing run_batch")
+    print("=" * 60)
+
+    model = load_protocol_model(PROTOCOL, use_cache=False)
+    car_path = os.path.join(TEMPLATES, 'car_data_with_ranges_MASTER.txt')
+    telemetry_path = os.path.join(TEMPLATES, 'sample_telemetry.json')
+    with open(car_path) as f:
+        car_data = parse_car_data(f.read())
+    telemetry = extract_paths(telemetry_path, TELEMETRY_PATHS)
+
+    tmp = tempfile.mkdtemp(prefix="test_batch_")
+    try:
+        out = os.path.join(tmp, 'out')
+        manifest = os.path.join(tmp, 'manifest.json')
+        with open(manifest, 'w') as f:
+            json.dump([
+                {'car': car_path, 'telemetry': telemetry_path, 'track_type': 'all'},
+                {'car': car_path, 'telemetry': telemetry_path, 'track_type': 'technical',
+                 'conservative_ride_height': True, 'output': 'conservative.txt'},
+                {'car': car_path, 'telemetry': 'missing.json'},
+                {'car': 'no_such_car.txt', 'telemetry': telemetry_path},
+            ], f)
+        jobs = jobs_from_manifest(manifest, out)
+        jobs += jobs_from_globs([car_path], [os.path.join(tmp, 'gone.json')], ('balanced',), out)
+
+        summary = run_batch(jobs, model, out, workers=1)
+        with open(os.path.join(out, SUMMARY_FILENAME)) as f:
+            assert json.load(f)['total'] == summary['total'] == len(jobs) == 7
+        records = summary['jobs']
+
+        expected_inputs = [(telemetry, track_type, False) for track_type in TRACK_TYPES] + [
+            (telemetry, 'technical', True), ({}, 'balanced', False)]
+        for record, (job_telemetry, track_type, conservative) in zip(records, expected_inputs):
+            assert record['status'] == 'ok', record
+            expected = ClaudeTunesCLI.render_setup_sheet(
+                car_data, generate_setup(car_data, job_telemetry, model, track_type, conservative).setup)
+            with open(record['output'], 'rb') as f:
+                assert f.read() == expected.encode(), record['output']
+        assert records[3]['output'] == os.path.join(out, 'conservative.txt')
+        print("   sheets identical to generate_setup: ✅")
+
+        assert any('not found' in warning for warning in records[4]['warnings'])
+        print("   missing telemetry: ok with warning: ✅")
+
+        # Missing car file in the manifest; literal telemetry path that does not exist
+        for record, missing in ((records[5], 'no_such_car.txt'), (records[6], 'gone.json')):
+            assert record['status'] == 'error' and missing in record['error'], record
+            assert not os.path.exists(record['output'])
+        assert (summary['succeeded'], summary['failed']) == (5, 2)
+        print("   error records: ✅")
+
+        # Two jobs writing the same sheet are refused before anything runs
+        try:
+            run_batch(jobs[:1] * 2, model, out, workers=1)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("duplicate outputs accepted")
+        print("   duplicate outputs rejected: ✅")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("\n✅ run_batch working!")
+    return True
+
+
+if __name__ == '__main__':
+    print("ClaudeTunes Batch Tests")
+    print()
+
+    expansion_ok = test_job_expansion()
+    batch_ok = test_run_batch()
+
+    print("\n" + "=" * 60)
+    if expansion_ok and batch_ok:
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        print("=" * 60)
+        sys.exit(1)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test ClaudeTunes Daemon (claudetunes_daemon.py)
+
+Calls TuningService.handle() directly: request errors, {"path": ...}
+telemetry re-read when the file changes, and memoized sessions following a
+protocol YAML edit. Every setup is compared against generate_setup().
+"""
+
+import sys
+import os
+import io
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+
+import yaml
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from claudetunes_daemon import TuningService, RequestError
+from claudetunes_engine import generate_setup, TELEMETRY_PATHS
+from json_paths import extract_paths
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+PROTOCOL = os.path.join(ROOT, 'config', 'ClaudeTunes_v8.5.3c.yaml')
+CAR_ID = 'car_data_with_ranges_MASTER'
+SAMPLE = os.path.join(ROOT, 'templates', 'sample_telemetry.json')
+ANALYZER = os.path.join(ROOT, 'examples', 'F430_Tsukuba_Baseline.json')
+
+
+def make_service(protocol_path):
+    service = TuningService(protocol_path)
+    service.load_car_library([os.path.join(ROOT, 'templates', CAR_ID + '.txt')])
+    return service
+
+
+def expect_request_error(service, method, path, request, message):
+    try:
+        service.handle(method, path, request)
+    except RequestError as e:
+        assert message in str(e), (message, str(e))
+        return
+    raise AssertionError(f"no RequestError for {request!r}")
+
+
+def test_request_errors():
+    """Unknown car / telemetry and badly shaped inline telemetry are RequestErrors (HTTP 400)"""
+    print("\n" + "=" * 60)
+    print("Testing request errors")
+    print("=" * 60)
+
+    service = make_service(PROTOCOL)
+    expect_request_error(service, 'POST', '/setup', {'car': 'Trabant'}, "Unknown car 'Trabant'")
+    expect_request_error(service, 'POST', '/setup', {'car': CAR_ID, 'telemetry': 'spa'}, "Unknown telemetry 'spa'")
+    expect_request_error(service, 'POST', '/setup', {'car': CAR_ID, 'track_type': 'oval'}, "Unknown track type")
+    print("   unknown car / telemetry / track type: ✅")
+
+    for telemetry, message in (
+        ({'tire_slip_analysis': 5}, "'telemetry.tire_slip_analysis' must be an object"),
+        ({'tire_slip_analysis': {'balance_analysis': [1]}}, "'telemetry.tire_slip_analysis.balance_analysis'"),
+        ({'suspension_travel': 'FL'}, "'telemetry.suspension_travel'"),
+        ({'individual_laps': {'lap_summary': {}}}, "'telemetry.individual_laps' must be a list"),
+        ({'individual_laps': [3]}, "'telemetry.individual_laps[0]' must be an object"),
+        ({'individual_laps': [{'tire_analysis': None}]}, "'telemetry.individual_laps[0].tire_analysis'"),
+    ):
+        expect_request_error(service, 'POST', '/setup', {'car': CAR_ID, 'telemetry': telemetry}, message)
+        expect_request_error(service, 'POST', '/telemetry', {'id': 'bad', 'telemetry': telemetry}, message)
+    assert 'bad' not in service.telemetry
+    print("   badly shaped inline telemetry: ✅")
+
+    # Well-formed inline telemetry (scalars included) is accepted as before
+    with open(SAMPLE) as f:
+        telemetry = json.load(f)
+    response = service.handle('POST', '/setup', {'car': CAR_ID, 'telemetry': telemetry})
+    expected = generate_setup(service.cars[CAR_ID], telemetry, service.model).to_dict()
+    assert response['balanced'] == expected
+    assert service.handle('POST', '/telemetry', {'id': 'sample', 'telemetry': telemetry})['id'] == 'sample'
+    print("   valid inline telemetry: ✅")
+
+    print("\n✅ Request errors working!")
+    return True
+
+
+def test_file_telemetry_and_reload():
+    """{"path": ...} telemetry follows the file; a YAML edit updates the memoized sessions"""
+    print("\n" + "=" * 60)
+    print("Testing file telemetry and protocol reload")
+    print("=" * 60)
+
+    tmp = tempfile.mkdtemp(prefix="test_daemon_")
+    try:
+        protocol_path = os.path.join(tmp, 'protocol.yaml')
+        shutil.copy(PROTOCOL, protocol_path)
+        telemetry_path = os.path.join(tmp, 'analysis.json')
+        shutil.copy(SAMPLE, telemetry_path)
+        service = make_service(protocol_path)
+        car_data = service.cars[CAR_ID]
+        request = {'car': CAR_ID, 'telemetry': {'path': telemetry_path}, 'track_type': 'all'}
+
+        def check(telemetry, model):
+            response = service.handle('POST', '/setup', request)
+            for track_type in ('high_speed', 'technical', 'balanced'):
+                expected = generate_setup(car_data, telemetry, model, track_type).to_dict()
+                assert response[track_type] == expected, track_type
+            return response
+
+        sample = extract_paths(SAMPLE, TELEMETRY_PATHS)
+        first = check(sample, service.model)
+        session = service.sessions[CAR_ID, f'file:{os.path.abspath(telemetry_path)}']
+        print("   {\"path\": ...} telemetry: ✅")
+
+        # Same file again: no re-read, same memoized results
+        computed = dict(session.computed)
+        assert check(sample, service.model) == first
+        assert session.computed == computed
+        # Rewritten file: re-read, new setup
+        shutil.copy(ANALYZER, telemetry_path)
+        analyzer = extract_paths(ANALYZER, TELEMETRY_PATHS)
+        second = check(analyzer, service.model)
+        assert second != first
+        print("   file change re-read: ✅")
+
+        # Protocol edit: raise every compound's base frequency
+        with open(protocol_path) as f:
+            protocol = yaml.safe_load(f)
+        for compound in protocol['phase_B']['base_frequency_by_compound'].values():
+            compound['hz'] = round(compound['hz'] + 0.35, 2)
+        with open(protocol_path, 'w') as f:
+            yaml.safe_dump(protocol, f)
+        old_model = service.model
+        with redirect_stdout(io.StringIO()):
+            assert service.reload_protocol() is True
+        assert service.model is not old_model and service.reloads == 1
+        assert service.sessions[CAR_ID, f'file:{os.path.abspath(telemetry_path)}'] is session
+        third = check(analyzer, service.model)
+        assert third != second
+        print("   YAML edit updates memoized sessions: ✅")
+
+        health = service.handle('GET', '/health', None)
+        assert health['protocol']['sha256'] == service.model.source_sha256 and health['sessions'] == 1
+        print("   /health: ✅")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("\n✅ File telemetry and reload working!")
+    return True
+
+
+if __name__ == '__main__':
+    print("Tuning Daemon Tests")
+    print()
+
+    errors_ok = test_request_errors()
+    reload_ok = test_file_telemetry_and_reload()
+
+    print("\n" + "=" * 60)
+    if errors_ok and reload_ok:
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        print("=" * 60)
+        sys.exit(1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test GT7 Telemetry Logger (gt7_1r.py)
+
+Verifies that lap CSVs written from the compact LapBuffer are identical to
+CSVs written straight from the extracted rows.
+
+gt7_1r.py is a script (it opens the UDP socket on import), so only the
+definitions under test are loaded from its source.
+"""
+
+import ast
+import csv
+import io
+import os
+import struct
+import sys
+import time
+from array import array
+from operator import itemgetter
+
+import numpy as np
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'src', 'gt7_1r.py')
+DEFINITIONS = {
+    'CAR_DATABASE', 'get_car_name', 'csv_headers', 'INT_COLUMNS', 'PER_LAP_COLUMNS',
+    'LapBuffer', 'decode_flags', 'extract_telemetry_data', 'current_position', 'total_positions',
+}
+
+
+def load_definitions():
+    """Execute just the DEFINITIONS from gt7_1r.py"""
+    with open(SCRIPT, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), SCRIPT)
+    nodes = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            name = node.name
+        elif isinstance(node, ast.Assign) and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+        else:
+            continue
+        if name in DEFINITIONS:
+            nodes.append(node)
+    namespace = {'struct': struct, 'array': array, 'itemgetter': itemgetter}
+    exec(compile(ast.Module(nodes, type_ignores=[]), SCRIPT, 'exec'), namespace)
+    return namespace
+
+
+def make_packet(rng, packet_id):
+    """Decrypted Packet A with plausible float32 channels and a few int fields set"""
+    floats = rng.normal(0, 50, 0x128 // 4).astype(np.float32)
+    ddata = bytearray(floats.tobytes())
+    struct.pack_into('i', ddata, 0x70, packet_id)
+    struct.pack_into('h', ddata, 0x74, 3)
+    struct.pack_into('H', ddata, 0x8E, 0x0001)
+    struct.pack_into('B', ddata, 0x90, 0x34)
+    struct.pack_into('i', ddata, 0x124, 3462)
+    return bytes(ddata)
+
+
+def test_lap_csv_round_trip():
+    """LapBuffer CSV text matches the baseline (rows written as extracted)"""
+    print("\n" + "=" * 60)
+    print("Testing LapBuffer CSV round trip")
+    print("=" * 60)
+
+    ns = load_definitions()
+    rng = np.random.default_rng(30)
+    rows = [ns['extract_telemetry_data'](make_packet(rng, 1000 + i), time.monotonic_ns(), 12.345 + i / 60)
+            for i in range(600)]
+
+    baseline = io.StringIO()
+    csv.writer(baseline).writerows(rows)
+
+    buffer = ns['LapBuffer']()
+    for row in rows:
+        buffer.append(row)
+    buffered = io.StringIO()
+    csv.writer(buffered).writerows(buffer.rows())
+
+    assert buffer.row_width == len(ns['csv_headers'])
+    mismatched = [(got, want) for got, want in zip(buffered.getvalue().splitlines(), baseline.getvalue().splitlines())
+                  if got != want]
+    assert not mismatched, f"{len(mismatched)} rows differ, first:\n{mismatched[0][0]}\n{mismatched[0][1]}"
+    assert buffered.getvalue() == baseline.getvalue()
+    assert buffered.getvalue().splitlines()[0].endswith(',12.345')  # lap time, as extracted
+    print(f"   {len(rows)} rows, {len(baseline.getvalue())} bytes identical")
+
+    print("\n✅ LapBuffer round trip exact!")
+    return True
+
+
+if __name__ == '__main__':
+    print("GT7 Telemetry Logger Tests")
+    print()
+
+    round_trip_ok = test_lap_csv_round_trip()
+
+    print("\n" + "=" * 60)
+    if round_trip_ok:
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        print("=" * 60)
+        sys.exit(1)
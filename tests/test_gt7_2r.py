@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Test GT7 Telemetry Analyzer (gt7_2r.py)
+
+Verifies the robust statistics helpers used for the analyzer's
+percentile and spike-filtered fields, the packet-id derivative channels and
+the persisted track heatmap grid and the per-lap metrics cache.
+"""
+
+import sys
+import os
+import csv
+import json
+import math
+import shutil
+import tempfile
+from unittest import mock
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import gt7_2r
+from gt7_2r import (hampel_filter, unwrap_segments, calculate_derivative_channels, analyze_session,
+                    heatmap_path, load_heatmap_grid, save_heatmap_grid, HEATMAP_CHANNELS, LAP_CACHE_DIRNAME)
+
+LAP_CSV_COLUMNS = (
+    ['packet_id', 'timestamp', 'car_name', 'position_x', 'position_y', 'position_z', 'speed_kph',
+     'throttle', 'brake', 'flag_car_on_track', 'flag_tcs_active', 'flag_asm_active']
+    + [f'{channel}_{corner}' for channel in ('tire_slip_ratio', 'tire_temp', 'suspension')
+       for corner in ('fl', 'fr', 'rl', 'rr')]
+)
+
+
+def write_lap_csv(path, center_x=0.0, samples=600):
+    """Synthetic lap: one 100 m radius circle around (center_x, 0); returns the (x, z) positions"""
+    positions = []
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(LAP_CSV_COLUMNS)
+        for i in range(samples):
+            angle = 2 * math.pi * i / samples
+            x, z = center_x + 100 * math.cos(angle), 100 * math.sin(angle)
+            positions.append((x, z))
+            writer.writerow([i + 1, f'{i / 60:.3f}', "Ferrari F430 '06", x, 0.0, z,
+                             150 + 30 * math.sin(3 * angle), 80, 0, 1, int(i % 50 == 0), 0]
+                            + [0.05] * 4 + [85.0] * 4 + [0.1 + 0.05 * math.sin(angle)] * 4)
+    return positions
+
+
+def test_hampel_flat_channel():
+    """A spike on a flat (MAD 0) channel is still flagged"""
+    print("\n" + "=" * 60)
+    print("Testing Hampel filter on flat channels")
+    print("=" * 60)
+
+    flat = np.zeros(600)
+    flat[300] = 0.5
+    filtered, spikes = hampel_filter(flat)
+    assert spikes.sum() == 1 and spikes[300]
+    assert filtered.max() == 0.0
+    print("   zeros + 0.5 spike: ✅")
+
+    # Quantized channel: steps of 1 are the resolution, not spikes
+    rng = np.random.default_rng(3)
+    quantized = np.round(rng.normal(50, 0.3, 5400))
+    quantized[1000] = 60
+    _, spikes = hampel_filter(quantized, quantum=1.0)
+    assert np.flatnonzero(spikes).tolist() == [1000]
+    print("   quantized channel: ✅")
+
+    # A clean step is a level change, not a spike
+    step = np.r_[np.zeros(300), np.ones(300)]
+    assert not hampel_filter(step)[1].any()
+    print("   step: ✅")
+
+    print("\n✅ Flat channels handled!")
+    return True
+
+
+def test_hampel_gaussian_noise():
+    """Pure Gaussian noise is (almost) never flagged"""
+    print("\n" + "=" * 60)
+    print("Testing Hampel false positives on Gaussian noise")
+    print("=" * 60)
+
+    rng = np.random.default_rng(11)
+    flagged = [int(hampel_filter(rng.normal(0, 1, 5400))[1].sum()) for _ in range(10)]
+    print(f"   flagged per 5400 samples: {flagged}")
+    assert max(flagged) <= 6
+    assert np.mean(flagged) <= 3
+
+    # Real spikes on top of the noise are still caught
+    noisy = rng.normal(0, 1, 5400)
+    noisy[[500, 2500, 4500]] += 20
+    _, spikes = hampel_filter(noisy)
+    assert spikes[[500, 2500, 4500]].all()
+
+    print("\n✅ Gaussian noise passes through!")
+    return True
+
+
+def test_derivative_gaps():
+    """Packet gaps neither poison nor inflate the derived heading rate"""
+    print("\n" + "=" * 60)
+    print("Testing derivative channels across packet gaps")
+    print("=" * 60)
+
+    rng = np.random.default_rng(5)
+    angle = np.mod(np.cumsum(rng.uniform(-20, 20, 1000)), 2 * np.pi) - np.pi
+    assert np.allclose(unwrap_segments(angle), np.unwrap(angle))
+    angle[500] = np.nan
+    assert np.isfinite(unwrap_segments(angle)[501:]).all()
+
+    # Constant-radius corner at 172 deg/s: short gap, long gap, rows rejected by validation
+    rate, radius = np.radians(172), 40.0
+    ids = np.arange(1, 1201)
+    missing = np.zeros(ids.size, dtype=bool)
+    missing[300:306] = missing[700:760] = missing[800:810] = True
+    rows = [
+        {'packet_id': float(i), 'position_x': radius * np.sin(rate * (i - 1) / 60),
+         'position_z': radius * np.cos(rate * (i - 1) / 60), 'speed_mps': radius * rate,
+         'angular_velocity_y': rate, 'suspension_fl': 0.1, 'suspension_fr': 0.1,
+         'suspension_rl': 0.1, 'suspension_rr': 0.1}
+        for i in ids[~missing]
+    ]
+    result = calculate_derivative_channels(rows, rejected_ids=ids[800:810])
+    course_rate = result['derived_dynamics']['max_course_rate_deg_s']
+    print(f"   max course rate: {course_rate:.1f} deg/s")
+    assert abs(course_rate - 172) < 1
+
+    report = result['time_base']
+    assert report['packets_dropped'] == 66
+    assert report['rejected_by_validation'] == 10
+    assert report['interpolated_packets'] == 6
+
+    print("\n✅ Derivative channels handle gaps!")
+    return True
+
+
+def test_heatmap_round_trip():
+    """Saved grids reload exactly, re-runs never double count, the grid grows for new track area"""
+    print("\n" + "=" * 60)
+    print("Testing heatmap grid persistence")
+    print("=" * 60)
+
+    def quiet(*args):
+        pass
+
+    def assert_same_grid(a, b):
+        assert a['cell_size'] == b['cell_size'] and a['origin'] == b['origin'] and a['laps'] == b['laps']
+        assert np.array_equal(a['count'], b['count'])
+        for ch in HEATMAP_CHANNELS:
+            assert np.array_equal(a['sum'][ch], b['sum'][ch]) and np.array_equal(a['max'][ch], b['max'][ch]), ch
+
+    tmp = tempfile.mkdtemp(prefix="test_heatmap_")
+    try:
+        session = os.path.join(tmp, 'session_1')
+        os.makedirs(session)
+        positions = write_lap_csv(os.path.join(session, 'lap_001.csv'))
+        positions += write_lap_csv(os.path.join(session, 'lap_002.csv'))
+        heatmap_dir = os.path.join(tmp, 'heatmaps')
+        grid_file = heatmap_path(heatmap_dir, 'Test Track')
+
+        summary = analyze_session(session, track='Test Track', heatmap_dir=heatmap_dir, log=quiet)
+        grid = load_heatmap_grid(grid_file)
+        assert grid['laps'] == {'session_1/lap_001.csv', 'session_1/lap_002.csv'}
+        assert summary['track_heatmap']['laps_accumulated'] == 2
+
+        # Cell counts match binning the positions by hand
+        cells = {}
+        for x, z in positions:
+            cell = (math.floor(x / grid['cell_size']), math.floor(z / grid['cell_size']))
+            cells[cell] = cells.get(cell, 0) + 1
+        ox, oz = grid['origin']
+        assert grid['count'].sum() == len(positions) == 1200
+        assert all(grid['count'][iz - oz, ix - ox] == n for (ix, iz), n in cells.items())
+        assert np.count_nonzero(grid['count']) == len(cells)
+        print(f"   two laps accumulated ({grid['count'].shape[1]}x{grid['count'].shape[0]} cells): ✅")
+
+        # save -> load is exact
+        copy_file = os.path.join(tmp, 'copy.npz')
+        save_heatmap_grid(grid, copy_file)
+        assert_same_grid(load_heatmap_grid(copy_file), grid)
+        print("   save / load round trip: ✅")
+
+        # Re-running the same session (cached or not) leaves the grid untouched
+        for use_cache in (True, False):
+            analyze_session(session, track='Test Track', heatmap_dir=heatmap_dir, use_cache=use_cache, log=quiet)
+            assert_same_grid(load_heatmap_grid(grid_file), grid)
+        print("   re-run does not double count: ✅")
+
+        # A lap on new ground (-x side) grows the grid and shifts its origin; old cells are kept
+        other = os.path.join(tmp, 'session_2')
+        os.makedirs(other)
+        write_lap_csv(os.path.join(other, 'lap_001.csv'), center_x=-500.0)
+        analyze_session(other, track='Test Track', heatmap_dir=heatmap_dir, log=quiet)
+        grown = load_heatmap_grid(grid_file)
+        assert grown['laps'] == grid['laps'] | {'session_2/lap_001.csv'}
+        assert grown['count'].sum() == 1800
+        gx, gz = grown['origin']
+        assert gx < ox and gz == oz
+        nz, nx = grid['count'].shape
+        assert grown['count'].shape == (nz, nx + ox - gx)
+        block = (slice(oz - gz, oz - gz + nz), slice(ox - gx, ox - gx + nx))
+        assert np.array_equal(grown['count'][block], grid['count'])
+        for ch in HEATMAP_CHANNELS:
+            assert np.array_equal(grown['sum'][ch][block], grid['sum'][ch])
+            assert np.array_equal(grown['max'][ch][block], grid['max'][ch])
+        print(f"   grid grown to {grown['count'].shape[1]}x{grown['count'].shape[0]} cells: ✅")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("\n✅ Heatmap grid persists without double counting!")
+    return True
+
+
+def test_lap_cache():
+    """A second analyze_session reads the JSON cache; touching a CSV re-parses only that lap"""
+    print("\n" + "=" * 60)
+    print("Testing per-lap metrics cache")
+    print("=" * 60)
+
+    def quiet(*args):
+        pass
+
+    def summary(session):
+        result = analyze_session(session, log=quiet)
+        del result['session_info']['processed_at']
+        return json.dumps(result, sort_keys=True)
+
+    tmp = tempfile.mkdtemp(prefix="test_lap_cache_")
+    try:
+        session = os.path.join(tmp, 'session_1')
+        os.makedirs(session)
+        for lap in ('lap_001.csv', 'lap_002.csv', 'lap_003.csv'):
+            write_lap_csv(os.path.join(session, lap))
+        cache_dir = os.path.join(session, LAP_CACHE_DIRNAME)
+        first = summary(session)
+        assert sorted(os.listdir(cache_dir)) == ['lap_001.csv.json', 'lap_002.csv.json', 'lap_003.csv.json']
+        print("   metrics cached as JSON: ✅")
+
+        # Nothing changed: no CSV is parsed, same summary
+        with mock.patch.object(gt7_2r, 'process_single_lap', side_effect=AssertionError("re-parsed")):
+            assert summary(session) == first
+        print("   second run served from cache: ✅")
+
+        # Touched CSV (new mtime) and a tampered cache entry are parsed again - only those laps
+        stat = os.stat(os.path.join(session, 'lap_002.csv'))
+        os.utime(os.path.join(session, 'lap_002.csv'), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        with open(os.path.join(cache_dir, 'lap_003.csv.json'), 'w') as f:
+            f.write('{"key": [3, 0, 0, "gt"], "stats": "junk"')
+        with mock.patch.object(gt7_2r, 'process_single_lap', wraps=gt7_2r.process_single_lap) as parse:
+            assert summary(session) == first
+        assert sorted(os.path.basename(call.args[0]) for call in parse.call_args_list) == ['lap_002.csv', 'lap_003.csv']
+        with mock.patch.object(gt7_2r, 'process_single_lap', side_effect=AssertionError("re-parsed")):
+            assert summary(session) == first
+        print("   touched CSV / bad cache entry re-parsed: ✅")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("\n✅ Lap cache working!")
+    return True
+
+
+if __name__ == '__main__':
+    print("GT7 Telemetry Analyzer Tests")
+    print()
+
+    flat_ok = test_hampel_flat_channel()
+    gaussian_ok = test_hampel_gaussian_noise()
+    derivative_ok = test_derivative_gaps()
+    heatmap_ok = test_heatmap_round_trip()
+    cache_ok = test_lap_cache()
+
+    print("\n" + "=" * 60)
+    if flat_ok and gaussian_ok and derivative_ok and heatmap_ok and cache_ok:
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        print("=" * 60)
+        sys.exit(1)
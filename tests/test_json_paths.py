@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test Streaming JSON Path Extraction (json_paths.py)
+
+Every extraction is compared against json.loads of the whole document,
+pruned to the same paths, including skips that cross the 4 KB and 1 MB
+window edges with brackets, quotes and escapes inside strings.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from json_paths import extract_from_buffer, extract_paths, path_tree, FIRST_WINDOW, WINDOW
+from claudetunes_engine import TELEMETRY_PATHS
+
+TEMPLATES = os.path.join(os.path.dirname(__file__), '..', 'templates')
+
+
+def prune(value, tree):
+    """Reference result: the fully decoded value cut down to the path tree"""
+    if tree is None:
+        return value
+    if isinstance(value, dict) and all(isinstance(key, str) for key in tree):
+        return {key: prune(value[key], subtree) for key, subtree in tree.items() if key in value}
+    if isinstance(value, list) and all(isinstance(key, int) for key in tree):
+        return [prune(value[index], tree[index]) for index in sorted(tree) if index < len(value)]
+    return value
+
+
+def check(text, paths):
+    """extract_from_buffer() on text equals the pruned json.loads() result"""
+    buf = text.encode('utf-8') if isinstance(text, str) else text
+    expected = prune(json.loads(buf), path_tree(paths))
+    got = extract_from_buffer(buf, paths)
+    assert got == expected, (paths, got, expected)
+    return got
+
+
+def test_strings_and_nesting():
+    """Escapes, brackets inside strings, nested arrays, indices past the end, missing paths"""
+    print("\n" + "=" * 60)
+    print("Testing path extraction on small documents")
+    print("=" * 60)
+
+    doc = {
+        'skip_escapes': ['a \\" b', 'quote \\"[{', 'ends in backslash \\', '\\\\"]}', '"', ''],
+        'skip_brackets': {'s': '[[[{{{', 't': ']]}}}', 'u': '""[]""', 'nested': [[[1, [2]], {}], []]},
+        'unicode': 'ünïcødé ☃ [',
+        'laps': [
+            {'summary': {'time': 81.2}, 'travel': [[0.1, 0.2], [0.3]]},
+            {'summary': {'time': 80.9}, 'travel': [[0.4], []]},
+        ],
+        'scalar': 5,
+        'esc\\"key': {'v': 1},
+        'target': {'deep': {'list': [10, [20, 21], {'x': '}'}]}},
+    }
+    text = json.dumps(doc, ensure_ascii=False)
+    for paths in (
+        ['target.deep.list[1]'],
+        ['target.deep.list[2].x', 'laps[1].summary'],
+        ['laps[0].travel[0][1]', 'laps[1].travel[1]'],
+        ['laps[5].summary', 'laps[1]'],            # index past the end
+        ['missing', 'target.missing.deeper'],      # missing paths
+        ['scalar.inner', 'laps.summary'],          # cannot descend: kept whole
+        ['esc\\"key.v', 'unicode'],
+        ['skip_escapes', 'skip_brackets.nested[0][0]'],
+        ['target', 'target.deep'],                 # ancestor read whole
+    ):
+        check(text, paths)
+        check(json.dumps(doc, indent=2), paths)
+    print("   escapes, brackets in strings, nesting: ✅")
+
+    assert extract_from_buffer(b'{"a": [1, 2]}', ['a[2]', 'b']) == {'a': []}
+    assert extract_from_buffer(b'{"a": 1}', []) == {}
+    print("   missing paths: ✅")
+
+    print("\n✅ Small documents match json.loads!")
+    return True
+
+
+def test_window_edges():
+    """Skipped values whose strings straddle the 4 KB and 1 MB window edges"""
+    print("\n" + "=" * 60)
+    print("Testing skips across window edges")
+    print("=" * 60)
+
+    # Skip windows start FIRST_WINDOW bytes after the opening bracket and double up to WINDOW
+    edges, size, total = [], FIRST_WINDOW, 0
+    while len(edges) < 10:
+        total += size
+        edges.append(total)
+        size = min(size * 2, WINDOW)
+
+    prefix = '{"skip": ["'
+    start = prefix.index('[') + 1
+    pieces = ['[{', '"]}"', ']}', '\\"[', '\\\\', '{"k": "]"}']
+    cases = 0
+    for edge in (edges[0], edges[1], edges[8], edges[9]):  # 4 KB, 12 KB, end of the first 1 MB window, next
+        for shift in range(-5, 3):
+            for piece in pieces:
+                # The string opens before the window edge and the piece sits across it
+                filler = 'x' * (start + edge + shift - len(prefix))
+                value = json.dumps(filler + piece + 'tail')[1:-1]
+                text = prefix + value + '", [1, {"a": "}"}]], "want": {"v": [1, 2]}}'
+                check(text, ['want.v[1]'])
+                cases += 1
+    print(f"   {cases} edge placements: ✅")
+
+    # One multi-megabyte value, bracket strings (some escaped) every few hundred bytes
+    items = []
+    for i in range(12000):
+        items.append({'id': i, 'label': f'lap {i} [{"{" * (i % 3)}', 'note': '\\"]' if i % 7 == 0 else ']}'})
+        items.append([i, [i + 1, 'x' * (i % 400)]])
+    text = json.dumps({'bulk': items, 'after': {'k': 'v'}, 'bulk2': items[:5000], 'last': [0, 1]})
+    assert len(text) > 2 * WINDOW
+    check(text, ['after.k', 'last[1]'])
+    check(text, ['bulk[23999][1][0]', 'last'])
+    print(f"   {len(text) // 1024} KB document: ✅")
+
+    print("\n✅ Window edges handled!")
+    return True
+
+
+def test_malformed_and_files():
+    """Empty or malformed input raises JSONDecodeError; TELEMETRY_PATHS on the sample template"""
+    print("\n" + "=" * 60)
+    print("Testing malformed input and files")
+    print("=" * 60)
+
+    for bad in (b'', b'   \n', b'{"a": [1, 2', b'{"a" 1}', b'{"b": [1, "]", {', b'{"a": "open', b'[1, 2'):
+        try:
+            extract_from_buffer(bad, ['a'])
+        except json.JSONDecodeError:
+            continue
+        raise AssertionError(f"no JSONDecodeError for {bad!r}")
+    print("   malformed buffers: ✅")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        empty = os.path.join(tmp, 'empty.json')
+        open(empty, 'wb').close()
+        try:
+            extract_paths(empty, ['a'])
+        except json.JSONDecodeError:
+            pass
+        else:
+            raise AssertionError("no JSONDecodeError for an empty file")
+    print("   empty file: ✅")
+
+    sample = os.path.join(TEMPLATES, 'sample_telemetry.json')
+    with open(sample, 'rb') as f:
+        expected = prune(json.load(f), path_tree(TELEMETRY_PATHS))
+    got = extract_paths(sample, TELEMETRY_PATHS)
+    assert got == expected and got
+    print(f"   TELEMETRY_PATHS on sample_telemetry.json ({sorted(got)}): ✅")
+
+    print("\n✅ Malformed input and files handled!")
+    return True
+
+
+if __name__ == '__main__':
+    print("Streaming JSON Path Extraction Tests")
+    print()
+
+    nesting_ok = test_strings_and_nesting()
+    edges_ok = test_window_edges()
+    malformed_ok = test_malformed_and_files()
+
+    print("\n" + "=" * 60)
+    if nesting_ok and edges_ok and malformed_ok:
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        print("=" * 60)
+        sys.exit(1)
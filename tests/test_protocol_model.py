@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test ClaudeTunes Protocol Model (protocol_model.py)
+
+Verifies the SHA-256 keyed compile cache (including pruning of stale
+entries), the frozen model tables and ProtocolError on bad YAML, all on a
+temporary copy of the protocol.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import protocol_model
+from protocol_model import load_protocol_model, ProtocolError, CACHE_DIRNAME
+
+PROTOCOL = os.path.join(os.path.dirname(__file__), '..', 'config', 'ClaudeTunes_v8.5.3c.yaml')
+
+
+def test_protocol_cache():
+    """Editing the YAML gives a new model and prunes the old cache entry"""
+    print("\n" + "=" * 60)
+    print("Testing protocol model cache")
+    print("=" * 60)
+
+    tmp = tempfile.mkdtemp(prefix="test_protocol_")
+    try:
+        path = os.path.join(tmp, 'protocol.yaml')
+        shutil.copy(PROTOCOL, path)
+        cache_dir = os.path.join(tmp, CACHE_DIRNAME)
+        # Another YAML sharing the cache dir keeps its entry
+        other = os.path.join(cache_dir, 'other-' + 'f' * 64 + '-v1.pickle')
+        legacy = os.path.join(cache_dir, 'e' * 64 + '-v1.pickle')
+        os.makedirs(cache_dir)
+        open(other, 'wb').close()
+        open(legacy, 'wb').close()
+
+        protocol_model._loaded_models.clear()  # an earlier load of the same YAML would skip the cache
+        first = load_protocol_model(path)
+        cached = sorted(os.listdir(cache_dir))
+        assert cached == sorted([f'protocol-{first.source_sha256}-v{protocol_model.MODEL_VERSION}.pickle',
+                                 os.path.basename(other)]), cached
+        print("   first load writes one entry, legacy entry pruned: ✅")
+
+        # A new process reads the pickle without compiling
+        protocol_model._loaded_models.clear()
+        with mock.patch.object(protocol_model, 'compile_protocol', side_effect=AssertionError("cache miss")):
+            again = load_protocol_model(path)
+        assert again.source_sha256 == first.source_sha256
+        assert again.compounds == first.compounds
+        print("   unchanged YAML is a cache hit: ✅")
+
+        # Editing the YAML: new hash, newly compiled values, old entry pruned
+        with open(path) as f:
+            text = f.read()
+        hz = first.compounds['Racing Hard']
+        edited = text.replace(f'hz: {hz}', f'hz: {hz + 0.5}', 1)
+        assert edited != text
+        with open(path, 'w') as f:
+            f.write(edited)
+        protocol_model._loaded_models.clear()
+        second = load_protocol_model(path)
+        assert second.source_sha256 != first.source_sha256
+        assert second.compounds['Racing Hard'] == hz + 0.5
+        cached = sorted(os.listdir(cache_dir))
+        assert cached == sorted([f'protocol-{second.source_sha256}-v{protocol_model.MODEL_VERSION}.pickle',
+                                 os.path.basename(other)]), cached
+        print("   edited YAML recompiled, stale entry pruned: ✅")
+
+        print("\n✅ Protocol cache working!")
+        return True
+
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def test_frozen_and_errors():
+    """model.raw rejects mutation; invalid YAML raises ProtocolError"""
+    print("\n" + "=" * 60)
+    print("Testing frozen model and ProtocolError")
+    print("=" * 60)
+
+    model = load_protocol_model(PROTOCOL, use_cache=False)
+    for mutate in (
+        lambda: model.raw.__setitem__('phase_B', {}),
+        lambda: model.raw['phase_B'].pop('base_frequency_by_compound'),
+        lambda: model.raw['phase_B']['base_frequency_by_compound']['Racing_Hard'].update(hz=9),
+        lambda: model.compounds.clear(),
+    ):
+        try:
+            mutate()
+        except TypeError:
+            continue
+        raise AssertionError("protocol model table was mutable")
+    try:
+        model.version = 'x'
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("ProtocolModel attribute was assignable")
+    assert not any(isinstance(value, list) for value in model.raw.values())
+    print("   raw tables read-only: ✅")
+
+    tmp = tempfile.mkdtemp(prefix="test_protocol_")
+    try:
+        for text in ('phase_B: [unclosed\n', '- just\n- a list\n', 'phase_B: {}\n'):
+            path = os.path.join(tmp, 'bad.yaml')
+            with open(path, 'w') as f:
+                f.write(text)
+            try:
+                load_protocol_model(path)
+            except ProtocolError:
+                continue
+            raise AssertionError(f"no ProtocolError for {text!r}")
+        assert not os.path.exists(os.path.join(tmp, CACHE_DIRNAME))
+        print("   invalid YAML -> ProtocolError: ✅")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print("\n✅ Frozen model and errors working!")
+    return True
+
+
+if __name__ == '__main__':
+    print("Protocol Model Tests")
+    print()
+
+    cache_ok = test_protocol_cache()
+    frozen_ok = test_frozen_and_errors()
+
+    print("\n" + "=" * 60)
+    if cache_ok and frozen_ok:
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        print("=" * 60)
+        sys.exit(1)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test SetupSession (claudetunes_engine.py)
+
+After every update() of car data, telemetry or protocol model, each
+memoized evaluate() must equal a fresh generate_setup() - a stale stage
+would silently hand out the previous setup.
+"""
+
+import sys
+import os
+import copy
+import json
+import tempfile
+
+import yaml
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from claudetunes_engine import generate_setup, parse_car_data, SetupSession, TRACK_TYPES
+from protocol_model import load_protocol_model
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+PROTOCOL = os.path.join(ROOT, 'config', 'ClaudeTunes_v8.5.3c.yaml')
+
+
+def check_session(session, car_data, telemetry, model):
+    """Every track type / ride height option matches generate_setup(); returns the dicts"""
+    results = {}
+    for track_type in TRACK_TYPES:
+        for conservative in (False, True):
+            got = session.evaluate(track_type, conservative).to_dict()
+            expected = generate_setup(car_data, telemetry, model, track_type, conservative).to_dict()
+            assert got == expected, (track_type, conservative)
+            results[track_type, conservative] = got
+    return results
+
+
+def test_session_updates():
+    """Car, telemetry ({} included) and model updates invalidate the right stages"""
+    print("\n" + "=" * 60)
+    print("Testing SetupSession against generate_setup")
+    print("=" * 60)
+
+    with open(os.path.join(ROOT, 'templates', 'car_data_with_ranges_MASTER.txt')) as f:
+        car_data = parse_car_data(f.read())
+    with open(os.path.join(ROOT, 'templates', 'sample_telemetry.json')) as f:
+        telemetry = json.load(f)
+    with open(os.path.join(ROOT, 'examples', 'F430_Tsukuba_Baseline.json')) as f:
+        analyzer_telemetry = json.load(f)
+    model = load_protocol_model(PROTOCOL, use_cache=False)
+
+    session = SetupSession(model, car_data, telemetry)
+    previous = check_session(session, car_data, telemetry, model)
+    assert session.computed == {'analysis': 1, 'physics': 1, 'constraints': 1, 'setup': 6}
+    print("   initial inputs: ✅")
+
+    def step(label, analysis_reruns, **inputs):
+        nonlocal previous
+        computed = dict(session.computed)
+        session.update(**inputs)
+        current = check_session(session, car_data, telemetry, model)
+        reruns = {name: session.computed[name] - computed[name] for name in computed}
+        assert reruns == {'analysis': analysis_reruns, 'physics': 1, 'constraints': 1, 'setup': 6}, reruns
+        assert current != previous, f"{label} did not change the setup - test inputs too weak"
+        previous = current
+        print(f"   {label}: ✅")
+
+    # Car data: heavier, more power, different compound
+    car_data = copy.deepcopy(car_data)
+    car_data.update(weight=3100, hp=800, tire_compound='Sports Soft Tires')
+    step("car data update", 0, car_data=car_data)
+
+    telemetry = analyzer_telemetry
+    step("telemetry update (analyzer format)", 1, telemetry=telemetry)
+
+    telemetry = {}
+    step("telemetry update ({})", 1, telemetry=telemetry)
+
+    # Model: same protocol with every compound's base frequency raised
+    with open(PROTOCOL) as f:
+        protocol = yaml.safe_load(f)
+    for compound in protocol['phase_B']['base_frequency_by_compound'].values():
+        compound['hz'] = round(compound['hz'] + 0.35, 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        edited = os.path.join(tmp, 'protocol.yaml')
+        with open(edited, 'w') as f:
+            yaml.safe_dump(protocol, f)
+        model = load_protocol_model(edited, use_cache=False)
+    step("model update", 0, model=model)
+
+    # Re-asking without changes is served from the memo
+    computed = dict(session.computed)
+    check_session(session, car_data, telemetry, model)
+    assert session.computed == computed
+
+    print("\n✅ SetupSession stays in sync!")
+    return True
+
+
+if __name__ == '__main__':
+    print("SetupSession Tests")
+    print()
+
+    session_ok = test_session_updates()
+
+    print("\n" + "=" * 60)
+    if session_ok:
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        print("=" * 60)
+        sys.exit(1)
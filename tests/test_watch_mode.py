@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Test Watch Mode (session_watcher.py, claudetunes_cli.py --watch)
+
+Verifies debouncing / max_delay of FolderWatcher with the polling and
+inotify backends, the .diff written next to a rewritten sheet, and that the
+measured ride frequency from Phase 1 domain JSONs reaches Phase B.
+"""
+
+import sys
+import os
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from session_watcher import FolderWatcher
+from claudetunes_cli import ClaudeTunesCLI
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+PROTOCOL = os.path.join(ROOT, 'config', 'ClaudeTunes_v8.5.3c.yaml')
+
+
+def wait_in_thread(watcher, timeout=10.0):
+    """watcher.wait() with a time limit (a missed event must fail, not hang); returns (changed, seconds)"""
+    result = {}
+
+    def run():
+        started = time.monotonic()
+        result['changed'] = watcher.wait()
+        result['seconds'] = time.monotonic() - started
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread, result
+
+
+def write_burst(folder, names, repeats, pause):
+    for i in range(repeats):
+        for name in names:
+            with open(os.path.join(folder, name), 'a') as f:
+                f.write(f"row {i}\n")
+        time.sleep(pause)
+
+
+def test_folder_watcher():
+    """A burst of lap CSV writes is one change set; irrelevant files are ignored"""
+    print("\n" + "=" * 60)
+    print("Testing FolderWatcher")
+    print("=" * 60)
+
+    for use_inotify in (False, True):
+        folder = tempfile.mkdtemp(prefix="test_watch_")
+        try:
+            watcher = FolderWatcher(folder, ClaudeTunesCLI._is_lap_csv, debounce=0.3, poll_interval=0.05,
+                                    max_delay=5.0, use_inotify=use_inotify)
+            try:
+                # Burst: two laps and a notes file rewritten every 50 ms
+                thread, result = wait_in_thread(watcher)
+                write_burst(folder, ['lap_001.csv', 'lap_002.csv', 'notes.txt'], repeats=8, pause=0.05)
+                thread.join(10.0)
+                assert result.get('changed') == {'lap_001.csv', 'lap_002.csv'}, result
+
+                # Only irrelevant files change: nothing is reported until a lap CSV is written
+                thread, result = wait_in_thread(watcher)
+                write_burst(folder, ['notes.txt', 'setup.diff'], repeats=3, pause=0.05)
+                time.sleep(0.8)
+                assert thread.is_alive(), result
+                write_burst(folder, ['lap_003.csv'], repeats=1, pause=0)
+                thread.join(10.0)
+                assert result.get('changed') == {'lap_003.csv'}, result
+
+                # A folder that never goes quiet is reported after max_delay
+                watcher.max_delay = 0.6
+                thread, result = wait_in_thread(watcher)
+                write_burst(folder, ['lap_003.csv'], repeats=40, pause=0.05)
+                thread.join(10.0)
+                assert result.get('changed') == {'lap_003.csv'}, result
+                assert result['seconds'] < 1.8, result
+            finally:
+                watcher.close()
+            print(f"   {watcher.backend.name} (use_inotify={use_inotify}): ✅")
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n✅ FolderWatcher working!")
+    return True
+
+
+def test_sheet_diff():
+    """Rewriting a sheet writes a .diff holding only the changed lines"""
+    print("\n" + "=" * 60)
+    print("Testing sheet .diff")
+    print("=" * 60)
+
+    cli = ClaudeTunesCLI(PROTOCOL)
+    folder = tempfile.mkdtemp(prefix="test_watch_")
+    try:
+        path = Path(folder) / 'setup.txt'
+        lines = [f"Parameter {i}: {i * 10}\n" for i in range(20)]
+        with redirect_stdout(io.StringIO()):
+            cli._save_sheet_with_diff(''.join(lines), path)
+            assert not path.with_suffix('.diff').exists()  # first version: nothing to compare
+
+            changed = list(lines)
+            changed[3] = "Parameter 3: 31\n"
+            changed[15] = "Parameter 15: 151\n"
+            cli._save_sheet_with_diff(''.join(changed), path)
+        assert path.read_text() == ''.join(changed)
+        diff = path.with_suffix('.diff').read_text().splitlines()
+        body = [line for line in diff if line[:1] in '+-' and line[:3] not in ('+++', '---')]
+        assert body == ['-Parameter 3: 30', '+Parameter 3: 31', '-Parameter 15: 150', '+Parameter 15: 151'], body
+        print("   changed lines only: ✅")
+
+        # Same sheet again: neither the sheet nor the diff is rewritten
+        before = path.with_suffix('.diff').stat().st_mtime_ns
+        with redirect_stdout(io.StringIO()) as out:
+            cli._save_sheet_with_diff(''.join(changed), path)
+        assert 'Setup unchanged' in out.getvalue()
+        assert path.with_suffix('.diff').stat().st_mtime_ns == before
+        print("   unchanged sheet: ✅")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n✅ Sheet diff working!")
+    return True
+
+
+def test_watch_domain_frequency():
+    """Watch mode on domain JSONs compares the measured ride frequency with the Phase B target"""
+    print("\n" + "=" * 60)
+    print("Testing watch update on domain JSONs")
+    print("=" * 60)
+
+    cli = ClaudeTunesCLI(PROTOCOL)
+    cli.car_data = cli._parse_car_data(os.path.join(ROOT, 'templates', 'car_data_with_ranges_MASTER.txt'))
+    folder = tempfile.mkdtemp(prefix="test_watch_")
+    try:
+        suspension = {
+            'travel_mm': {corner: {'avg': 90.0, 'samples': [80.0, 95.0, 100.0]} for corner in ('FL', 'FR', 'RL', 'RR')},
+            'ride_frequency_hz': {'front': 2.4, 'rear': 2.9, 'window_s': 10.0},
+        }
+        with open(os.path.join(folder, 'suspension.json'), 'w') as f:
+            json.dump(suspension, f)
+
+        with redirect_stdout(io.StringIO()):
+            session = cli._watch_update(Path(folder), {'suspension.json'}, None, 'setup.txt', folder)
+        assert session is not None and os.path.exists(os.path.join(folder, 'setup.txt'))
+        frequencies = cli.result.frequencies
+        measured = frequencies['measured']
+        assert measured['front'] == 2.4 and measured['rear'] == 2.9
+        assert abs(measured['front_delta'] - (2.4 - frequencies['target']['front'])) < 1e-9
+        assert any('Measured: F=2.40 Hz' in line for _, line in cli.result.log)
+        print(f"   measured vs target F: {measured['front_delta']:+.2f} Hz: ✅")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    print("\n✅ Measured ride frequency used!")
+    return True
+
+
+if __name__ == '__main__':
+    print("Watch Mode Tests")
+    print()
+
+    watcher_ok = test_folder_watcher()
+    diff_ok = test_sheet_diff()
+    frequency_ok = test_watch_domain_frequency()
+
+    print("\n" + "=" * 60)
+    if watcher_ok and diff_ok and frequency_ok:
+        print("✅ ALL TESTS PASSED!")
+        print("=" * 60)
+        sys.exit(0)
+    else:
+        print("❌ SOME TESTS FAILED")
+        print("=" * 60)
+        sys.exit(1)